@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'reports.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,6 +85,34 @@ DATABASES = {
     }
 }
 
+# Cache
+# Sdílená cache pro HTML fragmenty publikovaných reportů (reports/fragments.py);
+# souborová, aby ji viděly všechny procesy i příkaz `manage.py warm_report_cache`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
+# Limit velikosti cache vykreslených grafů v MEDIA_ROOT/charts/cache (LRU, viz reports/chart_cache.py)
+REPORT_CHART_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Měření SQL dotazů a časů požadavků (reports/profiling.py); percentily na /profiling/ (staff)
+REPORT_PROFILING = False
+REPORT_PROFILING_WINDOW = 500
+# Nejvyšší počet SQL dotazů na požadavek podle view; překročení se loguje,
+# s REPORT_QUERY_BUDGET_STRICT = True vyvolá výjimku (používají testy)
+REPORT_QUERY_BUDGETS = {
+    'reports:report_detail': 10,
+    'reports:published_report_list': 5,
+    'reports:open_report_list': 5,
+    'reports:chart_edit': 21,  # Naměřeno 21 při změně titulku (jeden zápis grafu a přeindexování), bez změny 16
+    'reports:section_action': 25,
+}
+REPORT_QUERY_BUDGET_STRICT = False
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -124,6 +153,9 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Sloupcové soubory datových zdrojů mapované do paměti (viz data_sources/columnar.py),
+# musí ležet na lokálním disku; výchozí je MEDIA_ROOT / 'data_columns'
+# DATA_COLUMNS_ROOT = BASE_DIR / 'data_columns'
 
 # Crispy Forms
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
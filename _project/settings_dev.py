@@ -4,7 +4,16 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['*']  # pro lokální testování klidně otevřené
 
-# Nepoužíváme cachování ani jiné optimalizace
+# Nepoužíváme sdílenou cache – fragmenty reportů žijí jen v paměti procesu
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Dotazy a časy požadavků v hlavičce Server-Timing a na /profiling/
+REPORT_PROFILING = True
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Volitelné: logování výjimek
@@ -1,13 +1,17 @@
 # _project/urls.py
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from reports.views import media_file
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('django.contrib.auth.urls')), # vestavěné auth views (login, logout, password)
     path('profiles/', include('profiles.urls', namespace='profiles')), # vlastní views
     path('', include('reports.urls', namespace='reports')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+if settings.DEBUG:
+    # Média s hlavičkami pro cache (obsahově pojmenované obrázky grafů natrvalo), viz reports.views.media_file
+    urlpatterns += [re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', media_file)]
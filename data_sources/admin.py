@@ -1,3 +1,22 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
 
-# Register your models here.
+from . import ingest
+from .models import DataSource
+
+
+@admin.register(DataSource)
+class DataSourceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'source_type', 'storage', 'row_count', 'ingested_at')
+    readonly_fields = ('columns', 'content_hash', 'row_count', 'ingested_at')
+    actions = ('ingest_files',)
+
+    @admin.action(description="Načíst soubory do dat")
+    def ingest_files(self, request, queryset):
+        for source in queryset:
+            try:
+                result = ingest.ingest_data_source(source)
+            except ValidationError as e:
+                self.message_user(request, f"{source.name}: {' '.join(e.messages)}", messages.ERROR)
+                continue
+            self.message_user(request, f"{source.name}: {result['status']}, řádků {result['total_rows']}")
@@ -0,0 +1,354 @@
+# data_sources/columnar.py
+
+"""
+Sloupcové úložiště dat zdroje v binárních souborech mapovaných do paměti.
+
+Pro zdroje s `DataSource.storage == COLUMNAR` se řádky neukládají jako JSON do
+`Data.content`. Každý sloupec je samostatný soubor v adresáři
+`DATA_COLUMNS_ROOT/<id zdroje>/<verze>/` (výchozí `MEDIA_ROOT/data_columns`):
+
+- `c<i>.i8` / `c<i>.f8` – čísla jako pole int64 / float64 (little-endian),
+- `c<i>.off` + `c<i>.txt` – text: offsety (int64, n+1 hodnot) do UTF-8 dat,
+- `c<i>.null` – maska prázdných hodnot (uint8, 1 = None) pro každý sloupec.
+
+V databázi zůstává jen jeden záznam `Data` s metadaty (adresář, názvy a typy
+sloupců). Čtení sloupce nebo rozsahu řádků přes `np.memmap` nic nekopíruje –
+do paměti se načtou jen stránky souboru, na které se skutečně sáhne.
+"""
+
+"""
+Seznam funkcí v `data_sources/columnar.py`:
+
+1. `columns_root() -> str`
+2. `store_columns(source: DataSource, open_rows, append: bool, chunk_rows: int) -> tuple[list, int]`
+3. `columnar_metadata(source: DataSource) -> dict | None`
+4. `read_column(source: DataSource, name: str, start: int = 0, stop: int = None) -> np.ma.MaskedArray`
+5. `read_rows(source: DataSource, start: int = 0, stop: int = None, block_rows: int = 5000) -> Iterator[list]`
+6. `read_positions(source: DataSource, positions: list) -> list`
+7. `remove_columns(path: str) -> None`
+"""
+
+import json
+import os
+import shutil
+import uuid
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import DataSource, Data
+
+COLUMN_INT = 'i8'
+COLUMN_FLOAT = 'f8'
+COLUMN_TEXT = 'text'
+
+COLUMNAR_FORMAT = 'columnar'
+
+
+def columns_root() -> str:
+    """
+    Kořenový adresář sloupcových souborů (nastavení `DATA_COLUMNS_ROOT`).
+    """
+    return str(getattr(settings, 'DATA_COLUMNS_ROOT', None) or os.path.join(settings.MEDIA_ROOT, 'data_columns'))
+
+
+def _kind(value, current):
+    """Typ sloupce po přidání hodnoty: int -> float -> text (jen směrem k obecnějšímu)."""
+    if value is None or current == COLUMN_TEXT:
+        return current
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return COLUMN_TEXT
+    if isinstance(value, float) or current == COLUMN_FLOAT:
+        return COLUMN_FLOAT
+    return COLUMN_INT if -2 ** 63 <= value < 2 ** 63 else COLUMN_FLOAT
+
+
+def _text(value) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class _ColumnWriter:
+    """
+    Připisuje hodnoty jednoho sloupce na konec jeho souborů.
+
+    Soubory se nejprve zkrátí na `rows` řádků – případný zbytek po přerušeném
+    zápisu se tak zahodí.
+    """
+
+    def __init__(self, directory: str, index: int, kind: str, rows: int):
+        self.kind = kind
+        prefix = os.path.join(directory, f"c{index}")
+        self.nulls = self._open(f"{prefix}.null", rows)
+        if kind == COLUMN_TEXT:
+            self.offsets = self._open(f"{prefix}.off", rows + 1 if rows else 0, itemsize=8)
+            if rows == 0:
+                self.offsets.write(np.zeros(1, dtype='<i8').tobytes())
+                self.end = 0
+            else:
+                self.end = int(np.fromfile(f"{prefix}.off", dtype='<i8', offset=rows * 8, count=1)[0])
+            self.values = self._open(f"{prefix}.txt", self.end)
+        else:
+            self.values = self._open(f"{prefix}.{kind}", rows, itemsize=8)
+
+    @staticmethod
+    def _open(path: str, items: int, itemsize: int = 1):
+        handle = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        handle.truncate(items * itemsize)
+        handle.seek(0, os.SEEK_END)
+        return handle
+
+    def write(self, values: list) -> None:
+        nulls = np.fromiter((value is None for value in values), dtype=np.uint8, count=len(values))
+        self.nulls.write(nulls.tobytes())
+        if self.kind == COLUMN_TEXT:
+            encoded = [b'' if value is None else _text(value).encode('utf-8') for value in values]
+            lengths = np.fromiter((len(item) for item in encoded), dtype='<i8', count=len(encoded))
+            offsets = self.end + np.cumsum(lengths)
+            self.offsets.write(offsets.astype('<i8').tobytes())
+            self.values.write(b''.join(encoded))
+            if len(offsets):
+                self.end = int(offsets[-1])
+        else:
+            filled = [0 if value is None else value for value in values]
+            try:
+                array = np.array(filled, dtype='<' + self.kind)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError("Hodnoty sloupce neodpovídají jeho číselnému typu.")
+            if self.kind == COLUMN_FLOAT:
+                array[nulls.astype(bool)] = np.nan
+            self.values.write(array.tobytes())
+
+    def close(self) -> None:
+        self.nulls.close()
+        self.values.close()
+        if self.kind == COLUMN_TEXT:
+            self.offsets.close()
+
+
+def _infer_kinds(rows, kinds: list) -> list:
+    for row in rows:
+        if len(row) > len(kinds):
+            kinds.extend([None] * (len(row) - len(kinds)))
+        for index, value in enumerate(row):
+            kinds[index] = _kind(value, kinds[index])
+    return kinds
+
+
+def store_columns(source: DataSource, open_rows, append: bool, chunk_rows: int):
+    """
+    Uloží řádky souboru zdroje do sloupcových souborů a metadatového záznamu `Data`.
+
+    Soubor se čte dvakrát proudově: poprvé se určí typy sloupců, podruhé se
+    hodnoty po blocích `chunk_rows` připisují do souborů. Nové načtení se
+    zapisuje do nové verze adresáře, stará se smaže až po commitu transakce.
+
+    Args:
+        source: Datový zdroj.
+        open_rows: Funkce vracející context manager s dvojicí (sloupce, iterátor řádků).
+        append: Připsat jen řádky za `source.row_count` do stávající verze.
+        chunk_rows: Počet řádků zapisovaných najednou.
+
+    Returns:
+        tuple[list, int]: Názvy sloupců a počet nově uložených řádků.
+
+    Raises:
+        ValidationError: Pokud se při `append` změnila hlavička nebo typ sloupce.
+    """
+    metadata = columnar_metadata(source) if append else None
+    skip = source.row_count if metadata else 0
+    known = [column['kind'] for column in metadata['columns']] if metadata else []
+
+    with open_rows() as (columns, rows):
+        kinds = _infer_kinds(islice(rows, skip, None), list(known))
+        columns = list(columns)
+    if metadata:
+        if columns[:len(known)] != [column['name'] for column in metadata['columns']]:
+            raise ValidationError("Hlavička souboru se od posledního načtení změnila, načtěte ho celý.")
+        # Už zapsaný sloupec nelze rozšířit na obecnější typ bez přepsání celého souboru
+        if kinds[:len(known)] != known:
+            raise ValidationError("Typ sloupce se od posledního načtení změnil, načtěte soubor celý.")
+        version = metadata['path']
+    else:
+        version = f"{source.pk}/{uuid.uuid4().hex}"
+    kinds = [kind or COLUMN_FLOAT for kind in kinds]
+    columns = columns + [f"column_{index + 1}" for index in range(len(columns), len(kinds))]
+
+    directory = os.path.join(columns_root(), version)
+    os.makedirs(directory, exist_ok=True)
+
+    writers = []
+    for index, kind in enumerate(kinds):
+        if index < len(known):
+            writers.append(_ColumnWriter(directory, index, kind, skip))
+            continue
+        # Nový sloupec (nový klíč v JSON) – dříve uložené řádky v něm mají prázdnou hodnotu
+        writer = _ColumnWriter(directory, index, kind, 0)
+        for offset in range(0, skip, chunk_rows):
+            writer.write([None] * min(chunk_rows, skip - offset))
+        writers.append(writer)
+    stored = 0
+    try:
+        with open_rows() as (_, rows):
+            rows = islice(rows, skip, None)
+            while True:
+                chunk = list(islice(rows, chunk_rows))
+                if not chunk:
+                    break
+                for index, writer in enumerate(writers):
+                    writer.write([row[index] if index < len(row) else None for row in chunk])
+                stored += len(chunk)
+    except Exception:
+        if not metadata:
+            remove_columns(version)
+        raise
+    finally:
+        for writer in writers:
+            writer.close()
+
+    previous = columnar_metadata(source)
+    source.data_entries.all().delete()
+    Data.objects.create(
+        data_source=source,
+        content={
+            'format': COLUMNAR_FORMAT,
+            'path': version,
+            'columns': [{'name': name, 'kind': kind} for name, kind in zip(columns, kinds)],
+        },
+        start_row=0,
+        row_count=skip + stored,
+    )
+    if previous and previous['path'] != version:
+        transaction.on_commit(lambda: remove_columns(previous['path']))
+    return columns, stored
+
+
+def columnar_metadata(source: DataSource):
+    """
+    Vrátí metadata sloupcového uložení zdroje, nebo None, pokud zdroj není uložen sloupcově.
+    """
+    return source.data_entries.filter(content__format=COLUMNAR_FORMAT).values_list('content', flat=True).first()
+
+
+def _memmap(path: str, dtype: str, count: int):
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+def _column(metadata: dict, name: str):
+    for index, column in enumerate(metadata['columns']):
+        if column['name'] == name:
+            return index, column['kind']
+    raise KeyError(name)
+
+
+def _read(directory: str, index: int, kind: str, rows: int, start: int, stop: int):
+    prefix = os.path.join(directory, f"c{index}")
+    nulls = _memmap(f"{prefix}.null", np.uint8, rows)[start:stop].view(bool)
+    if kind != COLUMN_TEXT:
+        return np.ma.MaskedArray(_memmap(f"{prefix}.{kind}", '<' + kind, rows)[start:stop], mask=nulls, copy=False)
+
+    offsets = _memmap(f"{prefix}.off", '<i8', rows + 1)[start:stop + 1]
+    data = _memmap(f"{prefix}.txt", np.uint8, int(offsets[-1]) if len(offsets) else 0)
+    values = np.empty(len(nulls), dtype=object)
+    for position in range(len(values)):
+        values[position] = bytes(data[offsets[position]:offsets[position + 1]]).decode('utf-8')
+    return np.ma.MaskedArray(values, mask=nulls, copy=False)
+
+
+def _range(rows: int, start: int, stop):
+    stop = rows if stop is None else min(stop, rows)
+    return min(start, stop), stop
+
+
+def read_column(source: DataSource, name: str, start: int = 0, stop: int = None):
+    """
+    Přečte rozsah řádků [start, stop) jednoho sloupce.
+
+    Číselné sloupce se vrací jako pohled do souboru mapovaného do paměti (bez
+    kopie); textové se dekódují jen v požadovaném rozsahu.
+
+    Returns:
+        np.ma.MaskedArray: Hodnoty s maskou prázdných buněk.
+
+    Raises:
+        ValidationError: Pokud zdroj není uložen sloupcově.
+        KeyError: Pokud sloupec neexistuje.
+    """
+    metadata = columnar_metadata(source)
+    if metadata is None:
+        raise ValidationError("Datový zdroj není uložen sloupcově.")
+    rows = source.row_count
+    index, kind = _column(metadata, name)
+    start, stop = _range(rows, start, stop)
+    return _read(os.path.join(columns_root(), metadata['path']), index, kind, rows, start, stop)
+
+
+def read_rows(source: DataSource, start: int = 0, stop: int = None, block_rows: int = 5000):
+    """
+    Proudově vrací řádky [start, stop) sestavené ze sloupcových souborů (prázdné hodnoty jako None).
+
+    Raises:
+        ValidationError: Pokud zdroj není uložen sloupcově.
+    """
+    metadata = columnar_metadata(source)
+    if metadata is None:
+        raise ValidationError("Datový zdroj není uložen sloupcově.")
+    rows = source.row_count
+    directory = os.path.join(columns_root(), metadata['path'])
+    start, stop = _range(rows, start, stop)
+    for block_start in range(start, stop, block_rows):
+        block_stop = min(block_start + block_rows, stop)
+        values = [
+            _read(directory, index, column['kind'], rows, block_start, block_stop).tolist()
+            for index, column in enumerate(metadata['columns'])
+        ]
+        yield from (list(row) for row in zip(*values))
+
+
+def _read_at(directory: str, index: int, kind: str, rows: int, positions: np.ndarray) -> list:
+    prefix = os.path.join(directory, f"c{index}")
+    nulls = _memmap(f"{prefix}.null", np.uint8, rows)[positions].view(bool)
+    if kind != COLUMN_TEXT:
+        values = _memmap(f"{prefix}.{kind}", '<' + kind, rows)[positions]
+        return np.ma.MaskedArray(values, mask=nulls).tolist()
+
+    offsets = _memmap(f"{prefix}.off", '<i8', rows + 1)
+    data = _memmap(f"{prefix}.txt", np.uint8, int(offsets[-1]))
+    return [
+        None if null else bytes(data[offsets[position]:offsets[position + 1]]).decode('utf-8')
+        for position, null in zip(positions.tolist(), nulls.tolist())
+    ]
+
+
+def read_positions(source: DataSource, positions: list) -> list:
+    """
+    Vrátí řádky na zadaných pozicích (v zadaném pořadí); text se dekóduje jen u nich.
+
+    Raises:
+        ValidationError: Pokud zdroj není uložen sloupcově.
+        IndexError: Pokud pozice leží mimo zdroj.
+    """
+    metadata = columnar_metadata(source)
+    if metadata is None:
+        raise ValidationError("Datový zdroj není uložen sloupcově.")
+    rows = source.row_count
+    positions = np.asarray(positions, dtype=np.int64)
+    if positions.size and (positions.min() < 0 or positions.max() >= rows):
+        raise IndexError("Pozice řádku mimo datový zdroj.")
+    directory = os.path.join(columns_root(), metadata['path'])
+    values = [
+        _read_at(directory, index, column['kind'], rows, positions)
+        for index, column in enumerate(metadata['columns'])
+    ]
+    return [list(row) for row in zip(*values)]
+
+
+def remove_columns(path: str) -> None:
+    """
+    Smaže adresář jedné verze sloupcových souborů (cesta relativně k `columns_root()`).
+    """
+    shutil.rmtree(os.path.join(columns_root(), path), ignore_errors=True)
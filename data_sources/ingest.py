@@ -0,0 +1,418 @@
+# data_sources/ingest.py
+
+"""
+Načítání souborů datových zdrojů (CSV, JSON, XLSX) do `Data`.
+
+Soubor se čte proudově a ukládá po blocích `DATA_CHUNK_ROWS` řádků – v paměti
+je vždy nejvýš jeden blok, takže lze načítat i soubory o stovkách MB. Každý
+blok je jeden záznam `Data` (`content` = seznam řádků, `start_row` = index
+prvního řádku), názvy sloupců jsou v `DataSource.columns`.
+
+Ke zdroji se ukládá SHA-256 souboru; opakované nahrání nezměněného souboru se
+přeskočí. V režimu `append` se ze souboru, který jen narostl na konci, uloží
+pouze nové řádky. Ke zdroji se proto ukládá i délka a hash načtené části
+souboru (u JSON pole bez uzavírací `]`) a `append` se odmítne, pokud se tato
+část mezitím změnila – jinak by se nové řádky počítaly od špatného místa. Velké číselné zdroje lze místo JSON bloků ukládat sloupcově
+(`DataSource.storage`, viz `data_sources/columnar.py`).
+"""
+
+"""
+Seznam funkcí v `data_sources/ingest.py`:
+
+1. `file_hash(fileobj) -> str`
+2. `iter_rows(source: DataSource, fileobj) -> tuple[list, Iterator[list]]`
+3. `open_rows(source: DataSource) -> ContextManager[tuple[list, Iterator[list]]]`
+4. `ingest_data_source(source: DataSource, append: bool = False, force: bool = False) -> dict`
+5. `iter_source_rows(source: DataSource, start: int = 0, stop: int = None) -> Iterator[list]`
+"""
+
+import csv
+import hashlib
+import io
+import json
+import re
+import zipfile
+from contextlib import contextmanager
+from itertools import islice
+from xml.etree import ElementTree
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import columnar
+from .models import DataSource, Data
+
+DATA_CHUNK_ROWS = 5000  # Řádků v jednom záznamu Data
+READ_SIZE = 1024 * 1024  # Velikost čteného bloku souboru (hash, JSON)
+
+INGEST_SKIPPED = 'skipped'
+INGEST_REPLACED = 'replaced'
+INGEST_APPENDED = 'appended'
+
+
+def _prefix_hashes(fileobj, sizes) -> list:
+    """
+    Spočítá jedním průchodem SHA-256 prvních N bajtů souboru pro každou délku
+    v `sizes` (None = celý soubor) a vrátí ukazatel souboru na začátek.
+    """
+    digest = hashlib.sha256()
+    hashes = {}
+    pending = sorted({size for size in sizes if size is not None})
+    position = 0
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(READ_SIZE), b''):
+        while pending and pending[0] <= position + len(block):
+            size = pending.pop(0)
+            prefix = digest.copy()
+            prefix.update(block[:size - position])
+            hashes[size] = prefix.hexdigest()
+        digest.update(block)
+        position += len(block)
+    fileobj.seek(0)
+    full = digest.hexdigest()
+    # Delší než soubor: hash celého souboru, s uloženým prefixem se neshoduje
+    return [full if size is None else hashes.get(size, '') for size in sizes]
+
+
+def file_hash(fileobj) -> str:
+    """
+    Spočítá SHA-256 souboru po blocích a vrátí ukazatel souboru na začátek.
+    """
+    return _prefix_hashes(fileobj, [None])[0]
+
+
+def _appendable_size(source: DataSource, fileobj) -> int:
+    """
+    Vrátí délku části souboru, která se při `append` nesmí změnit: celý soubor,
+    u JSON pole bez závěrečné `]` (a bílých znaků kolem ní), za kterou se připisuje.
+    """
+    size = fileobj.seek(0, io.SEEK_END)
+    if source.source_type == DataSource.SourceType.JSON:
+        start = max(size - 64, 0)
+        fileobj.seek(start)
+        tail = fileobj.read().rstrip()
+        if tail.endswith(b']'):
+            size = start + len(tail[:-1].rstrip())
+    fileobj.seek(0)
+    return size
+
+
+def _cell(value):
+    """Převede textovou hodnotu buňky na číslo, pokud to jde; prázdná buňka je None."""
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    value = value.strip()
+    if value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+# -------------------- CSV --------------------
+
+def _read_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return [], iter(())
+    return [name.strip() for name in header], ([_cell(value) for value in row] for row in reader if row)
+
+
+# -------------------- JSON --------------------
+
+_JSON_SKIP = re.compile(r'[\s,]*')
+
+
+def _iter_json_array(text, buf: str):
+    """Proudově dekóduje prvky JSON pole; `buf` je už načtený text za úvodní '['."""
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+    while True:
+        pos = _JSON_SKIP.match(buf, pos).end()
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        if pos < len(buf):
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                end = None
+            # Prvek končící přesně na konci bloku (např. číslo) může pokračovat v dalším bloku
+            if end is not None and (end < len(buf) or eof):
+                yield value
+                pos = end
+                continue
+        if eof:
+            raise ValueError("Neplatný nebo neukončený JSON.")
+        more = text.read(READ_SIZE)
+        eof = not more
+        buf, pos = buf[pos:] + more, 0
+
+
+def _read_json(fileobj):
+    """
+    Čte pole objektů (`[{...}, ...]`) nebo JSON Lines (jeden objekt na řádek).
+    Sloupce se doplňují podle klíčů, jak se v objektech objevují.
+    """
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig')
+    buf = text.read(READ_SIZE).lstrip()
+    if buf.startswith('['):
+        records = _iter_json_array(text, buf[1:])
+    else:
+        text.seek(0)
+        records = (json.loads(line) for line in text if line.strip())
+
+    columns = []
+    positions = {}
+
+    def rows():
+        for record in records:
+            if isinstance(record, list):
+                yield record
+                continue
+            if not isinstance(record, dict):
+                raise ValueError("Řádek JSON musí být objekt nebo pole.")
+            for key in record:
+                if key not in positions:
+                    positions[key] = len(columns)
+                    columns.append(key)
+            row = [None] * len(columns)
+            for key, value in record.items():
+                row[positions[key]] = value
+            yield row
+
+    return columns, rows()
+
+
+# -------------------- XLSX --------------------
+
+_XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_CELL_COLUMN = re.compile(r'[A-Z]+')
+
+
+def _column_index(ref: str) -> int:
+    index = 0
+    for letter in _CELL_COLUMN.match(ref).group():
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def _xlsx_shared_strings(archive) -> list:
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == _XLSX_NS + 'si':
+                strings.append(''.join(node.text or '' for node in elem.iter(_XLSX_NS + 't')))
+                elem.clear()
+    return strings
+
+
+def _xlsx_value(cell, shared_strings):
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(node.text or '' for node in cell.iter(_XLSX_NS + 't'))
+    value = cell.find(_XLSX_NS + 'v')
+    if value is None or value.text is None:
+        return None
+    if kind == 's':
+        return shared_strings[int(value.text)]
+    if kind == 'b':
+        return value.text == '1'
+    if kind in ('str', 'e'):
+        return value.text
+    return _cell(value.text)
+
+
+def _iter_xlsx_rows(archive, sheet: str, shared_strings):
+    with archive.open(sheet) as f:
+        sheet_data = None
+        for event, elem in ElementTree.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == _XLSX_NS + 'sheetData':
+                    sheet_data = elem
+                continue
+            if elem.tag != _XLSX_NS + 'row':
+                continue
+            row = []
+            for cell in elem.iter(_XLSX_NS + 'c'):
+                index = _column_index(cell.get('r')) if cell.get('r') else len(row)
+                row.extend([None] * (index - len(row)))
+                row.append(_xlsx_value(cell, shared_strings))
+            sheet_data.clear()  # Zpracované řádky se v paměti nedrží
+            yield row
+
+
+def _read_xlsx(fileobj):
+    """
+    Čte první list sešitu XLSX proudově (zipfile + iterparse), bez načtení celého listu.
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise ValueError("Soubor není platný sešit XLSX.")
+    sheets = sorted(
+        (name for name in archive.namelist() if re.fullmatch(r'xl/worksheets/sheet\d+\.xml', name)),
+        key=lambda name: int(re.search(r'\d+', name.rsplit('/', 1)[1]).group()),
+    )
+    if not sheets:
+        raise ValueError("Sešit XLSX neobsahuje žádný list.")
+    rows = _iter_xlsx_rows(archive, sheets[0], _xlsx_shared_strings(archive))
+    header = next(rows, None)
+    if header is None:
+        return [], iter(())
+    return ['' if name is None else str(name).strip() for name in header], rows
+
+
+_READERS = {
+    DataSource.SourceType.CSV: _read_csv,
+    DataSource.SourceType.JSON: _read_json,
+    DataSource.SourceType.EXCEL: _read_xlsx,
+}
+
+
+def iter_rows(source: DataSource, fileobj):
+    """
+    Vrátí sloupce a iterátor řádků souboru zdroje podle jeho typu.
+
+    U JSON se seznam sloupců doplňuje postupně během iterace.
+
+    Raises:
+        ValidationError: Pokud typ zdroje nejde načíst ze souboru.
+    """
+    reader = _READERS.get(source.source_type)
+    if reader is None:
+        raise ValidationError(f"Zdroj typu {source.source_type} nelze načíst ze souboru.")
+    return reader(fileobj)
+
+
+@contextmanager
+def open_rows(source: DataSource):
+    """
+    Otevře soubor zdroje a vrátí dvojici (sloupce, iterátor řádků); soubor se po bloku `with` zavře.
+    """
+    with source.file.storage.open(source.file.name, 'rb') as fileobj:
+        yield iter_rows(source, fileobj)
+
+
+def _store_row_chunks(source: DataSource, append: bool, chunk_rows: int):
+    with open_rows(source) as (columns, rows):
+        if append:
+            next(islice(rows, source.row_count, source.row_count), None)  # Přeskočí načtené řádky
+            start_row = source.row_count
+        else:
+            source.data_entries.all().delete()
+            start_row = 0
+
+        stored = 0
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            Data.objects.create(data_source=source, content=chunk, start_row=start_row + stored, row_count=len(chunk))
+            stored += len(chunk)
+
+    if append and source.source_type == DataSource.SourceType.JSON:
+        columns = source.columns + [name for name in columns if name not in source.columns]
+    return columns, stored
+
+
+def _stored_as(source: DataSource) -> str:
+    """Vrátí, ve kterém úložišti jsou teď data zdroje (může se lišit od `source.storage` před novým načtením)."""
+    if columnar.columnar_metadata(source) is not None:
+        return DataSource.Storage.COLUMNAR
+    return DataSource.Storage.ROWS
+
+
+def ingest_data_source(source: DataSource, append: bool = False, force: bool = False,
+                       chunk_rows: int = DATA_CHUNK_ROWS) -> dict:
+    """
+    Načte soubor datového zdroje do záznamů `Data`, případně do sloupcových
+    souborů (`DataSource.storage == COLUMNAR`, viz `data_sources/columnar.py`).
+
+    Args:
+        source: Datový zdroj se souborem (CSV, JSON nebo XLSX).
+        append: Uložit jen řádky za již načtenými (soubor od posledního načtení jen narostl).
+        force: Načíst soubor i tehdy, když se jeho hash nezměnil.
+        chunk_rows: Počet řádků v jednom záznamu `Data` (u sloupcového úložiště v jednom zápisu).
+
+    Returns:
+        dict: `status` (`skipped`, `replaced`, `appended`), `rows` (nově uložené řádky)
+        a `total_rows` (řádků ve zdroji celkem).
+
+    Raises:
+        ValidationError: Pokud zdroj nemá soubor, soubor nejde přečíst nebo
+        se při `append` změnila už načtená část souboru.
+    """
+    if not source.file:
+        raise ValidationError("Datový zdroj nemá soubor k načtení.")
+
+    with source.file.open('rb') as fileobj:
+        size = _appendable_size(source, fileobj)
+        digest, size_hash, ingested_hash = _prefix_hashes(fileobj, [None, size, source.ingested_bytes])
+    stored_as = _stored_as(source) if source.row_count else source.storage
+    if digest == source.content_hash and stored_as == source.storage and not force:
+        return {'status': INGEST_SKIPPED, 'rows': 0, 'total_rows': source.row_count}
+
+    # Při změně úložiště se soubor vždy načte celý
+    append = append and source.row_count > 0 and stored_as == source.storage
+    if append:
+        if source.source_type == DataSource.SourceType.EXCEL:
+            raise ValidationError("Sešit XLSX nelze načíst v režimu append, načtěte ho celý.")
+        if not source.ingested_hash or ingested_hash != source.ingested_hash:
+            raise ValidationError("Již načtená část souboru se od posledního načtení změnila, načtěte ho celý.")
+    try:
+        with transaction.atomic():
+            if source.storage == DataSource.Storage.COLUMNAR:
+                columns, stored = columnar.store_columns(source, lambda: open_rows(source), append, chunk_rows)
+            else:
+                previous = columnar.columnar_metadata(source)
+                columns, stored = _store_row_chunks(source, append, chunk_rows)
+                if previous is not None:
+                    transaction.on_commit(lambda: columnar.remove_columns(previous['path']))
+
+            source.columns = columns
+            source.content_hash = digest
+            source.row_count = (source.row_count if append else 0) + stored
+            source.ingested_at = timezone.now()
+            source.ingested_bytes = size
+            source.ingested_hash = size_hash
+            source.save(update_fields=['columns', 'content_hash', 'row_count', 'ingested_at',
+                                       'ingested_bytes', 'ingested_hash'])
+    except (ValueError, UnicodeDecodeError, csv.Error, ElementTree.ParseError) as e:
+        raise ValidationError(f"Soubor zdroje {source.name} nelze načíst: {e}")
+
+    status = INGEST_APPENDED if append else INGEST_REPLACED
+    return {'status': status, 'rows': stored, 'total_rows': source.row_count}
+
+
+def iter_source_rows(source: DataSource, start: int = 0, stop: int = None):
+    """
+    Proudově vrací uložené řádky zdroje v rozsahu [start, stop), doplněné na počet sloupců.
+
+    Načítají se jen bloky `Data`, které rozsah překrývají; sloupcově uložené
+    zdroje se čtou ze souborů mapovaných do paměti.
+    """
+    if _stored_as(source) == DataSource.Storage.COLUMNAR:
+        yield from columnar.read_rows(source, start, stop)
+        return
+
+    width = len(source.columns)
+    chunks = source.data_entries.alias(end_row=F('start_row') + F('row_count')).filter(end_row__gt=start)
+    if stop is not None:
+        chunks = chunks.filter(start_row__lt=stop)
+    for chunk in chunks.order_by('start_row').iterator(chunk_size=1):
+        first = max(start - chunk.start_row, 0)
+        last = chunk.row_count if stop is None else min(stop - chunk.start_row, chunk.row_count)
+        for row in chunk.content[first:last]:
+            yield row + [None] * (width - len(row))
@@ -0,0 +1,39 @@
+# data_sources/management/commands/ingest_data_source.py
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources import ingest
+from data_sources.models import DataSource
+
+
+class Command(BaseCommand):
+    help = (
+        "Načte soubory datových zdrojů (CSV, JSON, XLSX) do Data po blocích řádků. "
+        "Zdroje, jejichž soubor se od posledního načtení nezměnil, se přeskočí."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source_ids', nargs='*', type=int, help="ID zdrojů (výchozí všechny zdroje se souborem).")
+        parser.add_argument('--append', action='store_true', help="Uložit jen nové řádky na konci souboru.")
+        parser.add_argument('--force', action='store_true', help="Načíst i nezměněné soubory.")
+
+    def handle(self, *args, **options):
+        sources = DataSource.objects.exclude(file='').exclude(file__isnull=True).order_by('pk')
+        if options['source_ids']:
+            sources = sources.filter(pk__in=options['source_ids'])
+
+        failed = 0
+        for source in sources:
+            try:
+                result = ingest.ingest_data_source(source, append=options['append'], force=options['force'])
+            except ValidationError as e:
+                failed += 1
+                self.stderr.write(f"{source.name}: {' '.join(e.messages)}")
+                continue
+            self.stdout.write(
+                f"{source.name}: {result['status']}, nových řádků {result['rows']}, celkem {result['total_rows']}"
+            )
+
+        if failed:
+            raise CommandError(f"Nepodařilo se načíst {failed} zdrojů.")
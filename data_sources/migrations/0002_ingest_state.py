@@ -0,0 +1,51 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_sources', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='data',
+            options={'ordering': ['data_source', 'start_row']},
+        ),
+        migrations.AddField(
+            model_name='data',
+            name='row_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='data',
+            name='start_row',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='columns',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='ingested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='row_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='data',
+            index=models.Index(fields=['data_source', 'start_row'], name='data_source_data_so_328729_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_sources', '0002_ingest_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasource',
+            name='storage',
+            field=models.CharField(choices=[('ROWS', 'JSON row chunks'), ('COLUMNAR', 'Memory-mapped columns')], default='ROWS', max_length=10),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_sources', '0003_datasource_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasource',
+            name='ingested_bytes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='ingested_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
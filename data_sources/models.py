@@ -7,18 +7,36 @@ class DataSource(models.Model):
         EXCEL = "EXCEL", "Excel File"
         API = "API", "API Endpoint"
 
+    class Storage(models.TextChoices):
+        ROWS = "ROWS", "JSON row chunks"
+        COLUMNAR = "COLUMNAR", "Memory-mapped columns"
+
     name = models.CharField(max_length=200)
     source_type = models.CharField(max_length=10, choices=SourceType.choices)
     file = models.FileField(upload_to="data_sources/", null=True, blank=True)
     api_url = models.URLField(null=True, blank=True)
+    storage = models.CharField(max_length=10, choices=Storage.choices, default=Storage.ROWS)  # Viz data_sources/columnar.py
+
+    # Stav posledního načtení souboru (viz data_sources/ingest.py)
+    columns = models.JSONField(default=list, blank=True)  # Názvy sloupců v pořadí hodnot v řádcích
+    content_hash = models.CharField(max_length=64, blank=True)  # SHA-256 naposledy načteného souboru
+    row_count = models.PositiveIntegerField(default=0)
+    ingested_at = models.DateTimeField(null=True, blank=True)
+    ingested_bytes = models.PositiveBigIntegerField(default=0)  # Délka načtené části souboru (pro append)
+    ingested_hash = models.CharField(max_length=64, blank=True)  # SHA-256 prvních `ingested_bytes` bajtů
 
     def __str__(self):
         return self.name
 
 class Data(models.Model):
     data_source = models.ForeignKey(DataSource, on_delete=models.CASCADE, related_name="data_entries")
-    content = models.JSONField()  # Uložená data jako JSON
+    content = models.JSONField()  # Uložená data jako JSON – blok řádků (seznamy hodnot podle DataSource.columns)
+    start_row = models.PositiveIntegerField(default=0)  # Index prvního řádku bloku ve zdroji
+    row_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['data_source', 'start_row']
+        indexes = [models.Index(fields=['data_source', 'start_row'])]
 
     def __str__(self):
         return f"Data for {self.data_source.name}"
-
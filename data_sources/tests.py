@@ -1,3 +1,271 @@
-from django.test import TestCase
+# data_sources/tests.py
 
-# Create your tests here.
+"""
+Obsahuje testy načítání souborů datových zdrojů (data_sources/ingest.py) a
+sloupcového úložiště dat (data_sources/columnar.py).
+"""
+
+"""
+Seznam testovaných funkcí v 'data_sources/tests.py':
+
+Načítání datových zdrojů
+1. `test_ingest_csv_stores_row_chunks`
+2. `test_ingest_skips_unchanged_file`
+3. `test_ingest_append_stores_only_new_rows`
+4. `test_ingest_append_rejects_changed_ingested_rows`
+5. `test_ingest_json_and_xlsx`
+6. `test_ingest_invalid_file_keeps_previous_data`
+
+Sloupcové úložiště dat
+7. `test_columnar_ingest_stores_typed_column_files`
+8. `test_columnar_rows_match_row_storage`
+9. `test_columnar_append_adds_rows_and_new_columns`
+10. `test_columnar_reingest_removes_old_version`
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO, StringIO
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from data_sources import columnar, ingest
+from data_sources.models import DataSource, Data
+
+
+    # -------------------- data source ingestion --------------------
+
+class DataSourceIngestTest(TestCase):
+    """
+    Testy pro proudové načítání souborů datových zdrojů do Data (data_sources/ingest.py).
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _source(self, name, content, source_type=DataSource.SourceType.CSV):
+        source = DataSource(name=name, source_type=source_type)
+        source.file.save(name, ContentFile(content))
+        return source
+
+    def _replace_file(self, source, content):
+        source.file.delete(save=False)
+        source.file.save(source.name, ContentFile(content))
+
+    def _csv(self, rows):
+        return ("rok,hodnota\n" + "".join(f"{2000 + i},{i * 1.5}\n" for i in range(rows))).encode('utf-8')
+
+    def test_ingest_csv_stores_row_chunks(self):
+        """
+        Testuje, že CSV se uloží po blocích řádků s čísly převedenými z textu.
+        """
+        source = self._source("rates.csv", self._csv(12))
+        result = ingest.ingest_data_source(source, chunk_rows=5)
+
+        self.assertEqual(result, {'status': ingest.INGEST_REPLACED, 'rows': 12, 'total_rows': 12})
+        source.refresh_from_db()
+        self.assertEqual(source.columns, ["rok", "hodnota"])
+        self.assertEqual(len(source.content_hash), 64)
+        self.assertEqual(list(Data.objects.filter(data_source=source).values_list('start_row', 'row_count')),
+                         [(0, 5), (5, 5), (10, 2)])
+        self.assertEqual(list(ingest.iter_source_rows(source, 4, 7)), [[2004, 6.0], [2005, 7.5], [2006, 9.0]])
+
+    def test_ingest_skips_unchanged_file(self):
+        """
+        Testuje, že opakované načtení nezměněného souboru nic nezapisuje.
+        """
+        source = self._source("rates.csv", self._csv(3))
+        ingest.ingest_data_source(source)
+        data_ids = list(Data.objects.values_list('pk', flat=True))
+
+        result = ingest.ingest_data_source(source)
+
+        self.assertEqual(result['status'], ingest.INGEST_SKIPPED)
+        self.assertEqual(list(Data.objects.values_list('pk', flat=True)), data_ids)
+        self.assertEqual(ingest.ingest_data_source(source, force=True)['status'], ingest.INGEST_REPLACED)
+
+    def test_ingest_append_stores_only_new_rows(self):
+        """
+        Testuje, že v režimu append se ze zvětšeného souboru uloží jen nové řádky.
+        """
+        source = self._source("rates.csv", self._csv(4))
+        ingest.ingest_data_source(source)
+        first_chunk = Data.objects.get(data_source=source)
+
+        self._replace_file(source, self._csv(7))
+        call_command('ingest_data_source', str(source.pk), '--append', stdout=StringIO())
+
+        source.refresh_from_db()
+        self.assertEqual(source.row_count, 7)
+        self.assertTrue(Data.objects.filter(pk=first_chunk.pk).exists())
+        new_chunk = Data.objects.exclude(pk=first_chunk.pk).get(data_source=source)
+        self.assertEqual((new_chunk.start_row, new_chunk.content), (4, [[2004, 6.0], [2005, 7.5], [2006, 9.0]]))
+
+        self._replace_file(source, b"year,value\n2010,1\n2011,2\n2012,3\n2013,4\n2014,5\n2015,6\n2016,7\n2017,8\n")
+        with self.assertRaises(ValidationError):
+            ingest.ingest_data_source(source, append=True)
+
+    def test_ingest_append_rejects_changed_ingested_rows(self):
+        """
+        Testuje, že append se odmítne, když se změnil už načtený řádek (hlavička zůstala stejná).
+        """
+        source = self._source("rates.csv", self._csv(4))
+        ingest.ingest_data_source(source)
+
+        self._replace_file(source, self._csv(6).replace(b"2001,1.5", b"2001,9.5"))
+        with self.assertRaises(ValidationError):
+            ingest.ingest_data_source(source, append=True)
+
+        source.refresh_from_db()
+        self.assertEqual(source.row_count, 4)
+        self.assertEqual(list(ingest.iter_source_rows(source, 1, 2)), [[2001, 1.5]])
+        self.assertEqual(ingest.ingest_data_source(source)['status'], ingest.INGEST_REPLACED)
+        self.assertEqual(list(ingest.iter_source_rows(source, 1, 2)), [[2001, 9.5]])
+
+    def test_ingest_json_and_xlsx(self):
+        """
+        Testuje načtení JSON pole objektů (sloupce podle klíčů) a prvního listu sešitu XLSX.
+        """
+        source = self._source("data.json", b'[{"kraj": "Praha", "pocet": 10}, {"kraj": "Brno", "podil": 0.5}]',
+                              DataSource.SourceType.JSON)
+        ingest.ingest_data_source(source)
+        source.refresh_from_db()
+        self.assertEqual(source.columns, ["kraj", "pocet", "podil"])
+        self.assertEqual(list(ingest.iter_source_rows(source)), [["Praha", 10, None], ["Brno", None, 0.5]])
+
+        ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+        workbook = BytesIO()
+        with zipfile.ZipFile(workbook, 'w') as archive:
+            archive.writestr('xl/sharedStrings.xml', f'<sst {ns}><si><t>kraj</t></si><si><t>pocet</t></si>'
+                                                     f'<si><t>Praha</t></si></sst>')
+            archive.writestr('xl/worksheets/sheet1.xml', (
+                f'<worksheet {ns}><sheetData>'
+                '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>'
+                '<row r="2"><c r="A2" t="s"><v>2</v></c><c r="B2"><v>12</v></c></row>'
+                '<row r="3"><c r="B3"><v>2.5</v></c></row>'
+                '</sheetData></worksheet>'
+            ))
+        source = self._source("data.xlsx", workbook.getvalue(), DataSource.SourceType.EXCEL)
+        ingest.ingest_data_source(source)
+        source.refresh_from_db()
+        self.assertEqual(source.columns, ["kraj", "pocet"])
+        self.assertEqual(list(ingest.iter_source_rows(source)), [["Praha", 12], [None, 2.5]])
+
+    def test_ingest_invalid_file_keeps_previous_data(self):
+        """
+        Testuje, že chyba při čtení souboru vrátí ValidationError a ponechá předchozí data.
+        """
+        source = self._source("data.json", b'[{"a": 1}]', DataSource.SourceType.JSON)
+        ingest.ingest_data_source(source)
+
+        self._replace_file(source, b'[{"a": 2}, {"a": ')
+        with self.assertRaises(ValidationError):
+            ingest.ingest_data_source(source)
+
+        source.refresh_from_db()
+        self.assertEqual(list(ingest.iter_source_rows(source)), [[1]])
+
+
+    # -------------------- columnar data storage --------------------
+
+class ColumnarDataTest(TestCase):
+    """
+    Testy pro sloupcové úložiště dat zdrojů v souborech mapovaných do paměti (data_sources/columnar.py).
+    """
+
+    CSV = b"rok,hodnota,kraj\n2020,1.5,Praha\n2021,,Brno\n2022,3.5,\n2023,4.25,Ostrava\n"
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _source(self, name, content, source_type=DataSource.SourceType.CSV, storage=DataSource.Storage.COLUMNAR):
+        source = DataSource(name=name, source_type=source_type, storage=storage)
+        source.file.save(name, ContentFile(content))
+        return source
+
+    def _replace_file(self, source, content):
+        source.file.delete(save=False)
+        source.file.save(source.name, ContentFile(content))
+
+    def test_columnar_ingest_stores_typed_column_files(self):
+        """
+        Testuje, že sloupce se uloží jako typované soubory a v DB zůstane jen řádek s metadaty.
+        """
+        source = self._source("rates.csv", self.CSV)
+        ingest.ingest_data_source(source, chunk_rows=3)
+
+        metadata = Data.objects.get(data_source=source)
+        self.assertEqual(metadata.row_count, 4)
+        self.assertEqual([column['kind'] for column in metadata.content['columns']], ['i8', 'f8', 'text'])
+
+        years = columnar.read_column(source, "rok", 1, 3)
+        self.assertIsInstance(years.data.base, np.memmap)  # Pohled do souboru, žádná kopie
+        self.assertEqual(years.tolist(), [2021, 2022])
+        self.assertEqual(columnar.read_column(source, "hodnota").tolist(), [1.5, None, 3.5, 4.25])
+        self.assertEqual(columnar.read_column(source, "kraj", 2).tolist(), [None, "Ostrava"])
+        with self.assertRaises(KeyError):
+            columnar.read_column(source, "missing")
+
+    def test_columnar_rows_match_row_storage(self):
+        """
+        Testuje, že čtení řádků vrací stejná data bez ohledu na zvolené úložiště.
+        """
+        columnar_source = self._source("columns.csv", self.CSV)
+        row_source = self._source("rows.csv", self.CSV, storage=DataSource.Storage.ROWS)
+        ingest.ingest_data_source(columnar_source)
+        ingest.ingest_data_source(row_source)
+
+        self.assertEqual(
+            list(ingest.iter_source_rows(columnar_source, 1, 3)),
+            list(ingest.iter_source_rows(row_source, 1, 3)),
+        )
+        self.assertEqual(list(ingest.iter_source_rows(columnar_source))[-1], [2023, 4.25, "Ostrava"])
+
+    def test_columnar_append_adds_rows_and_new_columns(self):
+        """
+        Testuje připsání nových řádků (i s novým klíčem JSON) a odmítnutí změny typu sloupce.
+        """
+        source = self._source("data.json", b'[{"rok": 2020, "pocet": 1}]', DataSource.SourceType.JSON)
+        ingest.ingest_data_source(source)
+
+        self._replace_file(source, b'[{"rok": 2020, "pocet": 1}, {"rok": 2021, "pocet": 2, "poznamka": "nova"}]')
+        result = ingest.ingest_data_source(source, append=True)
+
+        self.assertEqual(result, {'status': ingest.INGEST_APPENDED, 'rows': 1, 'total_rows': 2})
+        source.refresh_from_db()
+        self.assertEqual(list(ingest.iter_source_rows(source)), [[2020, 1, None], [2021, 2, "nova"]])
+
+        self._replace_file(source, b'[{"rok": 2020, "pocet": 1}, {"rok": 2021, "pocet": 2, "poznamka": "nova"}, '
+                                   b'{"rok": 2022, "pocet": "n/a"}]')
+        with self.assertRaises(ValidationError):
+            ingest.ingest_data_source(source, append=True)
+        self.assertEqual(list(ingest.iter_source_rows(source)), [[2020, 1, None], [2021, 2, "nova"]])
+
+    def test_columnar_reingest_removes_old_version(self):
+        """
+        Testuje, že nové načtení zapíše novou verzi souborů a starou po commitu smaže.
+        """
+        source = self._source("rates.csv", self.CSV)
+        ingest.ingest_data_source(source)
+        old_directory = os.path.join(columnar.columns_root(), columnar.columnar_metadata(source)['path'])
+        self.assertTrue(os.path.isdir(old_directory))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest.ingest_data_source(source, force=True)
+
+        self.assertFalse(os.path.exists(old_directory))
+        self.assertEqual(list(ingest.iter_source_rows(source, 0, 1)), [[2020, 1.5, "Praha"]])
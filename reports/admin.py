@@ -1,5 +1,10 @@
-from django.contrib import admin
-from .models import Report, Section, Paragraph, Chart, Table
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+from .models import Report, Section, Paragraph, Chart, Table, ChartRenderJob, ChartImage, ReportSnapshot
+from . import repositories
+from . import services
 
 # -- inlines ---
 class ParagraphInline(admin.TabularInline):
@@ -14,21 +19,81 @@ class TableInline(admin.TabularInline):
     model = Table
     extra = 0
 
+# Admin ukládá prvky mimo repository funkce – počty dotčených sekcí se po změně přepočítají
+class ContentCountersAdminMixin:
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        repositories.recount_content_counters([obj.section_id])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        repositories.recount_content_counters([obj.section_id])
+
+    def delete_queryset(self, request, queryset):
+        section_ids = set(queryset.values_list('section_id', flat=True))
+        super().delete_queryset(request, queryset)
+        repositories.recount_content_counters(section_ids)
+
 # -- Report admin --
 class ReportAdmin(admin.ModelAdmin):
-    list_display = ('title', 'year')
+    list_display = ('title', 'year', 'status', 'approved_count', 'element_count')
     ordering = ('year',)
+    readonly_fields = ('content_overview',)
+    actions = ('approve_staged', 'publish')
+
+    def get_object(self, request, object_id, from_field=None):
+        # Detail reportu načítá celý strom obsahu konstantním počtem dotazů
+        if from_field is not None:
+            return super().get_object(request, object_id, from_field)
+        try:
+            return repositories.get_report_tree(object_id)
+        except (Report.DoesNotExist, ValidationError, ValueError):
+            return None
+
+    @admin.display(description='Obsah')
+    def content_overview(self, obj):
+        if obj.pk is None:
+            return '-'
+        return format_html_join(
+            mark_safe('<br>'),
+            '{}. {} ({} prvků)',
+            ((position, section.title, len(section.element_list)) for position, section in enumerate(obj.section_list, start=1)),
+        ) or '-'
+
+    @admin.action(description="Schválit připravené (STAGED) prvky")
+    def approve_staged(self, request, queryset):
+        for report in queryset:
+            approved = services.approve_staged_elements(report=report)
+            self.message_user(request, f"{report.title}: schváleno prvků {approved}")
+
+    @admin.action(description="Publikovat")
+    def publish(self, request, queryset):
+        for report in queryset:
+            try:
+                services.publish_report(report, request.user)
+            except ValidationError as e:
+                blockers = e.params['blockers'] if e.params else []
+                listed = ', '.join(f"{b['type']} {b['id']} v sekci {b['section_title']} ({b['status']})" for b in blockers[:10])
+                self.message_user(request, f"{report.title}: publikaci blokuje {len(blockers)} prvků: {listed}", messages.ERROR)
+                continue
+            self.message_user(request, f"{report.title}: publikováno")
 
 # -- Section admin s inline editací obsahu --
 class SectionAdmin(admin.ModelAdmin):
     list_display = ('title', 'report', 'order')
     list_filter = ('report',)
+    list_select_related = ('report',)
     ordering = ('report', 'order')
     inlines = [ParagraphInline, ChartInline, TableInline]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        repositories.recount_content_counters([form.instance.pk])
+
 # Paragraph Admin
-class ParagraphAdmin(admin.ModelAdmin):
+class ParagraphAdmin(ContentCountersAdminMixin, admin.ModelAdmin):
     list_display = ('short_text', 'get_report', 'section', 'order')
+    list_select_related = ('section__report',)
     ordering = ('section__report', 'section', 'order')
 
     @admin.display(description='Report')
@@ -40,25 +105,56 @@ class ParagraphAdmin(admin.ModelAdmin):
         return (obj.text[:50] + '...') if len(obj.text) > 50 else obj.text
 
 # podobně Chart a Table admin...
-class ChartAdmin(admin.ModelAdmin):
-    list_display = ('title', 'section', 'get_report', 'order')
+class ChartAdmin(ContentCountersAdminMixin, admin.ModelAdmin):
+    list_display = ('title', 'section', 'get_report', 'order', 'render_status')
+    list_select_related = ('section__report',)
     ordering = ('section__report', 'section', 'order')
 
     @admin.display(description='Report')
     def get_report(self, obj):
         return obj.section.report.title
 
-class TableAdmin(admin.ModelAdmin):
+class TableAdmin(ContentCountersAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'section', 'get_report', 'order')
+    list_select_related = ('section__report',)
     ordering = ('section__report', 'section', 'order')
 
     @admin.display(description='Report')
     def get_report(self, obj):
         return obj.section.report.title
 
+class ChartRenderJobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'chart', 'status', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('status',)
+    list_select_related = ('chart__section',)
+    readonly_fields = ('params', 'error', 'created_at', 'started_at', 'finished_at')
+
+class ChartImageAdmin(admin.ModelAdmin):
+    list_display = ('key', 'size', 'hits', 'last_used_at', 'created_at')
+    ordering = ('-last_used_at',)
+    readonly_fields = ('key', 'file', 'size', 'hits', 'created_at', 'last_used_at')
+
+class ReportSnapshotAdmin(admin.ModelAdmin):
+    # Snapshoty jsou neměnné – jen pro čtení, velké sloupce se nenačítají
+    list_display = ('title', 'version', 'published_at', 'published_by')
+    list_select_related = ('published_by',)
+    exclude = ('content', 'html', 'pdf', 'images')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('content', 'html', 'pdf')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 # --- Registrace modelů ---
 admin.site.register(Report, ReportAdmin)
 admin.site.register(Section, SectionAdmin)
 admin.site.register(Paragraph, ParagraphAdmin)
 admin.site.register(Chart, ChartAdmin)
 admin.site.register(Table, TableAdmin)
+admin.site.register(ChartRenderJob, ChartRenderJobAdmin)
+admin.site.register(ChartImage, ChartImageAdmin)
+admin.site.register(ReportSnapshot, ReportSnapshotAdmin)
@@ -0,0 +1,382 @@
+# reports/archive.py
+
+"""
+Hromadný export a import reportů (přenos mezi prostředími).
+
+Archiv je proudový `tar.gz`: `manifest.json`, soubory médií (obrázky grafů
+`Chart.dataset` a soubory datových zdrojů) pod `media/` a záznamy jako JSON
+lines rozdělené do členů po `ARCHIVE_BATCH_ROWS` řádcích
+(`data_sources-00001.jsonl`, `data-…`, `reports-…`, `sections-…`,
+`elements-…`). Export ani import nedrží v paměti víc než jednu dávku řádků
+a archiv lze zapisovat i číst z roury (stdout/stdin).
+
+Import vytváří záznamy přes `bulk_create` po dávkách a přemapovává cizí klíče
+(id zdrojů, reportů a sekcí z archivu na nová id, autory podle uživatelského
+jména, cesty souborů médií). Vše proběhne v jedné transakci; signály se
+neposílají, fulltextový index je potřeba po importu znovu sestavit
+(`search.rebuild_index`, příkaz `import_reports` to dělá sám).
+"""
+
+"""
+Seznam funkcí v `reports/archive.py`:
+
+1. `export_reports(output, reports=None) -> dict`
+2. `import_reports(fileobj, default_author=None) -> dict`
+"""
+
+import base64
+import io
+import json
+import tarfile
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import SuspiciousFileOperation, ValidationError
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from data_sources import ingest
+from data_sources.models import DataSource, Data
+from . import chart_cache
+from . import repositories
+from .models import Report, Section, ContentElement, Paragraph, Chart, Table
+
+ARCHIVE_FORMAT = 1  # Zvýšit při nekompatibilní změně formátu
+ARCHIVE_BATCH_ROWS = 1000  # Řádků v jednom členu archivu (a v jednom bulk_create při importu)
+MEDIA_PREFIX = 'media/'
+
+# Pořadí členů v archivu – import potřebuje mapy id z předchozích členů
+RECORD_KINDS = ('data_sources', 'data', 'reports', 'sections', 'elements')
+
+ELEMENT_TYPES = {'paragraph': Paragraph, 'chart': Chart, 'table': Table}
+
+
+class _RecordWriter:
+    """Zapisuje záznamy jednoho druhu do členů archivu po `ARCHIVE_BATCH_ROWS` řádcích."""
+
+    def __init__(self, tar: tarfile.TarFile, kind: str):
+        self.tar = tar
+        self.kind = kind
+        self.buffer = io.BytesIO()
+        self.rows = 0
+        self.members = 0
+        self.total = 0
+
+    def write(self, record: dict) -> None:
+        self.buffer.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8'))
+        self.buffer.write(b'\n')
+        self.rows += 1
+        self.total += 1
+        if self.rows >= ARCHIVE_BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        self.members += 1
+        _add_member(self.tar, f"{self.kind}-{self.members:05d}.jsonl", self.buffer.getvalue())
+        self.buffer = io.BytesIO()
+        self.rows = 0
+
+
+def _add_member(tar: tarfile.TarFile, name: str, content: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(content))
+
+
+def _add_media(tar: tarfile.TarFile, path: str) -> bool:
+    """Přidá soubor z úložiště médií; chybějící soubor přeskočí (vrátí False)."""
+    if not path or not default_storage.exists(path):
+        return False
+    info = tarfile.TarInfo(MEDIA_PREFIX + path)
+    info.size = default_storage.size(path)
+    info.mtime = int(time.time())
+    with default_storage.open(path, 'rb') as fileobj:
+        tar.addfile(info, fileobj)
+    return True
+
+
+def _element_record(element, kind: str, authors: dict) -> dict:
+    record = {
+        'type': kind,
+        'id': element.pk,
+        'section': element.section_id,
+        'order': element.order,
+        'status': element.status,
+        'author': authors.get(element.author_id),
+    }
+    if kind == 'paragraph':
+        record['text'] = element.text
+    elif kind == 'chart':
+        record.update(
+            title=element.title,
+            dataset=element.dataset.name or '',
+            data_source=element.data_source_id,
+            render_status=element.render_status,
+            render_key=element.render_key,
+            render_params=element.render_params,
+            series=base64.b64encode(bytes(element.series)).decode('ascii') if element.series is not None else None,
+        )
+    else:
+        record.update(
+            title=element.title,
+            data=element.data,
+            data_source=element.data_source_id,
+            data_fingerprint=element.data_fingerprint,
+        )
+    return record
+
+
+def export_reports(output, reports=None) -> dict:
+    """
+    Zapíše reporty s obsahem, použitými datovými zdroji a soubory médií do archivu.
+
+    Args:
+        output: Zapisovatelný binární souborový objekt (nemusí umět seek).
+        reports: QuerySet exportovaných reportů (výchozí všechny).
+
+    Returns:
+        dict: Počty exportovaných záznamů podle druhu a počet souborů médií (`media`).
+    """
+    reports = (reports if reports is not None else Report.objects.all()).order_by('pk')
+    report_ids = reports.values('pk')  # Poddotaz, ne seznam id – počet parametrů SQL je omezený
+    sections = Section.objects.filter(report_id__in=report_ids).order_by('pk')
+    element_querysets = {
+        kind: model.objects.non_polymorphic().filter(section__report_id__in=report_ids).order_by('pk')
+        for kind, model in ELEMENT_TYPES.items()
+    }
+    source_ids = set()
+    for kind in ('chart', 'table'):
+        source_ids.update(element_querysets[kind].exclude(data_source=None).values_list('data_source_id', flat=True))
+    sources = DataSource.objects.filter(pk__in=source_ids).order_by('pk')
+
+    author_ids = set(reports.values_list('author_id', flat=True))
+    author_ids.update(
+        ContentElement.objects.non_polymorphic().filter(section__report_id__in=report_ids)
+        .exclude(author=None).values_list('author_id', flat=True).distinct()
+    )
+    authors = dict(get_user_model().objects.filter(pk__in=author_ids).values_list('pk', 'username'))
+
+    counts = {'media': 0}
+    with tarfile.open(fileobj=output, mode='w|gz') as tar:
+        manifest = {'format': ARCHIVE_FORMAT, 'created_at': timezone.now(), 'reports': reports.count()}
+        _add_member(tar, 'manifest.json', json.dumps(manifest, cls=DjangoJSONEncoder).encode('utf-8'))
+
+        # Média jsou před záznamy, aby import znal nové cesty souborů dřív než prvky, které na ně odkazují
+        media_paths = [source.file.name for source in sources if source.file]
+        media_paths += list(element_querysets['chart'].exclude(dataset='').values_list('dataset', flat=True))
+        for path in dict.fromkeys(media_paths):
+            counts['media'] += _add_media(tar, path)
+
+        writers = {kind: _RecordWriter(tar, kind) for kind in RECORD_KINDS}
+        for source in sources:
+            writers['data_sources'].write({
+                'id': source.pk, 'name': source.name, 'source_type': source.source_type,
+                'file': source.file.name or '', 'api_url': source.api_url, 'storage': source.storage,
+                'columns': source.columns, 'content_hash': source.content_hash, 'row_count': source.row_count,
+                'ingested_at': source.ingested_at,
+            })
+        writers['data_sources'].flush()
+        for chunk in Data.objects.filter(data_source__in=sources).order_by('pk').iterator():
+            writers['data'].write({
+                'data_source': chunk.data_source_id, 'content': chunk.content,
+                'start_row': chunk.start_row, 'row_count': chunk.row_count,
+            })
+        writers['data'].flush()
+        for report in reports.iterator():
+            writers['reports'].write({
+                'id': report.pk, 'title': report.title, 'topic': report.topic, 'year': report.year,
+                'status': report.status, 'author': authors.get(report.author_id),
+            })
+        writers['reports'].flush()
+        for section in sections.iterator():
+            writers['sections'].write({'id': section.pk, 'report': section.report_id, 'title': section.title, 'order': section.order})
+        writers['sections'].flush()
+        for kind, queryset in element_querysets.items():
+            for element in queryset.iterator():
+                writers['elements'].write(_element_record(element, kind, authors))
+        writers['elements'].flush()
+
+    counts.update({kind: writer.total for kind, writer in writers.items()})
+    return counts
+
+
+class _Importer:
+    """Stav importu: mapy starých id na nová a cest médií na nové cesty."""
+
+    def __init__(self, default_author):
+        self.default_author = default_author
+        self.ids = defaultdict(dict)  # druh -> {id v archivu: nové id}
+        self.media = {}  # cesta v archivu -> nová cesta
+        self.users = {}  # uživatelské jméno -> id
+        self.columnar_sources = []
+        self.counts = dict.fromkeys(RECORD_KINDS + ('media',), 0)
+
+    def user_id(self, username, required: bool):
+        if username is not None and username not in self.users:
+            self.users[username] = get_user_model().objects.filter(username=username).values_list('pk', flat=True).first()
+        user_id = self.users.get(username)
+        if user_id is None and required:
+            if self.default_author is None:
+                raise ValidationError(f"Uživatel '{username}' neexistuje a není zadán výchozí autor.")
+            return self.default_author.pk
+        return user_id
+
+    def mapped(self, kind: str, old_id, required: bool = True):
+        if old_id is None:
+            return None
+        try:
+            return self.ids[kind][old_id]
+        except KeyError:
+            if required:
+                raise ValidationError(f"Archiv odkazuje na neexistující záznam {kind} {old_id}.")
+            return None
+
+    def save_media(self, member: tarfile.TarInfo, fileobj) -> None:
+        path = member.name[len(MEDIA_PREFIX):]
+        if chart_cache.is_content_addressed(path) and default_storage.exists(path):
+            self.media[path] = path  # Stejný obsahový název = stejný obrázek
+            return
+        try:
+            self.media[path] = default_storage.save(path, File(fileobj, name=path))
+        except SuspiciousFileOperation as e:
+            raise ValidationError(f"Neplatná cesta souboru v archivu: {member.name}") from e
+        self.counts['media'] += 1
+
+    def import_batch(self, kind: str, records: list) -> None:
+        getattr(self, f'_import_{kind}')(records)
+        self.counts[kind] += len(records)
+
+    def _import_data_sources(self, records):
+        sources = [
+            DataSource(
+                name=record['name'], source_type=record['source_type'], file=self.media.get(record['file'], ''),
+                api_url=record['api_url'], storage=record['storage'], columns=record['columns'],
+                content_hash=record['content_hash'], row_count=record['row_count'], ingested_at=record['ingested_at'],
+            )
+            for record in records
+        ]
+        DataSource.objects.bulk_create(sources)
+        for record, source in zip(records, sources):
+            self.ids['data_sources'][record['id']] = source.pk
+            if source.storage == DataSource.Storage.COLUMNAR and source.file:
+                self.columnar_sources.append(source)  # Sloupcové soubory se neexportují – znovu se načtou ze souboru
+
+    def _import_data(self, records):
+        Data.objects.bulk_create([
+            Data(
+                data_source_id=self.mapped('data_sources', record['data_source']), content=record['content'],
+                start_row=record['start_row'], row_count=record['row_count'],
+            )
+            for record in records
+        ])
+
+    def _import_reports(self, records):
+        reports = [
+            Report(
+                title=record['title'], topic=record['topic'], year=record['year'], status=record['status'],
+                author_id=self.user_id(record['author'], required=True),
+            )
+            for record in records
+        ]
+        Report.objects.bulk_create(reports)
+        for record, report in zip(records, reports):
+            self.ids['reports'][record['id']] = report.pk
+
+    def _import_sections(self, records):
+        sections = [
+            Section(report_id=self.mapped('reports', record['report']), title=record['title'], order=record['order'])
+            for record in records
+        ]
+        Section.objects.bulk_create(sections)
+        for record, section in zip(records, sections):
+            self.ids['sections'][record['id']] = section.pk
+
+    def _import_elements(self, records):
+        elements = []
+        for record in records:
+            model = ELEMENT_TYPES.get(record['type'])
+            if model is None:
+                raise ValidationError(f"Neznámý typ prvku v archivu: {record['type']}")
+            fields = {
+                'section_id': self.mapped('sections', record['section']),
+                'order': record['order'],
+                'status': record['status'],
+                'author_id': self.user_id(record['author'], required=False),
+            }
+            if model is Paragraph:
+                fields['text'] = record['text']
+            elif model is Chart:
+                fields.update(
+                    title=record['title'],
+                    dataset=self.media.get(record['dataset'], ''),
+                    data_source_id=self.mapped('data_sources', record['data_source'], required=False),
+                    render_status=record['render_status'],
+                    render_key=record['render_key'],
+                    render_params=record['render_params'],
+                    series=base64.b64decode(record['series']) if record['series'] is not None else None,
+                )
+            else:
+                fields.update(
+                    title=record['title'],
+                    data=record['data'],
+                    data_source_id=self.mapped('data_sources', record['data_source'], required=False),
+                    data_fingerprint=record['data_fingerprint'],
+                )
+            elements.append(model(**fields))
+        repositories.bulk_create_content_elements(elements)
+
+
+def import_reports(fileobj, default_author=None) -> dict:
+    """
+    Načte reporty z archivu vytvořeného `export_reports` jako nové záznamy.
+
+    Args:
+        fileobj: Čitelný binární souborový objekt (nemusí umět seek).
+        default_author: Uživatel, kterému připadnou reporty autorů, kteří v cílovém
+            prostředí neexistují (bez něj import v takovém případě selže).
+
+    Returns:
+        dict: Počty importovaných záznamů podle druhu, počet nových souborů médií (`media`)
+        a mapa id reportů z archivu na nová id (`report_ids`).
+
+    Raises:
+        ValidationError: Pokud archiv není platný nebo odkazuje na neexistující záznamy či uživatele.
+    """
+    importer = _Importer(default_author)
+    manifest = None
+    try:
+        with transaction.atomic(), tarfile.open(fileobj=fileobj, mode='r|gz') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                content = tar.extractfile(member)
+                if member.name == 'manifest.json':
+                    manifest = json.load(content)
+                    if manifest.get('format') != ARCHIVE_FORMAT:
+                        raise ValidationError(f"Nepodporovaná verze archivu: {manifest.get('format')}")
+                    continue
+                if manifest is None:
+                    raise ValidationError("Archiv neobsahuje manifest.json na začátku.")
+                if member.name.startswith(MEDIA_PREFIX):
+                    importer.save_media(member, content)
+                    continue
+                kind = member.name.rsplit('-', 1)[0]
+                if kind not in RECORD_KINDS or not member.name.endswith('.jsonl'):
+                    raise ValidationError(f"Neznámý člen archivu: {member.name}")
+                importer.import_batch(kind, [json.loads(line) for line in content if line.strip()])
+
+            if manifest is None:
+                raise ValidationError("Archiv neobsahuje manifest.json.")
+            for source in importer.columnar_sources:
+                ingest.ingest_data_source(source, force=True)
+    except (tarfile.TarError, EOFError, OSError, ValueError, KeyError) as e:
+        raise ValidationError(f"Neplatný archiv: {e}") from e
+
+    return {**importer.counts, 'report_ids': dict(importer.ids['reports'])}
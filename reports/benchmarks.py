@@ -0,0 +1,232 @@
+# reports/benchmarks.py
+
+"""
+Výkonnostní benchmarky nad syntetickými reporty.
+
+`generate_report` vytvoří report se zadaným počtem sekcí a prvků (střídavě
+`Paragraph`, `Chart` s datovou řadou a `Table`). Prvky se zakládají hromadně
+bez signálů (`repositories.bulk_create_content_elements`), takže i report
+s 1000 sekcemi × 50 prvky vznikne za pár sekund.
+
+`run_benchmarks` změří vykreslení detailu, `generate_pdf`, `move_section`,
+`reorder_section_content`, vykreslení grafu a `publish_report`. Vše běží
+v transakci, která se na konci vrátí zpět, a výsledek je slovník
+serializovatelný do JSON, který lze porovnat s výsledkem jiného commitu
+(`compare`). Spouští se příkazem `manage.py benchmark_reports`.
+"""
+
+"""
+Seznam funkcí v `reports/benchmarks.py`:
+
+1. `generate_report(user, sections: int, elements: int, chart_points: int = CHART_POINTS) -> Report`
+2. `run_benchmarks(sections: int = BENCHMARK_SECTIONS, elements: int = BENCHMARK_ELEMENTS, repeat: int = BENCHMARK_REPEAT, chart_points: int = CHART_POINTS) -> dict`
+3. `compare(baseline: dict, current: dict) -> list`
+"""
+
+import platform
+import statistics
+import time
+
+import django
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from . import charts
+from . import fragments
+from . import repositories
+from . import series
+from . import services
+from . import utils
+from .models import Report, Section, ContentElement, Paragraph, Chart, Table
+from .views import ReportDetailView
+
+BENCHMARK_SECTIONS = 100
+BENCHMARK_ELEMENTS = 20  # Prvků na sekci
+BENCHMARK_REPEAT = 3
+CHART_POINTS = 24  # Bodů datové řady generovaných grafů
+TABLE_ROWS = 20
+
+BENCHMARK_USERNAME = 'benchmark'
+ELEMENT_MODELS = (Paragraph, Chart, Table)
+
+
+def _element_fields(model, index: int, chart_points: int) -> dict:
+    """Obsah `index`-tého syntetického prvku daného typu."""
+    if model is Paragraph:
+        return {'text': f"<p>Odstavec {index}: " + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4 + "</p>"}
+    if model is Chart:
+        x_data = [str(2000 + point) for point in range(chart_points)]
+        y_data = np.round(np.sin(np.arange(chart_points) / 3 + index) * 100, 2)
+        params = charts.chart_params(f"Graf {index}", charts.CHART_TYPES[index % len(charts.CHART_TYPES)], x_data, y_data)
+        return {
+            'title': params['title'],
+            'render_params': charts.chart_style(params),
+            'series': series.pack_series(params['x_data'], params['y_data']),
+        }
+    rows = [[f"Řádek {row}", row, index * row] for row in range(TABLE_ROWS)]
+    return {'title': f"Tabulka {index}", 'data': {'columns': ['Název', 'A', 'B'], 'rows': rows, 'row_count': TABLE_ROWS}}
+
+
+def generate_report(user, sections: int, elements: int, chart_points: int = CHART_POINTS) -> Report:
+    """
+    Vytvoří syntetický report se schválenými prvky (lze ho rovnou publikovat).
+
+    Args:
+        user: Autor reportu.
+        sections: Počet sekcí.
+        elements: Počet prvků v každé sekci (střídavě odstavec, graf, tabulka).
+        chart_points: Počet bodů datové řady grafů.
+
+    Returns:
+        Report: Vytvořený report.
+    """
+    report = Report.objects.create(title=f"Benchmark {sections}×{elements}", topic="Benchmark", year=2024, author=user)
+    created = Section.objects.bulk_create([
+        Section(report=report, title=f"Sekce {index + 1}", order=(index + 1) * repositories.ORDER_GAP)
+        for index in range(sections)
+    ])
+
+    elements_to_create = []
+    for section in created:
+        for index in range(elements):
+            model = ELEMENT_MODELS[index % len(ELEMENT_MODELS)]
+            elements_to_create.append(model(
+                section=section,
+                order=(index + 1) * repositories.ORDER_GAP,
+                status=ContentElement.ContentElementStatus.APPROVED,
+                author=user,
+                **_element_fields(model, index, chart_points),
+            ))
+    repositories.bulk_create_content_elements(elements_to_create)
+    return report
+
+
+def _measure(prepare, repeat: int) -> dict:
+    """
+    Změří `repeat` běhů; `prepare()` se volá před každým během mimo měření a vrací měřenou funkci.
+    """
+    runs, queries = [], 0
+    for _ in range(repeat):
+        run = prepare()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+        runs.append(round(elapsed * 1000, 3))
+        queries = len(captured.captured_queries)
+    return {
+        'runs_ms': runs,
+        'min_ms': min(runs),
+        'median_ms': round(statistics.median(runs), 3),
+        'mean_ms': round(statistics.fmean(runs), 3),
+        'queries': queries,
+    }
+
+
+def _benchmark_cases(report: Report, user, chart_points: int) -> list:
+    """Dvojice (název, prepare) v pořadí spuštění; publikace je poslední, protože mění stav reportu."""
+    factory = RequestFactory(SERVER_NAME='localhost')
+    detail_view = ReportDetailView.as_view()
+
+    def detail():
+        request = factory.get(report.get_absolute_url())
+        request.user = user
+        return lambda: detail_view(request, pk=report.pk).render()
+
+    def pdf():
+        fresh = Report.objects.select_related('author').get(pk=report.pk)
+        return lambda: utils.generate_pdf(fresh)
+
+    def move_section():
+        last = Section.objects.filter(report=report).order_by('-order').first()
+        return lambda: services.move_section(last, 1)
+
+    def reorder_section_content():
+        # Hustě očíslované pořadí (1..n), aby přečíslování mělo co zapisovat
+        section = Section.objects.filter(report=report).order_by('order').first()
+        ids = list(ContentElement.objects.non_polymorphic().filter(section=section).order_by('order').values_list('pk', flat=True))
+        repositories.set_content_element_orders(section, {pk: index + 1 for index, pk in enumerate(ids)})
+        return lambda: utils.reorder_section_content(section)
+
+    def chart_render():
+        params = charts.chart_params(
+            "Benchmark", 'line', [str(point) for point in range(chart_points)], np.arange(chart_points, dtype=np.float64)
+        )
+        return lambda: charts.render_chart_png(params)
+
+    def publish():
+        fresh = Report.objects.select_related('author').get(pk=report.pk)
+        return lambda: services.publish_report(fresh, user)
+
+    return [
+        ('detail_render', detail),
+        ('generate_pdf', pdf),
+        ('move_section', move_section),
+        ('reorder_section_content', reorder_section_content),
+        ('chart_render', chart_render),
+        ('publish_report', publish),
+    ]
+
+
+def run_benchmarks(sections: int = BENCHMARK_SECTIONS, elements: int = BENCHMARK_ELEMENTS,
+                   repeat: int = BENCHMARK_REPEAT, chart_points: int = CHART_POINTS) -> dict:
+    """
+    Vygeneruje syntetický report a změří hlavní operace nad ním. Databáze zůstane beze změny.
+
+    Args:
+        sections: Počet sekcí reportu.
+        elements: Počet prvků v sekci.
+        repeat: Počet měřených běhů každé operace.
+        chart_points: Počet bodů datové řady grafů.
+
+    Returns:
+        dict: `meta` (velikosti, prostředí, doba generování) a `results`
+        ({operace: {'runs_ms', 'min_ms', 'median_ms', 'mean_ms', 'queries'}}).
+    """
+    results = {}
+    with transaction.atomic():
+        user, _ = get_user_model().objects.get_or_create(username=BENCHMARK_USERNAME)
+        started = time.perf_counter()
+        report = generate_report(user, sections, elements, chart_points)
+        generate_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        for name, prepare in _benchmark_cases(report, user, chart_points):
+            results[name] = _measure(prepare, repeat)
+
+        fragments.invalidate_report(report.pk)  # Id sekcí se po vrácení transakce mohou znovu použít
+        transaction.set_rollback(True)
+
+    return {
+        'meta': {
+            'sections': sections,
+            'elements_per_section': elements,
+            'repeat': repeat,
+            'chart_points': chart_points,
+            'generate_ms': generate_ms,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """
+    Porovná mediány dvou výsledků `run_benchmarks`.
+
+    Returns:
+        list[tuple[str, float, float, float]]: (operace, medián před, medián po, změna v %)
+        pro operace obsažené v obou výsledcích.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            continue
+        change = (result['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0.0
+        rows.append((name, before['median_ms'], result['median_ms'], round(change, 1)))
+    return rows
@@ -0,0 +1,191 @@
+# reports/chart_cache.py
+
+"""
+Content-addressed cache vykreslených obrázků grafů.
+
+Obrázek se ukládá pod klíčem `charts.chart_key(params)` (hash typu, dat, barvy,
+titulku a velikosti) do `charts/cache/<2 znaky>/<klíč>.png`. Opakované uložení
+nezměněného grafu tak jen znovu použije existující soubor a nevolá matplotlib;
+různé grafy se stejným titulkem už nekolidují.
+
+Na disku drží cache nejvýše `REPORT_CHART_CACHE_MAX_BYTES` bajtů. Při překročení
+se mažou nejdéle nepoužité obrázky (LRU), na které neodkazuje žádný graf ani
+publikovaná verze reportu (`ReportSnapshot.images`).
+Počty zásahů a výpadků se sčítají v Django cache (viz `stats`).
+"""
+
+"""
+Seznam funkcí v `reports/chart_cache.py`:
+
+1. `image_path(key: str, fmt: str = 'png') -> str`
+2. `lookup(key: str) -> str | None`
+3. `cached_path(key: str) -> str | None`
+4. `store(key: str, content: bytes, fmt: str = 'png') -> str`
+5. `evict(max_bytes: int = None) -> int`
+6. `stats() -> dict`
+7. `is_content_addressed(path: str) -> bool`
+8. `cached_paths(keys) -> dict`
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import Chart, ChartImage
+
+CHART_CACHE_MAX_BYTES = getattr(settings, 'REPORT_CHART_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+
+CACHE_DIR = 'charts/cache/'
+# Soubor pod obsahovým názvem se nikdy nezmění – prohlížeče a proxy ho mohou cachovat natrvalo
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+HITS_COUNTER = 'reports:chart_cache:hits'
+MISSES_COUNTER = 'reports:chart_cache:misses'
+
+
+def image_path(key: str, fmt: str = 'png') -> str:
+    """
+    Cesta k obrázku v úložišti médií (první dva znaky klíče rozdělují adresáře).
+    """
+    return f"{CACHE_DIR}{key[:2]}/{key}.{fmt}"
+
+
+def _count(counter: str) -> None:
+    cache.add(counter, 0, timeout=None)
+    try:
+        cache.incr(counter)
+    except ValueError:  # Klíč mezitím vypršel nebo byl smazán
+        cache.set(counter, 1, timeout=None)
+
+
+def lookup(key: str):
+    """
+    Najde obrázek v cache, označí ho jako naposledy použitý a započítá zásah/výpadek.
+
+    Args:
+        key: Klíč obrázku (`charts.chart_key`).
+
+    Returns:
+        str | None: Název souboru v úložišti (pro `Chart.dataset`), nebo None.
+    """
+    entry = ChartImage.objects.filter(key=key).only('pk', 'file').first()
+    if entry is not None and not default_storage.exists(entry.file.name):
+        entry.delete()  # Soubor někdo smazal ručně – záznam už neplatí
+        entry = None
+    if entry is None:
+        _count(MISSES_COUNTER)
+        return None
+
+    ChartImage.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    _count(HITS_COUNTER)
+    return entry.file.name
+
+
+def cached_path(key: str):
+    """
+    Vrátí název souboru obrázku v cache, nebo None (bez započítání do statistik).
+    """
+    return ChartImage.objects.filter(key=key).values_list('file', flat=True).first()
+
+
+def store(key: str, content: bytes, fmt: str = 'png') -> str:
+    """
+    Uloží vykreslený obrázek pod jeho klíčem a případně vyřadí staré obrázky.
+
+    Pokud už obrázek se stejným klíčem existuje, soubor se nepřepisuje.
+
+    Args:
+        key: Klíč obrázku (`charts.chart_key`).
+        content: Obsah souboru.
+        fmt: Přípona souboru.
+
+    Returns:
+        str: Název souboru v úložišti.
+    """
+    entry = ChartImage.objects.filter(key=key).first()
+    if entry is not None:
+        ChartImage.objects.filter(pk=entry.pk).update(last_used_at=timezone.now())
+        return entry.file.name
+
+    path = image_path(key, fmt)
+    if default_storage.exists(path):
+        default_storage.delete(path)  # Osiřelý soubor bez záznamu (např. po pádu workeru)
+    name = default_storage.save(path, ContentFile(content))
+    try:
+        with transaction.atomic():
+            ChartImage.objects.create(key=key, file=name, size=len(content))
+    except IntegrityError:
+        # Stejný obrázek mezitím uložil jiný worker – použijeme jeho soubor
+        if name != path:
+            default_storage.delete(name)
+        return ChartImage.objects.get(key=key).file.name
+
+    evict()
+    return name
+
+
+def evict(max_bytes: int = None) -> int:
+    """
+    Smaže nejdéle nepoužité obrázky, dokud cache nezabírá nejvýše `max_bytes`.
+
+    Obrázky, na které odkazuje některý graf (`Chart.dataset`) nebo snapshot
+    publikovaného reportu (`ReportSnapshot.images`), se nemažou.
+
+    Args:
+        max_bytes: Limit velikosti cache (výchozí `REPORT_CHART_CACHE_MAX_BYTES`).
+
+    Returns:
+        int: Počet smazaných obrázků.
+    """
+    max_bytes = CHART_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    total = ChartImage.objects.aggregate(total=Sum('size'))['total'] or 0
+    if total <= max_bytes:
+        return 0
+
+    referenced = Chart.objects.exclude(dataset='').values('dataset')
+    candidates = ChartImage.objects.exclude(file__in=referenced).filter(snapshots__isnull=True).order_by('last_used_at', 'pk')
+    removed = 0
+    for entry in candidates.only('pk', 'file', 'size').iterator():
+        if total <= max_bytes:
+            break
+        default_storage.delete(entry.file.name)
+        entry.delete()
+        total -= entry.size
+        removed += 1
+    return removed
+
+
+def stats() -> dict:
+    """
+    Vrátí statistiky cache: zásahy, výpadky, počet obrázků a jejich celkovou velikost.
+    """
+    totals = ChartImage.objects.aggregate(bytes=Sum('size'))
+    return {
+        'hits': cache.get(HITS_COUNTER, 0),
+        'misses': cache.get(MISSES_COUNTER, 0),
+        'entries': ChartImage.objects.count(),
+        'bytes': totals['bytes'] or 0,
+    }
+
+
+def is_content_addressed(path: str) -> bool:
+    """
+    True, pokud je soubor v úložišti médií pojmenovaný podle obsahu (obrázky cache grafů).
+    """
+    return path.replace('\\', '/').lstrip('/').startswith(CACHE_DIR)
+
+
+def cached_paths(keys) -> dict:
+    """
+    Vrátí názvy souborů obrázků v cache pro více klíčů najednou jako {klíč: soubor}
+    (chybějící klíče ve výsledku nejsou; bez započítání do statistik).
+    """
+    keys = list(keys)
+    paths = {}
+    for start in range(0, len(keys), 500):  # Limit počtu parametrů dotazu (SQLite)
+        paths.update(ChartImage.objects.filter(key__in=keys[start:start + 500]).values_list('key', 'file'))
+    return paths
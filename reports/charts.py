@@ -0,0 +1,236 @@
+# reports/charts.py
+
+"""
+Vykreslování grafů mimo request vlákno.
+
+Grafy se kreslí objektovým API matplotlibu (`Figure` + `FigureCanvasAgg`), které
+nesahá na globální stav `pyplot` – několik grafů se tak může kreslit současně
+ve více vláknech nebo procesech. Funkce `render_chart_png` pracuje jen s čistými
+daty (žádné ORM), proto ji lze spouštět v `ProcessPoolExecutor` workeru
+(viz `manage.py run_chart_workers`).
+
+Ze zdrojových dat grafu (styl v `Chart.render_params`, řada v `Chart.series`)
+se na první vyžádání generují varianty z `CHART_VARIANTS` – PNG v několika
+šířkách pro `srcset`, SVG a PDF. Pro export reportu do PDF se graf kreslí přímo
+vektorově přes ReportLab (`chart_drawing`), bez rasterizace.
+"""
+
+"""
+Seznam funkcí v `reports/charts.py`:
+
+1. `chart_params(title: str, chart_type: str, x_data, y_data, color: str = None) -> dict`
+2. `chart_style(params: dict) -> dict`
+3. `with_series(style: dict, blob: bytes) -> dict`
+4. `render_chart_png(params: dict) -> bytes`
+5. `render_chart_variant(params: dict, variant: str) -> bytes`
+6. `chart_key(params: dict, variant: str = None) -> str`
+7. `chart_drawing(params: dict, width: float, height: float) -> Drawing`
+"""
+
+import hashlib
+import io
+import json
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+
+from . import series
+
+CHART_TYPES = ('line', 'bar', 'pie')
+CHART_FIGSIZE = (6, 4)  # Velikost grafu v palcích
+CHART_DPI = 100
+RENDERER_VERSION = 1  # Zvýšit při změně vzhledu grafů – zneplatní cache obrázků (viz chart_cache)
+
+# Varianty generované na vyžádání: název -> (formát, šířka v pixelech pro rastrové formáty)
+CHART_VARIANTS = {
+    'sm': ('png', 480),
+    'md': ('png', 720),
+    'lg': ('png', 1200),
+    'svg': ('svg', None),
+    'pdf': ('pdf', None),
+}
+MAX_AXIS_LABELS = 20  # Víc popisků osy X se do grafu nevejde – zobrazí se jen každý n-tý
+
+
+def chart_params(title: str, chart_type: str, x_data, y_data, color: str = None) -> dict:
+    """
+    Zkontroluje vstup a sestaví parametry pro vykreslení grafu.
+
+    Args:
+        title: Titulek grafu.
+        chart_type: Typ grafu ('line', 'bar', 'pie').
+        x_data: Hodnoty osy X (popisky) – seznam nebo pole NumPy.
+        y_data: Hodnoty osy Y (čísla) – seznam nebo pole NumPy.
+        color: Barva grafu (volitelné).
+
+    Returns:
+        dict: Styl grafu a řada jako pole NumPy (`x_data`, `y_data`); pro uložení
+        viz `chart_style` a `series.pack_series`.
+
+    Raises:
+        ValueError: Pokud typ grafu není podporovaný nebo řada není platná.
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Nepodporovaný typ grafu: {chart_type}")
+    x_data, y_data = series.validate_series(x_data, y_data)
+    return {'title': title, 'chart_type': chart_type, 'color': color or None, 'x_data': x_data, 'y_data': y_data}
+
+
+def chart_style(params: dict) -> dict:
+    """
+    Vrátí JSON-serializovatelnou část parametrů bez datové řady (pro `Chart.render_params`).
+    """
+    return {name: params.get(name) for name in ('title', 'chart_type', 'color')}
+
+
+def with_series(style: dict, blob: bytes) -> dict:
+    """
+    Složí parametry grafu ze stylu (`chart_style`) a zabalené řady (`Chart.series`).
+    """
+    x_data, y_data = series.unpack_series(blob)
+    return {**style, 'x_data': x_data, 'y_data': y_data}
+
+
+def _axis_labels(x_data, max_labels: int):
+    """
+    Vrátí pozice a popisky osy X, u dlouhých řad jen každý n-tý popisek.
+    """
+    step = max(1, -(-len(x_data) // max_labels))  # Zaokrouhlení nahoru
+    positions = np.arange(len(x_data))
+    return positions, positions[::step], np.asarray(x_data)[::step]
+
+
+def _draw_figure(params: dict, dpi: float) -> Figure:
+    figure = Figure(figsize=CHART_FIGSIZE, dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+
+    chart_type, color = params['chart_type'], params.get('color')
+    x_data, y_data = params['x_data'], params['y_data']
+    if chart_type in ('line', 'bar'):
+        # Číselné pozice místo kategorií – matplotlib nemusí zakládat osu s tisíci popisků
+        positions, tick_positions, tick_labels = _axis_labels(x_data, MAX_AXIS_LABELS)
+        if chart_type == 'line':
+            axes.plot(positions, y_data, color=color or 'blue')
+        else:
+            axes.bar(positions, y_data, color=color or 'green')
+        axes.set_xticks(tick_positions, labels=tick_labels)
+    elif chart_type == 'pie':
+        axes.pie(y_data, labels=x_data, colors=[color] * len(x_data) if color else None)
+    else:
+        raise ValueError(f"Nepodporovaný typ grafu: {chart_type}")
+
+    axes.set_title(params['title'])
+    figure.tight_layout()
+    return figure
+
+
+def render_chart_png(params: dict) -> bytes:
+    """
+    Vykreslí graf podle parametrů (viz `chart_params`) a vrátí obsah PNG souboru.
+
+    Každé volání používá vlastní `Figure`, takže je bezpečné pro souběžné použití.
+    """
+    buf = io.BytesIO()
+    _draw_figure(params, CHART_DPI).savefig(buf, format='png')
+    return buf.getvalue()
+
+
+def render_chart_variant(params: dict, variant: str) -> bytes:
+    """
+    Vykreslí variantu grafu z `CHART_VARIANTS` (PNG dané šířky, SVG nebo PDF).
+
+    Raises:
+        KeyError: Pokud varianta neexistuje.
+    """
+    fmt, width = CHART_VARIANTS[variant]
+    dpi = width / CHART_FIGSIZE[0] if width else CHART_DPI
+    buf = io.BytesIO()
+    _draw_figure(params, dpi).savefig(buf, format=fmt)
+    return buf.getvalue()
+
+
+def chart_key(params: dict, variant: str = None) -> str:
+    """
+    Vrátí obsahový klíč obrázku grafu – SHA-256 z typu, dat, barvy, titulku, velikosti
+    a varianty. Stejné parametry dají vždy stejný klíč (viz `reports/chart_cache.py`).
+
+    Args:
+        params: Parametry grafu (viz `chart_params`).
+        variant: Varianta z `CHART_VARIANTS`; None = hlavní PNG ukládané do `Chart.dataset`.
+    """
+    payload = {
+        'params': chart_style(params),
+        'series': series.series_digest(params['x_data'], params['y_data']),
+        'format': 'png',
+        'size': CHART_FIGSIZE,
+        'dpi': CHART_DPI,
+        'version': RENDERER_VERSION,
+    }
+    if variant is not None:
+        payload['format'], payload['width'] = CHART_VARIANTS[variant]
+        payload['variant'] = variant
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _reportlab_color(color: str, default):
+    try:
+        return colors.toColor(color) if color else default
+    except ValueError:
+        return default
+
+
+def chart_drawing(params: dict, width: float, height: float) -> Drawing:
+    """
+    Sestaví vektorový graf pro ReportLab (vkládá se do PDF exportu bez rasterizace).
+
+    Args:
+        params: Parametry grafu (viz `chart_params`).
+        width: Šířka kresby v bodech.
+        height: Výška kresby v bodech (včetně titulku).
+
+    Returns:
+        Drawing: Kresba připravená pro `renderPDF.draw`.
+    """
+    drawing = Drawing(width, height)
+    title_height = 18
+    drawing.add(String(width / 2, height - 12, params['title'], fontName='Helvetica-Bold', fontSize=10, textAnchor='middle'))
+
+    chart_type = params['chart_type']
+    x_data, y_data = np.asarray(params['x_data'], dtype=str), np.asarray(params['y_data'], dtype=np.float64)
+    plot_height = height - title_height - 30
+    if chart_type == 'pie':
+        pie = Pie()
+        pie.width = pie.height = min(width, plot_height) * 0.8
+        pie.x, pie.y = (width - pie.width) / 2, 15
+        pie.data = y_data.tolist()
+        pie.labels = x_data.tolist()
+        if params.get('color'):
+            for index in range(len(y_data)):
+                pie.slices[index].fillColor = _reportlab_color(params['color'], colors.grey)
+        drawing.add(pie)
+        return drawing
+
+    if chart_type == 'bar':
+        plot = VerticalBarChart()
+        plot.bars[0].fillColor = _reportlab_color(params.get('color'), colors.green)
+    else:
+        plot = HorizontalLineChart()
+        plot.lines[0].strokeColor = _reportlab_color(params.get('color'), colors.blue)
+    plot.x, plot.y = 40, 30
+    plot.width, plot.height = width - 50, plot_height
+    plot.data = [tuple(y_data.tolist())]
+
+    step = max(1, -(-len(x_data) // MAX_AXIS_LABELS))  # Zaokrouhlení nahoru
+    plot.categoryAxis.categoryNames = [label if index % step == 0 else '' for index, label in enumerate(x_data.tolist())]
+    plot.categoryAxis.labels.fontSize = 7
+    plot.valueAxis.labels.fontSize = 7
+    drawing.add(plot)
+    return drawing
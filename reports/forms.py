@@ -4,8 +4,11 @@ from django.contrib.auth.forms import UserCreationForm
 
 # reports/forms.py
 from django import forms
+from . import series
 from .models import Paragraph, Chart, Table
 
+MAX_INLINE_SERIES_POINTS = 500  # Delší řady se do textových polí nepředvyplňují
+
 class ParagraphForm(forms.ModelForm):
     class Meta:
         model = Paragraph
@@ -25,13 +28,50 @@ class ChartForm(forms.ModelForm):
         ('pie', 'Koláčový')
     ])
     color = forms.CharField(required=False, help_text="Hex kód nebo název barvy")
-    data_x = forms.CharField(widget=forms.Textarea, help_text="Čárkou oddělené roky, např. 2010,2011,...")
-    data_y = forms.CharField(widget=forms.Textarea, help_text="Čárkou oddělené hodnoty, např. 12.5,13.0,...")
+    data_x = forms.CharField(required=False, widget=forms.Textarea, help_text="Čárkou oddělené roky, např. 2010,2011,...")
+    data_y = forms.CharField(required=False, widget=forms.Textarea, help_text="Čárkou oddělené hodnoty, např. 12.5,13.0,...")
+    data_file = forms.FileField(
+        required=False,
+        help_text="Nebo CSV soubor se dvěma sloupci (popisek, hodnota) – vhodné pro dlouhé řady.",
+    )
 
     class Meta:
         model = Chart
         fields = ['title']
-        
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stored_series = None
+        if self.instance.pk and self.instance.series is not None:
+            self.stored_series = series.unpack_series(self.instance.series)
+            x, y = self.stored_series
+            if y.size <= MAX_INLINE_SERIES_POINTS:
+                self.initial.setdefault('data_x', ','.join(x.tolist()))
+                self.initial.setdefault('data_y', ','.join(f"{value:g}" for value in y.tolist()))
+            else:
+                summary = series.summarize_series(y)
+                self.fields['data_x'].help_text = (
+                    f"Uloženo {summary['count']} bodů (min {summary['min']:g}, max {summary['max']:g}). "
+                    "Prázdná pole = ponechat uložená data."
+                )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        data_file = cleaned_data.get('data_file')
+        data_x, data_y = cleaned_data.get('data_x'), cleaned_data.get('data_y')
+        try:
+            if data_file:
+                cleaned_data['series'] = series.read_series_csv(data_file)
+            elif data_x or data_y:
+                cleaned_data['series'] = series.parse_series_text(data_x or '', data_y or '')
+            elif self.stored_series is not None:
+                cleaned_data['series'] = self.stored_series
+            else:
+                raise forms.ValidationError("Zadejte data grafu nebo nahrajte CSV soubor.")
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+        return cleaned_data
+
 class TableForm(forms.ModelForm):
     class Meta:
         model = Table
@@ -0,0 +1,123 @@
+# reports/fragments.py
+
+"""
+Cache vyrenderovaných HTML fragmentů publikovaných reportů.
+
+Publikované reporty se prakticky nemění, proto se HTML jednotlivých prvků
+(klíč = id prvku + updated_at) a celých sekcí ukládá do Django cache.
+Fragmenty publikovaných reportů neobsahují ovládací prvky ani CSRF tokeny,
+takže jsou stejné pro všechny čtenáře.
+
+Invalidaci zajišťují signály v `reports/signals.py`; hromadné operace, které
+signály obcházejí (QuerySet.update, bulk_update), volají `invalidate_*` přímo.
+"""
+
+"""
+Seznam funkcí v `reports/fragments.py`:
+
+1. `element_cache_key(element: ContentElement) -> str`
+2. `section_cache_key(section_id: int) -> str`
+3. `render_section(section: Section) -> str`
+4. `render_report_sections(report: Report) -> list[str]`
+5. `invalidate_section(section_id: int) -> None`
+6. `invalidate_report(report_id: int) -> None`
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from . import repositories
+from . import tables
+from .models import Report, Section, ContentElement
+
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, 'REPORT_FRAGMENT_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+
+def element_cache_key(element: ContentElement) -> str:
+    """
+    Klíč fragmentu prvku – změna prvku (updated_at) automaticky vytvoří nový klíč.
+    """
+    return f"reports:fragment:element:{element.pk}:{element.updated_at.timestamp():.6f}"
+
+
+def section_cache_key(section_id: int) -> str:
+    """
+    Klíč fragmentu sekce – maže se explicitně při změně sekce nebo jejích prvků.
+    """
+    return f"reports:fragment:section:{section_id}"
+
+
+def _render_element_html(element: ContentElement) -> str:
+    return render_to_string('reports/content_element.html', {
+        'element': element, 'readonly': True, 'table_page_size': tables.TABLE_PAGE_SIZE,
+    })
+
+
+def render_section(section: Section) -> str:
+    """
+    Vrátí HTML celé sekce v režimu jen pro čtení.
+
+    Prvky sekce musí být načtené (viz `repositories.load_report_content`);
+    fragmenty prvků se čtou z cache jedním hromadným dotazem.
+    """
+    key = section_cache_key(section.pk)
+    html = cache.get(key)
+    if html is not None:
+        return mark_safe(html)
+
+    elements = list(section.element_list)
+    cached = cache.get_many([element_cache_key(element) for element in elements])
+    missing = {}
+    elements_html = []
+    for element in elements:
+        element_key = element_cache_key(element)
+        element_html = cached.get(element_key)
+        if element_html is None:
+            element_html = _render_element_html(element)
+            missing[element_key] = element_html
+        elements_html.append(mark_safe(element_html))
+    if missing:
+        cache.set_many(missing, FRAGMENT_CACHE_TIMEOUT)
+
+    html = render_to_string('reports/section_fragment.html', {'section': section, 'elements_html': elements_html})
+    cache.set(key, html, FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def render_report_sections(report: Report) -> list[str]:
+    """
+    Vrátí seřazené HTML fragmenty všech sekcí reportu.
+
+    Při plné cache stačí jediný dotaz na sekce; obsah reportu se z databáze
+    načítá až tehdy, když některý fragment sekce v cache chybí.
+
+    Args:
+        report: Report, jehož sekce se renderují.
+
+    Returns:
+        list[str]: HTML jednotlivých sekcí (bezpečné pro šablonu).
+    """
+    sections = list(report.sections.all())
+    cached = cache.get_many([section_cache_key(section.pk) for section in sections])
+    if len(cached) == len(sections):
+        return [mark_safe(cached[section_cache_key(section.pk)]) for section in sections]
+
+    repositories.load_report_content(report)
+    return [render_section(section) for section in report.section_list]
+
+
+def invalidate_section(section_id: int) -> None:
+    """
+    Odstraní z cache fragment sekce (fragmenty prvků jsou verzované přes updated_at).
+    """
+    cache.delete(section_cache_key(section_id))
+
+
+def invalidate_report(report_id: int) -> None:
+    """
+    Odstraní z cache fragmenty všech sekcí reportu.
+    """
+    section_ids = Section.objects.filter(report_id=report_id).values_list('pk', flat=True)
+    cache.delete_many([section_cache_key(section_id) for section_id in section_ids])
@@ -0,0 +1,64 @@
+# reports/management/commands/benchmark_reports.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Vygeneruje syntetický report (např. --sections 1000 --elements 50) a změří vykreslení detailu, "
+        "generate_pdf, move_section, reorder_section_content, vykreslení grafu a publish_report. "
+        "Databáze zůstane beze změny; výsledek lze uložit jako JSON a porovnat s jiným commitem."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', type=int, default=benchmarks.BENCHMARK_SECTIONS, help="Počet sekcí reportu.")
+        parser.add_argument('--elements', type=int, default=benchmarks.BENCHMARK_ELEMENTS, help="Počet prvků v každé sekci.")
+        parser.add_argument('--repeat', type=int, default=benchmarks.BENCHMARK_REPEAT, help="Počet měřených běhů každé operace.")
+        parser.add_argument('--chart-points', type=int, default=benchmarks.CHART_POINTS, help="Počet bodů datové řady grafů.")
+        parser.add_argument('--label', default='', help="Popisek výsledku (např. hash commitu), uloží se do JSON.")
+        parser.add_argument('--output', help="Uložit výsledky jako JSON do souboru.")
+        parser.add_argument('--compare', help="JSON s výsledky jiného běhu, se kterým se mediány porovnají.")
+
+    def handle(self, *args, **options):
+        if options['sections'] < 1 or options['elements'] < 1 or options['repeat'] < 1 or options['chart_points'] < 1:
+            raise CommandError("Počty sekcí, prvků, běhů a bodů grafu musí být kladné.")
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as fileobj:
+                    baseline = json.load(fileobj)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Nelze načíst výsledky pro porovnání: {e}")
+
+        result = benchmarks.run_benchmarks(
+            sections=options['sections'],
+            elements=options['elements'],
+            repeat=options['repeat'],
+            chart_points=options['chart_points'],
+        )
+        result['meta']['label'] = options['label']
+
+        meta = result['meta']
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{meta['sections']} sekcí × {meta['elements_per_section']} prvků, vygenerováno za {meta['generate_ms']:.0f} ms"
+        ))
+        for name, timing in result['results'].items():
+            self.stdout.write(
+                f"{name:<26} medián {timing['median_ms']:>10.2f} ms  min {timing['min_ms']:>10.2f} ms  "
+                f"dotazů {timing['queries']}"
+            )
+
+        if baseline is not None:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Porovnání s {baseline.get('meta', {}).get('label') or options['compare']}"))
+            for name, before, after, change in benchmarks.compare(baseline, result):
+                style = self.style.ERROR if change > 0 else self.style.SUCCESS
+                self.stdout.write(style(f"{name:<26} {before:>10.2f} ms -> {after:>10.2f} ms ({change:+.1f} %)"))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fileobj:
+                json.dump(result, fileobj, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Výsledky uloženy do {options['output']}"))
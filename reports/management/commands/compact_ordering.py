@@ -0,0 +1,42 @@
+# reports/management/commands/compact_ordering.py
+
+from django.core.management.base import BaseCommand
+
+from reports import repositories, services, utils
+from reports.models import Report, Section, ContentElement
+
+
+class Command(BaseCommand):
+    help = (
+        "Přečísluje pořadí sekcí a prvků obsahu s rozestupem ORDER_GAP tam, kde se mezery "
+        "mezi sousedy opakovaným vkládáním zmenšily (vhodné spouštět pravidelně, např. z cronu)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-gap', type=int, default=16,
+            help="Přečíslovat rodiče, kde je mezi sousedy rozestup menší než tato hodnota (výchozí 16).",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Jen vypsat, co by se přečíslovalo.")
+
+    def handle(self, *args, **options):
+        min_gap = options['min_gap']
+        report_ids = repositories.get_crowded_parent_ids(Section.objects.all(), 'report_id', min_gap)
+        section_ids = repositories.get_crowded_parent_ids(
+            ContentElement.objects.non_polymorphic(), 'section_id', min_gap
+        )
+
+        if options['verbosity'] > 1:
+            self.stdout.write(f"Reporty: {report_ids}")
+            self.stdout.write(f"Sekce: {section_ids}")
+
+        if not options['dry_run']:
+            for report in Report.objects.filter(pk__in=report_ids):
+                services.reorder_sections(report)
+            for section in Section.objects.filter(pk__in=section_ids):
+                utils.reorder_section_content(section)
+
+        action = "K přečíslování" if options['dry_run'] else "Přečíslováno"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action}: {len(report_ids)} reportů (sekce), {len(section_ids)} sekcí (prvky obsahu)."
+        ))
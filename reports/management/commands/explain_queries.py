@@ -0,0 +1,78 @@
+# reports/management/commands/explain_queries.py
+
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from reports import repositories
+from reports.models import Report, Section, ContentElement
+
+# Úplný průchod tabulkou bez indexu (SQLite: "SCAN tabulka", PostgreSQL: "Seq Scan")
+_FULL_SCAN = re.compile(r'\bSCAN \w+(?! USING)(?:\s|$)|\bSeq Scan\b')
+
+
+def _hot_queries():
+    """
+    Dotazy seznamů a detailu reportu, které mají obsluhovat indexy z migrace 0010.
+    Parametry se berou z prvního existujícího reportu a sekce (jinak 0).
+    """
+    report = Report.objects.order_by('pk').values('pk', 'author_id').first() or {'pk': 0, 'author_id': 0}
+    section_id = Section.objects.order_by('pk').values_list('pk', flat=True).first() or 0
+    unpublished = [status for status in Report.ReportStatus if status != Report.ReportStatus.PUBLISHED]
+    unapproved = [
+        status for status in ContentElement.ContentElementStatus
+        if status != ContentElement.ContentElementStatus.APPROVED
+    ]
+    return [
+        ("Publikované reporty", Report.objects.filter(status=Report.ReportStatus.PUBLISHED)),
+        ("Otevřené reporty", Report.objects.filter(status__in=unpublished)),
+        ("Nejnovější otevřené reporty",
+         Report.objects.filter(status=Report.ReportStatus.OPEN).order_by('-year', '-id')[:5]),
+        ("Další stránka publikovaných reportů",
+         Report.objects.filter(status=Report.ReportStatus.PUBLISHED)
+         .filter(Q(year__lt=2024) | Q(year=2024, id__lt=report['pk']))
+         .select_related('author').order_by('-year', '-id')[:repositories.REPORT_PAGE_SIZE + 1]),
+        ("Reporty autora", Report.objects.filter(author_id=report['author_id'], status=Report.ReportStatus.OPEN)),
+        ("Reporty podle roku", Report.objects.filter(year=2024)),
+        ("Sekce reportu", Section.objects.filter(report_id=report['pk']).order_by('order', 'id')),
+        ("Prvky sekce",
+         ContentElement.objects.non_polymorphic().filter(section_id=section_id).order_by('order', 'id')),
+        ("Neschválené prvky sekce",
+         ContentElement.objects.non_polymorphic().filter(section_id=section_id, status__in=unapproved)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Vypíše plány (EXPLAIN) a průměrnou dobu hlavních dotazů na reporty, sekce a prvky "
+        "obsahu, aby bylo vidět, které indexy databáze použije."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Kolikrát každý dotaz spustit pro měření (výchozí 20).")
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help="Skončit chybou, pokud některý dotaz prochází celou tabulku bez indexu.",
+        )
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+        scans = []
+        for name, queryset in _hot_queries():
+            plan = queryset.explain()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({elapsed_ms:.2f} ms)"))
+            self.stdout.write(plan)
+            if _FULL_SCAN.search(plan):
+                scans.append(name)
+                self.stdout.write(self.style.WARNING("Úplný průchod tabulkou bez indexu."))
+
+        if scans and options['fail_on_scan']:
+            raise CommandError(f"Dotazy bez indexu: {', '.join(scans)}")
+        self.stdout.write(self.style.SUCCESS(f"Dotazů bez indexu: {len(scans)}"))
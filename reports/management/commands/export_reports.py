@@ -0,0 +1,45 @@
+# reports/management/commands/export_reports.py
+
+import sys
+
+from django.core.management.base import BaseCommand
+
+from reports import archive
+from reports.models import Report
+
+
+class Command(BaseCommand):
+    help = (
+        "Exportuje reporty (sekce, prvky, použité datové zdroje a soubory grafů) do proudového archivu "
+        "tar.gz s JSON lines, který načte příkaz import_reports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Cesta k archivu, nebo '-' pro standardní výstup.")
+        parser.add_argument('--year', type=int, action='append', dest='years', help="Jen reporty daného roku (lze opakovat).")
+        parser.add_argument('--report', type=int, action='append', dest='report_ids', help="Jen report s daným ID (lze opakovat).")
+        parser.add_argument('--status', choices=Report.ReportStatus.values, help="Jen reporty v daném stavu.")
+
+    def handle(self, *args, **options):
+        reports = Report.objects.all()
+        if options['years']:
+            reports = reports.filter(year__in=options['years'])
+        if options['report_ids']:
+            reports = reports.filter(pk__in=options['report_ids'])
+        if options['status']:
+            reports = reports.filter(status=options['status'])
+
+        if options['output'] == '-':
+            counts = archive.export_reports(sys.stdout.buffer, reports)
+        else:
+            with open(options['output'], 'wb') as output:
+                counts = archive.export_reports(output, reports)
+
+        summary = (
+            f"Exportováno reportů: {counts['reports']}, sekcí: {counts['sections']}, prvků: {counts['elements']}, "
+            f"zdrojů: {counts['data_sources']}, souborů: {counts['media']}"
+        )
+        if options['output'] == '-':
+            self.stderr.write(summary)  # Standardní výstup patří archivu
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
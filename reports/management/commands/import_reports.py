@@ -0,0 +1,48 @@
+# reports/management/commands/import_reports.py
+
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from reports import archive
+from reports import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Načte reporty z archivu vytvořeného příkazem export_reports jako nové záznamy "
+        "(hromadně, s přemapováním id) a znovu sestaví fulltextový index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Cesta k archivu, nebo '-' pro standardní vstup.")
+        parser.add_argument(
+            '--author',
+            help="Uživatelské jméno, kterému připadnou reporty autorů, kteří v tomto prostředí neexistují.",
+        )
+        parser.add_argument('--skip-search-index', action='store_true', help="Nesestavovat po importu fulltextový index.")
+
+    def handle(self, *args, **options):
+        default_author = None
+        if options['author']:
+            default_author = get_user_model().objects.filter(username=options['author']).first()
+            if default_author is None:
+                raise CommandError(f"Uživatel '{options['author']}' neexistuje.")
+
+        try:
+            if options['input'] == '-':
+                counts = archive.import_reports(sys.stdin.buffer, default_author)
+            else:
+                with open(options['input'], 'rb') as fileobj:
+                    counts = archive.import_reports(fileobj, default_author)
+        except (OSError, ValidationError) as e:
+            raise CommandError(' '.join(e.messages) if isinstance(e, ValidationError) else str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Importováno reportů: {counts['reports']}, sekcí: {counts['sections']}, prvků: {counts['elements']}, "
+            f"zdrojů: {counts['data_sources']}, nových souborů: {counts['media']}"
+        ))
+        if not options['skip_search_index']:
+            self.stdout.write(f"Fulltextový index: {search.rebuild_index()} dokumentů")
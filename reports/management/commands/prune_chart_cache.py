@@ -0,0 +1,29 @@
+# reports/management/commands/prune_chart_cache.py
+
+from django.core.management.base import BaseCommand
+
+from reports import chart_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Vypíše statistiky cache obrázků grafů (zásahy, výpadky, velikost) a vyřadí "
+        "nejdéle nepoužité obrázky nad limit REPORT_CHART_CACHE_MAX_BYTES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-bytes', type=int, help="Jednorázově použít jiný limit velikosti cache.")
+        parser.add_argument('--stats-only', action='store_true', help="Jen vypsat statistiky, nic nemazat.")
+
+    def handle(self, *args, **options):
+        if not options['stats_only']:
+            removed = chart_cache.evict(options['max_bytes'])
+            self.stdout.write(f"Vyřazeno obrázků: {removed}")
+
+        stats = chart_cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = f"{100 * stats['hits'] / lookups:.1f} %" if lookups else "-"
+        self.stdout.write(self.style.SUCCESS(
+            f"Obrázků: {stats['entries']} ({stats['bytes']} B), "
+            f"zásahy: {stats['hits']}, výpadky: {stats['misses']}, úspěšnost: {hit_rate}"
+        ))
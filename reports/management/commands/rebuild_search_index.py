@@ -0,0 +1,16 @@
+# reports/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from reports import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Smaže a znovu sestaví fulltextový index reportů, sekcí a prvků obsahu. "
+        "Běžně se index aktualizuje průběžně; příkaz je pro první naplnění nebo po hromadných importech."
+    )
+
+    def handle(self, *args, **options):
+        count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Zaindexováno {count} dokumentů."))
@@ -0,0 +1,31 @@
+# reports/management/commands/refresh_tables.py
+
+from django.core.management.base import BaseCommand
+
+from data_sources.models import DataSource
+from reports import services
+
+
+class Command(BaseCommand):
+    help = (
+        "Obnoví Table.data ze všech navázaných datových zdrojů. Tabulky, jejichž zdroj "
+        "se od posledního obnovení nezměnil (stejný otisk), se nepřepisují."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source_ids', nargs='*', type=int, help="ID zdrojů (výchozí všechny zdroje s tabulkami).")
+        parser.add_argument('--force', action='store_true', help="Přepsat data i u tabulek s aktuálním otiskem.")
+
+    def handle(self, *args, **options):
+        sources = DataSource.objects.filter(table__isnull=False).distinct().order_by('pk')
+        if options['source_ids']:
+            sources = sources.filter(pk__in=options['source_ids'])
+
+        total = 0
+        for source in sources:
+            updated = services.refresh_tables_for_source(source, force=options['force'])
+            total += updated
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{source.name}: obnoveno tabulek {updated}")
+
+        self.stdout.write(self.style.SUCCESS(f"Obnoveno {total} tabulek."))
@@ -0,0 +1,31 @@
+# reports/management/commands/repair_content_counters.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reports import repositories
+from reports.models import Section
+
+
+class Command(BaseCommand):
+    help = (
+        "Přepočítá denormalizované počty prvků (podle typu a stavu) sekcí a reportů z tabulek prvků "
+        "a opraví rozdílné řádky (po hromadných úpravách přes QuerySet.update, SQL nebo obnově zálohy)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report', type=int, action='append', dest='reports', help="Jen tento report (lze opakovat).")
+        parser.add_argument('--dry-run', action='store_true', help="Jen vypsat, kolik řádků by se opravilo.")
+
+    def handle(self, *args, **options):
+        section_ids = None
+        if options['reports']:
+            section_ids = list(Section.objects.filter(report__in=options['reports']).values_list('pk', flat=True))
+
+        with transaction.atomic():
+            sections, reports = repositories.recount_content_counters(section_ids)
+            if options['dry_run']:
+                transaction.set_rollback(True)
+
+        action = "K opravě" if options['dry_run'] else "Opraveno"
+        self.stdout.write(self.style.SUCCESS(f"{action}: {sections} sekcí, {reports} reportů."))
@@ -0,0 +1,109 @@
+# reports/management/commands/run_chart_workers.py
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports import chart_cache, charts, repositories, services
+
+
+class Command(BaseCommand):
+    help = (
+        "Zpracovává frontu vykreslování grafů (ChartRenderJob) v poolu procesů. "
+        "Pool kreslí jen obrázky (PNG a varianty) z parametrů úlohy; databázi čte a zapisuje jen tento hlavní proces."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Počet procesů poolu (výchozí počet CPU). 0 = kreslit přímo v tomto procesu.",
+        )
+        parser.add_argument('--once', action='store_true', help="Zpracovat frontu a skončit, místo čekání na další úlohy.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Prodleva mezi dotazy na prázdnou frontu (s).")
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help="Úlohy ve stavu RUNNING starší než tento počet sekund vrátit do fronty (pád workeru).",
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        batch_size = max(workers, 1) * 4
+        # Procesy se spouštějí metodou spawn – nedědí databázová spojení hlavního procesu
+        executor = (
+            ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            if workers else None
+        )
+
+        processed = 0
+        try:
+            while True:
+                stale_before = timezone.now() - timedelta(seconds=options['stale_after'])
+                repositories.requeue_stale_chart_render_jobs(stale_before)
+
+                jobs = repositories.claim_chart_render_jobs(batch_size)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                processed += self._process(jobs, executor, options['verbosity'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Zpracováno {processed} úloh vykreslení grafů."))
+
+    def _process(self, jobs, executor, verbosity):
+        # Stejný graf mohl mezitím vykreslit jiný worker – takové úlohy se jen dokončí z cache
+        to_render = []
+        params = {job.pk: charts.with_series(job.params, job.series) for job in jobs}
+        for job in jobs:
+            if chart_cache.cached_path(charts.chart_key(params[job.pk], job.variant or None)) is not None:
+                services.complete_chart_render(job)
+            else:
+                to_render.append(job)
+        jobs_done = len(jobs) - len(to_render)
+        jobs = to_render
+
+        if executor is None:
+            results = ((job, self._call(*self._render_call(job, params[job.pk]))) for job in jobs)
+        else:
+            futures = {executor.submit(*self._render_call(job, params[job.pk])): job for job in jobs}
+            results = ((futures[future], self._result(future)) for future in as_completed(futures))
+
+        for job, (content, error) in results:
+            if error is None:
+                services.complete_chart_render(job, content)
+            else:
+                services.fail_chart_render(job, error)
+            if verbosity > 1:
+                self.stdout.write(f"Graf {job.chart_id}: {'chyba – ' + error if error else 'vykreslen'}")
+        return jobs_done + len(jobs)
+
+    @staticmethod
+    def _render_call(job, params):
+        # Hlavní PNG (Chart.dataset), nebo varianta vyžádaná přes reports:chart_image
+        if job.variant:
+            return charts.render_chart_variant, params, job.variant
+        return charts.render_chart_png, params
+
+    @staticmethod
+    def _call(func, *args):
+        try:
+            return func(*args), None
+        except Exception as e:
+            return None, repr(e)
+
+    @staticmethod
+    def _result(future):
+        try:
+            return future.result(), None
+        except Exception as e:
+            return None, repr(e)
@@ -0,0 +1,33 @@
+# reports/management/commands/warm_report_cache.py
+
+from django.core.management.base import BaseCommand
+
+from reports import fragments
+from reports.models import Report
+
+
+class Command(BaseCommand):
+    help = (
+        "Předrenderuje HTML fragmenty všech publikovaných reportů do cache (spouštět po nasazení). "
+        "Má smysl jen se sdílenou cache (CACHES v settings.py), ne s LocMemCache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report', type=int, action='append', dest='report_ids', help="Předehřát jen report s daným ID (lze opakovat).")
+        parser.add_argument('--force', action='store_true', help="Nejdřív smazat existující fragmenty a vše vyrenderovat znovu.")
+
+    def handle(self, *args, **options):
+        reports = Report.objects.filter(status=Report.ReportStatus.PUBLISHED).select_related('author').order_by('pk')
+        if options['report_ids']:
+            reports = reports.filter(pk__in=options['report_ids'])
+
+        count = 0
+        for report in reports.iterator():
+            if options['force']:
+                fragments.invalidate_report(report.pk)
+            sections = fragments.render_report_sections(report)
+            count += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{report.pk}: {report.title} ({len(sections)} sekcí)")
+
+        self.stdout.write(self.style.SUCCESS(f"Předehřáto {count} publikovaných reportů."))
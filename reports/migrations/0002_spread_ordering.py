@@ -0,0 +1,49 @@
+# reports/migrations/0002_spread_ordering.py
+
+"""
+Rozprostře existující hodnoty `order` sekcí a prvků obsahu na násobky ORDER_GAP.
+
+Souvislé číslování 1..N neumožňuje vložit prvek mezi dva sousedy bez posunu
+ostatních řádků; po migraci má každý rodič mezi sousedy rozestup 1024.
+"""
+
+from django.db import migrations
+
+ORDER_GAP = 1024  # Kopie repositories.ORDER_GAP – migrace nesmí záviset na aktuálním kódu aplikace
+
+
+def _renumber(queryset, parent_field, step):
+    """
+    Přečísluje řádky každého rodiče na step, 2 * step, ... při zachování pořadí.
+    """
+    batch = []
+    parent, rank = None, 0
+    for obj in queryset.order_by(parent_field, 'order', 'id').only('id', 'order', parent_field):
+        if getattr(obj, parent_field) != parent:
+            parent, rank = getattr(obj, parent_field), 0
+        rank += 1
+        if obj.order != rank * step:
+            obj.order = rank * step
+            batch.append(obj)
+    queryset.model.objects.bulk_update(batch, ['order'], batch_size=500)
+
+
+def spread_orders(apps, schema_editor):
+    _renumber(apps.get_model('reports', 'Section').objects.all(), 'report_id', ORDER_GAP)
+    _renumber(apps.get_model('reports', 'ContentElement').objects.all(), 'section_id', ORDER_GAP)
+
+
+def dense_orders(apps, schema_editor):
+    _renumber(apps.get_model('reports', 'Section').objects.all(), 'report_id', 1)
+    _renumber(apps.get_model('reports', 'ContentElement').objects.all(), 'section_id', 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(spread_orders, dense_orders),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_spread_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chart',
+            name='render_status',
+            field=models.CharField(choices=[('READY', 'Ready'), ('RENDERING', 'Rendering'), ('FAILED', 'Failed')], default='READY', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ChartRenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('params', models.JSONField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('chart', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='reports.chart')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reports_cha_status_02d0e0_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_chart_render_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChartImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(upload_to='charts/cache/')),
+                ('size', models.PositiveIntegerField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='chart',
+            name='render_key',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_chart_image_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chart',
+            name='render_params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
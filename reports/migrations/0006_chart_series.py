@@ -0,0 +1,48 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+from reports import series
+
+SERIES_KEYS = ('x_data', 'y_data')
+
+
+def _split_params(params):
+    """Oddělí datovou řadu od stylu ve starých parametrech grafu."""
+    style = {name: value for name, value in params.items() if name not in SERIES_KEYS}
+    return style, series.pack_series(params['x_data'], params['y_data'])
+
+
+def _move_series(apps, schema_editor):
+    Chart = apps.get_model('reports', 'Chart')
+    ChartRenderJob = apps.get_model('reports', 'ChartRenderJob')
+
+    for chart in Chart.objects.filter(render_params__has_key='x_data').only('pk', 'render_params').iterator():
+        style, blob = _split_params(chart.render_params)
+        Chart.objects.filter(pk=chart.pk).update(render_params=style, series=blob)
+
+    for job in ChartRenderJob.objects.only('pk', 'params').iterator():
+        style, blob = _split_params(job.params)
+        ChartRenderJob.objects.filter(pk=job.pk).update(params=style, series=blob)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_chart_render_params'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chart',
+            name='series',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='chartrenderjob',
+            name='series',
+            field=models.BinaryField(default=b''),
+            preserve_default=False,
+        ),
+        migrations.RunPython(_move_series, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_chart_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='table',
+            name='data_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
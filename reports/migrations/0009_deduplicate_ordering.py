@@ -0,0 +1,47 @@
+# reports/migrations/0009_deduplicate_ordering.py
+
+"""
+Odstraní duplicitní hodnoty `order` u sourozenců před přidáním unikátních
+omezení (report, order) a (section, order) v 0010.
+
+Rodiče, kde se pořadí opakuje, se přečíslují na násobky ORDER_GAP při
+zachování pořadí (shodné hodnoty rozhoduje id, stejně jako při řazení).
+"""
+
+from django.db import migrations
+from django.db.models import Count
+
+ORDER_GAP = 1024  # Kopie repositories.ORDER_GAP – migrace nesmí záviset na aktuálním kódu aplikace
+
+
+def _renumber_duplicates(queryset, parent_field):
+    duplicated = (
+        queryset.values(parent_field, 'order').annotate(n=Count('id')).filter(n__gt=1).values_list(parent_field, flat=True)
+    )
+    batch = []
+    parent, rank = None, 0
+    rows = queryset.filter(**{f'{parent_field}__in': set(duplicated)}).order_by(parent_field, 'order', 'id')
+    for obj in rows.only('id', 'order', parent_field):
+        if getattr(obj, parent_field) != parent:
+            parent, rank = getattr(obj, parent_field), 0
+        rank += 1
+        if obj.order != rank * ORDER_GAP:
+            obj.order = rank * ORDER_GAP
+            batch.append(obj)
+    queryset.model.objects.bulk_update(batch, ['order'], batch_size=500)
+
+
+def deduplicate_orders(apps, schema_editor):
+    _renumber_duplicates(apps.get_model('reports', 'Section').objects.all(), 'report_id')
+    _renumber_duplicates(apps.get_model('reports', 'ContentElement').objects.all(), 'section_id')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_orders, migrations.RunPython.noop),
+    ]
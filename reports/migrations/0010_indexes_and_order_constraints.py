@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('reports', '0009_deduplicate_ordering'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contentelement',
+            index=models.Index(fields=['section', 'status'], name='content_section_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['status', '-year'], name='report_status_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['author', 'status'], name='report_author_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['year'], name='report_year_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='contentelement',
+            constraint=models.UniqueConstraint(fields=('section', 'order'), name='unique_content_element_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='section',
+            constraint=models.UniqueConstraint(fields=('report', 'order'), name='unique_section_order'),
+        ),
+    ]
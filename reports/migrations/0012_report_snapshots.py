@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_report_list_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('topic', models.CharField(max_length=100)),
+                ('year', models.IntegerField()),
+                ('author_name', models.CharField(max_length=150)),
+                ('content', models.BinaryField()),
+                ('html', models.TextField()),
+                ('pdf', models.BinaryField()),
+                ('published_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('published_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='reports.report')),
+            ],
+            options={
+                'ordering': ['report', '-version'],
+                'constraints': [models.UniqueConstraint(fields=('report', 'version'), name='unique_report_snapshot_version')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-17 23:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_report_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.1.7 on 2026-10-18 00:13
+
+from collections import defaultdict
+
+import django.db.models.manager
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+COUNTER_FIELDS = ('paragraph_count', 'chart_count', 'table_count', 'draft_count', 'staged_count', 'approved_count')
+
+
+def fill_counters(apps, schema_editor):
+    # Vlastní kopie přepočtu (repositories.recount_content_counters) – migrace nesmí záviset na kódu aplikace
+    Section = apps.get_model('reports', 'Section')
+    Report = apps.get_model('reports', 'Report')
+    ContentElement = apps.get_model('reports', 'ContentElement')
+
+    counts = defaultdict(dict)
+    for model_name in ('Paragraph', 'Chart', 'Table'):
+        rows = apps.get_model('reports', model_name).objects.values('section_id').annotate(n=Count('pk'))
+        for row in rows.order_by():
+            counts[row['section_id']][f'{model_name.lower()}_count'] = row['n']
+    for row in ContentElement.objects.values('section_id', 'status').annotate(n=Count('pk')).order_by():
+        counts[row['section_id']][f"{row['status'].lower()}_count"] = row['n']
+    for row in ContentElement.objects.values('section_id').annotate(last=Max('updated_at')).order_by():
+        counts[row['section_id']]['content_updated_at'] = row['last']
+
+    sections = list(Section.objects.filter(pk__in=list(counts)))
+    for section in sections:
+        for field, value in counts[section.pk].items():
+            setattr(section, field, value)
+    Section.objects.bulk_update(sections, COUNTER_FIELDS + ('content_updated_at',), batch_size=500)
+
+    totals = Section.objects.values('report_id').annotate(
+        last=Max('content_updated_at'), **{field: Sum(field) for field in COUNTER_FIELDS}
+    ).order_by()
+    reports = []
+    for row in totals:
+        report = Report(pk=row['report_id'], content_updated_at=row['last'], **{field: row[field] or 0 for field in COUNTER_FIELDS})
+        reports.append(report)
+    Report.objects.bulk_update(reports, COUNTER_FIELDS + ('content_updated_at',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0013_report_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='chart_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='content_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='draft_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='paragraph_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='staged_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='table_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='chart_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='content_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='draft_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='paragraph_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='staged_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='table_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterModelOptions(
+            name='contentelement',
+            options={'base_manager_name': 'plain_objects', 'default_manager_name': 'objects', 'ordering': ['order']},
+        ),
+        migrations.AlterModelManagers(
+            name='contentelement',
+            managers=[
+                ('objects', django.db.models.manager.Manager()),
+                ('plain_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
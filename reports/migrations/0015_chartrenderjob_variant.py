@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0014_content_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chartrenderjob',
+            name='variant',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0015_chartrenderjob_variant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportsnapshot',
+            name='images',
+            field=models.ManyToManyField(blank=True, related_name='snapshots', to='reports.chartimage'),
+        ),
+    ]
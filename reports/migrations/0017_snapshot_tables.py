@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0016_reportsnapshot_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotTable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('element_id', models.PositiveBigIntegerField()),
+                ('columns', models.JSONField(default=list)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tables', to='reports.reportsnapshot')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SnapshotTableChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_row', models.PositiveIntegerField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('content', models.JSONField()),
+                ('table', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='reports.snapshottable')),
+            ],
+            options={
+                'ordering': ['table', 'start_row'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='snapshottable',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'element_id'), name='unique_snapshot_table'),
+        ),
+        migrations.AddConstraint(
+            model_name='snapshottablechunk',
+            constraint=models.UniqueConstraint(fields=('table', 'start_row'), name='unique_snapshot_table_chunk'),
+        ),
+    ]
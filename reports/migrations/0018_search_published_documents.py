@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0017_snapshot_tables'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='searchdocument',
+            name='unique_search_document',
+        ),
+        migrations.AddField(
+            model_name='searchdocument',
+            name='published',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'published'), name='unique_search_document'),
+        ),
+    ]
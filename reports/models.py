@@ -3,12 +3,38 @@ from django.db import models
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
 from data_sources.models import DataSource
+from polymorphic.managers import PolymorphicManager
 from polymorphic.models import PolymorphicModel
 
 User = get_user_model()
 
-class Report(models.Model):
+class ContentCounters(models.Model):
+    """
+    Denormalizované počty prvků obsahu podle typu a stavu (sekce a celého reportu).
+
+    Udržují je repository funkce, které prvky vytvářejí, mažou a mění jejich stav
+    (`repositories.adjust_content_counters`); opravu po zásazích mimo ně provede
+    `manage.py repair_content_counters`.
+    """
+    paragraph_count = models.PositiveIntegerField(default=0, editable=False)
+    chart_count = models.PositiveIntegerField(default=0, editable=False)
+    table_count = models.PositiveIntegerField(default=0, editable=False)
+    draft_count = models.PositiveIntegerField(default=0, editable=False)
+    staged_count = models.PositiveIntegerField(default=0, editable=False)
+    approved_count = models.PositiveIntegerField(default=0, editable=False)
+    content_updated_at = models.DateTimeField(null=True, blank=True, editable=False)  # Poslední změna prvků obsahu
+
+    class Meta:
+        abstract = True
+
+    @property
+    def element_count(self) -> int:
+        return self.paragraph_count + self.chart_count + self.table_count
+
+
+class Report(ContentCounters):
     class ReportStatus(models.TextChoices):
         OPEN = "OPEN", "Open"
         PUBLISHED = "PUBLISHED", "Published"
@@ -18,6 +44,15 @@ class Report(models.Model):
     year = models.IntegerField()
     status = models.CharField(max_length=10, choices=ReportStatus.choices, default=ReportStatus.OPEN)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)  # Zvyšuje se při změně sekcí a pořadí obsahu (ETag detailu)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-year", "-id"], name="report_status_year_idx"),  # Seznamy podle stavu, nejnovější první
+            models.Index(fields=["author", "status"], name="report_author_status_idx"),  # Reporty autora
+            models.Index(fields=["year"], name="report_year_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -25,13 +60,17 @@ class Report(models.Model):
     def get_absolute_url(self):
         return reverse('reports:report_detail', kwargs={'pk': self.pk})
 
-class Section(models.Model):
+class Section(ContentCounters):
     report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="sections")
     title = models.CharField(max_length=200)
     order = models.PositiveIntegerField()
 
     class Meta:
         ordering = ["order"]
+        constraints = [
+            # Slouží zároveň jako index pro řazení sekcí reportu
+            models.UniqueConstraint(fields=["report", "order"], name="unique_section_order"),
+        ]
 
     def __str__(self):
         return f"{self.order}. {self.title}"
@@ -55,8 +94,20 @@ class ContentElement(PolymorphicModel):
     updated_at = models.DateTimeField(auto_now=True)  # Datum poslední aktualizace
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)  # Autor prvku
 
+    # Nepolymorfní základní manager: kaskádové mazání (např. sekce) jinak přiřadí
+    # prvky různých typů jedné podtřídě a řádky ostatních podtříd nesmaže.
+    objects = PolymorphicManager()
+    plain_objects = models.Manager()
+
     class Meta:
+        default_manager_name = "objects"
+        base_manager_name = "plain_objects"
         ordering = ["order"]
+        constraints = [
+            # Slouží zároveň jako index pro řazení prvků sekce
+            models.UniqueConstraint(fields=["section", "order"], name="unique_content_element_order"),
+        ]
+        indexes = [models.Index(fields=["section", "status"], name="content_section_status_idx")]
 
     def get_class_name(self):  #  Přidána metoda
         return self.__class__.__name__ # Název třídy
@@ -70,17 +121,196 @@ class Paragraph(ContentElement):
         return f"Paragraph {self.order} in {self.section.title}"
 
 class Chart(ContentElement):
+    class RenderStatus(models.TextChoices):
+        READY = "READY", "Ready"
+        RENDERING = "RENDERING", "Rendering"  # Čeká na worker (viz ChartRenderJob)
+        FAILED = "FAILED", "Failed"
+
     title = models.CharField(max_length=200)
     dataset = models.FileField(upload_to="charts/")  # Dataset pro graf (např. CSV, JSON)
     data_source = models.ForeignKey(DataSource, on_delete=models.SET_NULL, null=True, blank=True)
+    render_status = models.CharField(max_length=10, choices=RenderStatus.choices, default=RenderStatus.READY)
+    render_key = models.CharField(max_length=64, blank=True)  # Hash parametrů posledního požadovaného vykreslení
+    render_params = models.JSONField(null=True, blank=True)  # Styl grafu (titulek, typ, barva) pro varianty (SVG, PNG, PDF)
+    series = models.BinaryField(null=True, blank=True, editable=False)  # Datová řada grafu (viz reports/series.py)
 
     def __str__(self):
         return f"Chart: {self.title} in {self.section.title}"
 
 class Table(ContentElement):
     title = models.CharField(max_length=200)
-    data = models.JSONField(null=True, blank=True)  # Uloží strukturovaná data jako JSON
+    data = models.JSONField(null=True, blank=True)  # Uloží strukturovaná data jako JSON (columns, rows, row_count, truncated)
     data_source = models.ForeignKey(DataSource, on_delete=models.SET_NULL, null=True, blank=True) # Přidáno data_source
+    data_fingerprint = models.CharField(max_length=64, blank=True, editable=False)  # Otisk zdroje, ze kterého jsou `data` (viz utils.data_source_fingerprint)
+
+    def __str__(self):
+        return f"Table: {self.title} in {self.section.title}"
+
+# ----------------- Fronta vykreslování grafů -----------------
+
+class ChartRenderJob(models.Model):
+    """
+    Úloha na vykreslení grafu, kterou zpracuje `manage.py run_chart_workers`.
+
+    Fronta je v databázi, takže nepotřebuje žádný externí broker.
+    """
+    class JobStatus(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    chart = models.ForeignKey(Chart, on_delete=models.CASCADE, related_name="render_jobs")
+    variant = models.CharField(max_length=10, blank=True)  # Varianta z charts.CHART_VARIANTS; "" = hlavní PNG (Chart.dataset)
+    params = models.JSONField()  # title, chart_type, color
+    series = models.BinaryField()  # Datová řada v okamžiku založení úlohy (viz reports/series.py)
+    status = models.CharField(max_length=10, choices=JobStatus.choices, default=JobStatus.PENDING)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"Render job {self.pk} ({self.status}) for chart {self.chart_id}"
+
+
+class ChartImage(models.Model):
+    """
+    Vykreslený obrázek v content-addressed cache grafů (viz `reports/chart_cache.py`).
+
+    Klíč je hash parametrů vykreslení, takže stejný graf se kreslí a ukládá jen jednou.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to="charts/cache/")
+    size = models.PositiveIntegerField()  # Velikost souboru v bajtech
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)  # Pro LRU vyřazování
+
+    def __str__(self):
+        return f"Chart image {self.key[:12]} ({self.size} B)"
+
+
+# ----------------- Fulltextový index -----------------
+
+class SearchDocument(models.Model):
+    """
+    Jeden indexovaný objekt (report, sekce nebo prvek obsahu) ve fulltextovém indexu
+    (viz `reports/search.py`). Text se ukládá kvůli zvýraznění nalezených slov.
+    Publikované reporty mají v indexu navíc dokumenty z poslední verze (`published`).
+    """
+    class Kind(models.TextChoices):
+        REPORT = "report", "Report"
+        SECTION = "section", "Section"
+        PARAGRAPH = "paragraph", "Paragraph"
+        CHART = "chart", "Chart"
+        TABLE = "table", "Table"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="search_documents")
+    title = models.CharField(max_length=200, blank=True)
+    text = models.TextField(blank=True)  # Prostý text bez HTML
+    length = models.PositiveIntegerField(default=0)  # Počet slov (pro BM25)
+    published = models.BooleanField(default=False)  # Dokument z poslední publikované verze, ne z živých dat
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", "published"], name="unique_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
+
+
+class SearchPosting(models.Model):
+    """
+    Výskyt slova v dokumentu indexu (invertovaný index: slovo -> dokumenty).
+    """
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name="postings")
+    frequency = models.PositiveIntegerField()  # Počet výskytů slova v dokumentu
+
+    class Meta:
+        indexes = [models.Index(fields=["term", "document"])]
+
+    def __str__(self):
+        return f"{self.term} in {self.document_id} ({self.frequency}×)"
+
+
+# ----------------- Snapshoty publikovaných reportů -----------------
+
+class ReportSnapshot(models.Model):
+    """
+    Neměnná verze publikovaného reportu (viz `reports/snapshots.py`).
+
+    Každá publikace uloží novou verzi: komprimovaný JSON stromu reportu,
+    předrenderované HTML sekcí a PDF. Čtení publikované verze je jeden řádek
+    bez JOINů a polymorfních dotazů; pozdější úpravy reportu ji nemění.
+    Obrázky grafů, na které HTML odkazuje, jsou v `images` chráněné před vyřazením z cache.
+    """
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="snapshots")
+    version = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    topic = models.CharField(max_length=100)
+    year = models.IntegerField()
+    author_name = models.CharField(max_length=150)
+    content = models.BinaryField()  # JSON stromu reportu komprimovaný zlibem
+    html = models.TextField()  # HTML sekcí v režimu jen pro čtení
+    pdf = models.BinaryField()
+    images = models.ManyToManyField(ChartImage, blank=True, related_name="snapshots")  # Obrázky grafů v HTML
+    published_at = models.DateTimeField(default=timezone.now)
+    published_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+
+    class Meta:
+        ordering = ["report", "-version"]
+        constraints = [models.UniqueConstraint(fields=["report", "version"], name="unique_report_snapshot_version")]
+
+    def __str__(self):
+        return f"{self.title} v{self.version}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Snapshot publikovaného reportu nelze měnit.")
+        super().save(*args, **kwargs)
+
+
+class SnapshotTable(models.Model):
+    """
+    Tabulka uložená v publikované verzi reportu. Řádky jsou mimo JSON stromu
+    snapshotu v blocích `SnapshotTableChunk`, aby stránkování četlo jen potřebné bloky.
+    """
+    snapshot = models.ForeignKey(ReportSnapshot, on_delete=models.CASCADE, related_name="tables")
+    element_id = models.PositiveBigIntegerField()  # ID tabulky v době publikace
+    columns = models.JSONField(default=list)
+    row_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["snapshot", "element_id"], name="unique_snapshot_table")]
+
+    def __str__(self):
+        return f"Table {self.element_id} in snapshot {self.snapshot_id}"
+
+
+class SnapshotTableChunk(models.Model):
+    """
+    Blok řádků tabulky v publikované verzi (stejný tvar jako `data_sources.Data`).
+    """
+    table = models.ForeignKey(SnapshotTable, on_delete=models.CASCADE, related_name="chunks")
+    start_row = models.PositiveIntegerField()  # Index prvního řádku bloku v tabulce
+    row_count = models.PositiveIntegerField()
+    content = models.JSONField()  # Řádky bloku (seznamy hodnot podle SnapshotTable.columns)
+
+    class Meta:
+        ordering = ["table", "start_row"]
+        constraints = [models.UniqueConstraint(fields=["table", "start_row"], name="unique_snapshot_table_chunk")]
 
     def __str__(self):
-        return f"Table: {self.title} in {self.section.title}"
\ No newline at end of file
+        return f"Rows {self.start_row}–{self.start_row + self.row_count} of {self.table}"
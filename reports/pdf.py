@@ -0,0 +1,218 @@
+# reports/pdf.py
+
+"""
+Stránkovaný PDF engine pro export reportů.
+
+Strom reportu se načte konstantním počtem dotazů (`repositories.load_report_content`),
+text odstavců se zalamuje podle šířky stránky a přetéká na další stránky. Grafy
+se vkládají jako vektorové kresby ze zdrojových dat (`charts.chart_drawing`).
+Hotový dokument se zapisuje do dočasného souboru (malé dokumenty zůstávají
+v paměti, velké se odkládají na disk) a do odpovědi se posílá po částech.
+"""
+
+"""
+Seznam funkcí v `reports/pdf.py`:
+
+1. `write_report_pdf(report: Report, output) -> None`
+2. `render_report_pdf(report: Report) -> SpooledTemporaryFile`
+3. `iter_file_chunks(fileobj, chunk_size: int = PDF_CHUNK_SIZE) -> Iterator[bytes]`
+"""
+
+import re
+import tempfile
+from html import unescape
+
+from django.utils.html import strip_tags
+from reportlab.graphics import renderPDF
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from . import charts
+from . import repositories
+from .models import Report, Paragraph, Chart, Table
+
+PDF_CHUNK_SIZE = 64 * 1024  # Velikost jednoho kusu streamované odpovědi
+PDF_SPOOL_MAX_SIZE = 2 * 1024 * 1024  # Nad tuto velikost se PDF odkládá do souboru na disku
+
+# Řádky, které v HTML odstavce (CKEditor) ukončují blok textu
+_BLOCK_BREAK_RE = re.compile(r'<br\s*/?>|</(p|div|li|h[1-6]|blockquote)>', re.IGNORECASE)
+
+
+class PDFLayout:
+    """
+    Jednoduchý sazeč nad ReportLab canvasem.
+
+    Drží aktuální pozici kurzoru a před každým řádkem ověří, že se řádek vejde
+    na stránku. Pokud ne, založí novou stránku – text tak nikdy nepřeteče přes
+    spodní okraj.
+    """
+
+    def __init__(self, pdf_canvas: canvas.Canvas, pagesize=letter, margin: float = inch):
+        self.canvas = pdf_canvas
+        self.width, self.height = pagesize
+        self.margin = margin
+        self.top = self.height - margin * 0.5
+        self.bottom = margin
+        self.y = self.top
+
+    @property
+    def text_width(self) -> float:
+        return self.width - 2 * self.margin
+
+    def new_page(self) -> None:
+        self.canvas.showPage()
+        self.y = self.top
+
+    def ensure_space(self, height: float) -> None:
+        """
+        Založí novou stránku, pokud pod kurzorem nezbývá `height` bodů.
+        """
+        if self.y - height < self.bottom and self.y < self.top:
+            self.new_page()
+
+    def skip(self, height: float) -> None:
+        self.y -= height
+
+    def write_line(self, text: str, font: str, size: float, indent: float = 0, leading: float = None) -> None:
+        """
+        Vypíše jeden řádek textu (bez zalamování) a posune kurzor dolů.
+        """
+        leading = leading or size * 1.4
+        self.ensure_space(leading)
+        self.y -= leading
+        self.canvas.setFont(font, size)
+        self.canvas.drawString(self.margin + indent, self.y, text)
+
+    def draw(self, drawing, indent: float = 0) -> None:
+        """
+        Vloží vektorovou kresbu ReportLab (např. graf) pod kurzor a posune ho dolů.
+        """
+        self.ensure_space(drawing.height)
+        self.y -= drawing.height
+        renderPDF.draw(drawing, self.canvas, self.margin + indent, self.y)
+
+    def write_text(self, text: str, font: str, size: float, indent: float = 0, leading: float = None) -> None:
+        """
+        Vypíše víceřádkový text se zalamováním podle šířky stránky.
+        """
+        for line in wrap_text(text, font, size, self.text_width - indent):
+            self.write_line(line, font, size, indent=indent, leading=leading)
+
+
+def wrap_text(text: str, font: str, size: float, width: float) -> list[str]:
+    """
+    Rozdělí text na řádky, které se vejdou do šířky `width`.
+
+    Zachovává explicitní konce řádků; slova delší než celý řádek se rozdělí po znacích.
+    """
+    lines = []
+    for raw_line in text.split("\n"):
+        current = ""
+        for word in raw_line.split():
+            candidate = f"{current} {word}" if current else word
+            if stringWidth(candidate, font, size) <= width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            # Slovo samo o sobě je širší než řádek – rozdělíme ho po znacích
+            while stringWidth(word, font, size) > width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and stringWidth(word[:cut], font, size) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            current = word
+        lines.append(current)
+    return lines
+
+
+def paragraph_plain_text(html: str) -> str:
+    """
+    Převede HTML odstavce z editoru na prostý text s konci řádků.
+    """
+    text = _BLOCK_BREAK_RE.sub("\n", html or "")
+    text = unescape(strip_tags(text))
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+def write_report_pdf(report: Report, output) -> None:
+    """
+    Vysází report do PDF a zapíše ho do souborového objektu `output`.
+
+    Args:
+        report: Report objekt k exportu do PDF.
+        output: Zapisovatelný binární souborový objekt.
+
+    Raises:
+        Exception: Pokud generování PDF selže (např. chyba knihovny ReportLab).
+    """
+    pdf_canvas = canvas.Canvas(output, pagesize=letter)
+    pdf_canvas.setTitle(report.title)
+    layout = PDFLayout(pdf_canvas)
+
+    layout.write_text(report.title, "Helvetica-Bold", 16)
+    layout.skip(0.1 * inch)
+    layout.write_line(f"Author: {report.author}", "Helvetica", 12)
+    layout.write_line(f"Topic: {report.topic}", "Helvetica", 12)
+    layout.write_line(f"Year: {report.year}", "Helvetica", 12)
+    layout.skip(0.3 * inch)
+
+    indent = 0.2 * inch
+    repositories.load_report_content(report)
+    for section in report.section_list:
+        # Nadpis sekce nenecháme osamocený na konci stránky
+        layout.ensure_space(14 * 1.4 + 12 * 1.4 * 2)
+        layout.write_text(section.title, "Helvetica-Bold", 14)
+        layout.skip(0.1 * inch)
+
+        for element in section.element_list:
+            if isinstance(element, Paragraph):
+                layout.write_text(paragraph_plain_text(element.text), "Helvetica", 12, indent=indent)
+            elif isinstance(element, Chart) and element.render_params and element.series is not None:
+                width = layout.text_width - indent
+                params = charts.with_series(element.render_params, element.series)
+                layout.draw(charts.chart_drawing(params, width, width * 2 / 3), indent=indent)
+            elif isinstance(element, Chart):
+                layout.write_text(f"Chart: {element.title} (Chart visualization not implemented in PDF)", "Helvetica", 12, indent=indent)
+            elif isinstance(element, Table):
+                layout.write_text(f"Table: {element.title} (Table data not implemented in PDF)", "Helvetica", 12, indent=indent)
+            layout.skip(0.1 * inch)
+
+        layout.skip(0.3 * inch)
+
+    pdf_canvas.save()
+
+
+def render_report_pdf(report: Report) -> tempfile.SpooledTemporaryFile:
+    """
+    Vygeneruje PDF reportu do dočasného souboru připraveného ke čtení od začátku.
+
+    Volající je zodpovědný za uzavření souboru (např. přes `iter_file_chunks`).
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+    try:
+        write_report_pdf(report, output)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+def iter_file_chunks(fileobj, chunk_size: int = PDF_CHUNK_SIZE):
+    """
+    Postupně čte souborový objekt po částech a na konci ho uzavře.
+
+    Vhodné jako iterátor pro `StreamingHttpResponse`.
+    """
+    try:
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
@@ -0,0 +1,195 @@
+# reports/profiling.py
+
+"""
+Měření počtu SQL dotazů a doby zpracování požadavků.
+
+`ProfilingMiddleware` (zapíná se nastavením `REPORT_PROFILING`) u každého
+požadavku zaznamená počet SQL dotazů, čas strávený v SQL, čas vykreslování
+šablon (bez SQL spuštěných během vykreslování) a zbývající čas v Pythonu.
+Čas šablon se měří na vykreslení `TemplateResponse` (class-based views) přes
+`process_template_response` a post-render callback; u view vracejících hotovou
+odpověď (`render`) je vykreslení součástí času Pythonu. Nic se globálně nepřepisuje.
+Hodnoty posílá v hlavičce `Server-Timing` a ukládá do klouzavého okna
+posledních `REPORT_PROFILING_WINDOW` požadavků pro každý view; percentily
+vrací `stats` a endpoint `reports:profiling_stats` (jen pro staff). Okno je
+v paměti procesu, takže každý worker vidí jen své požadavky.
+
+`REPORT_QUERY_BUDGETS` určuje nejvyšší povolený počet dotazů pro jednotlivé
+view (podle `view_name`, např. `'reports:report_detail'`). Překročení se
+zaloguje jako varování; s `REPORT_QUERY_BUDGET_STRICT = True` (v testech)
+vyvolá `QueryBudgetExceeded`, takže N+1 regrese shodí test.
+"""
+
+"""
+Seznam funkcí v `reports/profiling.py`:
+
+1. `record(view_name: str, sample: dict) -> None`
+2. `stats(view_name: str = None) -> dict`
+3. `reset() -> None`
+4. `check_budget(view_name: str, queries: int) -> None`
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PROFILING_WINDOW = getattr(settings, 'REPORT_PROFILING_WINDOW', 500)  # Požadavků na view v klouzavém okně
+PERCENTILES = (50, 90, 99)
+UNRESOLVED = '<unresolved>'  # Požadavky mimo URL vzory (404) – jedno okno pro všechny cesty
+METRICS = ('queries', 'sql_ms', 'template_ms', 'python_ms', 'total_ms')
+
+_samples = defaultdict(lambda: deque(maxlen=PROFILING_WINDOW))
+_samples_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    """View spustil více SQL dotazů, než povoluje `REPORT_QUERY_BUDGETS`."""
+
+
+class _Profile:
+    """Průběžné hodnoty jednoho požadavku."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.template = 0.0
+        self.template_sql = 0.0  # SQL spuštěné během vykreslování šablon
+        self.in_template = False
+        self.template_started = 0.0
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.sql += elapsed
+            if self.in_template:
+                self.template_sql += elapsed
+
+    def start_template(self):
+        self.in_template = True
+        self.template_started = time.perf_counter()
+
+    def end_template(self, response=None):
+        """Post-render callback TemplateResponse – ukončí měření času šablon."""
+        if self.in_template:
+            self.template += time.perf_counter() - self.template_started
+            self.in_template = False
+
+
+def record(view_name: str, sample: dict) -> None:
+    """
+    Uloží měření jednoho požadavku do klouzavého okna view.
+    """
+    with _samples_lock:
+        _samples[view_name].append(tuple(sample[metric] for metric in METRICS))
+
+
+def stats(view_name: str = None) -> dict:
+    """
+    Vrátí percentily měření z klouzavého okna.
+
+    Args:
+        view_name: Jen pro tento view (None = všechny).
+
+    Returns:
+        dict: {view_name: {'count': n, 'queries': {'p50': ..., 'p90': ..., 'p99': ..., 'max': ...}, ...}}
+    """
+    with _samples_lock:
+        windows = {name: list(rows) for name, rows in _samples.items() if view_name in (None, name) and rows}
+    result = {}
+    for name, rows in windows.items():
+        values = np.array(rows, dtype=np.float64)
+        result[name] = {'count': len(rows)}
+        for index, metric in enumerate(METRICS):
+            column = values[:, index]
+            summary = {f'p{p}': round(float(value), 2) for p, value in zip(PERCENTILES, np.percentile(column, PERCENTILES))}
+            summary['max'] = round(float(column.max()), 2)
+            result[name][metric] = summary
+    return result
+
+
+def reset() -> None:
+    """
+    Smaže všechna měření.
+    """
+    with _samples_lock:
+        _samples.clear()
+
+
+def check_budget(view_name: str, queries: int) -> None:
+    """
+    Porovná počet dotazů s rozpočtem view v `REPORT_QUERY_BUDGETS`.
+
+    Raises:
+        QueryBudgetExceeded: Pokud je rozpočet překročen a `REPORT_QUERY_BUDGET_STRICT` je zapnuto.
+    """
+    budget = getattr(settings, 'REPORT_QUERY_BUDGETS', {}).get(view_name)
+    if budget is None or queries <= budget:
+        return
+    message = f"{view_name}: {queries} SQL dotazů, rozpočet je {budget}"
+    if getattr(settings, 'REPORT_QUERY_BUDGET_STRICT', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class ProfilingMiddleware:
+    """
+    Měří dotazy a časy požadavku, viz popis modulu. Bez `REPORT_PROFILING` nic nedělá.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'REPORT_PROFILING', False):
+            return self.get_response(request)
+
+        profile = _Profile()
+        request._reports_profile = profile
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.execute))
+            response = self.get_response(request)
+        profile.end_template()  # Vykreslení skončilo výjimkou – callback se nezavolal
+        total = time.perf_counter() - started
+
+        template = profile.template - profile.template_sql
+        sample = {
+            'queries': profile.queries,
+            'sql_ms': profile.sql * 1000,
+            'template_ms': template * 1000,
+            'python_ms': max(total - profile.sql - template, 0.0) * 1000,
+            'total_ms': total * 1000,
+        }
+        response['Server-Timing'] = (
+            f"sql;desc=\"{profile.queries} SQL\";dur={sample['sql_ms']:.1f}, "
+            f"tpl;dur={sample['template_ms']:.1f}, py;dur={sample['python_ms']:.1f}"
+        )
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else UNRESOLVED
+        record(view_name, sample)
+        check_budget(view_name, profile.queries)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Zahájí měření času šablon těsně před vykreslením TemplateResponse; ukončí ho post-render callback.
+        """
+        profile = getattr(request, '_reports_profile', None)
+        if profile is not None:
+            profile.start_template()
+            response.add_post_render_callback(profile.end_template)
+        return response
@@ -7,18 +7,36 @@ Obsahuje ORM operace pro modely Report, Section, Paragraph, Chart, Table.
 # obsahuje následující funkce
 """
 get_report_by_id(report_id)
+get_report_tree(report_id)
+load_report_content(report)
+load_section_content(section)
 list_reports(filter_criteria)
+get_reports_page(statuses, after=None, limit=REPORT_PAGE_SIZE)
 get_reports_by_author(user)
 create_report(title, topic, year, author)
 update_report(report, **fields)
+lock_report(report_id)
 delete_report(report)
+touch_report(report_id=None, section_id=None)
+get_report_change_state(report_id)
 get_section_by_id(section_id)
 get_sections_by_report(report)
 create_section(report, title, order=None)
+lock_section(section_id)
 update_section(section, **fields)
 delete_section(section)
+next_order(queryset)
+order_for_position(queryset, position)
+spaced_orders(ids)
+set_section_orders(report, orders)
+set_content_element_orders(section, orders)
+get_content_element_position(element)
+get_crowded_parent_ids(queryset, parent_field, min_gap)
+has_unapproved_elements(report)
+get_unapproved_elements(report)
+approve_staged_elements(report=None, section=None)
 get_paragraph_by_id(paragraph_id)
-create_paragraph(section, text, order=None)
+create_paragraph(section, text, author=None, order=None)
 update_paragraph(paragraph, **fields)
 delete_paragraph(paragraph)
 get_chart_by_id(chart_id)
@@ -29,11 +47,49 @@ get_table_by_id(table_id)
 create_table(section, title, data=None, order=None)
 update_table(table, **fields)
 delete_table(table)
+bulk_create_content_elements(elements, batch_size=BULK_CREATE_BATCH_SIZE)
+element_counter_deltas(element, sign=1)
+adjust_content_counters(section_id, deltas)
+recount_content_counters(section_ids=None)
+get_stale_tables(data_source, fingerprint=None)
+update_tables_data(table_ids, data, fingerprint)
+create_chart_render_job(chart, params, series)
+cancel_pending_chart_render_jobs(chart)
+enqueue_chart_variant_job(chart, params, series, variant)
+claim_chart_render_jobs(limit)
+finish_chart_render_job(job, status, error="")
+get_chart_render_key(chart_id)
+requeue_stale_chart_render_jobs(started_before)
 """
 
-from .models import Report, Section, Paragraph, Chart, Table
+from collections import Counter, defaultdict
+
+from .models import Report, Section, ContentElement, Paragraph, Chart, Table, ChartRenderJob
 from profiles.models import User
-from django.db import models
+from django.utils import timezone
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models, transaction
+from django.db.models import Case, Count, F, Max, Sum, Value, When, Window
+from django.db.models.functions import Greatest, Lag
+
+# Rozestup mezi sousedními hodnotami `order` – vložení mezi dva prvky použije
+# střed mezery, takže se ostatní řádky nepřečíslovávají.
+ORDER_GAP = 1024
+
+# Maximální počet větví CASE v jednom UPDATE při hromadném přečíslování
+ORDER_UPDATE_BATCH_SIZE = 500
+
+# Počet reportů na stránce seznamů (viz get_reports_page)
+REPORT_PAGE_SIZE = 25
+
+# Počet řádků v jednom INSERT při hromadném vytváření prvků obsahu
+BULK_CREATE_BATCH_SIZE = 500
+
+# Denormalizované počty prvků na Section a Report (viz models.ContentCounters)
+COUNTER_FIELDS = ('paragraph_count', 'chart_count', 'table_count', 'draft_count', 'staged_count', 'approved_count')
+
+# Pole počtu podle typu prvku
+COUNTER_TYPE_FIELDS = {Paragraph: 'paragraph_count', Chart: 'chart_count', Table: 'table_count'}
 
 
 # -------------------- Report Repository Functions --------------------
@@ -54,6 +110,100 @@ def get_report_by_id(report_id: int) -> Report:
     return Report.objects.get(pk=report_id)
 
 
+def get_report_tree(report_id: int) -> Report:
+    """
+    Načte Report včetně seřazených sekcí a všech prvků obsahu (strom reportu).
+
+    Počet dotazů je konstantní bez ohledu na počet sekcí: report + autor,
+    sekce a jeden dotaz pro každý typ prvku (Paragraph, Chart, Table) včetně
+    autorů a datových zdrojů. `report.section_list` a `section.element_list`
+    (seřazené seznamy sekcí a prvků) pak už databázi nevolají.
+
+    Args:
+        report_id: Primární klíč Report objektu.
+
+    Returns:
+        Report: Report s předem načteným stromem obsahu.
+
+    Raises:
+        Report.DoesNotExist: Pokud Report s daným ID neexistuje.
+    """
+    report = Report.objects.select_related('author').get(pk=report_id)
+    return load_report_content(report)
+
+
+def load_report_content(report: Report) -> Report:
+    """
+    Načte do existující instance Report seřazené sekce a prvky obsahu.
+
+    Prvky se načítají přímo z tabulek jednotlivých podtříd (bez polymorfního
+    dotazování po sekcích), jeden `Prefetch` na typ prvku. Sekce jsou
+    v `report.section_list`, prvky sekce seřazené podle `order` v
+    `section.element_list`. Opakované volání obsah načte znovu.
+
+    Args:
+        report: Instance Report modelu.
+
+    Returns:
+        Report: Tatáž instance s naplněnými seznamy `section_list` a `element_list`.
+    """
+    if hasattr(report, 'section_list'):
+        del report.section_list
+    models.prefetch_related_objects(
+        [report],
+        models.Prefetch('sections', queryset=Section.objects.order_by('order', 'id'), to_attr='section_list'),
+        *_element_prefetches('section_list__'),
+    )
+    for section in report.section_list:
+        _merge_elements(section)
+    return report
+
+
+def load_section_content(section: Section) -> Section:
+    """
+    Načte do existující instance Section seřazené prvky obsahu (jeden dotaz na typ prvku).
+
+    Args:
+        section: Instance Section modelu.
+
+    Returns:
+        Section: Tatáž instance se seznamem prvků v `section.element_list`.
+    """
+    for _, _, to_attr in ELEMENT_PREFETCHES:
+        if hasattr(section, to_attr):
+            delattr(section, to_attr)
+    models.prefetch_related_objects([section], *_element_prefetches())
+    _merge_elements(section)
+    return section
+
+
+# Typy prvků obsahu: (model, select_related, atribut sekce pro Prefetch)
+ELEMENT_PREFETCHES = (
+    (Paragraph, ('author',), 'prefetched_paragraphs'),
+    (Chart, ('author', 'data_source'), 'prefetched_charts'),
+    (Table, ('author', 'data_source'), 'prefetched_tables'),
+)
+
+
+def _element_prefetches(prefix: str = '') -> list:
+    """
+    Vrátí `Prefetch` relace `content_elements` pro každý typ prvku (dotaz přímo na tabulku podtřídy).
+    """
+    return [
+        models.Prefetch(
+            f'{prefix}content_elements',
+            queryset=model.objects.non_polymorphic().select_related(*related),
+            to_attr=to_attr,
+        )
+        for model, related, to_attr in ELEMENT_PREFETCHES
+    ]
+
+
+def _merge_elements(section: Section) -> None:
+    elements = [element for _, _, to_attr in ELEMENT_PREFETCHES for element in getattr(section, to_attr)]
+    section.element_list = sorted(elements, key=lambda e: (e.order, e.pk))
+
+
 def list_reports(filter_criteria: dict = None) -> models.QuerySet[Report]: ###
     """
     Vrátí QuerySet reportů s možností filtrování.
@@ -76,6 +226,41 @@ def list_reports(filter_criteria: dict = None) -> models.QuerySet[Report]: ###
     return queryset
 
 
+def get_reports_page(statuses: list, after: tuple = None, limit: int = REPORT_PAGE_SIZE) -> tuple:
+    """
+    Vrátí stránku reportů v daných stavech, od nejnovějších (year a id sestupně).
+
+    Stránkuje se podle klíče (keyset): další stránka začíná za klíčem (year, id)
+    posledního reportu předchozí stránky, takže databáze čte jen `limit + 1`
+    řádků z indexu report_status_year_idx bez ohledu na to, jak daleko stránka je.
+    Načítají se jen sloupce, které seznamy zobrazují, autor jedním JOINem;
+    počty prvků jsou denormalizované na reportu, tabulky prvků se nečtou.
+
+    Args:
+        statuses: Stavy reportů (Report.ReportStatus).
+        after: Klíč (year, id), za kterým stránka začíná; None = první stránka.
+        limit: Počet reportů na stránce.
+
+    Returns:
+        tuple[list[Report], tuple | None]: Reporty stránky a klíč (year, id) pro další stránku,
+        nebo None, pokud je to poslední stránka.
+    """
+    queryset = (
+        Report.objects.filter(status__in=statuses)
+        .select_related('author')
+        .only('title', 'year', 'status', 'author__username', 'approved_count', 'paragraph_count', 'chart_count', 'table_count')
+        .order_by('-year', '-id')
+    )
+    if after is not None:
+        year, pk = after
+        queryset = queryset.filter(models.Q(year__lt=year) | models.Q(year=year, id__lt=pk))
+    reports = list(queryset[:limit + 1])
+    if len(reports) <= limit:
+        return reports, None
+    last = reports[limit - 1]
+    return reports[:limit], (last.year, last.pk)
+
+
 def get_reports_by_author(author_user: 'User') -> models.QuerySet[Report]:
     """
     Vrátí QuerySet reportů vytvořených daným uživatelem.
@@ -123,6 +308,14 @@ def update_report(report: Report, **fields: dict) -> Report:
     return report
 
 
+def lock_report(report_id: int) -> None:
+    """
+    Zamkne řádek reportu (SELECT ... FOR UPDATE) do konce probíhající transakce.
+    Volá se uvnitř `transaction.atomic()`.
+    """
+    Report.objects.select_for_update().filter(pk=report_id).values_list('pk', flat=True).first()
+
+
 def delete_report(report: Report) -> None:
     """
     Smaže Report objekt z databáze.
@@ -133,6 +326,33 @@ def delete_report(report: Report) -> None:
     report.delete()
 
 
+def touch_report(report_id: int = None, section_id: int = None) -> None:
+    """
+    Zvýší `Report.version` (a `updated_at`) reportu nebo reportu dané sekce.
+
+    Volá se při změnách, které nemění `updated_at` žádného prvku – sekce,
+    pořadí, smazání prvku – aby se změnil ETag detailu reportu.
+    """
+    reports = Report.objects.filter(pk=report_id) if report_id is not None else Report.objects.filter(sections=section_id)
+    reports.update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def get_report_change_state(report_id: int):
+    """
+    Vrátí jedním dotazem údaje, ze kterých se skládá ETag a Last-Modified detailu reportu.
+
+    Returns:
+        tuple | None: (version, updated_at reportu, nejnovější updated_at prvku obsahu nebo None),
+        nebo None, pokud report neexistuje.
+    """
+    return (
+        Report.objects.filter(pk=report_id)
+        .annotate(elements_updated_at=Max('sections__content_elements__updated_at'))
+        .values_list('version', 'updated_at', 'elements_updated_at')
+        .first()
+    )
+
+
 # -------------------- Section Repository Functions --------------------
 
 def get_section_by_id(section_id: int) -> Section:
@@ -153,14 +373,24 @@ def create_section(report: Report, title: str, order: int = None) -> Section:
     """
     Vytvoří novou Section pro daný Report.
     """
-    if order is None:
-        # Automatické určení pořadí, pokud není zadáno
-        last_section = Section.objects.filter(report=report).order_by('-order').first()
-        order = (last_section.order + 1) if last_section else 1
-    section = Section.objects.create(report=report, title=title, order=order)
+    with transaction.atomic():
+        if order is None:
+            # Automatické určení pořadí (na konec, s rozestupem ORDER_GAP) až po zamčení reportu,
+            # aby souběžná připojení nedostala stejné pořadí (unikátní (report, order))
+            lock_report(report.pk)
+            order = next_order(Section.objects.filter(report=report))
+        section = Section.objects.create(report=report, title=title, order=order)
     return section
 
 
+def lock_section(section_id: int) -> None:
+    """
+    Zamkne řádek sekce (SELECT ... FOR UPDATE) do konce probíhající transakce.
+    Volá se uvnitř `transaction.atomic()`, např. před výpočtem pořadí nového prvku.
+    """
+    Section.objects.select_for_update().filter(pk=section_id).values_list('pk', flat=True).first()
+
+
 def update_section(section: Section, **fields: dict) -> Section:
     """
     Aktualizuje pole existujícího Section objektu.
@@ -173,9 +403,271 @@ def update_section(section: Section, **fields: dict) -> Section:
 
 def delete_section(section: Section) -> None:
     """
-    Smaže Section objekt z databáze.
+    Smaže Section objekt z databáze a odečte její počty prvků od reportu.
+    """
+    with transaction.atomic():
+        counts = Section.objects.filter(pk=section.pk).values(*COUNTER_FIELDS).first()
+        section.delete()
+        if counts:
+            Report.objects.filter(pk=section.report_id).update(
+                **_counter_updates({field: -value for field, value in counts.items()})
+            )
+
+
+# -------------------- Ordering Repository Functions --------------------
+
+def next_order(queryset: models.QuerySet) -> int:
+    """
+    Vrátí pořadí pro připojení nového řádku na konec (poslední order + ORDER_GAP).
+
+    Volá se v transakci po zamčení rodiče (`lock_report`, `lock_section`), jinak
+    dvě souběžná připojení dostanou stejné pořadí a jedno selže na unikátním omezení.
+
+    Args:
+        queryset: Sourozenci (sekce reportu nebo prvky sekce).
+
+    Returns:
+        int: Volné pořadí za posledním řádkem.
+    """
+    last_order = queryset.aggregate(last=Max('order'))['last']
+    return (last_order or 0) + ORDER_GAP
+
+
+def order_for_position(queryset: models.QuerySet, position: int):
+    """
+    Spočítá hodnotu `order` pro vložení na danou pozici mezi sourozence.
+
+    Načte nejvýše dva sousední řádky a vrátí střed mezery mezi nimi.
+
+    Args:
+        queryset: Sourozenci bez přesouvaného řádku.
+        position: Cílová pozice (1 = první).
+
+    Returns:
+        int | None: Nové pořadí, nebo None, pokud mezi sousedy už není volná hodnota
+        (pak je potřeba sourozence přečíslovat, viz `spaced_orders`).
+    """
+    offset = max(position - 2, 0)
+    neighbours = list(queryset.order_by('order', 'id').values_list('order', flat=True)[offset:position])
+    if position == 1:
+        before, after = 0, (neighbours[0] if neighbours else None)
+    else:
+        before, after = neighbours[0], (neighbours[1] if len(neighbours) > 1 else None)
+
+    if after is None:
+        return before + ORDER_GAP
+    if after - before < 2:
+        return None
+    return (before + after) // 2
+
+
+def spaced_orders(ids: list) -> dict:
+    """
+    Přidělí seřazeným ID pořadí s rozestupem ORDER_GAP: {id: ORDER_GAP, id2: 2 * ORDER_GAP, ...}.
+    """
+    return {pk: index * ORDER_GAP for index, pk in enumerate(ids, start=1)}
+
+
+def set_section_orders(report: Report, orders: dict) -> int:
+    """
+    Nastaví sekcím reportu nová pořadí podle slovníku {section_id: order}.
+
+    Zapisuje se UPDATE ... SET order = CASE ... (po dávkách ORDER_UPDATE_BATCH_SIZE), před
+    kterým se měněné řádky posunou mimo obsazená pořadí (unikátní omezení (report, order)).
+
+    Returns:
+        int: Počet změněných sekcí.
     """
-    section.delete()
+    updated = _set_orders(Section.objects.filter(report=report), orders)
+    if updated:
+        touch_report(report_id=report.pk)
+    return updated
+
+
+def set_content_element_orders(section: Section, orders: dict) -> int:
+    """
+    Nastaví prvkům obsahu sekce nová pořadí podle slovníku {element_id: order}.
+
+    Returns:
+        int: Počet změněných prvků.
+    """
+    updated = _set_orders(ContentElement.objects.filter(section=section), orders)
+    if updated:
+        touch_report(report_id=section.report_id)
+    return updated
+
+
+def get_content_element_position(element: ContentElement) -> int:
+    """
+    Vrátí pozici prvku v sekci (1 = první) bez ohledu na mezery v číslování.
+    """
+    preceding = ContentElement.objects.filter(section_id=element.section_id).filter(
+        models.Q(order__lt=element.order) | models.Q(order=element.order, pk__lt=element.pk)
+    )
+    return preceding.count() + 1
+
+
+def get_crowded_parent_ids(queryset: models.QuerySet, parent_field: str, min_gap: int) -> list:
+    """
+    Najde rodiče (sekce nebo reporty), mezi jejichž potomky je mezera v pořadí menší než `min_gap`.
+
+    Používá okenní funkci LAG, takže stačí jediný dotaz bez načítání řádků do Pythonu.
+
+    Args:
+        queryset: Řazené řádky (Section nebo ContentElement).
+        parent_field: Název FK na rodiče ('report_id' nebo 'section_id').
+        min_gap: Nejmenší přípustný rozestup sousedních hodnot `order`.
+
+    Returns:
+        list: ID rodičů, které je vhodné přečíslovat.
+    """
+    gaps = queryset.annotate(
+        gap=F('order') - Window(Lag('order'), partition_by=[F(parent_field)], order_by=[F('order'), F('id')])
+    )
+    return sorted(set(gaps.filter(gap__lt=min_gap).values_list(parent_field, flat=True)))
+
+
+def _set_orders(queryset: models.QuerySet, orders: dict) -> int:
+    items = list(orders.items())
+    if not items:
+        return 0
+    # (rodič, order) je unikátní a databáze to kontroluje po každém řádku UPDATE, takže
+    # prohození dvou hodnot by selhalo. Měněné řádky se proto nejdřív posunou nad všechna
+    # stávající i nová pořadí a teprve pak dostanou cílové hodnoty.
+    shift = max(queryset.aggregate(last=Max('order'))['last'] or 0, max(orders.values())) + 1
+    for offset in range(0, len(items), ORDER_UPDATE_BATCH_SIZE):
+        batch = items[offset:offset + ORDER_UPDATE_BATCH_SIZE]
+        queryset.filter(pk__in=[pk for pk, _ in batch]).update(order=F('order') + shift)
+
+    updated = 0
+    for offset in range(0, len(items), ORDER_UPDATE_BATCH_SIZE):
+        batch = items[offset:offset + ORDER_UPDATE_BATCH_SIZE]
+        whens = [When(pk=pk, then=Value(order)) for pk, order in batch]
+        updated += queryset.filter(pk__in=[pk for pk, _ in batch]).update(
+            order=Case(*whens, output_field=models.PositiveIntegerField())
+        )
+    return updated
+
+
+# -------------------- Publishing Repository Functions --------------------
+
+def _report_elements(report: Report = None, section: Section = None) -> models.QuerySet:
+    elements = ContentElement.objects.non_polymorphic()
+    if section is not None:
+        return elements.filter(section=section)
+    return elements.filter(section__report=report)
+
+
+def _unapproved_statuses() -> list:
+    # IN (...) místo NOT (status = ...), aby dotaz obsloužil index content_section_status_idx
+    return [status for status in ContentElement.ContentElementStatus if status != ContentElement.ContentElementStatus.APPROVED]
+
+
+def has_unapproved_elements(report: Report) -> bool:
+    """
+    Zjistí jedním dotazem (EXISTS), zda report obsahuje neschválený prvek obsahu.
+    """
+    return _report_elements(report).filter(status__in=_unapproved_statuses()).exists()
+
+
+def get_unapproved_elements(report: Report) -> list:
+    """
+    Vrátí neschválené prvky obsahu reportu (bez načítání konkrétních typů prvků).
+
+    Returns:
+        list[dict]: `id`, `section_id`, `section_title`, `type` (název modelu) a `status`,
+        v pořadí sekcí a prvků.
+    """
+    rows = (
+        _report_elements(report)
+        .filter(status__in=_unapproved_statuses())
+        .order_by('section__order', 'order')
+        .values('id', 'section_id', 'section__title', 'polymorphic_ctype__model', 'status')
+    )
+    return [
+        {
+            'id': row['id'],
+            'section_id': row['section_id'],
+            'section_title': row['section__title'],
+            'type': row['polymorphic_ctype__model'],
+            'status': row['status'],
+        }
+        for row in rows
+    ]
+
+
+def approve_staged_elements(report: Report = None, section: Section = None) -> tuple:
+    """
+    Schválí všechny prvky ve stavu STAGED v reportu nebo sekci jedním UPDATE.
+
+    Args:
+        report: Report, jehož prvky se schvalují (pokud není zadána sekce).
+        section: Sekce, jejíž prvky se schvalují.
+
+    Returns:
+        tuple[int, list]: Počet schválených prvků a ID dotčených sekcí.
+    """
+    staged = _report_elements(report, section).filter(status=ContentElement.ContentElementStatus.STAGED)
+    with transaction.atomic():
+        # Zamčené řádky určí změny počtů; GROUP BY s FOR UPDATE databáze nepovolí, sčítá se v Pythonu
+        per_section = Counter(staged.select_for_update(of=('self',)).order_by().values_list('section_id', flat=True))
+        if not per_section:
+            return 0, []
+        approved = staged.update(status=ContentElement.ContentElementStatus.APPROVED, updated_at=timezone.now())
+
+        # Typ prvku se nemění, přesouvá se jen STAGED -> APPROVED; sekce se stejnou změnou sdílí jeden UPDATE
+        by_count = defaultdict(list)
+        for section_id, count in per_section.items():
+            by_count[count].append(section_id)
+        for count, section_ids in by_count.items():
+            Section.objects.filter(pk__in=section_ids).update(**_counter_updates({'staged_count': -count, 'approved_count': count}))
+        report_id = section.report_id if section is not None else report.pk
+        Report.objects.filter(pk=report_id).update(**_counter_updates({'staged_count': -approved, 'approved_count': approved}))
+    return approved, list(per_section)
+
+
+# -------------------- Content Element Helpers --------------------
+
+def _locked_counter_state(element: ContentElement):
+    # Uložený (status, section_id) prvku; řádek zůstane zamčený do konce transakce,
+    # takže počty se odečtou podle DB, ne podle případně zastaralé instance v paměti
+    return (
+        ContentElement.plain_objects.select_for_update()
+        .filter(pk=element.pk).values_list('status', 'section_id').first()
+    )
+
+
+def _update_element(element: ContentElement, fields: dict) -> ContentElement:
+    # Změna stavu nebo sekce přesune prvek mezi počty; content_updated_at se posune vždy
+    with transaction.atomic():
+        stored = _locked_counter_state(element)
+        for key, value in fields.items():
+            setattr(element, key, value)
+        element.save()
+        added = element_counter_deltas(element)
+        if stored is None:
+            adjust_content_counters(element.section_id, added)
+            return element
+        status, section_id = stored
+        removed = _counter_deltas(element, status, -1)
+        if section_id == element.section_id:
+            for field, delta in added.items():
+                removed[field] = removed.get(field, 0) + delta
+            adjust_content_counters(section_id, removed)
+        else:
+            adjust_content_counters(section_id, removed)
+            adjust_content_counters(element.section_id, added)
+    return element
+
+
+def _delete_element(element: ContentElement) -> None:
+    with transaction.atomic():
+        stored = _locked_counter_state(element)
+        if stored is None:  # Prvek už smazal jiný požadavek – počty jsou odečtené
+            return
+        element.delete()
+        status, section_id = stored
+        adjust_content_counters(section_id, _counter_deltas(element, status, -1))
 
 
 # -------------------- Paragraph Repository Functions --------------------
@@ -190,18 +682,22 @@ def get_paragraph_by_id(paragraph_id: int) -> Paragraph: ###
         raise Paragraph.DoesNotExist(f"Paragraph with id {paragraph_id} not found.")
 
 
-def create_paragraph(section: Section, text: str, author: User, order: int = None) -> Paragraph:
-    if order is None:
-        last_paragraph = Paragraph.objects.filter(section=section).order_by('-order').first()
-        order = (last_paragraph.order + 1) if last_paragraph else 1
-
-    paragraph = Paragraph.objects.create(
-        section=section,
-        text=text,
-        order=order,
-        author=author,
-        status=Paragraph.ContentElementStatus.DRAFT
-    )
+def create_paragraph(section: Section, text: str, author: User = None, order: int = None) -> Paragraph:
+    """
+    Vytvoří nový Paragraph v dané sekci.
+    """
+    with transaction.atomic():
+        if order is None:
+            lock_section(section.pk)  # Souběžná připojení na konec sekce dostanou různá pořadí
+            order = next_order(ContentElement.objects.filter(section=section))
+        paragraph = Paragraph.objects.create(
+            section=section,
+            text=text,
+            order=order,
+            author=author,
+            status=Paragraph.ContentElementStatus.DRAFT
+        )
+        adjust_content_counters(section.pk, element_counter_deltas(paragraph))
     return paragraph
 
 
@@ -209,17 +705,14 @@ def update_paragraph(paragraph: Paragraph, **fields: dict) -> Paragraph:
     """
     Aktualizuje pole existujícího Paragraph objektu.
     """
-    for key, value in fields.items():
-        setattr(paragraph, key, value)
-    paragraph.save()
-    return paragraph
+    return _update_element(paragraph, fields)
 
 
 def delete_paragraph(paragraph: Paragraph) -> None:
     """
     Smaže Paragraph objekt z databáze.
     """
-    paragraph.delete()
+    _delete_element(paragraph)
 
 
 # -------------------- Chart Repository Functions --------------------
@@ -238,13 +731,15 @@ def create_chart(section: Section, title: str, dataset=None, data_source=None, o
     """
     Vytvoří nový Chart v dané sekci.
     """
-    if order is None:
-        # Automatické určení pořadí
-        last_chart = Chart.objects.filter(section=section).order_by('-order').first()
-        order = (last_chart.order + 1) if last_chart else 1
-    chart = Chart.objects.create(
-        section=section, title=title, dataset=dataset, data_source=data_source, order=order, author=author, status=Chart.ContentElementStatus.DRAFT
-    )
+    with transaction.atomic():
+        if order is None:
+            # Automatické určení pořadí (za všechny prvky sekce, ne jen grafy) po zamčení sekce
+            lock_section(section.pk)
+            order = next_order(ContentElement.objects.filter(section=section))
+        chart = Chart.objects.create(
+            section=section, title=title, dataset=dataset, data_source=data_source, order=order, author=author, status=Chart.ContentElementStatus.DRAFT
+        )
+        adjust_content_counters(section.pk, element_counter_deltas(chart))
     return chart
 
 
@@ -252,17 +747,14 @@ def update_chart(chart: Chart, **fields: dict) -> Chart:
     """
     Aktualizuje pole existujícího Chart objektu.
     """
-    for key, value in fields.items():
-        setattr(chart, key, value)
-    chart.save()
-    return chart
+    return _update_element(chart, fields)
 
 
 def delete_chart(chart: Chart) -> None:
     """
     Smaže Chart objekt z databáze.
     """
-    chart.delete()
+    _delete_element(chart)
 
 
 # -------------------- Table Repository Functions --------------------
@@ -277,15 +769,20 @@ def get_table_by_id(table_id: int) -> Table: ###
         raise Table.DoesNotExist(f"Table with id {table_id} not found.")
 
 
-def create_table(section: Section, title: str, data=None, data_source=None, order: int = None) -> Table: ###
+def create_table(section: Section, title: str, data=None, data_source=None, order: int = None, data_fingerprint: str = "") -> Table: ###
     """
     Vytvoří nový Table v dané sekci.
     """
-    if order is None:
-        # Automatické určení pořadí
-        last_table = Table.objects.filter(section=section).order_by('-order').first()
-        order = (last_table.order + 1) if last_table else 1
-    table = Table.objects.create(section=section, title=title, data=data, data_source=data_source, order=order, status=Table.ContentElementStatus.DRAFT)
+    with transaction.atomic():
+        if order is None:
+            # Automatické určení pořadí (za všechny prvky sekce, ne jen tabulky) po zamčení sekce
+            lock_section(section.pk)
+            order = next_order(ContentElement.objects.filter(section=section))
+        table = Table.objects.create(
+            section=section, title=title, data=data, data_source=data_source, order=order,
+            status=Table.ContentElementStatus.DRAFT, data_fingerprint=data_fingerprint,
+        )
+        adjust_content_counters(section.pk, element_counter_deltas(table))
     return table
 
 
@@ -293,14 +790,297 @@ def update_table(table: Table, **fields: dict) -> Table:
     """
     Aktualizuje pole existujícího Table objektu.
     """
-    for key, value in fields.items():
-        setattr(table, key, value)
-    table.save()
-    return table
+    return _update_element(table, fields)
 
 
 def delete_table(table: Table) -> None:
     """
     Smaže Table objekt z databáze.
     """
-    table.delete()
+    _delete_element(table)
+
+
+def bulk_create_content_elements(elements: list, batch_size: int = BULK_CREATE_BATCH_SIZE) -> list:
+    """
+    Hromadně uloží nové prvky obsahu (instance Paragraph, Chart, Table).
+
+    `bulk_create` u víceúrovňové dědičnosti nefunguje: řádky `ContentElement`
+    se proto vytvoří přes `bulk_create` a řádky podtříd se vloží po dávkách
+    přímo (INSERT ... VALUES s `executemany`; `pre_save` polí se volá, takže se
+    uloží i nové soubory ve FileField). Signály se neposílají – volající se
+    stará o fulltextový index a cache fragmentů. Počty prvků dotčených sekcí
+    a reportů se na konci přepočítají (`recount_content_counters`).
+
+    Returns:
+        list: Stejné instance s nastaveným primárním klíčem.
+    """
+    base_fields = [
+        field for field in ContentElement._meta.concrete_fields
+        if not field.primary_key and field.name != 'polymorphic_ctype'
+    ]
+    content_types = {}
+    parents = []
+    for element in elements:
+        model = type(element)
+        if model not in content_types:
+            content_types[model] = ContentType.objects.get_for_model(model, for_concrete_model=False)
+        parents.append(ContentElement(
+            polymorphic_ctype=content_types[model],
+            **{field.attname: getattr(element, field.attname) for field in base_fields},
+        ))
+    ContentElement.objects.bulk_create(parents, batch_size=batch_size)
+
+    by_model = defaultdict(list)
+    for element, parent in zip(elements, parents):
+        element.id = element.contentelement_ptr_id = parent.pk
+        element.created_at, element.updated_at = parent.created_at, parent.updated_at
+        element.polymorphic_ctype_id = parent.polymorphic_ctype_id
+        element._state.adding = False
+        by_model[type(element)].append(element)
+
+    for model, objects in by_model.items():
+        fields = model._meta.local_concrete_fields
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(objects), batch_size):
+                cursor.executemany(sql, [
+                    [field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields]
+                    for obj in objects[start:start + batch_size]
+                ])
+    recount_content_counters({element.section_id for element in elements})
+    return elements
+
+
+# -------------------- Content Counter Repository Functions --------------------
+
+def element_counter_deltas(element: ContentElement, sign: int = 1) -> dict:
+    """
+    Vrátí změny počtů, které prvek způsobí při přidání (`sign=1`) nebo odebrání (`sign=-1`).
+
+    Args:
+        element: Prvek (Paragraph, Chart, Table, nebo ContentElement se skutečným typem v `polymorphic_ctype`).
+        sign: 1 pro přidání, -1 pro odebrání.
+
+    Returns:
+        dict: {pole počtu: změna}, např. {'chart_count': 1, 'draft_count': 1}.
+
+    Raises:
+        ValueError: Pokud typ prvku nemá pole počtu.
+    """
+    return _counter_deltas(element, element.status, sign)
+
+
+def _counter_deltas(element: ContentElement, status: str, sign: int) -> dict:
+    # Instance základní třídy (plain_objects, non_polymorphic) se mapují přes skutečný typ prvku
+    model = type(element)
+    if model is ContentElement and element.polymorphic_ctype_id is not None:
+        model = element.get_real_instance_class()
+    field = next((field for counted, field in COUNTER_TYPE_FIELDS.items() if model and issubclass(model, counted)), None)
+    if field is None:
+        raise ValueError(f"Neznámý typ prvku obsahu: {model.__name__ if model else None}")
+    return {field: sign, f"{status.lower()}_count": sign}
+
+
+def _counter_updates(deltas: dict) -> dict:
+    # F-výrazy pro QuerySet.update; záporné změny se zastaví na nule (PositiveIntegerField)
+    updates = {}
+    for field, delta in deltas.items():
+        if delta > 0:
+            updates[field] = F(field) + delta
+        elif delta < 0:
+            updates[field] = Greatest(F(field) + delta, Value(0))
+    updates['content_updated_at'] = timezone.now()
+    return updates
+
+
+def adjust_content_counters(section_id: int, deltas: dict) -> None:
+    """
+    Upraví počty prvků sekce a jejího reportu dvěma UPDATE s F-výrazy.
+
+    Hodnoty se nečtou do Pythonu, takže souběžné změny se neztratí. Volá se
+    ve stejné transakci jako změna prvku. Nastaví i `content_updated_at`.
+
+    Args:
+        section_id: ID sekce, ve které se prvek změnil.
+        deltas: {pole počtu: změna} (viz `element_counter_deltas`); nulové změny se vynechají.
+    """
+    updates = _counter_updates(deltas)
+    Section.objects.filter(pk=section_id).update(**updates)
+    Report.objects.filter(sections=section_id).update(**updates)
+
+
+def _counted_sections(section_ids) -> dict:
+    # Skutečné počty prvků podle typu a stavu a nejnovější updated_at pro sekce
+    elements = ContentElement.objects.non_polymorphic()
+    if section_ids is not None:
+        elements = elements.filter(section_id__in=section_ids)
+    counts = defaultdict(dict)
+    rows = elements.values('section_id', 'polymorphic_ctype__model').annotate(n=Count('pk')).order_by()
+    for row in rows:
+        counts[row['section_id']][f"{row['polymorphic_ctype__model']}_count"] = row['n']
+    for row in elements.values('section_id', 'status').annotate(n=Count('pk')).order_by():
+        counts[row['section_id']][f"{row['status'].lower()}_count"] = row['n']
+    for row in elements.values('section_id').annotate(last=Max('updated_at')).order_by():
+        counts[row['section_id']]['content_updated_at'] = row['last']
+    return counts
+
+
+def _fix_counters(instance: models.Model, values: dict) -> bool:
+    # Přepíše rozdílné počty; content_updated_at se jen posouvá dopředu
+    # (smazání prvku ho nastaví na čas smazání, který z prvků dohledat nelze).
+    changed = False
+    for field in COUNTER_FIELDS:
+        if getattr(instance, field) != values.get(field, 0):
+            setattr(instance, field, values.get(field, 0))
+            changed = True
+    last = values.get('content_updated_at')
+    if last is not None and (instance.content_updated_at is None or instance.content_updated_at < last):
+        instance.content_updated_at = last
+        changed = True
+    return changed
+
+
+def recount_content_counters(section_ids=None) -> tuple:
+    """
+    Přepočítá denormalizované počty prvků z tabulek prvků a uloží jen rozdílné řádky.
+
+    Args:
+        section_ids: ID sekcí k přepočtu (spolu s jejich reporty); None = všechny sekce a reporty.
+
+    Returns:
+        tuple[int, int]: Počet opravených sekcí a reportů.
+    """
+    if section_ids is not None:
+        section_ids = list(section_ids)
+        if not section_ids:
+            return 0, 0
+    counted = _counted_sections(section_ids)
+    fields = COUNTER_FIELDS + ('content_updated_at',)
+
+    sections = Section.objects.only('report_id', *fields)
+    reports = Report.objects.only(*fields)
+    if section_ids is not None:
+        sections = sections.filter(pk__in=section_ids)
+        reports = reports.filter(sections__in=section_ids).distinct()
+    fixed_sections = [section for section in sections if _fix_counters(section, counted.get(section.pk, {}))]
+    Section.objects.bulk_update(fixed_sections, fields, batch_size=ORDER_UPDATE_BATCH_SIZE)
+
+    totals = {
+        row.pop('report_id'): row
+        for row in Section.objects.filter(report__in=reports.values('pk')).values('report_id').annotate(
+            content_updated_at=Max('content_updated_at'), **{field: Sum(field) for field in COUNTER_FIELDS}
+        ).order_by()
+    }
+    fixed_reports = [report for report in reports if _fix_counters(report, totals.get(report.pk, {}))]
+    Report.objects.bulk_update(fixed_reports, fields, batch_size=ORDER_UPDATE_BATCH_SIZE)
+    return len(fixed_sections), len(fixed_reports)
+
+
+def get_stale_tables(data_source, fingerprint: str = None) -> list:
+    """
+    Vrátí (id, section_id) tabulek navázaných na zdroj, jejichž data nemají daný otisk
+    (při `fingerprint=None` všech tabulek zdroje).
+    """
+    tables = Table.objects.non_polymorphic().filter(data_source=data_source)
+    if fingerprint is not None:
+        tables = tables.exclude(data_fingerprint=fingerprint)
+    return list(tables.values_list('pk', 'section_id'))
+
+
+def update_tables_data(table_ids: list, data, fingerprint: str) -> int:
+    """
+    Nastaví data a otisk zdroje více tabulkám najednou (bez načítání objektů).
+
+    `updated_at` se nastavuje ručně, protože QuerySet.update obchází auto_now.
+    """
+    if not table_ids:
+        return 0
+    return Table.objects.non_polymorphic().filter(pk__in=table_ids).update(
+        data=data, data_fingerprint=fingerprint, updated_at=timezone.now()
+    )
+
+
+# -------------------- Chart Render Job Repository Functions --------------------
+
+def create_chart_render_job(chart: Chart, params: dict, series: bytes) -> ChartRenderJob:
+    """
+    Založí úlohu na vykreslení grafu. Dosud nezpracované úlohy téhož grafu se
+    zahodí – vykreslovat má smysl jen poslední verzi dat.
+    """
+    cancel_pending_chart_render_jobs(chart)
+    return ChartRenderJob.objects.create(chart=chart, params=params, series=series)
+
+
+def cancel_pending_chart_render_jobs(chart: Chart) -> int:
+    """
+    Smaže dosud nezpracované úlohy grafu.
+
+    Returns:
+        int: Počet smazaných úloh.
+    """
+    deleted, _ = ChartRenderJob.objects.filter(chart=chart, status=ChartRenderJob.JobStatus.PENDING).delete()
+    return deleted
+
+
+def enqueue_chart_variant_job(chart: Chart, params: dict, series: bytes, variant: str) -> ChartRenderJob:
+    """
+    Založí úlohu na vykreslení varianty grafu, pokud stejná varianta už ve frontě nečeká.
+
+    Returns:
+        ChartRenderJob: Nová nebo již čekající úloha.
+    """
+    pending = ChartRenderJob.objects.filter(chart=chart, variant=variant, status=ChartRenderJob.JobStatus.PENDING).first()
+    if pending is not None and pending.params == params and bytes(pending.series) == bytes(series):
+        return pending
+    return ChartRenderJob.objects.create(chart=chart, variant=variant, params=params, series=series)
+
+
+def claim_chart_render_jobs(limit: int) -> list:
+    """
+    Převezme nejvýše `limit` čekajících úloh (PENDING -> RUNNING), nejstarší první.
+
+    Každá úloha se převezme podmíněným UPDATE (`WHERE status = 'PENDING'`), takže
+    ji při více souběžných workerech dostane právě jeden z nich – funguje to i na
+    databázích bez SELECT ... FOR UPDATE SKIP LOCKED (SQLite).
+
+    Returns:
+        list[ChartRenderJob]: Převzaté úlohy.
+    """
+    pending = ChartRenderJob.objects.filter(status=ChartRenderJob.JobStatus.PENDING)
+    claimed = []
+    for job_id in pending.values_list('pk', flat=True)[:limit]:
+        if pending.filter(pk=job_id).update(status=ChartRenderJob.JobStatus.RUNNING, started_at=timezone.now()):
+            claimed.append(job_id)
+    return list(ChartRenderJob.objects.filter(pk__in=claimed).select_related('chart'))
+
+
+def finish_chart_render_job(job: ChartRenderJob, status: str, error: str = "") -> None:
+    """
+    Označí úlohu jako dokončenou (DONE) nebo neúspěšnou (FAILED).
+    """
+    job.status, job.error, job.finished_at = status, error, timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+
+
+def get_chart_render_key(chart_id: int) -> str:
+    """
+    Načte aktuální `Chart.render_key` přímo z databáze (graf mohl být mezitím upraven).
+    """
+    return Chart.objects.filter(pk=chart_id).values_list('render_key', flat=True).first() or ""
+
+
+def requeue_stale_chart_render_jobs(started_before) -> int:
+    """
+    Vrátí do fronty úlohy, které zůstaly ve stavu RUNNING déle než do `started_before`
+    (např. po pádu workeru).
+
+    Returns:
+        int: Počet vrácených úloh.
+    """
+    return ChartRenderJob.objects.filter(
+        status=ChartRenderJob.JobStatus.RUNNING, started_at__lt=started_before
+    ).update(status=ChartRenderJob.JobStatus.PENDING, started_at=None)
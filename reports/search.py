@@ -0,0 +1,381 @@
+# reports/search.py
+
+"""
+Fulltextové vyhledávání v reportech.
+
+Index je invertovaný a uložený v databázi: `SearchDocument` je jeden
+indexovaný objekt (titulek a téma reportu, titulek sekce, text odstavce,
+titulek grafu nebo tabulky), `SearchPosting` je výskyt slova v dokumentu.
+Dotaz tak čte jen řádky indexu pro hledaná slova, nikoli všechny odstavce.
+
+Slova se porovnávají bez ohledu na velikost písmen a diakritiku ("Středočeský"
+najde i "stredocesky"). Výsledky musí obsahovat všechna hledaná slova a řadí
+se podle BM25, který se počítá přímo v databázi (SUM přes výskyty).
+
+Index se aktualizuje průběžně signály (`reports/signals.py`); celý ho lze
+znovu sestavit příkazem `manage.py rebuild_search_index`.
+
+Nepřihlášení hledají jen v publikovaných verzích: každá publikace nahradí
+dokumenty reportu s `published=True` obsahem nového snapshotu
+(`index_snapshot`), takže úpravy po publikaci se do veřejných titulků
+a úryvků nedostanou, dokud se report znovu nepublikuje.
+"""
+
+"""
+Seznam funkcí v `reports/search.py`:
+
+1. `fold(text: str) -> str`
+2. `tokenize(text: str) -> list[tuple[str, int, int]]`
+3. `index_object(instance) -> None`
+4. `index_new_objects(instances: list) -> int`
+5. `remove_object(instance) -> None`
+6. `index_snapshot(snapshot: ReportSnapshot) -> int`
+7. `rebuild_index() -> int`
+8. `highlight(text: str, terms: set, max_chars: int = SNIPPET_CHARS) -> str`
+9. `search(query: str, offset: int = 0, limit: int = SEARCH_PAGE_SIZE, published_only: bool = False) -> dict`
+"""
+
+import html
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Avg, Case, Count, FloatField, Subquery, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from . import snapshots
+from .models import Report, Section, Paragraph, Chart, Table, ReportSnapshot, SearchDocument, SearchPosting
+
+SEARCH_PAGE_SIZE = 20
+SNIPPET_CHARS = 200  # Délka úryvku se zvýrazněnými slovy
+MAX_QUERY_TERMS = 10
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64  # = SearchPosting.term.max_length
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r'\w+')
+
+
+def _fold_char(char: str) -> str:
+    base = unicodedata.normalize('NFKD', char)[0]
+    lowered = base.lower()
+    return lowered if len(lowered) == 1 else base
+
+
+def fold(text: str) -> str:
+    """
+    Převede text na malá písmena bez diakritiky. Výsledek má stejnou délku jako
+    vstup, takže pozice slov odpovídají původnímu textu (pro zvýraznění).
+    """
+    return ''.join(_fold_char(char) for char in text)
+
+
+def tokenize(text: str) -> list:
+    """
+    Rozdělí text na slova indexu.
+
+    Returns:
+        list[tuple[str, int, int]]: Normalizované slovo a jeho začátek a konec v `text`.
+    """
+    return [
+        (match.group()[:MAX_TERM_LENGTH], match.start(), match.end())
+        for match in _TOKEN.finditer(fold(text))
+        if len(match.group()) >= MIN_TERM_LENGTH
+    ]
+
+
+def _plain_text(value: str) -> str:
+    return html.unescape(strip_tags(value or ''))
+
+
+def _document_fields(instance, section_reports: dict = None):
+    """
+    Vrátí (druh, id reportu, titulek, text) pro indexovaný objekt, nebo None.
+    `section_reports` ({id sekce: id reportu}) ušetří dotaz na report prvku.
+    """
+    if isinstance(instance, Report):
+        return SearchDocument.Kind.REPORT, instance.pk, instance.title, instance.topic
+    if isinstance(instance, Section):
+        return SearchDocument.Kind.SECTION, instance.report_id, instance.title, ''
+
+    if section_reports is not None:
+        report_id = section_reports.get(instance.section_id)
+    else:
+        report_id = Section.objects.filter(pk=instance.section_id).values_list('report_id', flat=True).first()
+    if isinstance(instance, Paragraph):
+        return SearchDocument.Kind.PARAGRAPH, report_id, '', _plain_text(instance.text)
+    if isinstance(instance, Chart):
+        return SearchDocument.Kind.CHART, report_id, instance.title, ''
+    if isinstance(instance, Table):
+        return SearchDocument.Kind.TABLE, report_id, instance.title, ''
+    return None
+
+
+def _postings(document: SearchDocument, tokens: list) -> list:
+    counts = Counter(term for term, _, _ in tokens)
+    return [SearchPosting(document=document, term=term, frequency=count) for term, count in counts.items()]
+
+
+def _kind(instance):
+    for model, kind in ((Report, SearchDocument.Kind.REPORT), (Section, SearchDocument.Kind.SECTION),
+                        (Paragraph, SearchDocument.Kind.PARAGRAPH), (Chart, SearchDocument.Kind.CHART),
+                        (Table, SearchDocument.Kind.TABLE)):
+        if isinstance(instance, model):
+            return kind
+    return None
+
+
+def index_object(instance) -> None:
+    """
+    Přidá objekt do indexu, nebo aktualizuje jeho záznam. Nezměněný objekt se
+    nepřeindexovává – kontrola je jeden dotaz (u prvků včetně reportu podle sekce).
+    """
+    kind = _kind(instance)
+    if kind is None:
+        return
+    documents = SearchDocument.objects.filter(kind=kind, object_id=instance.pk, published=False)
+    section_reports = None
+    if isinstance(instance, (Report, Section)):
+        row = documents.values_list('pk', 'report_id', 'title', 'text').first()
+    else:
+        section_report = Section.objects.filter(pk=instance.section_id).values('report_id')[:1]
+        row = documents.annotate(section_report=Subquery(section_report)).values_list(
+            'pk', 'report_id', 'title', 'text', 'section_report'
+        ).first()
+        if row is not None:
+            section_reports = {instance.section_id: row[4]}
+
+    fields = _document_fields(instance, section_reports)
+    if fields is None or fields[1] is None:
+        return
+    kind, report_id, title, text = fields
+    if row is not None and row[1:4] == (report_id, title, text):
+        return
+
+    tokens = tokenize(f"{title}\n{text}")
+    values = {'report_id': report_id, 'title': title, 'text': text, 'length': len(tokens)}
+    with transaction.atomic():
+        if row is None:
+            document = SearchDocument.objects.create(kind=kind, object_id=instance.pk, published=False, **values)
+        else:
+            document = SearchDocument(pk=row[0])
+            documents.filter(pk=document.pk).update(updated_at=timezone.now(), **values)
+            document.postings.all().delete()
+        SearchPosting.objects.bulk_create(_postings(document, tokens))
+
+
+def index_new_objects(instances: list) -> int:
+    """
+    Hromadně přidá do indexu objekty, které v něm ještě nejsou (např. prvky vytvořené
+    přes `bulk_create`, které neposílají signály). Vrátí počet indexovaných dokumentů.
+    """
+    section_ids = {instance.section_id for instance in instances if hasattr(instance, 'section_id')}
+    section_reports = dict(Section.objects.filter(pk__in=section_ids).values_list('pk', 'report_id')) if section_ids else {}
+
+    documents, document_tokens = [], []
+    for instance in instances:
+        fields = _document_fields(instance, section_reports)
+        if fields is None or fields[1] is None:
+            continue
+        kind, report_id, title, text = fields
+        tokens = tokenize(f"{title}\n{text}")
+        documents.append(SearchDocument(
+            kind=kind, object_id=instance.pk, report_id=report_id, title=title, text=text, length=len(tokens)
+        ))
+        document_tokens.append(tokens)
+
+    with transaction.atomic():
+        SearchDocument.objects.bulk_create(documents)
+        SearchPosting.objects.bulk_create(
+            [posting for document, tokens in zip(documents, document_tokens) for posting in _postings(document, tokens)],
+            batch_size=1000,
+        )
+    return len(documents)
+
+
+def remove_object(instance) -> None:
+    """
+    Odstraní objekt z živého indexu (výskyty slov se smažou kaskádou). Dokumenty
+    publikované verze zůstávají, dokud je nenahradí další publikace.
+    """
+    fields = _document_fields(instance) if isinstance(instance, (Report, Section)) else None
+    kinds = [fields[0]] if fields else [SearchDocument.Kind.PARAGRAPH, SearchDocument.Kind.CHART, SearchDocument.Kind.TABLE]
+    SearchDocument.objects.filter(kind__in=kinds, object_id=instance.pk, published=False).delete()
+
+
+def _snapshot_documents(content: dict) -> list:
+    """(druh, id objektu, titulek, text) všech objektů ve stromu snapshotu (viz `snapshots.snapshot_content`)."""
+    report = content['report']
+    documents = [(SearchDocument.Kind.REPORT, report['id'], report['title'], report['topic'])]
+    for section in content['sections']:
+        documents.append((SearchDocument.Kind.SECTION, section['id'], section['title'], ''))
+        for element in section['elements']:
+            if element['type'] == SearchDocument.Kind.PARAGRAPH:
+                documents.append((SearchDocument.Kind.PARAGRAPH, element['id'], '', _plain_text(element['text'])))
+            elif element['type'] in (SearchDocument.Kind.CHART, SearchDocument.Kind.TABLE):
+                documents.append((element['type'], element['id'], element['title'], ''))
+    return documents
+
+
+def index_snapshot(snapshot: ReportSnapshot) -> int:
+    """
+    Nahradí dokumenty publikované verze reportu obsahem snapshotu (viz `search(published_only=True)`).
+    Vrátí počet indexovaných dokumentů.
+    """
+    documents, document_tokens = [], []
+    for kind, object_id, title, text in _snapshot_documents(snapshots.read_content(snapshot)):
+        tokens = tokenize(f"{title}\n{text}")
+        documents.append(SearchDocument(
+            kind=kind, object_id=object_id, report_id=snapshot.report_id, title=title, text=text,
+            length=len(tokens), published=True,
+        ))
+        document_tokens.append(tokens)
+
+    with transaction.atomic():
+        SearchDocument.objects.filter(report_id=snapshot.report_id, published=True).delete()
+        SearchDocument.objects.bulk_create(documents)
+        SearchPosting.objects.bulk_create(
+            [posting for document, tokens in zip(documents, document_tokens) for posting in _postings(document, tokens)],
+            batch_size=1000,
+        )
+    return len(documents)
+
+
+def rebuild_index() -> int:
+    """
+    Smaže a znovu sestaví celý index (živá data i poslední publikované verze).
+    Vrátí počet indexovaných dokumentů.
+    """
+    section_reports = dict(Section.objects.values_list('pk', 'report_id'))
+    sources = [
+        (SearchDocument.Kind.REPORT, Report.objects.values_list('pk', 'pk', 'title', 'topic')),
+        (SearchDocument.Kind.SECTION, Section.objects.values_list('pk', 'report_id', 'title', Value(''))),
+        (SearchDocument.Kind.PARAGRAPH, Paragraph.objects.non_polymorphic().values_list('pk', 'section_id', Value(''), 'text')),
+        (SearchDocument.Kind.CHART, Chart.objects.non_polymorphic().values_list('pk', 'section_id', 'title', Value(''))),
+        (SearchDocument.Kind.TABLE, Table.objects.non_polymorphic().values_list('pk', 'section_id', 'title', Value(''))),
+    ]
+    count = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for kind, rows in sources:
+            for pk, parent_id, title, text in rows.iterator():
+                report_id = parent_id if kind in (SearchDocument.Kind.REPORT, SearchDocument.Kind.SECTION) else section_reports[parent_id]
+                text = _plain_text(text) if kind == SearchDocument.Kind.PARAGRAPH else text
+                tokens = tokenize(f"{title}\n{text}")
+                document = SearchDocument.objects.create(
+                    kind=kind, object_id=pk, report_id=report_id, title=title, text=text, length=len(tokens)
+                )
+                SearchPosting.objects.bulk_create(_postings(document, tokens))
+                count += 1
+        latest = ReportSnapshot.objects.order_by('report_id', '-version').only('report_id', 'content')
+        seen = set()
+        for snapshot in latest.iterator(chunk_size=100):
+            if snapshot.report_id not in seen:
+                seen.add(snapshot.report_id)
+                count += index_snapshot(snapshot)
+    return count
+
+
+def highlight(text: str, terms: set, max_chars: int = SNIPPET_CHARS) -> str:
+    """
+    Vrátí úryvek textu kolem prvního nalezeného slova s nalezenými slovy v `<mark>`.
+
+    Returns:
+        str: Bezpečné HTML (ostatní text je escapovaný).
+    """
+    matches = [(start, end) for term, start, end in tokenize(text) if term in terms]
+    first = matches[0][0] if matches else 0
+    start = max(0, min(first - max_chars // 4, len(text) - max_chars))
+    end = min(len(text), start + max_chars)
+
+    parts = ['…' if start > 0 else '']
+    position = start
+    for match_start, match_end in matches:
+        if match_start < start or match_end > end:
+            continue
+        parts.append(escape(text[position:match_start]))
+        parts.append(f"<mark>{escape(text[match_start:match_end])}</mark>")
+        position = match_end
+    parts.append(escape(text[position:end]))
+    parts.append('…' if end < len(text) else '')
+    return mark_safe(''.join(parts))
+
+
+def search(query: str, offset: int = 0, limit: int = SEARCH_PAGE_SIZE, published_only: bool = False) -> dict:
+    """
+    Vyhledá dokumenty obsahující všechna slova dotazu, seřazené podle BM25.
+
+    Args:
+        query: Hledaný text.
+        offset: Index prvního výsledku stránky.
+        limit: Počet výsledků na stránku.
+        published_only: Hledat jen v posledních publikovaných verzích reportů (titulky
+            a úryvky z doby publikace, ne z živých dat).
+
+    Returns:
+        dict: `results` (seznam slovníků s `kind`, `kind_label`, `object_id`, `report_id`,
+        `report_title`, `title`, `snippet`, `score`, `published`), `total`, `offset` a `limit`.
+    """
+    terms = list(dict.fromkeys(term for term, _, _ in tokenize(query)))[:MAX_QUERY_TERMS]
+    empty = {'results': [], 'total': 0, 'offset': offset, 'limit': limit}
+    if not terms:
+        return empty
+
+    postings = SearchPosting.objects.filter(term__in=terms, document__published=published_only)
+    if published_only:
+        postings = postings.filter(document__report__status=Report.ReportStatus.PUBLISHED)
+    frequencies = dict(
+        postings.values('term').annotate(n=Count('id')).values_list('term', 'n')
+    )
+    if len(frequencies) < len(terms):
+        return empty  # Některé slovo není v žádném dokumentu
+
+    stats = SearchDocument.objects.filter(published=published_only).aggregate(documents=Count('id'), average=Avg('length'))
+    documents, average = stats['documents'], stats['average'] or 1.0
+    idf = {
+        term: math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+        for term, frequency in frequencies.items()
+    }
+
+    frequency = Cast('frequency', FloatField())
+    length_norm = Value(BM25_K1 * (1 - BM25_B)) + Value(BM25_K1 * BM25_B / average) * Cast('document__length', FloatField())
+    term_weight = Case(*[When(term=term, then=Value(weight)) for term, weight in idf.items()], output_field=FloatField())
+    score = term_weight * frequency * Value(BM25_K1 + 1) / (frequency + length_norm)
+
+    matches = (
+        postings.values('document')
+        .annotate(matched=Count('term', distinct=True), score=Sum(score))
+        .filter(matched=len(terms))
+    )
+    total = matches.count()
+    page = list(matches.order_by('-score', 'document')[offset:offset + limit].values_list('document', 'score'))
+
+    found = SearchDocument.objects.select_related('report').in_bulk([pk for pk, _ in page])
+    report_titles = {document.report_id: document.report.title for document in found.values()}
+    if published_only:  # Titulek reportu z publikované verze
+        report_titles.update(SearchDocument.objects.filter(
+            kind=SearchDocument.Kind.REPORT, object_id__in=report_titles, published=True,
+        ).values_list('object_id', 'title'))
+    term_set = set(terms)
+    results = []
+    for pk, score_value in page:
+        document = found[pk]
+        results.append({
+            'kind': document.kind,
+            'kind_label': document.get_kind_display(),
+            'object_id': document.object_id,
+            'report_id': document.report_id,
+            'report_title': report_titles[document.report_id],
+            'title': document.title,
+            'snippet': highlight(' – '.join(filter(None, [document.title, document.text])), term_set),
+            'score': score_value,
+            'published': document.published,
+        })
+    return {'results': results, 'total': total, 'offset': offset, 'limit': limit}
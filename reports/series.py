@@ -0,0 +1,137 @@
+# reports/series.py
+
+"""
+Sloupcové uložení datových řad grafů.
+
+Řada grafu je dvojice polí NumPy – popisky osy X (`str`) a hodnoty osy Y
+(`float64`). Do databáze se ukládá jako jeden binární blob (`Chart.series`,
+formát `.npz` bez picklování), takže se čísla při každém uložení znovu
+neparsují z textu a dají se znovu použít pro vykreslení, export i agregace.
+Validace i parsování pracují nad celými poli najednou.
+"""
+
+"""
+Seznam funkcí v `reports/series.py`:
+
+1. `parse_series_text(x_text: str, y_text: str) -> tuple[np.ndarray, np.ndarray]`
+2. `read_series_csv(fileobj) -> tuple[np.ndarray, np.ndarray]`
+3. `validate_series(x, y) -> tuple[np.ndarray, np.ndarray]`
+4. `pack_series(x, y) -> bytes`
+5. `unpack_series(blob: bytes) -> tuple[np.ndarray, np.ndarray]`
+6. `series_digest(x, y) -> str`
+7. `summarize_series(y) -> dict`
+"""
+
+import hashlib
+import io
+
+import numpy as np
+
+MAX_SERIES_POINTS = 200_000  # Ochrana před obřími soubory – víc bodů stejně nejde rozumně vykreslit
+
+
+def _split(text: str) -> np.ndarray:
+    return np.char.strip(np.array(text.split(','), dtype=str))
+
+
+def parse_series_text(x_text: str, y_text: str) -> tuple:
+    """
+    Převede čárkou oddělené popisky a hodnoty (pole formuláře) na pole NumPy.
+
+    Raises:
+        ValueError: Pokud hodnoty nejsou čísla nebo se délky neshodují.
+    """
+    try:
+        y = _split(y_text).astype(np.float64)
+    except ValueError:
+        raise ValueError("Hodnoty osy Y musí být čísla oddělená čárkou.")
+    return validate_series(_split(x_text), y)
+
+
+def read_series_csv(fileobj) -> tuple:
+    """
+    Načte řadu z CSV souboru se dvěma sloupci (popisek, hodnota), bez hlavičky.
+
+    Raises:
+        ValueError: Pokud soubor nemá dva sloupce nebo hodnoty nejsou čísla.
+    """
+    raw = fileobj.read()
+    text = raw.decode('utf-8-sig') if isinstance(raw, bytes) else raw
+    try:
+        table = np.loadtxt(io.StringIO(text), delimiter=',', dtype=str, ndmin=2, comments=None)
+    except ValueError:
+        raise ValueError("CSV musí mít na každém řádku právě dva sloupce: popisek, hodnota.")
+    if table.shape[1] != 2:
+        raise ValueError("CSV musí mít na každém řádku právě dva sloupce: popisek, hodnota.")
+    try:
+        y = np.char.strip(table[:, 1]).astype(np.float64)
+    except ValueError:
+        raise ValueError("Druhý sloupec CSV musí obsahovat čísla.")
+    return validate_series(np.char.strip(table[:, 0]), y)
+
+
+def validate_series(x, y) -> tuple:
+    """
+    Zkontroluje řadu (stejná délka, konečná čísla, limit bodů) a vrátí ji jako pole NumPy.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Popisky (`str`) a hodnoty (`float64`).
+
+    Raises:
+        ValueError: Pokud řada není platná.
+    """
+    x = np.asarray(x, dtype=str).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.size != y.size:
+        raise ValueError(f"Počet prvků osy X a Y se musí shodovat (x: {x.size}, y: {y.size}).")
+    if y.size == 0:
+        raise ValueError("Graf musí mít alespoň jeden bod.")
+    if y.size > MAX_SERIES_POINTS:
+        raise ValueError(f"Graf může mít nejvýše {MAX_SERIES_POINTS} bodů.")
+    if not np.isfinite(y).all():
+        raise ValueError("Hodnoty osy Y musí být konečná čísla.")
+    return x, y
+
+
+def pack_series(x, y) -> bytes:
+    """
+    Zabalí řadu do binárního blobu pro `Chart.series`.
+    """
+    buf = io.BytesIO()
+    np.savez(buf, x=np.asarray(x, dtype=str), y=np.asarray(y, dtype=np.float64))
+    return buf.getvalue()
+
+
+def unpack_series(blob: bytes) -> tuple:
+    """
+    Rozbalí blob z `pack_series` zpět na dvojici polí (bez povolení pickle).
+    """
+    with np.load(io.BytesIO(bytes(blob)), allow_pickle=False) as data:
+        return data['x'], data['y']
+
+
+def series_digest(x, y) -> str:
+    """
+    Vrátí SHA-256 obsahu řady (pro klíče cache obrázků).
+    """
+    digest = hashlib.sha256()
+    digest.update('\x1f'.join(np.asarray(x, dtype=str).tolist()).encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(np.ascontiguousarray(y, dtype='<f8').tobytes())
+    return digest.hexdigest()
+
+
+def summarize_series(y) -> dict:
+    """
+    Vrátí základní agregace hodnot řady: počet, součet, minimum, maximum a průměr.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    if y.size == 0:
+        return {'count': 0, 'sum': 0.0, 'min': None, 'max': None, 'mean': None}
+    return {
+        'count': int(y.size),
+        'sum': float(y.sum()),
+        'min': float(y.min()),
+        'max': float(y.max()),
+        'mean': float(y.mean()),
+    }
@@ -31,15 +31,43 @@ Content Element Services
 16. `edit_table(table: Table, new_title: str = None, refresh_data: bool = False) -> Table`
 17. `reorder_content_elements(section: Section) -> None`
 18. `remove_content_element(element: 'ContentElement') -> None`
+19. `move_content_element(element: 'ContentElement', new_order: int) -> 'ContentElement'`
+20. `apply_content_ordering(section: Section, element_ids: list) -> None`
+21. `apply_section_ordering(report: Report, section_ids: list) -> None`
+
+Chart Rendering Services
+22. `request_chart_render(chart: Chart, chart_type: str, x_data: list, y_data: list, color: str = None) -> ChartRenderJob | None`
+23. `complete_chart_render(job: ChartRenderJob, content: bytes = None) -> None`
+24. `fail_chart_render(job: ChartRenderJob, error: str) -> None`
+25. `get_chart_variant(chart: Chart, variant: str) -> str | None`
+26. `get_chart_series(chart: Chart) -> tuple | None`
+
+Table Data Services
+27. `refresh_table(table: Table, force: bool = False) -> bool`
+28. `refresh_tables_for_source(data_source: 'DataSource', force: bool = False) -> int`
+
+Publishing Services
+29. `get_publish_blockers(report: Report) -> list`
+30. `approve_staged_elements(report: Report = None, section: Section = None) -> int`
+
+Bulk Content Services
+31. `add_elements(section: Section, specs: list, author: User = None) -> list`
 
 """
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import transaction
 
+from . import chart_cache
+from . import charts
+from . import fragments
 from . import repositories
+from . import search
+from . import series
+from . import snapshots
 from . import utils
-from .models import Report, Section, Paragraph, Chart, Table
+from .models import Report, Section, ContentElement, Paragraph, Chart, Table, ChartRenderJob
 from django.utils import timezone
 
 # slovník s možnými změnami stavu reportu
@@ -75,7 +103,8 @@ def create_report(data: dict, user: User) -> Report:
 
 def publish_report(report: Report, admin_user: User) -> Report:  # Admin user for publishing
     """
-    Publikuje schválený report (nastaví publication_date).
+    Publikuje schválený report (nastaví publication_date) a uloží jeho novou neměnnou verzi
+    (snapshot s HTML a PDF, viz `reports/snapshots.py`). Opakovaná publikace uloží další verzi.
 
     Args:
         report: Report k publikování.
@@ -85,23 +114,22 @@ def publish_report(report: Report, admin_user: User) -> Report:  # Admin user fo
         Report: Aktualizovaný report.
 
     Raises:
-        ValidationError: Pokud report není ve stavu 'Approved' nebo uživatel nemá oprávnění.
+        ValidationError: Pokud report obsahuje neschválené prvky (seznam je v `params['blockers']`,
+            viz `get_publish_blockers`) nebo uživatel nemá oprávnění.
     """
-    # Kontrola, zda jsou všechny ContentElement ve stavu approved
-    all_approved = True
-    for section in report.sections.all():
-        for element in section.content_elements.all():
-            if element.status != element.ContentElementStatus.APPROVED:
-                all_approved = False
-                break
-        if not all_approved:
-            break
-
-    if not all_approved:
-        raise ValidationError("Nelze publikovat report, dokud nejsou všechny ContentElement schválené.")
-
-
-    report = repositories.update_report(report, status=Report.ReportStatus.PUBLISHED)  # Nastavíme publication date
+    with transaction.atomic():
+        # Kontrola jedním dotazem EXISTS až po zamčení řádku reportu: souběžné publikace
+        # se serializují a kontrola i snapshot vidí stav ze stejné transakce
+        repositories.lock_report(report.pk)
+        if repositories.has_unapproved_elements(report):
+            raise ValidationError(
+                "Nelze publikovat report, dokud nejsou všechny ContentElement schválené.",
+                code='unapproved_elements',
+                params={'blockers': repositories.get_unapproved_elements(report)},
+            )
+        report = repositories.update_report(report, status=Report.ReportStatus.PUBLISHED)  # Nastavíme publication date
+        snapshot = snapshots.create_snapshot(report, published_by=admin_user)
+        search.index_snapshot(snapshot)  # Veřejné vyhledávání čte publikovanou verzi
     # Zde by se mohly provést další kroky po publikaci (např. notifikace)
     return report
 
@@ -138,30 +166,31 @@ def get_report_detail(report_id: int, user: User = None) -> Report: # User is op
         user: Aktuální uživatel (pro kontrolu oprávnění, pokud je potřeba).
 
     Returns:
-        Report: Report objekt s prefetch_related pro sekce a content_elements.
+        Report: Report objekt s načteným stromem sekcí a prvků obsahu (viz repositories.get_report_tree).
 
     Raises:
         Report.DoesNotExist: Pokud report neexistuje.
         ValidationError: Pokud uživatel nemá oprávnění k zobrazení reportu.
     """
-    report = repositories.get_report_by_id(report_id)
-    report = Report.objects.prefetch_related('sections__content_elements').get(pk=report_id) # Re-fetch with prefetch
-    return report
+    return repositories.get_report_tree(report_id)
 
 def reorder_sections(report: Report) -> None:
     """
     Přečísluje pořadí (order) všech sekcí v daném reportu.
-    Zajišťuje sekvenční číslování od 1 bez mezer.
+    Sekce dostanou pořadí s rozestupem ORDER_GAP (ORDER_GAP, 2 * ORDER_GAP, ...),
+    aby šlo další sekce vkládat a přesouvat bez přečíslování sourozenců.
+
+    Volá se jen tehdy, když mezi sousedy dojde místo (případně z příkazu
+    `manage.py compact_ordering`); změněné sekce se zapíší jedním UPDATE.
 
     Args:
         report: Report, jehož sekce se mají přečíslovat.
     """
-    sections = repositories.get_sections_by_report(report) # Get sections ordered by 'order' already
-    current_order = 1
-    for section in sections:
-        if section.order != current_order: # Only update if order is not already correct to avoid unnecessary saves
-            repositories.update_section(section, order=current_order)
-        current_order += 1
+    rows = list(Section.objects.filter(report=report).order_by('order', 'id').values_list('pk', 'order'))
+    spaced = repositories.spaced_orders([pk for pk, _ in rows])
+    changes = {pk: spaced[pk] for pk, order in rows if order != spaced[pk]}
+    if changes:
+        repositories.set_section_orders(report, changes)
 
 
 # -------------------- Section Services --------------------
@@ -202,50 +231,90 @@ def remove_section(section: Section) -> None:
         raise Section.DoesNotExist("Section with id does not exist")
 
     # Zde by mohla být kontrola oprávnění, např. editor může mazat jen draft sekce
-    repositories.delete_section(section)
-    reorder_sections(report)
+    repositories.delete_section(section)  # Mezera v pořadí nevadí, ostatní sekce se nemění
 
 def move_section(section: Section, new_order: int) -> Section:
     """
-    Změní pořadí sekce v rámci reportu a provede přečíslování ostatních sekcí.
+    Přesune sekci na novou pozici v rámci reportu.
+
+    Sekce dostane hodnotu `order` ze středu mezery mezi novými sousedy, takže se
+    mění jediný řádek. Sourozenci se přečíslují jen tehdy, když mezera dojde.
+
+    Args:
+        section: Sekce, která se přesouvá.
+        new_order: Nová pozice sekce (1 až počet sekcí).
+
+    Returns:
+        Section: Přesunutá sekce s aktualizovaným pořadím.
+
+    Raises:
+        ValidationError: Pokud nová pozice není kladné celé číslo v rozsahu.
     """
     if not isinstance(new_order, int) or new_order <= 0:
         raise ValidationError("New order must be a positive integer.")
 
     report = section.report
-    sections = list(repositories.get_sections_by_report(report)) # Get sections as list for manipulation
-    if new_order > len(sections):
-        raise ValidationError("New order is out of range for the number of sections.")
+    siblings = Section.objects.filter(report=report).exclude(pk=section.pk)
+    with transaction.atomic():
+        repositories.lock_report(report.pk)  # Souběžné přesuny a připojení sekcí čekají
+        if new_order > siblings.count() + 1:
+            raise ValidationError("New order is out of range for the number of sections.")
+
+        order = repositories.order_for_position(siblings, new_order)
+        if order is None:
+            reorder_sections(report)  # Mezera mezi sousedy došla – přečíslujeme s rozestupem
+            order = repositories.order_for_position(siblings, new_order)
+        Section.objects.filter(pk=section.pk).update(order=order)
+        repositories.touch_report(report_id=report.pk)
+
+    section.order = order
+    return section
 
 
-    old_order = section.order
-    if old_order == new_order:
-        return section # No change needed if orders are the same
+def apply_section_ordering(report: Report, section_ids: list) -> None:
+    """
+    Nastaví kompletní pořadí sekcí reportu (např. po drag-and-drop v editoru).
 
-    section = repositories.update_section(section, order=new_order) # Update the moved section's order
+    Args:
+        report: Report, jehož sekce se řadí.
+        section_ids: ID všech sekcí reportu v novém pořadí.
 
-    if old_order < new_order: # Moving section down in order
-        for s in sections:
-            if s != section and old_order <= s.order <= new_order: # Shift sections between old and new order up by 1 if they are not the moved section
-                repositories.update_section(s, order=s.order - 1)
-    elif old_order > new_order: # Moving section up in order
-        for s in sections:
-            if s != section and new_order <= s.order <= old_order: # Shift sections between new and old order down by 1 if they are not the moved section
-                 repositories.update_section(s, order=s.order + 1)
+    Raises:
+        ValidationError: Pokud seznam neobsahuje právě všechny sekce reportu.
+    """
+    existing = set(Section.objects.filter(report=report).values_list('pk', flat=True))
+    _validate_full_ordering(existing, section_ids)
+    with transaction.atomic():
+        repositories.set_section_orders(report, repositories.spaced_orders(section_ids))
+
+
+def _validate_full_ordering(existing_ids: set, ordered_ids: list) -> None:
+    if len(ordered_ids) != len(set(ordered_ids)):
+        raise ValidationError("Ordering contains duplicate ids.")
+    if set(ordered_ids) != existing_ids:
+        raise ValidationError("Ordering must contain exactly all items of the parent.")
 
-    reorder_sections(report) # Final reordering to ensure sequential order from 1 to N after move. Redundant but safer.
-    return section
 
 # -------------------- Content Element Services --------------------
 
-def add_paragraph(section: Section, text: str, author: User) -> Paragraph:
+def add_paragraph(section: Section, text: str, author: User = None) -> Paragraph:
+    """
+    Přidá nový odstavec na konec sekce.
+
+    Args:
+        section: Sekce, do které se přidává odstavec.
+        text: Text odstavce.
+        author: Autor odstavce (volitelné).
+
+    Returns:
+        Paragraph: Nově vytvořený odstavec.
+    """
     try:
         utils.validate_paragraph_data({'text': text})
     except ValidationError as e:
         raise e
 
     paragraph = repositories.create_paragraph(section=section, text=text, author=author)
-    utils.reorder_section_content(section)
     return paragraph
 
 def add_chart(section: Section, title: str, dataset_file=None, data_source=None, author=None) -> Chart:
@@ -268,7 +337,6 @@ def add_chart(section: Section, title: str, dataset_file=None, data_source=None,
     chart = repositories.create_chart(
         section=section, title=title, dataset=dataset_file, data_source=data_source, author=author #oprava dataset_file -> dataset
     )
-    utils.reorder_section_content(section) # Volání přímo utility funkce utils.reorder_section_content
     return chart
 
 def add_table(section: Section, title: str, data_source: 'DataSource') -> Table:
@@ -288,9 +356,14 @@ def add_table(section: Section, title: str, data_source: 'DataSource') -> Table:
     except ValidationError as e:
         raise e
 
-    # Zde by se mohlo načíst data z data_source a uložit do Table.data (DataSourceService.fetch_data)
-    table = repositories.create_table(section=section, title=title, data=None, data_source=data_source) # Data might be fetched and updated later
-    utils.reorder_section_content(section) # Volání přímo utility funkce utils.reorder_section_content
+    # Už načtený zdroj se rovnou zkopíruje do Table.data, jinak data doplní refresh_table
+    data, fingerprint = None, ""
+    if data_source is not None and data_source.row_count:
+        data = utils.materialize_table_data(data_source)
+        fingerprint = utils.data_source_fingerprint(data_source)
+    table = repositories.create_table(
+        section=section, title=title, data=data, data_source=data_source, data_fingerprint=fingerprint
+    )
     return table
 
 def edit_paragraph(paragraph: Paragraph, new_text: str) -> Paragraph:
@@ -347,12 +420,12 @@ def edit_chart(chart: Chart, new_title: str = None, new_dataset_file=None, new_d
 
 def edit_table(table: Table, new_title: str = None, refresh_data: bool = False) -> Table:
     """
-    Upraví vlastnosti tabulky (titul, případně obnoví data ze zdroje). - Data refresh not implemented yet
+    Upraví vlastnosti tabulky (titul, případně obnoví data ze zdroje).
 
     Args:
         table: Tabulka k úpravě.
         new_title: Nový titul tabulky (volitelné).
-        refresh_data: True, pokud se mají obnovit data ze zdroje (volitelné). - Not yet implemented
+        refresh_data: True, pokud se mají obnovit data ze zdroje (volitelné), viz `refresh_table`.
 
     Returns:
         Table: Aktualizovaná tabulka.
@@ -369,7 +442,7 @@ def edit_table(table: Table, new_title: str = None, refresh_data: bool = False)
         table = repositories.update_table(table, **fields_to_update)
 
     if refresh_data:
-        raise NotImplementedError("Refresh data for table not implemented yet.") # Placeholder for data refresh logic
+        refresh_table(table)
 
     return table
 
@@ -388,6 +461,7 @@ def remove_content_element(element: 'ContentElement') -> None: # Type Hinting fo
     except Section.DoesNotExist as e:
         raise e
 
+    # Mezera v pořadí po smazání nevadí – ostatní prvky sekce se nemění
     if isinstance(element, Paragraph):
         repositories.delete_paragraph(element)
     elif isinstance(element, Chart):
@@ -396,5 +470,367 @@ def remove_content_element(element: 'ContentElement') -> None: # Type Hinting fo
         repositories.delete_table(element)
     else:
         raise ValueError("Unsupported content element type.")
+    # Fragment sekce a verzi reportu obslouží signál post_delete prvku (reports/signals.py)
+
+
+def move_content_element(element: 'ContentElement', new_order: int) -> 'ContentElement':
+    """
+    Přesune prvek obsahu na novou pozici v rámci sekce.
+
+    Prvek dostane hodnotu `order` ze středu mezery mezi novými sousedy, takže se
+    mění jediný řádek; sekce se přečísluje jen tehdy, když mezera dojde.
+
+    Args:
+        element: Prvek obsahu, který se přesouvá.
+        new_order: Nová pozice prvku (1 až počet prvků sekce).
+
+    Returns:
+        ContentElement: Přesunutý prvek s aktualizovaným pořadím.
+
+    Raises:
+        ValidationError: Pokud nová pozice není kladné celé číslo v rozsahu.
+    """
+    if not isinstance(new_order, int) or new_order <= 0:
+        raise ValidationError("New order must be a positive integer.")
+
+    section = element.section
+    siblings = ContentElement.objects.non_polymorphic().filter(section=section).exclude(pk=element.pk)
+    with transaction.atomic():
+        repositories.lock_section(section.pk)  # Souběžné přesuny a připojení prvků sekce čekají
+        if new_order > siblings.count() + 1:
+            raise ValidationError("New order is out of range for the number of content elements.")
+
+        order = repositories.order_for_position(siblings, new_order)
+        if order is None:
+            utils.reorder_section_content(section)  # Mezera mezi sousedy došla – přečíslujeme s rozestupem
+            order = repositories.order_for_position(siblings, new_order)
+        # updated_at se mění kvůli ETagu detailu reportu (QuerySet.update obchází auto_now)
+        ContentElement.objects.filter(pk=element.pk).update(order=order, updated_at=timezone.now())
+
+    fragments.invalidate_section(section.pk)
+    element.order = order
+    return element
+
+
+def apply_content_ordering(section: Section, element_ids: list) -> None:
+    """
+    Nastaví kompletní pořadí prvků obsahu sekce (např. po drag-and-drop v editoru).
+
+    Args:
+        section: Sekce, jejíž prvky se řadí.
+        element_ids: ID všech prvků sekce v novém pořadí.
+
+    Raises:
+        ValidationError: Pokud seznam neobsahuje právě všechny prvky sekce.
+    """
+    existing = set(ContentElement.objects.filter(section=section).values_list('pk', flat=True))
+    _validate_full_ordering(existing, element_ids)
+    with transaction.atomic():
+        repositories.set_content_element_orders(section, repositories.spaced_orders(element_ids))
+    fragments.invalidate_section(section.pk)
+
+
+# -------------------- Chart Rendering Services --------------------
+
+def request_chart_render(chart: Chart, chart_type: str, x_data: list, y_data: list, color: str = None):
+    """
+    Zajistí obrázek grafu pro nová data – z cache obrázků, nebo přes frontu vykreslování.
+
+    Pokud stejný graf (typ, data, barva, titulek, velikost) už byl vykreslen, graf
+    rovnou použije uložený soubor a matplotlib se vůbec nevolá. Jinak se graf přepne
+    do stavu RENDERING a vykreslí ho worker (`manage.py run_chart_workers`);
+    dosavadní obrázek zůstává zobrazený, dokud worker neuloží nový. Graf se uloží
+    jedním zápisem včetně dalších neuložených změn instance (např. titulku z formuláře).
+
+    Args:
+        chart: Graf, který se má vykreslit.
+        chart_type: Typ grafu ('line', 'bar', 'pie').
+        x_data: Hodnoty osy X.
+        y_data: Hodnoty osy Y.
+        color: Barva grafu (volitelné).
+
+    Returns:
+        ChartRenderJob | None: Založená úloha, nebo None při zásahu v cache.
+
+    Raises:
+        ValidationError: Pokud data grafu nejsou platná.
+    """
+    try:
+        params = charts.chart_params(chart.title, chart_type, x_data, y_data, color)
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    key = charts.chart_key(params)
+    style = charts.chart_style(params)
+    blob = series.pack_series(params['x_data'], params['y_data'])
+    with transaction.atomic():
+        cached_path = chart_cache.lookup(key)
+        if cached_path is not None:
+            repositories.cancel_pending_chart_render_jobs(chart)
+            repositories.update_chart(
+                chart, dataset=cached_path, render_key=key, render_params=style, series=blob,
+                render_status=Chart.RenderStatus.READY,
+            )
+            return None
+
+        repositories.update_chart(
+            chart, render_key=key, render_params=style, series=blob, render_status=Chart.RenderStatus.RENDERING
+        )
+        return repositories.create_chart_render_job(chart, style, blob)
+
+
+def _chart_job_key(job: ChartRenderJob) -> str:
+    # Klíč obrázku, který úloha vykresluje (hlavní PNG, nebo varianta `job.variant`)
+    return charts.chart_key(charts.with_series(job.params, job.series), job.variant or None)
+
+
+def complete_chart_render(job: ChartRenderJob, content: bytes = None) -> None:
+    """
+    Uloží vykreslený obrázek do cache obrázků. U hlavního PNG ho navíc nastaví
+    grafu (stav READY); varianty (`job.variant`) se jen uloží do cache.
+
+    Výsledek se grafu nepřiřadí, pokud mezitím požádal o vykreslení jiných dat
+    (`Chart.render_key` se liší); v cache obrázků ale zůstane.
+
+    Args:
+        job: Dokončená úloha.
+        content: Obsah souboru vráceného workerem; None = obrázek už je v cache.
+    """
+    key = _chart_job_key(job)
+    fmt = charts.CHART_VARIANTS[job.variant][0] if job.variant else 'png'
+    path = chart_cache.store(key, content, fmt) if content is not None else chart_cache.cached_path(key)
+    with transaction.atomic():
+        if not job.variant and repositories.get_chart_render_key(job.chart_id) == key:
+            repositories.update_chart(job.chart, dataset=path, render_status=Chart.RenderStatus.READY)
+        repositories.finish_chart_render_job(job, ChartRenderJob.JobStatus.DONE)
+
+
+def fail_chart_render(job: ChartRenderJob, error: str) -> None:
+    """
+    Označí úlohu jako neúspěšnou a graf přepne do stavu FAILED (u variant jen úlohu).
+
+    Args:
+        job: Neúspěšná úloha.
+        error: Popis chyby (uloží se k úloze).
+    """
+    with transaction.atomic():
+        if not job.variant and repositories.get_chart_render_key(job.chart_id) == _chart_job_key(job):
+            repositories.update_chart(job.chart, render_status=Chart.RenderStatus.FAILED)
+        repositories.finish_chart_render_job(job, ChartRenderJob.JobStatus.FAILED, error=error)
+
+
+def get_chart_variant(chart: Chart, variant: str):
+    """
+    Vrátí soubor varianty grafu (PNG dané šířky, SVG, PDF), nebo ji zařadí do fronty vykreslování.
+
+    Varianta se kreslí ze zdrojových dat grafu (`Chart.render_params`, `Chart.series`) workerem
+    (`manage.py run_chart_workers`), nikdy v požadavku; každá kombinace dat a varianty se
+    kreslí jen jednou a pak se čte z cache obrázků.
+
+    Args:
+        chart: Graf s uloženými zdrojovými daty.
+        variant: Název varianty z `charts.CHART_VARIANTS`.
+
+    Returns:
+        str | None: Název souboru v úložišti médií, nebo None, pokud se varianta teprve vykreslí.
+
+    Raises:
+        ValidationError: Pokud varianta neexistuje nebo graf nemá zdrojová data.
+    """
+    if variant not in charts.CHART_VARIANTS:
+        raise ValidationError(f"Unknown chart variant: {variant}")
+    if not chart.render_params or chart.series is None:
+        raise ValidationError("Chart has no source data to render from.")
+
+    path = chart_cache.lookup(charts.chart_key(charts.with_series(chart.render_params, chart.series), variant))
+    if path is None:
+        repositories.enqueue_chart_variant_job(chart, chart.render_params, chart.series, variant)
+    return path
+
+
+def get_chart_series(chart: Chart):
+    """
+    Vrátí uloženou datovou řadu grafu jako dvojici polí NumPy (popisky, hodnoty).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray] | None: Řada, nebo None, pokud graf data nemá.
+    """
+    if chart.series is None:
+        return None
+    return series.unpack_series(chart.series)
+
+
+# -------------------- Table Data Services --------------------
+
+def refresh_table(table: Table, force: bool = False) -> bool:
+    """
+    Znovu sestaví `Table.data` z navázaného datového zdroje.
+
+    Pokud se otisk zdroje od posledního obnovení nezměnil, nic se nezapisuje.
+
+    Args:
+        table: Tabulka s datovým zdrojem.
+        force: Obnovit data i při nezměněném otisku.
+
+    Returns:
+        bool: True, pokud se data tabulky přepsala.
+
+    Raises:
+        ValidationError: Pokud tabulka nemá datový zdroj.
+    """
+    if table.data_source is None:
+        raise ValidationError("Table has no data source to refresh from.")
+
+    fingerprint = utils.data_source_fingerprint(table.data_source)
+    if table.data_fingerprint == fingerprint and not force:
+        return False
+
+    repositories.update_table(
+        table, data=utils.materialize_table_data(table.data_source), data_fingerprint=fingerprint
+    )
+    return True
+
+
+def refresh_tables_for_source(data_source: 'DataSource', force: bool = False) -> int:
+    """
+    Obnoví data všech tabulek navázaných na datový zdroj jedním hromadným UPDATE.
+
+    Data zdroje se sestaví jen jednou a jen tehdy, když je některá tabulka zastaralá.
+
+    Args:
+        data_source: Datový zdroj.
+        force: Obnovit i tabulky s aktuálním otiskem.
+
+    Returns:
+        int: Počet přepsaných tabulek.
+    """
+    fingerprint = utils.data_source_fingerprint(data_source)
+    stale = repositories.get_stale_tables(data_source, None if force else fingerprint)
+    if not stale:
+        return 0
+
+    data = utils.materialize_table_data(data_source)
+    with transaction.atomic():
+        updated = repositories.update_tables_data([pk for pk, _ in stale], data, fingerprint)
+    for section_id in {section_id for _, section_id in stale}:
+        fragments.invalidate_section(section_id)  # UPDATE neposílá signály
+    return updated
+
+
+# -------------------- Publishing Services --------------------
+
+def get_publish_blockers(report: Report) -> list:
+    """
+    Vrátí prvky obsahu, které brání publikaci reportu (nejsou ve stavu APPROVED).
+
+    Args:
+        report: Report.
+
+    Returns:
+        list[dict]: `id`, `section_id`, `section_title`, `type` a `status` každého prvku;
+        prázdný seznam, pokud lze report publikovat.
+    """
+    return repositories.get_unapproved_elements(report)
+
 
-    utils.reorder_section_content(section)
\ No newline at end of file
+def approve_staged_elements(report: Report = None, section: Section = None) -> int:
+    """
+    Hromadně schválí všechny prvky ve stavu STAGED v reportu nebo v sekci (jeden UPDATE).
+    Prvky ve stavu DRAFT se nemění.
+
+    Args:
+        report: Report, jehož prvky se schvalují.
+        section: Sekce, jejíž prvky se schvalují (má přednost před reportem).
+
+    Returns:
+        int: Počet schválených prvků.
+
+    Raises:
+        ValidationError: Pokud není zadán report ani sekce.
+    """
+    if report is None and section is None:
+        raise ValidationError("Je potřeba zadat report nebo sekci.")
+    with transaction.atomic():
+        approved, section_ids = repositories.approve_staged_elements(report=report, section=section)
+    for section_id in section_ids:
+        fragments.invalidate_section(section_id)  # UPDATE neposílá signály
+    return approved
+
+
+# -------------------- Bulk Content Services --------------------
+
+ELEMENT_VALIDATORS = {
+    'paragraph': utils.validate_paragraph_data,
+    'chart': utils.validate_chart_data,
+    'table': utils.validate_table_data,
+}
+
+
+def add_elements(section: Section, specs: list, author: User = None) -> list:
+    """
+    Přidá na konec sekce více prvků obsahu najednou (např. při skriptovaném importu).
+
+    Všechny specifikace se nejdřív zvalidují; prvky pak dostanou pořadí v paměti
+    (s rozestupem ORDER_GAP za posledním prvkem sekce, takže přečíslování není
+    potřeba) a uloží se hromadně v jedné transakci. Fulltextový index se doplní
+    hromadně a cache fragmentů sekce se zneplatní jednou.
+
+    Args:
+        section: Sekce, do které se prvky přidávají.
+        specs: Seznam slovníků s klíčem `type` ('paragraph', 'chart', 'table') a daty prvku:
+            `text` (odstavec), `title` a volitelně `dataset_file` nebo `data_source` (graf),
+            `title` a volitelně `data_source` (tabulka).
+        author: Autor prvků (volitelné).
+
+    Returns:
+        list: Vytvořené prvky ve stejném pořadí jako `specs`.
+
+    Raises:
+        ValidationError: Pokud některá specifikace není platná (zprávy všech chyb, nic se neuloží).
+    """
+    errors = []
+    for index, spec in enumerate(specs, start=1):
+        validate = ELEMENT_VALIDATORS.get(spec.get('type'))
+        if validate is None:
+            errors.append(f"Prvek {index}: neznámý typ '{spec.get('type')}'.")
+            continue
+        try:
+            validate(spec)
+        except ValidationError as e:
+            errors.extend(f"Prvek {index}: {message}" for message in e.messages)
+    if errors:
+        raise ValidationError(errors)
+    if not specs:
+        return []
+
+    table_data = {}  # Zdroj -> (data, otisk); každý zdroj se zkopíruje jen jednou
+    elements = []
+    with transaction.atomic():
+        repositories.lock_section(section.pk)  # Souběžná připojení na konec sekce čekají
+        order = repositories.next_order(ContentElement.objects.filter(section=section))
+        for spec in specs:
+            fields = {'section': section, 'order': order, 'author': author}
+            if spec['type'] == 'paragraph':
+                elements.append(Paragraph(text=spec['text'], **fields))
+            elif spec['type'] == 'chart':
+                elements.append(Chart(
+                    title=spec['title'], dataset=spec.get('dataset_file'), data_source=spec.get('data_source'), **fields
+                ))
+            else:
+                data_source = spec.get('data_source')
+                data, fingerprint = None, ""
+                if data_source is not None and data_source.row_count:
+                    if data_source.pk not in table_data:
+                        table_data[data_source.pk] = (
+                            utils.materialize_table_data(data_source), utils.data_source_fingerprint(data_source)
+                        )
+                    data, fingerprint = table_data[data_source.pk]
+                elements.append(Table(
+                    title=spec['title'], data=data, data_source=data_source, data_fingerprint=fingerprint, **fields
+                ))
+            order += repositories.ORDER_GAP
+
+        repositories.bulk_create_content_elements(elements)
+        search.index_new_objects(elements)  # bulk_create neposílá signály
+    fragments.invalidate_section(section.pk)
+    return elements
@@ -0,0 +1,78 @@
+# reports/signals.py
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import fragments
+from . import repositories
+from . import search
+from .models import Report, Section, ContentElement, Paragraph, Chart, Table
+
+# Jen konkrétní podtřídy: při smazání prvku posílá post_delete i rodičovský řádek
+# ContentElement, takže by se s ním každý handler spustil dvakrát
+CONTENT_ELEMENT_MODELS = (Paragraph, Chart, Table)
+
+
+def _is_cascade(origin) -> bool:
+    """
+    True, pokud prvek maže kaskáda ze sekce nebo reportu – fragment i verzi reportu
+    pak jednou obslouží signál sekce, ne každý prvek zvlášť.
+    """
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return not issubclass(model, ContentElement)
+
+
+def invalidate_element_fragments(sender, instance, origin=None, **kwargs):
+    """
+    Změna nebo smazání prvku zneplatní fragment jeho sekce.
+    """
+    if not _is_cascade(origin):
+        fragments.invalidate_section(instance.section_id)
+
+
+def touch_element_report(sender, instance, origin=None, **kwargs):
+    """
+    Smazání prvku nemění `updated_at` žádného zbylého prvku – změní se verze reportu (ETag detailu).
+    """
+    if not _is_cascade(origin):
+        repositories.touch_report(section_id=instance.section_id)
+
+
+for model in CONTENT_ELEMENT_MODELS:
+    post_save.connect(invalidate_element_fragments, sender=model, dispatch_uid=f"fragments_save_{model.__name__}")
+    post_delete.connect(invalidate_element_fragments, sender=model, dispatch_uid=f"fragments_delete_{model.__name__}")
+    post_delete.connect(touch_element_report, sender=model, dispatch_uid=f"version_delete_{model.__name__}")
+
+
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def invalidate_section_fragments(sender, instance, **kwargs):
+    fragments.invalidate_section(instance.pk)
+    repositories.touch_report(report_id=instance.report_id)
+
+
+@receiver(post_save, sender=Report)
+def invalidate_report_fragments(sender, instance, created, **kwargs):
+    if not created:
+        fragments.invalidate_report(instance.pk)
+
+
+# Fulltextový index (reports/search.py) se udržuje průběžně
+SEARCH_MODELS = (Report, Section, Paragraph, Chart, Table)
+
+
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_object(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+for model in SEARCH_MODELS:
+    post_save.connect(update_search_index, sender=model, dispatch_uid=f"search_save_{model.__name__}")
+    post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f"search_delete_{model.__name__}")
@@ -0,0 +1,304 @@
+# reports/snapshots.py
+
+"""
+Neměnné verze (snapshoty) publikovaných reportů.
+
+Při každé publikaci (`services.publish_report`) se uloží nová verze
+`ReportSnapshot`: strom reportu jako JSON komprimovaný zlibem, HTML sekcí
+v režimu jen pro čtení a PDF. Publikovaná stránka i PDF se pak čtou z jednoho
+řádku snapshotu, ne z živých tabulek `Section` a polymorfního `ContentElement`,
+a úpravy reportu po publikaci veřejnou verzi nezmění. Starší verze zůstávají
+dostupné.
+
+HTML snapshotu neodkazuje na živá data: grafy na soubory variant v cache
+obrázků (obsahové názvy, viz `reports/chart_cache.py`), tabulky na stránkování
+nad řádky uloženými ve verzi. Řádky tabulek nejsou v JSON stromu: ukládají se po
+blocích do `SnapshotTable`/`SnapshotTableChunk` a stránka řádků načte jen svou
+tabulku a potřebné bloky (`table_page`). Publikované verze jsou veřejné –
+stejně jako seznam publikovaných reportů je čtou i nepřihlášení.
+"""
+
+"""
+Seznam funkcí v `reports/snapshots.py`:
+
+1. `snapshot_content(report: Report, chart_variants: dict = None) -> dict`
+2. `create_snapshot(report: Report, published_by=None) -> ReportSnapshot`
+3. `read_content(snapshot: ReportSnapshot) -> dict`
+4. `get_snapshot(report_id: int, version: int = None, fields: tuple = SNAPSHOT_PAGE_FIELDS) -> ReportSnapshot | None`
+5. `list_versions(report_id: int) -> list`
+6. `get_snapshot_table(report_id: int, version: int, element_id: int) -> SnapshotTable | None`
+7. `table_page(snapshot_table: SnapshotTable, offset: int = 0, limit: int = tables.TABLE_PAGE_SIZE, sort: int = None, descending: bool = False, query: str = '') -> dict`
+"""
+
+import json
+import zlib
+from itertools import islice
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.safestring import mark_safe
+
+from data_sources.ingest import iter_source_rows
+from . import chart_cache
+from . import charts
+from . import pdf
+from . import repositories
+from . import tables
+from .models import Report, Paragraph, Chart, Table, ChartImage, ReportSnapshot, SnapshotTable, SnapshotTableChunk
+
+SNAPSHOT_COMPRESSION_LEVEL = 6
+
+# Sloupce potřebné pro zobrazení stránky snapshotu (bez JSON obsahu a PDF)
+SNAPSHOT_PAGE_FIELDS = ('report_id', 'version', 'title', 'topic', 'year', 'author_name', 'html', 'published_at')
+
+# Varianty grafů, na které odkazuje HTML snapshotu (viz content_element.html)
+SNAPSHOT_CHART_VARIANTS = ('sm', 'md', 'lg', 'svg')
+
+SNAPSHOT_TABLE_CHUNK_ROWS = 5000  # Řádků v jednom bloku SnapshotTableChunk
+SNAPSHOT_TABLE_BATCH_CHUNKS = 10  # Bloků v jednom INSERT
+
+
+def _chart_variants(chart_list: list) -> dict:
+    """
+    Vrátí soubory variant grafů v cache obrázků jako {id grafu: {varianta: cesta}}.
+
+    Publikace nic nekreslí: grafy, jejichž varianty v cache nejsou všechny
+    (nikdo si je zatím nevyžádal), mají prázdný slovník a snapshot zobrazí
+    jejich hlavní obrázek (`Chart.dataset`). Všechny cesty načte jeden dotaz.
+    """
+    keys = {}
+    for chart in chart_list:
+        if chart.render_status == Chart.RenderStatus.READY and chart.render_params and chart.series is not None:
+            params = charts.with_series(chart.render_params, chart.series)
+            keys[chart.pk] = {variant: charts.chart_key(params, variant) for variant in SNAPSHOT_CHART_VARIANTS}
+    cached = chart_cache.cached_paths(key for variant_keys in keys.values() for key in variant_keys.values())
+    variants = {}
+    for chart in chart_list:
+        paths = {variant: cached.get(key) for variant, key in keys.get(chart.pk, {}).items()}
+        variants[chart.pk] = paths if paths and all(paths.values()) else {}
+    return variants
+
+
+def _table_rows(table: Table):
+    """Proudově vrací všechny řádky tabulky (u zkrácených tabulek ze zdroje)."""
+    data = table.data or {}
+    if data.get('truncated') and table.data_source is not None:
+        return iter_source_rows(table.data_source)
+    return iter(data.get('rows') or [])
+
+
+def _store_table(snapshot: ReportSnapshot, table: Table) -> None:
+    """
+    Uloží řádky tabulky do bloků verze; v paměti je najednou nejvýš
+    `SNAPSHOT_TABLE_BATCH_CHUNKS` bloků, ne celá tabulka.
+    """
+    stored = SnapshotTable.objects.create(
+        snapshot=snapshot, element_id=table.pk, columns=(table.data or {}).get('columns') or [],
+    )
+    rows = _table_rows(table)
+    start = 0
+    while True:
+        chunks = []
+        for _ in range(SNAPSHOT_TABLE_BATCH_CHUNKS):
+            content = list(islice(rows, SNAPSHOT_TABLE_CHUNK_ROWS))
+            if not content:
+                break
+            chunks.append(SnapshotTableChunk(table=stored, start_row=start, row_count=len(content), content=content))
+            start += len(content)
+        if not chunks:
+            break
+        SnapshotTableChunk.objects.bulk_create(chunks)
+    SnapshotTable.objects.filter(pk=stored.pk).update(row_count=start)
+
+
+def _element_content(element, chart_variants: dict) -> dict:
+    content = {'id': element.pk, 'type': element.get_class_name().lower(), 'status': element.status}
+    if isinstance(element, Paragraph):
+        content['text'] = element.text
+    elif isinstance(element, Chart):
+        content.update(title=element.title, image=element.dataset.name or None, style=element.render_params,
+                       variants=chart_variants.get(element.pk, {}))
+    elif isinstance(element, Table):
+        data = element.data or {}
+        content.update(title=element.title, columns=data.get('columns') or [])  # Řádky jsou v SnapshotTableChunk
+    return content
+
+
+def _image_files(content: dict) -> set:
+    """Soubory cache obrázků, na které odkazuje strom snapshotu."""
+    files = set()
+    for section in content['sections']:
+        for element in section['elements']:
+            if element['type'] == 'chart':
+                files.update(element['variants'].values())
+                if element['image'] and chart_cache.is_content_addressed(element['image']):
+                    files.add(element['image'])
+    return files
+
+
+def _render_section(section, report_id: int, version: int, chart_variants: dict) -> str:
+    """
+    Vyrenderuje HTML sekce pro snapshot: grafy odkazují přímo na soubory variant,
+    tabulky na stránkování řádků uložených v dané verzi.
+    """
+    elements_html = []
+    for element in section.element_list:
+        context = {'element': element, 'readonly': True, 'table_page_size': tables.TABLE_PAGE_SIZE}
+        if isinstance(element, Chart):
+            context['snapshot_chart'] = True
+            context['chart_urls'] = {
+                variant: default_storage.url(path) for variant, path in chart_variants.get(element.pk, {}).items()
+            }
+        elif isinstance(element, Table):
+            context['rows_url'] = reverse('reports:report_snapshot_table_rows', args=[report_id, version, element.pk])
+        elements_html.append(mark_safe(render_to_string('reports/content_element.html', context)))
+    return render_to_string('reports/section_fragment.html', {'section': section, 'elements_html': elements_html})
+
+
+def snapshot_content(report: Report, chart_variants: dict = None) -> dict:
+    """
+    Vrátí strom reportu jako slovník serializovatelný do JSON.
+
+    Sekce a prvky musí být načtené (viz `repositories.load_report_content`).
+
+    Args:
+        report: Report s načteným obsahem.
+        chart_variants: Soubory variant grafů {id grafu: {varianta: cesta}} (viz `create_snapshot`).
+    """
+    chart_variants = chart_variants or {}
+    return {
+        'report': {
+            'id': report.pk, 'title': report.title, 'topic': report.topic, 'year': report.year,
+            'author': report.author.username,
+        },
+        'sections': [
+            {
+                'id': section.pk,
+                'title': section.title,
+                'elements': [_element_content(element, chart_variants) for element in section.element_list],
+            }
+            for section in report.section_list
+        ],
+    }
+
+
+def create_snapshot(report: Report, published_by=None) -> ReportSnapshot:
+    """
+    Uloží novou verzi publikovaného reportu (číslo verze = poslední + 1).
+
+    Snapshot si zapamatuje soubory grafů v cache obrázků (varianty a hlavní
+    obrázek, `ReportSnapshot.images`) a tabulky uloží se všemi řádky po blocích
+    (`SnapshotTable`). HTML tak na živá data reportu neodkazuje.
+
+    Args:
+        report: Report k uložení.
+        published_by: Uživatel, který report publikoval.
+
+    Returns:
+        ReportSnapshot: Uložený snapshot.
+    """
+    repositories.load_report_content(report)
+    chart_variants = _chart_variants([
+        element for section in report.section_list for element in section.element_list if isinstance(element, Chart)
+    ])
+    tree = snapshot_content(report, chart_variants)
+    content = json.dumps(tree, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8')
+    with pdf.render_report_pdf(report) as pdf_file:
+        pdf_bytes = pdf_file.read()
+
+    with transaction.atomic():
+        last = ReportSnapshot.objects.filter(report=report).aggregate(last=Max('version'))['last']
+        version = (last or 0) + 1
+        html = ''.join(_render_section(section, report.pk, version, chart_variants) for section in report.section_list)
+        snapshot = ReportSnapshot.objects.create(  # Souběžnou publikaci stejné verze odmítne unikátní omezení
+            report=report,
+            version=version,
+            title=report.title,
+            topic=report.topic,
+            year=report.year,
+            author_name=report.author.username,
+            content=zlib.compress(content, SNAPSHOT_COMPRESSION_LEVEL),
+            html=html,
+            pdf=pdf_bytes,
+            published_by=published_by,
+        )
+        snapshot.images.set(ChartImage.objects.filter(file__in=_image_files(tree)))
+        for section in report.section_list:
+            for element in section.element_list:
+                if isinstance(element, Table):
+                    _store_table(snapshot, element)
+        return snapshot
+
+
+def read_content(snapshot: ReportSnapshot) -> dict:
+    """
+    Vrátí strom reportu uložený ve snapshotu (viz `snapshot_content`).
+    """
+    return json.loads(zlib.decompress(bytes(snapshot.content)).decode('utf-8'))
+
+
+def get_snapshot(report_id: int, version: int = None, fields: tuple = SNAPSHOT_PAGE_FIELDS):
+    """
+    Načte jednu verzi snapshotu jedním dotazem (poslední verzi, pokud `version` není zadána).
+
+    Args:
+        report_id: ID reportu.
+        version: Číslo verze.
+        fields: Načítané sloupce (ostatní se načtou až při přístupu).
+
+    Returns:
+        ReportSnapshot | None: Snapshot, nebo None, pokud neexistuje.
+    """
+    snapshots = ReportSnapshot.objects.filter(report_id=report_id).only(*fields)
+    if version is not None:
+        snapshots = snapshots.filter(version=version)
+    return snapshots.order_by('-version').first()
+
+
+def list_versions(report_id: int) -> list:
+    """
+    Vrátí všechny verze reportu od nejnovější jako [(version, published_at), ...].
+    """
+    return list(
+        ReportSnapshot.objects.filter(report_id=report_id).order_by('-version').values_list('version', 'published_at')
+    )
+
+
+def get_snapshot_table(report_id: int, version: int, element_id: int):
+    """
+    Načte jedním dotazem tabulku uloženou v dané verzi (bez řádků a bez obsahu snapshotu).
+
+    Args:
+        report_id: ID reportu.
+        version: Číslo verze.
+        element_id: ID tabulky v době publikace.
+
+    Returns:
+        SnapshotTable | None: Tabulka, nebo None, pokud ve verzi taková tabulka není.
+    """
+    return (
+        SnapshotTable.objects.filter(snapshot__report_id=report_id, snapshot__version=version, element_id=element_id)
+        .select_related('snapshot').only('columns', 'row_count', 'snapshot__published_at').first()
+    )
+
+
+def table_page(snapshot_table: SnapshotTable, offset: int = 0, limit: int = tables.TABLE_PAGE_SIZE,
+               sort: int = None, descending: bool = False, query: str = '') -> dict:
+    """
+    Vrátí stránku řádků tabulky uložené ve verzi (parametry a výsledek jako `tables.table_page`).
+
+    Čtou se jen bloky s řádky stránky; pořadí po řazení a filtru se cachuje
+    (verze se nemění, klíč určuje tabulka verze).
+
+    Raises:
+        ValueError: Pokud offset, limit nebo sloupec pro řazení nejsou platné.
+    """
+    cache_key = f"snapshot:{snapshot_table.pk}:{snapshot_table.snapshot.published_at.timestamp():.6f}"
+    return tables.chunked_table_page(
+        snapshot_table.chunks.all(), snapshot_table.columns, snapshot_table.row_count, cache_key,
+        offset=offset, limit=limit, sort=sort, descending=descending, query=query,
+    )
@@ -0,0 +1,284 @@
+# reports/tables.py
+
+"""
+Stránkované čtení řádků tabulek (`Table`) pro zobrazení v prohlížeči.
+
+Šablona vykreslí jen první stránku z `Table.data`; další stránky, řazení a
+filtrování obsluhuje JSON endpoint `reports:table_rows` přes `table_page`.
+Velikost odpovědi je tak omezená stránkou bez ohledu na počet řádků tabulky.
+
+Bez řazení a filtru se čte jen požadovaný rozsah řádků – z `Table.data`, nebo
+(u tabulek zkrácených na `utils.TABLE_MAX_ROWS`) přímo z bloků `Data`, resp.
+ze sloupcových souborů zdroje. Řazení a filtr pracují vektorově nad poli
+NumPy; u sloupcově uložených zdrojů nad soubory mapovanými do paměti.
+
+Výsledné pořadí řádků (po filtru a seřazení) se ukládá do Django cache pod
+klíčem s otiskem dat, takže další stránky téhož řazení čtou jen řádky stránky
+(vybrané bloky, resp. pozice v mapovaných souborech), ne celý zdroj. Stejně
+se stránkují řádky tabulek uložené v publikovaných verzích (`chunked_table_page`).
+"""
+
+"""
+Seznam funkcí v `reports/tables.py`:
+
+1. `table_columns(table: Table) -> list`
+2. `table_page(table: Table, offset: int = 0, limit: int = TABLE_PAGE_SIZE, sort: int = None, descending: bool = False, query: str = '') -> dict`
+3. `chunked_table_page(chunks: QuerySet, columns: list, total: int, cache_key: str, offset: int = 0, limit: int = TABLE_PAGE_SIZE, sort: int = None, descending: bool = False, query: str = '') -> dict`
+"""
+
+import hashlib
+from bisect import bisect_right
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from data_sources import columnar
+from .models import Table
+
+TABLE_PAGE_SIZE = getattr(settings, 'REPORT_TABLE_PAGE_SIZE', 50)  # Řádků na stránku (předává se i do content_element.html)
+TABLE_MAX_PAGE_SIZE = 500
+TABLE_ORDER_CACHE_TIMEOUT = getattr(settings, 'REPORT_TABLE_ORDER_CACHE_TIMEOUT', 60 * 60)
+TABLE_ORDER_CACHE_MAX_ROWS = getattr(settings, 'REPORT_TABLE_ORDER_CACHE_MAX_ROWS', 1_000_000)  # Větší pořadí se necachuje
+
+
+def table_columns(table: Table) -> list:
+    """
+    Vrátí názvy sloupců tabulky.
+    """
+    return list((table.data or {}).get('columns') or [])
+
+
+def _is_partial(table: Table) -> bool:
+    """True, pokud `Table.data` neobsahuje všechny řádky a zbytek je ve zdroji."""
+    return bool((table.data or {}).get('truncated')) and table.data_source is not None
+
+
+def _object_arrays(rows, indexes: list) -> list:
+    """Vybrané sloupce řádků jako maskovaná pole (maska = prázdná buňka)."""
+    values = [[] for _ in indexes]
+    for row in rows:
+        for column, index in zip(values, indexes):
+            column.append(row[index] if index < len(row) else None)
+    arrays = []
+    for column in values:
+        array = np.empty(len(column), dtype=object)
+        array[:] = column
+        arrays.append(np.ma.MaskedArray(array, mask=np.equal(array, None)))
+    return arrays
+
+
+class _InlineRows:
+    """Řádky uložené přímo v `Table.data`."""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def range(self, start: int, stop: int) -> list:
+        return self.rows[start:stop]
+
+    def at(self, positions: list) -> list:
+        return [self.rows[position] for position in positions]
+
+    def arrays(self, indexes: list) -> list:
+        return _object_arrays(self.rows, indexes)
+
+
+class _ChunkRows:
+    """
+    Řádky uložené po blocích (`start_row`, `row_count`, `content`) – záznamy `Data`
+    zdroje nebo bloky tabulky v publikované verzi (`SnapshotTableChunk`).
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def range(self, start: int, stop: int) -> list:
+        chunks = (
+            self.chunks.alias(end_row=F('start_row') + F('row_count'))
+            .filter(end_row__gt=start, start_row__lt=stop).order_by('start_row')
+        )
+        rows = []
+        for chunk_start, content in chunks.values_list('start_row', 'content'):
+            rows.extend(content[max(start - chunk_start, 0):stop - chunk_start])
+        return rows
+
+    def at(self, positions: list) -> list:
+        # Hranice bloků jsou malý dotaz bez obsahu; načtou se jen bloky s řádky stránky
+        starts = list(self.chunks.order_by('start_row').values_list('start_row', flat=True))
+        owners = [starts[bisect_right(starts, position) - 1] for position in positions]
+        contents = dict(self.chunks.filter(start_row__in=set(owners)).values_list('start_row', 'content'))
+        return [contents[owner][position - owner] for owner, position in zip(owners, positions)]
+
+    def arrays(self, indexes: list) -> list:
+        contents = self.chunks.order_by('start_row').values_list('content', flat=True).iterator(chunk_size=1)
+        return _object_arrays((row for content in contents for row in content), indexes)
+
+
+class _ColumnarRows:
+    """Řádky sloupcově uloženého zdroje (soubory mapované do paměti)."""
+
+    def __init__(self, source, width: int):
+        self.source = source
+        self.names = source.columns[:width]
+
+    def range(self, start: int, stop: int) -> list:
+        return list(columnar.read_rows(self.source, start, stop))
+
+    def at(self, positions: list) -> list:
+        return columnar.read_positions(self.source, positions)
+
+    def arrays(self, indexes: list) -> list:
+        return [columnar.read_column(self.source, self.names[index]) for index in indexes]
+
+
+def _table_rows(table: Table, width: int):
+    """Úložiště řádků tabulky: `Table.data`, nebo u zkrácených tabulek zdroj."""
+    if not _is_partial(table):
+        return _InlineRows((table.data or {}).get('rows') or [])
+    source = table.data_source
+    if columnar.columnar_metadata(source) is not None:
+        return _ColumnarRows(source, width)
+    return _ChunkRows(source.data_entries.all())
+
+
+def _table_cache_identity(table: Table):
+    """Část klíče cache pořadí: změní se s každou změnou dat tabulky, resp. zdroje."""
+    if _is_partial(table):
+        source = table.data_source
+        return f"source:{source.pk}:{source.content_hash}:{source.row_count}:{source.storage}"
+    if table.pk is None or table.updated_at is None:
+        return None
+    return f"table:{table.pk}:{table.updated_at.timestamp():.6f}"
+
+
+def _sort_keys(array):
+    """Pole, podle kterého lze řadit: čísla jako float, ostatní jako text."""
+    data = np.ma.getdata(array)
+    if data.dtype != object:
+        return data.astype(np.float64)
+    try:
+        return np.ma.MaskedArray(data, mask=np.ma.getmaskarray(array)).filled(np.nan).astype(np.float64)
+    except (TypeError, ValueError):
+        return np.where(np.ma.getmaskarray(array), '', data.astype(str))
+
+
+def _matches(arrays: list, query: str):
+    """Maska řádků, ve kterých některá buňka obsahuje `query` (bez ohledu na velikost písmen)."""
+    query = query.lower()
+    selected = None
+    for array in arrays:
+        text = np.where(np.ma.getmaskarray(array), '', np.ma.getdata(array).astype(str))
+        found = np.char.find(np.char.lower(text), query) >= 0
+        selected = found if selected is None else selected | found
+    return selected
+
+
+def _stable_order(keys, descending: bool):
+    """
+    Pořadí podle klíčů; shodné klíče si i při sestupném řazení zachovají pořadí zdroje.
+    """
+    if not descending:
+        return np.argsort(keys, kind='stable')
+    # Stabilní vzestupné řazení obráceného pole, obrácené zpět = sestupně se stabilními shodami
+    return (len(keys) - 1 - np.argsort(keys[::-1], kind='stable'))[::-1]
+
+
+def _ordered_positions(rows, width: int, sort, descending: bool, query: str):
+    """Pozice řádků po filtrování a seřazení (prázdné buňky řazeného sloupce vždy na konci)."""
+    indexes = list(range(width)) if query else [sort]
+    arrays = dict(zip(indexes, rows.arrays(indexes)))
+    count = len(next(iter(arrays.values()))) if arrays else 0
+    positions = np.arange(count)
+    if query:
+        positions = positions[_matches(list(arrays.values()), query)]
+    if sort is not None:
+        keys = _sort_keys(arrays[sort])[positions]
+        nulls = np.ma.getmaskarray(arrays[sort])[positions]
+        order = _stable_order(keys, descending)
+        order = np.concatenate([order[~nulls[order]], order[nulls[order]]])
+        positions = positions[order]
+    return positions
+
+
+def _cached_positions(cache_key, rows, width: int, sort, descending: bool, query: str):
+    """Pozice z `_ordered_positions`, uložené v cache pod otiskem dat a parametry řazení."""
+    if cache_key is None:
+        return _ordered_positions(rows, width, sort, descending, query)
+    digest = hashlib.sha256(f"{sort}:{int(descending)}:{query}".encode('utf-8')).hexdigest()[:24]
+    key = f"reports:table_order:{cache_key}:{digest}"
+    cached = cache.get(key)
+    if cached is not None:
+        return np.frombuffer(cached, dtype=np.int64)
+    positions = _ordered_positions(rows, width, sort, descending, query)
+    if positions.size <= TABLE_ORDER_CACHE_MAX_ROWS:
+        cache.set(key, positions.astype(np.int64).tobytes(), TABLE_ORDER_CACHE_TIMEOUT)
+    return positions
+
+
+def _page(rows, columns: list, total: int, cache_key, offset: int, limit: int, sort, descending: bool,
+          query: str, inline=None) -> dict:
+    if offset < 0 or limit < 1:
+        raise ValueError("Offset musí být nezáporný a limit kladný.")
+    if sort is not None and not 0 <= sort < len(columns):
+        raise ValueError(f"Neplatný sloupec pro řazení: {sort}")
+    limit = min(limit, TABLE_MAX_PAGE_SIZE)
+    width = len(columns)
+
+    if sort is None and not query:
+        if inline is not None and offset + limit <= len(inline):
+            page_rows = inline[offset:offset + limit]  # Začátek zkrácené tabulky je přímo v Table.data
+        else:
+            page_rows = rows.range(offset, offset + limit)
+    else:
+        positions = _cached_positions(cache_key, rows, width, sort, descending, query)
+        total = int(positions.size)
+        page_rows = rows.at(positions[offset:offset + limit].tolist()) if width else []
+    page_rows = [list(row[:width]) + [None] * (width - len(row)) for row in page_rows]
+    return {'columns': columns, 'rows': page_rows, 'offset': offset, 'limit': limit, 'total': total}
+
+
+def table_page(table: Table, offset: int = 0, limit: int = TABLE_PAGE_SIZE, sort: int = None,
+               descending: bool = False, query: str = '') -> dict:
+    """
+    Vrátí jednu stránku řádků tabulky.
+
+    Args:
+        table: Tabulka.
+        offset: Index prvního řádku stránky (po filtrování a seřazení).
+        limit: Počet řádků (nejvýš `TABLE_MAX_PAGE_SIZE`).
+        sort: Index sloupce, podle kterého se řadí (None = pořadí zdroje).
+        descending: Řadit sestupně (shodné hodnoty zůstávají v pořadí zdroje).
+        query: Text, který musí obsahovat některá buňka řádku.
+
+    Returns:
+        dict: `columns`, `rows`, `offset`, `limit` a `total` (počet řádků po filtrování).
+
+    Raises:
+        ValueError: Pokud offset, limit nebo sloupec pro řazení nejsou platné.
+    """
+    columns = table_columns(table)
+    data = table.data or {}
+    inline = data.get('rows') or []
+    total = data.get('row_count', len(inline))
+    return _page(
+        _table_rows(table, len(columns)), columns, total, _table_cache_identity(table),
+        offset, limit, sort, descending, query, inline=inline,
+    )
+
+
+def chunked_table_page(chunks, columns: list, total: int, cache_key: str, offset: int = 0,
+                       limit: int = TABLE_PAGE_SIZE, sort: int = None, descending: bool = False,
+                       query: str = '') -> dict:
+    """
+    Vrátí stránku řádků uložených po blocích (`start_row`, `row_count`, `content`),
+    např. tabulky v publikované verzi reportu. Parametry a výsledek jako `table_page`.
+
+    Args:
+        chunks: QuerySet bloků jedné tabulky.
+        columns: Názvy sloupců.
+        total: Počet řádků tabulky.
+        cache_key: Neměnný identifikátor dat pro cache pořadí (None = necachovat).
+    """
+    return _page(_ChunkRows(chunks), columns, total, cache_key, offset, limit, sort, descending, query)
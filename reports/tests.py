@@ -110,6 +110,143 @@ Table Repository
 79. `test_delete_table_existing`
 80. `test_delete_table_non_existing`
 
+Strom reportu
+103. `test_get_report_tree_constant_query_count`
+104. `test_get_report_tree_orders_mixed_elements`
+105. `test_report_detail_view_query_count_independent_of_sections`
+
+Cache fragmentů publikovaných reportů
+106. `test_published_detail_served_from_fragment_cache`
+107. `test_paragraph_save_invalidates_section_fragment`
+108. `test_open_report_is_not_cached`
+109. `test_warm_report_cache_command`
+
+Hromadné přeřazování
+110. `test_move_section_both_directions`
+111. `test_move_content_element_constant_query_count`
+112. `test_remove_content_element_keeps_sibling_orders`
+113. `test_apply_content_ordering`
+114. `test_apply_content_ordering_rejects_incomplete_list`
+115. `test_content_order_view`
+
+Řazení s rozestupy
+116. `test_move_into_gap_updates_single_row`
+117. `test_move_compacts_section_when_gap_is_exhausted`
+118. `test_compact_ordering_command`
+
+Fronta vykreslování grafů
+119. `test_chart_update_view_enqueues_render_job`
+120. `test_run_chart_workers_stores_png`
+121. `test_run_chart_workers_with_process_pool`
+122. `test_render_failure_marks_chart_failed`
+123. `test_superseded_render_result_is_discarded`
+
+Cache obrázků grafů
+124. `test_identical_chart_reuses_cached_image`
+125. `test_same_title_different_data_does_not_collide`
+126. `test_evict_removes_least_recently_used_unreferenced_images`
+
+Varianty grafů (SVG, PNG v několika šířkách, PDF)
+127. `test_chart_variant_rendered_on_first_request_and_cached`
+128. `test_chart_image_requires_login_and_known_variant`
+129. `test_report_detail_serves_srcset`
+130. `test_pdf_export_embeds_chart_drawing`
+
+Datové řady grafů
+131. `test_pack_unpack_series_roundtrip`
+132. `test_parse_series_text_rejects_invalid_input`
+133. `test_chart_update_view_accepts_csv_upload`
+134. `test_chart_update_view_keeps_stored_series`
+135. `test_chart_variant_uses_stored_series`
+
+Obnova dat tabulek
+136. `test_add_table_materializes_ingested_source`
+137. `test_refresh_table_skips_unchanged_source`
+138. `test_refresh_tables_for_source_in_bulk`
+139. `test_edit_table_refresh_data_truncates_large_source`
+
+Stránkované tabulky
+140. `test_report_detail_renders_only_first_table_page`
+141. `test_table_rows_endpoint_returns_requested_page`
+142. `test_table_rows_sort_and_filter`
+143. `test_table_rows_read_truncated_rows_from_source`
+144. `test_table_rows_descending_sort_keeps_ties_in_source_order`
+145. `test_table_rows_reuse_cached_order_until_source_changes`
+146. `test_table_rows_invalid_parameters`
+
+Fulltextové vyhledávání
+147. `test_tokenize_folds_case_and_diacritics`
+148. `test_search_ranks_and_highlights_matches`
+149. `test_search_index_follows_edits_and_deletes`
+150. `test_search_view_paginates_and_hides_unpublished`
+151. `test_public_search_reads_published_version`
+152. `test_rebuild_search_index_command`
+
+Indexy a unikátní pořadí
+153. `test_duplicate_order_is_rejected`
+154. `test_full_reordering_swaps_orders_under_constraint`
+155. `test_append_computes_order_after_locking_parent`
+156. `test_explain_queries_uses_indexes`
+
+Stránkování seznamů reportů
+157. `test_get_reports_page_walks_all_reports_in_order`
+158. `test_list_views_paginate_by_cursor`
+159. `test_report_list_api`
+
+Publikace a hromadné schválení
+160. `test_publish_readiness_query_count_independent_of_size`
+161. `test_publish_report_reports_blockers`
+162. `test_publish_checks_approval_after_locking_report`
+163. `test_approve_staged_elements_single_update`
+
+Snapshoty publikovaných reportů
+164. `test_publish_creates_versioned_snapshot`
+165. `test_published_version_ignores_later_edits`
+166. `test_snapshot_page_is_one_row_fetch`
+167. `test_snapshot_versions_and_pdf`
+168. `test_snapshot_keeps_chart_files_and_table_rows`
+
+Podmíněné GET a cache médií
+169. `test_report_detail_returns_304_when_unchanged`
+170. `test_report_detail_etag_follows_changes`
+171. `test_element_delete_signals_run_once`
+172. `test_report_detail_etag_differs_per_user`
+173. `test_media_file_cache_headers`
+
+Částečné aktualizace sekcí
+174. `test_section_action_add_returns_section_html`
+175. `test_section_action_move_query_count_independent_of_report_size`
+176. `test_section_action_rejects_invalid_requests`
+
+Měření dotazů a časů požadavků
+177. `test_hot_views_stay_within_query_budgets`
+178. `test_chart_edit_fits_tight_query_budget`
+179. `test_query_budget_exceeded_raises_in_strict_mode_and_logs_otherwise`
+180. `test_profiling_stats_reports_percentiles_for_staff`
+
+Benchmarky nad syntetickými reporty
+181. `test_generate_report_creates_polymorphic_elements`
+182. `test_benchmark_command_writes_json_and_rolls_back`
+
+Export a import reportů
+183. `test_export_import_round_trip_remaps_ids_and_media`
+184. `test_import_maps_missing_authors_to_default_author`
+185. `test_import_rejects_invalid_archive_without_partial_data`
+186. `test_export_import_commands_rebuild_search_index`
+
+Hromadné přidávání prvků
+187. `test_add_elements_appends_mixed_elements_with_constant_queries`
+188. `test_add_elements_validates_all_specs_before_saving`
+189. `test_add_elements_materializes_table_data_once_and_saves_files`
+
+Denormalizované počty prvků
+190. `test_counters_follow_add_edit_approve_and_delete`
+191. `test_counters_use_stored_state_of_stale_instances`
+192. `test_counter_deltas_map_element_types`
+193. `test_approve_staged_elements_adjusts_counters_per_section`
+194. `test_list_pages_show_approved_counts_without_element_queries`
+195. `test_repair_command_fixes_counters_after_raw_update`
+
 ---
 
 Testy pro 'utils.py'
@@ -138,6 +275,9 @@ Generování PDF
 97. `test_generate_pdf_contains_report_info`
 98. `test_generate_pdf_contains_sections_and_elements`
 99. `test_generate_pdf_no_sections`
+100. `test_generate_pdf_long_paragraph_flows_to_next_page`
+101. `test_generate_pdf_constant_query_count`
+102. `test_report_pdf_view_streams_pdf`
 
 """
 
@@ -282,7 +422,7 @@ class SectionContentServiceTest(TestCase):
     def test_remove_section_valid_removal(self):
         """
         Testuje remove_section service funkci s validním smazáním sekce.
-        Ověřuje, že se sekce úspěšně smaže z databáze a pořadí zbývajících sekcí se přečísluje.
+        Ověřuje, že se sekce úspěšně smaže z databáze a zbývající sekce si zachovají pořadí.
         """
         section1 = services.add_section(report=self.report, title="Section 1")
         section2 = services.add_section(report=self.report, title="Section 2")
@@ -291,12 +431,12 @@ class SectionContentServiceTest(TestCase):
         services.remove_section(section2) # Smažeme sekci 2
 
         self.assertEqual(Section.objects.count(), 2)  # Ověříme, že zbyly 2 sekce
-        # Ověříme, že se správně přečíslovalo pořadí zbylých sekcí
+        # Mezera po smazané sekci zůstane, ostatní sekce se nepřečíslovávají
         sections = Section.objects.filter(report=self.report).order_by('order')
         self.assertEqual(sections[0].title, "Section 1")
-        self.assertEqual(sections[0].order, 1)
+        self.assertEqual(sections[0].order, section1.order)
         self.assertEqual(sections[1].title, "Section 3")
-        self.assertEqual(sections[1].order, 2)
+        self.assertEqual(sections[1].order, section3.order)
 
     def test_remove_section_nonexistent_section(self):
         """
@@ -682,7 +822,7 @@ class SectionRepositoryTest(TestCase):
         self.assertIsInstance(section, Section)  # Ověříme, že se vrátila instance modelu Section
         self.assertEqual(section.title, "New Section")  # Ověříme správné jméno sekce
         self.assertEqual(section.report, self.report)  # Ověříme správnou vazbu na report
-        self.assertEqual(section.order, 2)  # Ověříme správné pořadí (self.section už existuje s order=1)
+        self.assertEqual(section.order, 1 + repositories.ORDER_GAP)  # Ověříme správné pořadí (self.section už existuje s order=1)
         self.assertEqual(Section.objects.count(), 2)  # Ověříme, že v databázi jsou nyní 2 sekce
 
     def test_create_section_valid_data_with_custom_order(self):
@@ -797,7 +937,7 @@ class SectionRepositoryTest(TestCase):
         self.assertIsInstance(paragraph, Paragraph)
         self.assertEqual(paragraph.text, "Test Paragraph")
         self.assertEqual(paragraph.section, self.section)
-        self.assertEqual(paragraph.order, 1)  # První odstavec v sekci
+        self.assertEqual(paragraph.order, repositories.ORDER_GAP)  # První odstavec v sekci
 
     def test_create_paragraph_valid_data_with_custom_order(self):
         """
@@ -807,7 +947,7 @@ class SectionRepositoryTest(TestCase):
         paragraph1 = repositories.create_paragraph(section=self.section, text="First Paragraph")
         paragraph2 = repositories.create_paragraph(section=self.section, text="Second Paragraph", order=5)
 
-        self.assertEqual(paragraph1.order, 1)  # Automatické pořadí
+        self.assertEqual(paragraph1.order, repositories.ORDER_GAP)  # Automatické pořadí
         self.assertEqual(paragraph2.order, 5)  # Explicitně nastavené pořadí
 
     def test_create_paragraph_invalid_data_empty_text(self):
@@ -839,17 +979,18 @@ class SectionRepositoryTest(TestCase):
 
     def test_update_paragraph_invalid_data_empty_text(self):
         """
-        Testuje update_paragraph s nevalidními daty (prázdný text).
-        Ověřuje, že funkce vyvolá ValidationError.
+        Testuje úpravu odstavce s nevalidními daty (prázdný text).
+        Prázdný text odmítá validace ve vrstvě služeb (model má `blank=True`),
+        odstavec zůstane beze změny.
         """
         from django.core.exceptions import ValidationError
 
         paragraph = repositories.create_paragraph(section=self.section, text="Original Text")
 
         with self.assertRaises(ValidationError):
-            paragraph.text = ""
-            paragraph.full_clean()  # Spustí Django validaci modelu
-            repositories.update_paragraph(paragraph, text="")
+            services.edit_paragraph(paragraph, "")
+        paragraph.refresh_from_db()
+        self.assertEqual(paragraph.text, "Original Text")
 
     def test_update_paragraph_non_existing(self):
         """
@@ -912,7 +1053,7 @@ class SectionRepositoryTest(TestCase):
         self.assertIsInstance(chart, Chart)
         self.assertEqual(chart.title, "Test Chart")
         self.assertEqual(chart.section, self.section)
-        self.assertEqual(chart.order, 1)  # První graf v sekci
+        self.assertEqual(chart.order, repositories.ORDER_GAP)  # První graf v sekci
 
     def test_create_chart_valid_data_with_custom_order(self):
         """
@@ -922,7 +1063,7 @@ class SectionRepositoryTest(TestCase):
         chart1 = repositories.create_chart(section=self.section, title="First Chart")
         chart2 = repositories.create_chart(section=self.section, title="Second Chart", order=5)
 
-        self.assertEqual(chart1.order, 1)  # Automatické pořadí
+        self.assertEqual(chart1.order, repositories.ORDER_GAP)  # Automatické pořadí
         self.assertEqual(chart2.order, 5)  # Explicitně nastavené pořadí
 
     def test_create_chart_invalid_data_missing_title(self):
@@ -1027,7 +1168,7 @@ class SectionRepositoryTest(TestCase):
         self.assertIsInstance(table, Table)
         self.assertEqual(table.title, "Test Table")
         self.assertEqual(table.section, self.section)
-        self.assertEqual(table.order, 1)  # První tabulka v sekci
+        self.assertEqual(table.order, repositories.ORDER_GAP)  # První tabulka v sekci
 
     def test_create_table_valid_data_with_custom_order(self):
         """
@@ -1037,7 +1178,7 @@ class SectionRepositoryTest(TestCase):
         table1 = repositories.create_table(section=self.section, title="First Table")
         table2 = repositories.create_table(section=self.section, title="Second Table", order=5)
 
-        self.assertEqual(table1.order, 1)  # Automatické pořadí
+        self.assertEqual(table1.order, repositories.ORDER_GAP)  # Automatické pořadí
         self.assertEqual(table2.order, 5)  # Explicitně nastavené pořadí
 
     def test_create_table_invalid_data_missing_title(self):
@@ -1289,28 +1430,30 @@ class UtilsReorderContentTest(TestCase):
         self.assertEqual(ordered_elements[1].id, p1.id)  # Druhý by měl být p1
         self.assertEqual(ordered_elements[2].id, p3.id)  # Třetí by měl být p3
 
-        # Ověříme správné hodnoty `order`
-        self.assertEqual(ordered_elements[0].order, 1)
-        self.assertEqual(ordered_elements[1].order, 2)
-        self.assertEqual(ordered_elements[2].order, 3)
+        # Ověříme správné hodnoty `order` (rozestup ORDER_GAP)
+        self.assertEqual(ordered_elements[0].order, repositories.ORDER_GAP)
+        self.assertEqual(ordered_elements[1].order, 2 * repositories.ORDER_GAP)
+        self.assertEqual(ordered_elements[2].order, 3 * repositories.ORDER_GAP)
 
     def test_reorder_section_content_no_change_needed(self):
         """
         Testuje reorder_section_content, když jsou prvky již správně seřazené.
         Nemělo by dojít k žádné změně.
         """
-        p1 = Paragraph.objects.create(section=self.section, text="First paragraph", order=1)
-        p2 = Paragraph.objects.create(section=self.section, text="Second paragraph", order=2)
-        p3 = Paragraph.objects.create(section=self.section, text="Third paragraph", order=3)
+        gap = repositories.ORDER_GAP
+        p1 = Paragraph.objects.create(section=self.section, text="First paragraph", order=gap)
+        p2 = Paragraph.objects.create(section=self.section, text="Second paragraph", order=2 * gap)
+        p3 = Paragraph.objects.create(section=self.section, text="Third paragraph", order=3 * gap)
 
-        utils.reorder_section_content(self.section)
+        with self.assertNumQueries(1):  # Jen načtení (id, order), žádný UPDATE
+            utils.reorder_section_content(self.section)
 
         # Načteme prvky znovu z databáze
         ordered_elements = list(ContentElement.objects.filter(section=self.section).order_by("order"))
 
-        self.assertEqual(ordered_elements[0].order, 1)
-        self.assertEqual(ordered_elements[1].order, 2)
-        self.assertEqual(ordered_elements[2].order, 3)
+        self.assertEqual(ordered_elements[0].order, gap)
+        self.assertEqual(ordered_elements[1].order, 2 * gap)
+        self.assertEqual(ordered_elements[2].order, 3 * gap)
 
     def test_reorder_section_content_empty_section(self):
         """
@@ -1327,19 +1470,19 @@ class UtilsReorderContentTest(TestCase):
         Testuje reorder_section_content na složitějším scénáři s různými typy prvků.
         """
         # Vytvoříme prvky obsahu ve smíšeném pořadí
-        p1 = Paragraph.objects.create(section=self.section, text="Paragraph 1", order=1)
-        p2 = Paragraph.objects.create(section=self.section, text="Paragraph 2", order=2)
-        p3 = Paragraph.objects.create(section=self.section, text="Paragraph 3", order=3)
-        chart = Chart.objects.create(section=self.section, title="Chart 1", order=4)
-        p4 = Paragraph.objects.create(section=self.section, text="Paragraph 4", order=5)
-        p5 = Paragraph.objects.create(section=self.section, text="Paragraph 5", order=6)
-        table = Table.objects.create(section=self.section, title="Table 1", order=7)
-        p6 = Paragraph.objects.create(section=self.section, text="Paragraph 6", order=8)
-        p7 = Paragraph.objects.create(section=self.section, text="Paragraph 7", order=9)
-        p8 = Paragraph.objects.create(section=self.section, text="Paragraph 8", order=10)
+        p1 = Paragraph.objects.create(section=self.section, text="Paragraph 1", order=10)
+        p2 = Paragraph.objects.create(section=self.section, text="Paragraph 2", order=20)
+        p3 = Paragraph.objects.create(section=self.section, text="Paragraph 3", order=30)
+        chart = Chart.objects.create(section=self.section, title="Chart 1", order=40)
+        p4 = Paragraph.objects.create(section=self.section, text="Paragraph 4", order=50)
+        p5 = Paragraph.objects.create(section=self.section, text="Paragraph 5", order=60)
+        table = Table.objects.create(section=self.section, title="Table 1", order=70)
+        p6 = Paragraph.objects.create(section=self.section, text="Paragraph 6", order=80)
+        p7 = Paragraph.objects.create(section=self.section, text="Paragraph 7", order=90)
+        p8 = Paragraph.objects.create(section=self.section, text="Paragraph 8", order=100)
 
         # Nyní vložíme nový `Paragraph` mezi `Chart` a `Paragraph 4`
-        new_paragraph = Paragraph.objects.create(section=self.section, text="New Paragraph", order=4.5)
+        new_paragraph = Paragraph.objects.create(section=self.section, text="New Paragraph", order=45)
 
         # Spustíme funkci na přeuspořádání
         utils.reorder_section_content(self.section)
@@ -1359,7 +1502,7 @@ class UtilsReorderContentTest(TestCase):
 
         for i, element in enumerate(expected_order, start=1):
             self.assertEqual(ordered_elements[i - 1].id, element.id)
-            self.assertEqual(ordered_elements[i - 1].order, i)
+            self.assertEqual(ordered_elements[i - 1].order, i * repositories.ORDER_GAP)
 
 
 
@@ -1439,3 +1582,2219 @@ class GeneratePDFTest(TestCase):
 
         self.assertIn("Empty Report", pdf_text)  # Report by měl obsahovat název
         self.assertNotIn("Introduction", pdf_text)  # Neměl by obsahovat sekci
+
+    def test_generate_pdf_long_paragraph_flows_to_next_page(self):
+        """
+        Testuje, že dlouhý odstavec se zalomí a přeteče na další stránky.
+        """
+        long_text = " ".join(f"word{i}" for i in range(3000)) + " THE-END"
+        Paragraph.objects.create(section=self.section, text=long_text, order=4)
+
+        pdf_bytes = utils.generate_pdf(self.report)
+        pdf_reader = PdfReader(BytesIO(pdf_bytes))
+
+        self.assertGreater(len(pdf_reader.pages), 1)
+        self.assertIn("THE-END", pdf_reader.pages[-1].extract_text())
+
+    def test_generate_pdf_constant_query_count(self):
+        """
+        Testuje, že počet dotazů nezávisí na počtu sekcí.
+        """
+        for i in range(2, 12):
+            section = Section.objects.create(report=self.report, title=f"Section {i}", order=i)
+            Paragraph.objects.create(section=section, text=f"Paragraph {i}", order=1)
+            Chart.objects.create(section=section, title=f"Chart {i}", order=2)
+
+        # sekce + Paragraph/Chart/Table (autor reportu je už načtený)
+        with self.assertNumQueries(4):
+            utils.generate_pdf(self.report)
+
+    def test_report_pdf_view_streams_pdf(self):
+        """
+        Testuje exportní endpoint – odpověď je streamovaná a obsahuje platné PDF.
+        """
+        from django.urls import reverse
+
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse('reports:report_pdf', kwargs={'pk': self.report.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        pdf_bytes = b"".join(response.streaming_content)
+        self.assertEqual(len(pdf_bytes), int(response['Content-Length']))
+        pdf_text = PdfReader(BytesIO(pdf_bytes)).pages[0].extract_text()
+        self.assertIn("Test Report", pdf_text)
+
+
+    # -------------------- report tree loader --------------------
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+class ReportTreeRepositoryTest(TestCase):
+    """
+    Testy pro repositories.get_report_tree.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Tree Report", topic="Science", year=2024, author=self.user)
+
+    def _add_sections(self, count):
+        start = Section.objects.filter(report=self.report).count()  # Pořadí sekcí v reportu musí být unikátní
+        for i in range(start + 1, start + count + 1):
+            section = Section.objects.create(report=self.report, title=f"Section {i}", order=i)
+            Paragraph.objects.create(section=section, text=f"Paragraph {i}", order=1, author=self.user)
+            Chart.objects.create(section=section, title=f"Chart {i}", order=2, author=self.user)
+            Table.objects.create(section=section, title=f"Table {i}", order=3, author=self.user)
+
+    def test_get_report_tree_constant_query_count(self):
+        """
+        Testuje, že načtení i průchod celým stromem stojí konstantní počet dotazů.
+        """
+        self._add_sections(10)
+
+        # report + autor, sekce, Paragraph, Chart, Table
+        with self.assertNumQueries(5):
+            report = repositories.get_report_tree(self.report.pk)
+            for section in report.section_list:
+                self.assertEqual(len(section.element_list), 3)
+                for element in section.element_list:
+                    self.assertEqual(element.author.username, "testuser")
+                    self.assertEqual(element.section.report.title, "Tree Report")
+
+    def test_get_report_tree_orders_mixed_elements(self):
+        """
+        Testuje, že prvky různých typů jsou v sekci seřazené podle order.
+        """
+        section = Section.objects.create(report=self.report, title="Mixed", order=1)
+        table = Table.objects.create(section=section, title="Table", order=1)
+        paragraph = Paragraph.objects.create(section=section, text="Text", order=2)
+        chart = Chart.objects.create(section=section, title="Chart", order=3)
+
+        report = repositories.get_report_tree(self.report.pk)
+        elements = list(report.section_list[0].element_list)
+
+        self.assertEqual([e.pk for e in elements], [table.pk, paragraph.pk, chart.pk])
+        self.assertIsInstance(elements[0], Table)
+        self.assertIsInstance(elements[1], Paragraph)
+        self.assertIsInstance(elements[2], Chart)
+
+    def test_report_detail_view_query_count_independent_of_sections(self):
+        """
+        Testuje, že počet dotazů detailu reportu nezávisí na počtu sekcí.
+        """
+        self.client.login(username="testuser", password="testpassword")
+        url = reverse('reports:report_detail', kwargs={'pk': self.report.pk})
+        self._add_sections(2)
+        self.client.get(url)  # zahřátí (session, content types)
+
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self._add_sections(8)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+    # -------------------- fragment cache --------------------
+
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from reports import fragments
+
+class FragmentCacheTest(TestCase):
+    """
+    Testy pro cache HTML fragmentů publikovaných reportů (reports/fragments.py).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(
+            title="Published Report", topic="Science", year=2024, author=self.user,
+            status=Report.ReportStatus.PUBLISHED,
+        )
+        self.section = Section.objects.create(report=self.report, title="Intro", order=1)
+        self.paragraph = Paragraph.objects.create(section=self.section, text="Cached text", order=1, author=self.user)
+        self.url = reverse('reports:report_detail', kwargs={'pk': self.report.pk})
+        self.client.login(username="testuser", password="testpassword")
+
+    def test_published_detail_served_from_fragment_cache(self):
+        """
+        Testuje, že druhý požadavek na publikovaný report nenačítá prvky obsahu.
+        """
+        first = self.client.get(self.url)
+        self.assertContains(first, "Cached text")
+        self.assertIsNotNone(cache.get(fragments.section_cache_key(self.section.pk)))
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertContains(second, "Cached text")
+        self.assertFalse(any("reports_paragraph" in q['sql'] for q in queries.captured_queries))
+
+    def test_paragraph_save_invalidates_section_fragment(self):
+        """
+        Testuje, že uložení odstavce (post_save signál) zneplatní fragment sekce.
+        """
+        self.client.get(self.url)
+        self.paragraph.text = "Updated text"
+        self.paragraph.save()
+
+        self.assertIsNone(cache.get(fragments.section_cache_key(self.section.pk)))
+        response = self.client.get(self.url)
+        self.assertContains(response, "Updated text")
+        self.assertNotContains(response, "Cached text")
+
+    def test_open_report_is_not_cached(self):
+        """
+        Testuje, že rozpracovaný report se renderuje vždy znovu i s ovládacími prvky.
+        """
+        self.report.status = Report.ReportStatus.OPEN
+        self.report.save()
+
+        response = self.client.get(self.url)
+        self.assertContains(response, "move_element_up")
+        self.assertIsNone(cache.get(fragments.section_cache_key(self.section.pk)))
+
+    def test_warm_report_cache_command(self):
+        """
+        Testuje, že příkaz warm_report_cache předrenderuje sekce publikovaných reportů.
+        """
+        call_command('warm_report_cache', stdout=StringIO())
+
+        html = cache.get(fragments.section_cache_key(self.section.pk))
+        self.assertIn("Cached text", html)
+        self.assertNotIn("csrfmiddlewaretoken", html)
+
+
+    # -------------------- bulk reordering --------------------
+
+import json
+
+class BulkReorderingTest(TestCase):
+    """
+    Testy pro přeřazování sekcí a prvků obsahu hromadnými UPDATE dotazy.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = Section.objects.create(report=self.report, title="Section", order=1)
+
+    def _create_paragraphs(self, count):
+        return [
+            Paragraph.objects.create(section=self.section, text=f"P{i}", order=i)
+            for i in range(1, count + 1)
+        ]
+
+    def _ordered_ids(self):
+        return list(ContentElement.objects.filter(section=self.section).order_by('order').values_list('pk', flat=True))
+
+    def test_move_section_both_directions(self):
+        """
+        Testuje move_section oběma směry – mění se jen pořadí přesouvané sekce.
+        """
+        sections = [self.section] + [
+            Section.objects.create(report=self.report, title=f"Section {i}", order=i * repositories.ORDER_GAP)
+            for i in range(2, 6)
+        ]
+
+        services.move_section(sections[0], 4)
+        services.move_section(sections[4], 1)
+
+        ordered = list(Section.objects.filter(report=self.report).order_by('order'))
+        self.assertEqual([s.pk for s in ordered], [sections[i].pk for i in (4, 1, 2, 3, 0)])
+        gap = repositories.ORDER_GAP
+        self.assertEqual([s.order for s in ordered[1:4]], [2 * gap, 3 * gap, 4 * gap])  # Sourozenci zůstali beze změny
+
+    def test_move_content_element_constant_query_count(self):
+        """
+        Testuje, že přesun prvku stojí stejný počet dotazů v malé i velké sekci.
+        """
+        small = self._create_paragraphs(5)
+        with CaptureQueriesContext(connection) as small_queries:
+            services.move_content_element(small[0], 5)
+
+        Paragraph.objects.create(section=self.section, text="X", order=6)
+        for i in range(7, 201):
+            Paragraph.objects.create(section=self.section, text=f"P{i}", order=i)
+        element = ContentElement.objects.non_polymorphic().select_related('section').get(pk=small[1].pk)
+        with CaptureQueriesContext(connection) as large_queries:
+            services.move_content_element(element, 200)
+
+        self.assertEqual(len(small_queries.captured_queries), len(large_queries.captured_queries))
+        ids = self._ordered_ids()
+        self.assertEqual(ids[0], small[2].pk)
+        self.assertEqual(ids[-1], small[1].pk)
+        self.assertEqual(
+            list(ContentElement.objects.filter(section=self.section).order_by('order').values_list('order', flat=True))[:-1],
+            list(range(3, 201)) + [5 + repositories.ORDER_GAP],  # Kromě přesunutých prvků se nic nepřečíslovalo
+        )
+
+    def test_remove_content_element_keeps_sibling_orders(self):
+        """
+        Testuje, že smazání prvku nepřečíslovává ostatní prvky sekce.
+        """
+        p1, p2, p3 = self._create_paragraphs(3)
+        services.remove_content_element(p2)
+
+        self.assertEqual(self._ordered_ids(), [p1.pk, p3.pk])
+        p3.refresh_from_db()
+        self.assertEqual(p3.order, 3)
+
+    def test_apply_content_ordering(self):
+        """
+        Testuje nastavení kompletního pořadí prvků jedním voláním.
+        """
+        p1, p2, p3 = self._create_paragraphs(3)
+        services.apply_content_ordering(self.section, [p3.pk, p1.pk, p2.pk])
+        self.assertEqual(self._ordered_ids(), [p3.pk, p1.pk, p2.pk])
+
+    def test_apply_content_ordering_rejects_incomplete_list(self):
+        """
+        Testuje, že neúplný seznam ID vyvolá ValidationError a pořadí se nezmění.
+        """
+        p1, p2, p3 = self._create_paragraphs(3)
+        with self.assertRaises(ValidationError):
+            services.apply_content_ordering(self.section, [p3.pk, p1.pk])
+        self.assertEqual(self._ordered_ids(), [p1.pk, p2.pk, p3.pk])
+
+    def test_content_order_view(self):
+        """
+        Testuje JSON endpoint pro drag-and-drop řazení prvků sekce.
+        """
+        p1, p2 = self._create_paragraphs(2)
+        self.client.login(username="testuser", password="testpassword")
+        url = reverse('reports:content_order', kwargs={'pk': self.section.pk})
+
+        response = self.client.post(url, data=json.dumps({'element_ids': [p2.pk, p1.pk]}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._ordered_ids(), [p2.pk, p1.pk])
+
+        response = self.client.post(url, data=json.dumps({'element_ids': 'nope'}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+    # -------------------- gap ordering --------------------
+
+class GapOrderingTest(TestCase):
+    """
+    Testy pro řazení s rozestupy (ORDER_GAP) a příkaz compact_ordering.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+
+    def _orders(self):
+        return list(
+            ContentElement.objects.filter(section=self.section).order_by('order').values_list('pk', 'order')
+        )
+
+    def test_move_into_gap_updates_single_row(self):
+        """
+        Testuje, že přesun mezi dva sousedy zapíše jediný UPDATE a použije střed mezery.
+        """
+        gap = repositories.ORDER_GAP
+        p1, p2, p3 = [services.add_paragraph(section=self.section, text=f"P{i}") for i in range(1, 4)]
+
+        with CaptureQueriesContext(connection) as queries:
+            services.move_content_element(p3, 2)
+
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self._orders(), [(p1.pk, gap), (p3.pk, gap + gap // 2), (p2.pk, 2 * gap)])
+
+    def test_move_compacts_section_when_gap_is_exhausted(self):
+        """
+        Testuje, že když mezi sousedy dojde místo, sekce se přečísluje a přesun proběhne.
+        """
+        p1, p2, p3 = [
+            Paragraph.objects.create(section=self.section, text=f"P{i}", order=i) for i in range(1, 4)
+        ]
+
+        services.move_content_element(p3, 2)
+
+        self.assertEqual([pk for pk, _ in self._orders()], [p1.pk, p3.pk, p2.pk])
+        self.assertEqual(self._orders()[0][1], repositories.ORDER_GAP)
+
+    def test_compact_ordering_command(self):
+        """
+        Testuje, že compact_ordering přečísluje jen přeplněné sekce a --dry-run nic nemění.
+        """
+        crowded = [Paragraph.objects.create(section=self.section, text=f"P{i}", order=i) for i in range(1, 4)]
+        spaced_section = services.add_section(report=self.report, title="Spaced")
+        spaced = services.add_paragraph(section=spaced_section, text="Spaced")
+
+        call_command('compact_ordering', '--dry-run', stdout=StringIO())
+        self.assertEqual([order for _, order in self._orders()], [1, 2, 3])
+
+        call_command('compact_ordering', stdout=StringIO())
+        gap = repositories.ORDER_GAP
+        self.assertEqual(self._orders(), [(p.pk, i * gap) for i, p in enumerate(crowded, start=1)])
+        spaced.refresh_from_db()
+        self.assertEqual(spaced.order, gap)
+
+
+    # -------------------- chart render queue --------------------
+
+import shutil
+import tempfile
+from unittest import mock
+from django.test import override_settings
+from reports import series
+from reports.models import ChartRenderJob
+
+class ChartRenderQueueTest(TestCase):
+    """
+    Testy pro vykreslování grafů přes databázovou frontu a run_chart_workers.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+        self.chart = services.add_chart(section=self.section, title="Sales Chart", author=self.user)
+
+    def _chart(self):
+        return Chart.objects.get(pk=self.chart.pk)
+
+    def test_chart_update_view_enqueues_render_job(self):
+        """
+        Testuje, že uložení grafu ve view nic nekreslí, jen založí úlohu a graf je ve stavu RENDERING.
+        """
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.post(
+            reverse('reports:chart_edit', kwargs={'pk': self.chart.pk}),
+            {'title': "Sales Chart", 'chart_type': 'bar', 'color': '', 'data_x': "2020, 2021", 'data_y': "1.5, 2"},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        chart = self._chart()
+        self.assertEqual(chart.render_status, Chart.RenderStatus.RENDERING)
+        self.assertFalse(chart.dataset)
+        job = ChartRenderJob.objects.get(chart=chart)
+        self.assertEqual(job.status, ChartRenderJob.JobStatus.PENDING)
+        self.assertEqual(series.unpack_series(job.series)[1].tolist(), [1.5, 2.0])
+
+        response = self.client.get(reverse('reports:report_detail', kwargs={'pk': self.report.pk}))
+        self.assertContains(response, "Graf se vykresluje")
+
+    def test_run_chart_workers_stores_png(self):
+        """
+        Testuje, že worker (v hlavním procesu) uloží PNG a graf přepne do stavu READY.
+        """
+        job = services.request_chart_render(self.chart, 'line', ["2020", "2021"], [1, 2])
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+
+        chart = self._chart()
+        self.assertEqual(chart.render_status, Chart.RenderStatus.READY)
+        with chart.dataset.open('rb') as f:
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+        job.refresh_from_db()
+        self.assertEqual(job.status, ChartRenderJob.JobStatus.DONE)
+
+    def test_run_chart_workers_with_process_pool(self):
+        """
+        Testuje vykreslení v samostatném procesu poolu.
+        """
+        services.request_chart_render(self.chart, 'pie', ["a", "b"], [1, 3], color="red")
+        call_command('run_chart_workers', '--once', '--workers', '1', stdout=StringIO())
+
+        chart = self._chart()
+        self.assertEqual(chart.render_status, Chart.RenderStatus.READY)
+        self.assertTrue(chart.dataset.name.endswith(".png"))
+
+    def test_render_failure_marks_chart_failed(self):
+        """
+        Testuje, že chyba při kreslení označí úlohu i graf jako FAILED.
+        """
+        job = services.request_chart_render(self.chart, 'bar', ["a"], [1])
+
+        with mock.patch('reports.charts.render_chart_png', side_effect=RuntimeError("renderer crashed")):
+            call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ChartRenderJob.JobStatus.FAILED)
+        self.assertIn("renderer crashed", job.error)
+        self.assertEqual(self._chart().render_status, Chart.RenderStatus.FAILED)
+
+    def test_superseded_render_result_is_discarded(self):
+        """
+        Testuje, že výsledek starší úlohy se neuloží, pokud mezitím vznikla novější.
+        """
+        services.request_chart_render(self.chart, 'bar', ["a"], [1])
+        [old_job] = repositories.claim_chart_render_jobs(10)
+        services.request_chart_render(self.chart, 'bar', ["a"], [2])
+
+        services.complete_chart_render(old_job, b"stale")
+
+        chart = self._chart()
+        self.assertFalse(chart.dataset)
+        self.assertEqual(chart.render_status, Chart.RenderStatus.RENDERING)
+        self.assertEqual(ChartRenderJob.objects.filter(status=ChartRenderJob.JobStatus.PENDING).count(), 1)
+
+
+    # -------------------- chart image cache --------------------
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from reports import chart_cache, charts
+from reports.models import ChartImage
+
+class ChartImageCacheTest(TestCase):
+    """
+    Testy pro content-addressed cache obrázků grafů.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+
+    def _render(self, chart, y_data):
+        services.request_chart_render(chart, 'bar', ["2020", "2021"], y_data)
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+        return Chart.objects.get(pk=chart.pk)
+
+    def test_identical_chart_reuses_cached_image(self):
+        """
+        Testuje, že opětovné uložení stejného grafu použije uložený obrázek bez nové úlohy.
+        """
+        chart = self._render(services.add_chart(section=self.section, title="Sales"), [1, 2])
+
+        other = services.add_chart(section=self.section, title="Sales")
+        with mock.patch('reports.charts.render_chart_png') as render:
+            job = services.request_chart_render(other, 'bar', ["2020", "2021"], [1, 2])
+        render.assert_not_called()
+
+        self.assertIsNone(job)
+        other = Chart.objects.get(pk=other.pk)
+        self.assertEqual(other.render_status, Chart.RenderStatus.READY)
+        self.assertEqual(other.dataset.name, chart.dataset.name)
+        self.assertEqual(ChartImage.objects.count(), 1)
+        self.assertEqual(chart_cache.stats()['hits'], 1)
+        self.assertEqual(chart_cache.stats()['misses'], 1)
+
+    def test_same_title_different_data_does_not_collide(self):
+        """
+        Testuje, že grafy se stejným titulkem, ale jinými daty mají různé soubory.
+        """
+        first = self._render(services.add_chart(section=self.section, title="Sales"), [1, 2])
+        second = self._render(services.add_chart(section=self.section, title="Sales"), [3, 4])
+
+        self.assertNotEqual(first.dataset.name, second.dataset.name)
+        self.assertTrue(first.dataset.storage.exists(first.dataset.name))
+        self.assertEqual(ChartImage.objects.count(), 2)
+
+    def test_evict_removes_least_recently_used_unreferenced_images(self):
+        """
+        Testuje LRU vyřazování – mažou se nejstarší obrázky, na které neodkazuje žádný graf.
+        """
+        keys = [charts.chart_key(charts.chart_params(f"C{i}", 'line', ["a"], [i])) for i in range(3)]
+        paths = [chart_cache.store(key, b"x" * 100) for key in keys]
+        now = timezone.now()
+        for age, key in zip((30, 20, 10), keys):
+            ChartImage.objects.filter(key=key).update(last_used_at=now - timedelta(minutes=age))
+        services.add_chart(section=self.section, title="Pinned", dataset_file=paths[0])
+
+        removed = chart_cache.evict(max_bytes=150)
+
+        self.assertEqual(removed, 2)
+        self.assertEqual(list(ChartImage.objects.values_list('key', flat=True)), [keys[0]])
+        self.assertFalse(default_storage.exists(paths[1]))
+        self.assertTrue(default_storage.exists(paths[0]))
+
+
+    # -------------------- chart variants --------------------
+
+class ChartVariantTest(TestCase):
+    """
+    Testy pro varianty grafů generované na vyžádání a vektorové grafy v PDF.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+        self.chart = services.add_chart(section=self.section, title="Revenue Chart", author=self.user)
+        services.request_chart_render(self.chart, 'line', ["2020", "2021", "2022"], [1, 4, 2])
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+
+    def _url(self, variant):
+        return reverse('reports:chart_image', kwargs={'pk': self.chart.pk, 'variant': variant})
+
+    def test_chart_variant_rendered_on_first_request_and_cached(self):
+        """
+        Testuje, že první požadavek na SVG variantu ji jen zařadí do fronty (202 se zástupným
+        obrázkem, matplotlib se v požadavku nevolá), worker ji vykreslí a další požadavky ji
+        berou z cache.
+        """
+        self.client.login(username="testuser", password="testpassword")
+        with mock.patch('reports.charts.render_chart_variant') as render:
+            response = self.client.get(self._url('svg'))
+            self.client.get(self._url('svg'))
+        render.assert_not_called()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertEqual(ChartRenderJob.objects.filter(chart=self.chart, variant='svg').count(), 1)
+
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+        self.assertEqual(Chart.objects.get(pk=self.chart.pk).render_status, Chart.RenderStatus.READY)
+        response = self.client.get(self._url('svg'))
+        self.assertEqual(response.status_code, 302)
+        path = response['Location'].removeprefix(settings.MEDIA_URL)
+        with default_storage.open(path, 'rb') as f:
+            self.assertIn(b"<svg", f.read())
+
+        with mock.patch('reports.charts.render_chart_variant') as render:
+            response = self.client.get(self._url('svg'))
+        render.assert_not_called()
+        self.assertEqual(response['Location'].removeprefix(settings.MEDIA_URL), path)
+
+    def test_chart_image_requires_login_and_known_variant(self):
+        """
+        Testuje, že obrázky grafů vyžadují přihlášení a neznámá varianta vrátí 404 bez založení úlohy.
+        """
+        response = self.client.get(self._url('svg'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(settings.LOGIN_URL, response['Location'])
+
+        self.client.login(username="testuser", password="testpassword")
+        self.assertEqual(self.client.get(self._url('huge')).status_code, 404)
+        self.assertFalse(ChartRenderJob.objects.exclude(variant='').exists())
+
+    def test_report_detail_serves_srcset(self):
+        """
+        Testuje, že detail reportu nabízí prohlížeči PNG v několika šířkách přes srcset.
+        """
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse('reports:report_detail', kwargs={'pk': self.report.pk}))
+        self.assertContains(response, "srcset=")
+        self.assertContains(response, f"{self._url('sm')}?v=")
+        self.assertContains(response, "1200w")
+
+    def test_pdf_export_embeds_chart_drawing(self):
+        """
+        Testuje, že PDF export vloží graf jako vektorovou kresbu místo zástupného textu.
+        """
+        text = "".join(page.extract_text() for page in PdfReader(BytesIO(utils.generate_pdf(self.report))).pages)
+        self.assertIn("Revenue Chart", text)
+        self.assertIn("2021", text)  # Popisek osy X z kresby ReportLab
+        self.assertNotIn("Chart visualization not implemented", text)
+
+
+    # -------------------- chart series --------------------
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+import numpy as np
+
+class ChartSeriesTest(TestCase):
+    """
+    Testy pro uložení datových řad grafů jako binárního bloku NumPy (reports/series.py).
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+        self.chart = services.add_chart(section=self.section, title="Sensor Chart", author=self.user)
+        self.client.login(username="testuser", password="testpassword")
+
+    def _post(self, data):
+        data = {'title': "Sensor Chart", 'chart_type': 'line', 'color': '', **data}
+        return self.client.post(reverse('reports:chart_edit', kwargs={'pk': self.chart.pk}), data)
+
+    def test_pack_unpack_series_roundtrip(self):
+        """
+        Testuje, že zabalená řada se rozbalí beze ztráty (popisky i hodnoty float64).
+        """
+        x = np.array(["a", "b", "ččč"])
+        y = np.array([1.5, -2.0, 1e300])
+        unpacked_x, unpacked_y = series.unpack_series(series.pack_series(x, y))
+        self.assertEqual(unpacked_x.tolist(), x.tolist())
+        self.assertEqual(unpacked_y.dtype, np.float64)
+        self.assertEqual(unpacked_y.tolist(), y.tolist())
+        self.assertEqual(series.series_digest(x, y), series.series_digest(unpacked_x, unpacked_y))
+
+    def test_parse_series_text_rejects_invalid_input(self):
+        """
+        Testuje, že parsování odmítne nečíselné hodnoty, různé délky i nekonečna.
+        """
+        x, y = series.parse_series_text("2020, 2021", "1, 2.5")
+        self.assertEqual(y.tolist(), [1.0, 2.5])
+        for x_text, y_text in [("a,b", "1,x"), ("a,b,c", "1,2"), ("a,b", "1,inf")]:
+            with self.assertRaises(ValueError):
+                series.parse_series_text(x_text, y_text)
+
+    def test_chart_update_view_accepts_csv_upload(self):
+        """
+        Testuje, že dlouhou řadu lze nahrát jako CSV a uloží se do Chart.series.
+        """
+        rows = "\n".join(f"t{i},{i * 0.5}" for i in range(5000))
+        upload = SimpleUploadedFile("data.csv", rows.encode('utf-8'), content_type='text/csv')
+        response = self._post({'data_file': upload})
+
+        self.assertEqual(response.status_code, 302)
+        chart = Chart.objects.get(pk=self.chart.pk)
+        self.assertEqual(chart.render_params, {'title': "Sensor Chart", 'chart_type': 'line', 'color': None})
+        x, y = series.unpack_series(chart.series)
+        self.assertEqual(y.size, 5000)
+        self.assertEqual((x[-1], y[-1]), ("t4999", 2499.5))
+
+        # Dlouhá řada se do formuláře nepředvyplňuje, jen se shrne
+        response = self.client.get(reverse('reports:chart_edit', kwargs={'pk': self.chart.pk}))
+        self.assertContains(response, "Uloženo 5000 bodů")
+
+    def test_chart_update_view_keeps_stored_series(self):
+        """
+        Testuje, že bez nových dat se změní jen styl a uložená řada zůstane.
+        """
+        self._post({'data_x': "a, b", 'data_y': "1, 2"})
+        response = self._post({'chart_type': 'bar'})
+
+        self.assertEqual(response.status_code, 302)
+        chart = Chart.objects.get(pk=self.chart.pk)
+        self.assertEqual(chart.render_params['chart_type'], 'bar')
+        self.assertEqual(series.unpack_series(chart.series)[1].tolist(), [1.0, 2.0])
+
+        self.chart = services.add_chart(section=self.section, title="Empty Chart", author=self.user)
+        response = self._post({})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Zadejte data grafu")
+
+    def test_chart_variant_uses_stored_series(self):
+        """
+        Testuje, že worker i varianty kreslí z uložené řady a dlouhá osa X má omezený počet popisků.
+        """
+        labels = [f"t{i}" for i in range(1000)]
+        services.request_chart_render(self.chart, 'bar', labels, np.arange(1000.0))
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+
+        chart = Chart.objects.get(pk=self.chart.pk)
+        self.assertEqual(chart.render_status, Chart.RenderStatus.READY)
+        self.assertIsNone(services.get_chart_variant(chart, 'svg'))  # Varianta se kreslí ve workeru
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+        path = services.get_chart_variant(chart, 'svg')
+        with default_storage.open(path, 'rb') as f:
+            svg = f.read().decode('utf-8')
+        self.assertIn("t950", svg)
+        self.assertNotIn("t951", svg)
+
+
+    # -------------------- table refresh --------------------
+
+import os
+from django.core.files.base import ContentFile
+from data_sources import ingest
+from data_sources.models import DataSource, Data
+from reports import tables
+
+class TableRefreshTest(TestCase):
+    """
+    Testy pro obnovu Table.data z datového zdroje s detekcí změn (services.refresh_table).
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+        self.source = DataSource(name="rates.csv", source_type=DataSource.SourceType.CSV)
+        self.source.file.save("rates.csv", ContentFile(b"rok,hodnota\n2020,1\n2021,2\n"))
+        ingest.ingest_data_source(self.source)
+
+    def _update_source(self, content):
+        self.source.file.delete(save=False)
+        self.source.file.save("rates.csv", ContentFile(content))
+        ingest.ingest_data_source(self.source)
+
+    def test_add_table_materializes_ingested_source(self):
+        """
+        Testuje, že nová tabulka nad načteným zdrojem rovnou dostane jeho data.
+        """
+        table = services.add_table(section=self.section, title="Rates", data_source=self.source)
+
+        self.assertEqual(table.data, {
+            'columns': ["rok", "hodnota"], 'rows': [[2020, 1], [2021, 2]], 'row_count': 2, 'truncated': False,
+        })
+        self.assertEqual(table.data_fingerprint, utils.data_source_fingerprint(self.source))
+
+    def test_refresh_table_skips_unchanged_source(self):
+        """
+        Testuje, že obnova nezměněného zdroje nic nezapisuje a změněný zdroj data přepíše.
+        """
+        table = services.add_table(section=self.section, title="Rates", data_source=self.source)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(services.refresh_table(table))
+
+        self._update_source(b"rok,hodnota\n2020,1\n2021,2\n2022,3\n")
+        self.assertTrue(services.refresh_table(table))
+        table.refresh_from_db()
+        self.assertEqual(table.data['rows'][-1], [2022, 3])
+
+        with self.assertRaises(ValidationError):
+            services.refresh_table(services.add_table(section=self.section, title="Manual", data_source=None))
+
+    def test_refresh_tables_for_source_in_bulk(self):
+        """
+        Testuje, že všechny zastaralé tabulky zdroje se obnoví konstantním počtem dotazů.
+        """
+        tables = [services.add_table(section=self.section, title=f"Rates {i}", data_source=self.source) for i in range(5)]
+        self._update_source(b"rok,hodnota\n2030,9\n")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(services.refresh_tables_for_source(self.source), 5)
+        query_count = len(queries)
+        self.assertLess(query_count, 10)
+
+        for table in tables:
+            table.refresh_from_db()
+            self.assertEqual(table.data['rows'], [[2030, 9]])
+        self.assertEqual(services.refresh_tables_for_source(self.source), 0)
+
+        out = StringIO()
+        call_command('refresh_tables', '--force', stdout=out)
+        self.assertIn("Obnoveno 5 tabulek", out.getvalue())
+
+    def test_edit_table_refresh_data_truncates_large_source(self):
+        """
+        Testuje edit_table(refresh_data=True) a omezení počtu řádků kopírovaných do Table.data.
+        """
+        table = services.add_table(section=self.section, title="Rates", data_source=self.source)
+        self._update_source(("rok,hodnota\n" + "".join(f"{i},{i}\n" for i in range(50))).encode('utf-8'))
+
+        with mock.patch('reports.utils.TABLE_MAX_ROWS', 10):
+            table = services.edit_table(table, refresh_data=True)
+
+        table.refresh_from_db()
+        self.assertEqual(len(table.data['rows']), 10)
+        self.assertEqual(table.data['row_count'], 50)
+        self.assertTrue(table.data['truncated'])
+
+
+    # -------------------- paginated tables --------------------
+
+class TablePaginationTest(TestCase):
+    """
+    Testy pro stránkované zobrazení tabulek a JSON endpoint reports:table_rows (reports/tables.py).
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Test Report", topic="Science", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Section")
+        rows = [[f"obec-{i:03d}", (i * 37) % 200] for i in range(200)]
+        self.table = repositories.create_table(
+            section=self.section, title="Obce",
+            data={'columns': ["obec", "pocet"], 'rows': rows, 'row_count': 200, 'truncated': False},
+        )
+        self.client.login(username="testuser", password="testpassword")
+
+    def _rows(self, table=None, **params):
+        url = reverse('reports:table_rows', kwargs={'pk': (table or self.table).pk})
+        return self.client.get(url, params)
+
+    def test_report_detail_renders_only_first_table_page(self):
+        """
+        Testuje, že detail reportu vloží jen první stránku řádků (tables.TABLE_PAGE_SIZE) a odkaz na JSON endpoint.
+        """
+        url = reverse('reports:report_detail', kwargs={'pk': self.report.pk})
+        response = self.client.get(url)
+
+        self.assertContains(response, "obec-049")
+        self.assertNotContains(response, "obec-050")
+        self.assertContains(response, 'data-page-size="50"')
+        self.assertContains(response, reverse('reports:table_rows', kwargs={'pk': self.table.pk}))
+        self.assertContains(response, "Řádků: 200")
+
+        with mock.patch('reports.tables.TABLE_PAGE_SIZE', 20):
+            response = self.client.get(url)
+        self.assertContains(response, "obec-019")
+        self.assertNotContains(response, "obec-020")
+        self.assertContains(response, 'data-page-size="20"')
+
+    def test_table_rows_endpoint_returns_requested_page(self):
+        """
+        Testuje, že endpoint vrátí požadovaný rozsah řádků a celkový počet.
+        """
+        page = self._rows(offset=50, limit=20).json()
+
+        self.assertEqual(page['total'], 200)
+        self.assertEqual(len(page['rows']), 20)
+        self.assertEqual(page['rows'][0], ["obec-050", (50 * 37) % 200])
+        self.assertEqual(self._rows(limit=10_000).json()['limit'], tables.TABLE_MAX_PAGE_SIZE)
+
+    def test_table_rows_sort_and_filter(self):
+        """
+        Testuje řazení podle sloupce a filtrování řádků podle textu.
+        """
+        page = self._rows(sort=1, desc=1, limit=3).json()
+        self.assertEqual([row[1] for row in page['rows']], [199, 198, 197])
+
+        page = self._rows(q="OBEC-19", sort=1).json()
+        self.assertEqual(page['total'], 10)
+        self.assertEqual([row[1] for row in page['rows']], sorted(row[1] for row in page['rows']))
+        self.assertTrue(all(row[0].startswith("obec-19") for row in page['rows']))
+
+    def test_table_rows_read_truncated_rows_from_source(self):
+        """
+        Testuje, že řádky nad rámec Table.data se čtou ze zdroje (řádkového i sloupcového).
+        """
+        content = ("rok,hodnota\n" + "".join(f"{2000 + i},{i % 7}\n" for i in range(30))).encode('utf-8')
+        for storage in (DataSource.Storage.ROWS, DataSource.Storage.COLUMNAR):
+            source = DataSource(name=f"{storage}.csv", source_type=DataSource.SourceType.CSV, storage=storage)
+            source.file.save(source.name, ContentFile(content))
+            ingest.ingest_data_source(source, chunk_rows=8)
+            with mock.patch('reports.utils.TABLE_MAX_ROWS', 10):
+                table = services.add_table(section=self.section, title=storage, data_source=source)
+            self.assertTrue(table.data['truncated'])
+
+            page = self._rows(table, offset=20, limit=5).json()
+            self.assertEqual(page['total'], 30)
+            self.assertEqual([row[0] for row in page['rows']], [2020, 2021, 2022, 2023, 2024])
+
+            page = self._rows(table, sort=1, desc=1, limit=30).json()
+            self.assertEqual(page['total'], 30)
+            self.assertEqual(page['rows'][0][1], 6)
+            self.assertEqual(page['rows'][-1][1], 0)
+
+    def test_table_rows_descending_sort_keeps_ties_in_source_order(self):
+        """
+        Testuje, že sestupné řazení zachová pořadí zdroje u shodných hodnot.
+        """
+        table = repositories.create_table(
+            section=self.section, title="Shody",
+            data={'columns': ["kod", "hodnota"], 'rows': [["a", 1], ["b", 2], ["c", 1], ["d", 2], ["e", None]],
+                  'row_count': 5, 'truncated': False},
+        )
+
+        page = self._rows(table, sort=1, desc=1).json()
+        self.assertEqual([row[0] for row in page['rows']], ["b", "d", "a", "c", "e"])
+        page = self._rows(table, sort=1).json()
+        self.assertEqual([row[0] for row in page['rows']], ["a", "c", "b", "d", "e"])
+
+    def test_table_rows_reuse_cached_order_until_source_changes(self):
+        """
+        Testuje, že další stránky téhož řazení použijí pořadí z cache a čtou jen bloky stránky,
+        dokud se data zdroje nezmění.
+        """
+        cache.clear()
+        content = ("rok,hodnota\n" + "".join(f"{2000 + i},{i % 7}\n" for i in range(30))).encode('utf-8')
+        source = DataSource(name="rows.csv", source_type=DataSource.SourceType.CSV)
+        source.file.save(source.name, ContentFile(content))
+        ingest.ingest_data_source(source, chunk_rows=8)
+        with mock.patch('reports.utils.TABLE_MAX_ROWS', 10):
+            table = services.add_table(section=self.section, title="Zkrácená", data_source=source)
+
+        first = self._rows(table, sort=1, limit=5).json()
+        with mock.patch('reports.tables._ordered_positions', side_effect=AssertionError), \
+                CaptureQueriesContext(connection) as queries:
+            second = self._rows(table, sort=1, offset=5, limit=5).json()
+        self.assertEqual([row[1] for row in first['rows'] + second['rows']], [0] * 5 + [1] * 5)
+        self.assertEqual([row[0] for row in second['rows']], [2001, 2008, 2015, 2022, 2029])
+        self.assertEqual(sum('"start_row" IN' in query['sql'] for query in queries), 1)  # Jen bloky s řádky stránky
+
+        source.file.save(source.name, ContentFile(content.replace(b"2000,0", b"2000,9")))
+        ingest.ingest_data_source(source, chunk_rows=8)
+        page = self._rows(table, sort=1, desc=1, limit=1).json()
+        self.assertEqual(page['rows'], [[2000, 9]])
+
+    def test_table_rows_invalid_parameters(self):
+        """
+        Testuje, že neplatné parametry vrátí 400, neexistující tabulka 404 a nepřihlášený uživatel přesměrování.
+        """
+        self.assertEqual(self._rows(offset="x").status_code, 400)
+        self.assertEqual(self._rows(sort=5).status_code, 400)
+        self.assertEqual(self._rows(limit=0).status_code, 400)
+        self.assertEqual(self.client.get(reverse('reports:table_rows', kwargs={'pk': 9999})).status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self._rows().status_code, 302)
+
+
+    # -------------------- full-text search --------------------
+
+from reports import search
+from reports.models import SearchDocument, SearchPosting
+
+class SearchIndexTest(TestCase):
+    """
+    Testy pro fulltextový index reportů (reports/search.py).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Nezaměstnanost v krajích", topic="Trh práce", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Středočeský kraj")
+
+    def test_tokenize_folds_case_and_diacritics(self):
+        """
+        Testuje, že slova se normalizují na malá písmena bez diakritiky a drží pozice v textu.
+        """
+        text = "Středočeský KRAJ, a 2024"
+        tokens = search.tokenize(text)
+        self.assertEqual([term for term, _, _ in tokens], ["stredocesky", "kraj", "2024"])
+        _, start, end = tokens[0]
+        self.assertEqual(text[start:end], "Středočeský")
+
+    def test_search_ranks_and_highlights_matches(self):
+        """
+        Testuje, že výsledky obsahují všechna slova, řadí se podle relevance a zvýrazňují shody.
+        """
+        once = services.add_paragraph(section=self.section, text="<p>Míra nezaměstnanosti v kraji klesla.</p>")
+        twice = services.add_paragraph(section=self.section, text="<p>Nezaměstnanosti a zase nezaměstnanosti v kraji.</p>")
+        services.add_paragraph(section=self.section, text="<p>Nezaměstnanosti bez druhého slova.</p>")
+
+        found = search.search("nezamestnanosti KRAJI")
+
+        self.assertEqual(found['total'], 2)
+        self.assertEqual([result['object_id'] for result in found['results']], [twice.pk, once.pk])
+        self.assertIn("<mark>Nezaměstnanosti</mark>", found['results'][0]['snippet'])
+        self.assertNotIn("<p>", found['results'][0]['snippet'])
+        self.assertEqual(search.search("neexistujici")['total'], 0)
+
+    def test_search_index_follows_edits_and_deletes(self):
+        """
+        Testuje průběžnou aktualizaci indexu při úpravě a smazání objektů.
+        """
+        paragraph = services.add_paragraph(section=self.section, text="Inflace rostla.")
+        self.assertEqual(search.search("inflace")['total'], 1)
+
+        services.edit_paragraph(paragraph, "Mzdy rostly.")
+        self.assertEqual(search.search("inflace")['total'], 0)
+        self.assertEqual(search.search("mzdy")['total'], 1)
+
+        with self.assertNumQueries(1):  # Nezměněný text se znovu neindexuje
+            search.index_object(paragraph)
+
+        services.remove_content_element(paragraph)
+        self.assertEqual(search.search("mzdy")['total'], 0)
+        self.assertEqual(search.search("stredocesky")['results'][0]['kind'], SearchDocument.Kind.SECTION)
+
+        self.report.delete()
+        self.assertFalse(SearchPosting.objects.exists())
+
+    def test_search_view_paginates_and_hides_unpublished(self):
+        """
+        Testuje, že nepřihlášený uživatel vidí jen publikované reporty a výsledky jsou stránkované.
+        """
+        published = Report.objects.create(title="Publikovaný", topic="Trh práce", year=2023, author=self.user)
+        published_section = services.add_section(report=published, title="Sekce")
+        for i in range(search.SEARCH_PAGE_SIZE + 5):
+            services.add_paragraph(section=published_section, text=f"Odstavec o mzdách číslo {i}")
+        ContentElement.objects.filter(section=published_section).update(status=ContentElement.ContentElementStatus.APPROVED)
+        services.publish_report(published, self.user)
+        services.add_paragraph(section=self.section, text="Draft o mzdách")
+
+        response = self.client.get(reverse('reports:search'), {'q': "mzdach"})
+        self.assertContains(response, "Nalezeno výsledků: 25")
+        self.assertEqual(len(response.context['results']), search.SEARCH_PAGE_SIZE)
+        self.assertTrue(response.context['has_next'])
+        self.assertEqual(len(self.client.get(reverse('reports:search'), {'q': "mzdach", 'page': 2}).context['results']), 5)
+
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse('reports:search'), {'q': "mzdach"})
+        self.assertContains(response, "Nalezeno výsledků: 26")
+
+    def test_public_search_reads_published_version(self):
+        """
+        Testuje, že nepřihlášený uživatel vidí titulky a úryvky z publikované verze,
+        ne úpravy provedené po publikaci.
+        """
+        paragraph = services.add_paragraph(section=self.section, text="<p>Mzdy v kraji rostly.</p>")
+        ContentElement.objects.filter(pk=paragraph.pk).update(status=ContentElement.ContentElementStatus.APPROVED)
+        services.publish_report(self.report, self.user)
+
+        services.edit_paragraph(Paragraph.objects.get(pk=paragraph.pk), "<p>Mzdy v kraji klesaly.</p>")
+        repositories.update_report(self.report, title="Nový titulek")
+
+        found = search.search("mzdy", published_only=True)
+        self.assertEqual(found['total'], 1)
+        self.assertIn("rostly", found['results'][0]['snippet'])
+        self.assertEqual(found['results'][0]['report_title'], "Nezaměstnanost v krajích")
+        self.assertEqual(search.search("klesaly", published_only=True)['total'], 0)
+        response = self.client.get(reverse('reports:search'), {'q': "mzdy"})
+        self.assertContains(response, reverse('reports:report_snapshot', kwargs={'pk': self.report.pk}))
+        self.assertNotContains(response, "klesaly")
+
+        self.assertIn("klesaly", search.search("mzdy")['results'][0]['snippet'])  # Přihlášení hledají v živých datech
+        services.remove_content_element(Paragraph.objects.get(pk=paragraph.pk))
+        self.assertEqual(search.search("mzdy", published_only=True)['total'], 1)
+
+        services.publish_report(self.report, self.user)
+        self.assertEqual(search.search("mzdy", published_only=True)['total'], 0)
+        self.assertEqual(search.search("titulek", published_only=True)['results'][0]['report_title'], "Nový titulek")
+
+    def test_rebuild_search_index_command(self):
+        """
+        Testuje, že příkaz znovu sestaví index se stejným obsahem.
+        """
+        services.add_paragraph(section=self.section, text="Inflace a mzdy.")
+        SearchDocument.objects.all().delete()
+        self.assertEqual(search.search("inflace")['total'], 0)
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn("Zaindexováno 3 dokumentů", out.getvalue())
+        self.assertEqual(search.search("inflace mzdy")['total'], 1)
+        self.assertEqual(search.search("trh prace")['results'][0]['kind'], SearchDocument.Kind.REPORT)
+
+
+    # -------------------- indexes and order constraints --------------------
+
+from django.db import IntegrityError
+
+class OrderConstraintTest(TestCase):
+    """
+    Testy pro unikátní pořadí (rodič, order) a indexy hlavních dotazů.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Sekce")
+
+    def test_duplicate_order_is_rejected(self):
+        """
+        Testuje, že dvě sekce reportu ani dva prvky sekce nemohou mít stejné pořadí.
+        """
+        paragraph = services.add_paragraph(section=self.section, text="Odstavec")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Section.objects.create(report=self.report, title="Duplicitní", order=self.section.order)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Paragraph.objects.create(section=self.section, text="Duplicitní", order=paragraph.order)
+
+    def test_full_reordering_swaps_orders_under_constraint(self):
+        """
+        Testuje, že obrácení pořadí (prohození obsazených hodnot) projde i s unikátním omezením.
+        """
+        sections = [self.section] + [services.add_section(report=self.report, title=f"Sekce {i}") for i in range(3)]
+        elements = [services.add_paragraph(section=self.section, text=f"Odstavec {i}") for i in range(4)]
+
+        services.apply_section_ordering(self.report, [section.pk for section in reversed(sections)])
+        services.apply_content_ordering(self.section, [element.pk for element in reversed(elements)])
+
+        self.assertEqual(
+            list(Section.objects.filter(report=self.report).order_by('order').values_list('pk', flat=True)),
+            [section.pk for section in reversed(sections)],
+        )
+        self.assertEqual(
+            list(ContentElement.objects.filter(section=self.section).order_by('order').values_list('pk', flat=True)),
+            [element.pk for element in reversed(elements)],
+        )
+        self.assertEqual(
+            list(ContentElement.objects.filter(section=self.section).order_by('order').values_list('order', flat=True)),
+            [i * repositories.ORDER_GAP for i in range(1, 5)],
+        )
+
+    def test_append_computes_order_after_locking_parent(self):
+        """
+        Testuje, že připojení sekce a prvků na konec spočítá pořadí až po zamčení rodiče (report, sekce).
+        """
+        calls = mock.Mock()
+        with mock.patch('reports.repositories.lock_report', wraps=repositories.lock_report) as lock_report, \
+                mock.patch('reports.repositories.lock_section', wraps=repositories.lock_section) as lock_section, \
+                mock.patch('reports.repositories.next_order', wraps=repositories.next_order) as next_order:
+            calls.attach_mock(lock_report, 'lock_report')
+            calls.attach_mock(lock_section, 'lock_section')
+            calls.attach_mock(next_order, 'next_order')
+            services.add_section(report=self.report, title="Druhá")
+            services.add_paragraph(section=self.section, text="Odstavec")
+            services.add_elements(self.section, [{'type': 'chart', 'title': "Graf"}])
+
+        self.assertEqual([call[0] for call in calls.mock_calls], [
+            'lock_report', 'next_order', 'lock_section', 'next_order', 'lock_section', 'next_order',
+        ])
+        self.assertEqual(calls.mock_calls[0], mock.call.lock_report(self.report.pk))
+        self.assertEqual(calls.mock_calls[2], mock.call.lock_section(self.section.pk))
+
+    def test_explain_queries_uses_indexes(self):
+        """
+        Testuje, že příkaz vypíše plány dotazů a žádný dotaz neprochází celou tabulku.
+        """
+        out = StringIO()
+        call_command('explain_queries', '--repeat', '1', '--fail-on-scan', stdout=out)
+
+        self.assertIn("Otevřené reporty", out.getvalue())
+        self.assertIn("report_status_year_idx", out.getvalue())
+        self.assertIn("Dotazů bez indexu: 0", out.getvalue())
+
+
+    # -------------------- keyset pagination --------------------
+
+class ReportListPaginationTest(TestCase):
+    """
+    Testy pro stránkování seznamů reportů podle klíče (year, id).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.published = [
+            Report.objects.create(title=f"Publikovaný {i}", topic="Téma", year=2020 + i % 3, author=self.user,
+                                  status=Report.ReportStatus.PUBLISHED)
+            for i in range(repositories.REPORT_PAGE_SIZE + 7)
+        ]
+        self.open = Report.objects.create(title="Rozpracovaný", topic="Téma", year=2024, author=self.user)
+        self.expected = [report.pk for report in sorted(self.published, key=lambda r: (r.year, r.pk), reverse=True)]
+
+    def test_get_reports_page_walks_all_reports_in_order(self):
+        """
+        Testuje, že stránky navazují bez mezer a duplicit i u reportů se stejným rokem.
+        """
+        seen, after = [], None
+        while True:
+            reports, after = repositories.get_reports_page([Report.ReportStatus.PUBLISHED], after=after, limit=4)
+            seen.extend(report.pk for report in reports)
+            if after is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+        with self.assertNumQueries(1):  # Autor je součástí dotazu
+            reports, _ = repositories.get_reports_page([Report.ReportStatus.PUBLISHED])
+            [report.author.username for report in reports]
+
+    def test_list_views_paginate_by_cursor(self):
+        """
+        Testuje, že seznam zobrazí jednu stránku a odkaz na další pomocí kurzoru.
+        """
+        url = reverse('reports:published_report_list')
+        response = self.client.get(url)
+        first_page = [report.pk for report in response.context['reports']]
+        self.assertEqual(first_page, self.expected[:repositories.REPORT_PAGE_SIZE])
+        self.assertContains(response, f"?after={response.context['next_cursor']}")
+
+        response = self.client.get(url, {'after': response.context['next_cursor']})
+        self.assertEqual([report.pk for report in response.context['reports']], self.expected[repositories.REPORT_PAGE_SIZE:])
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertEqual(self.client.get(url, {'after': "x"}).status_code, 404)
+
+        response = self.client.get(reverse('reports:open_report_list'))
+        self.assertEqual(list(response.context['reports']), [self.open])
+
+    def test_report_list_api(self):
+        """
+        Testuje JSON seznam reportů s kurzorem a chybné parametry.
+        """
+        url = reverse('reports:report_list_api')
+        data = self.client.get(url, {'status': 'published', 'limit': 30}).json()
+        self.assertEqual([item['id'] for item in data['results']], self.expected[:repositories.REPORT_PAGE_SIZE])
+        self.assertEqual(data['results'][0]['author'], "testuser")
+
+        data = self.client.get(url, {'status': 'published', 'after': data['next']}).json()
+        self.assertEqual([item['id'] for item in data['results']], self.expected[repositories.REPORT_PAGE_SIZE:])
+        self.assertIsNone(data['next'])
+
+        self.assertEqual([item['id'] for item in self.client.get(url, {'status': 'open'}).json()['results']], [self.open.pk])
+        self.assertEqual(self.client.get(url, {'status': 'deleted'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'after': '2024'}).status_code, 400)
+
+
+    # -------------------- publish pipeline --------------------
+
+class PublishPipelineTest(TestCase):
+    """
+    Testy pro kontrolu připravenosti k publikaci a hromadné schválení prvků.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+
+    def _add_section(self, status=ContentElement.ContentElementStatus.APPROVED):
+        section = services.add_section(report=self.report, title=f"Sekce {self.report.sections.count() + 1}")
+        for element in (services.add_paragraph(section=section, text="Odstavec"), services.add_chart(section=section, title="Graf")):
+            ContentElement.objects.filter(pk=element.pk).update(status=status)
+        return section
+
+    def test_publish_readiness_query_count_independent_of_size(self):
+        """
+        Testuje, že kontrola připravenosti je jeden dotaz a publikace nezávisí na počtu sekcí.
+        """
+        self._add_section()
+        with self.assertNumQueries(1):
+            self.assertFalse(repositories.has_unapproved_elements(self.report))
+        services.publish_report(self.report, self.user)  # Obě měřené publikace nahrazují předchozí verzi v indexu
+        with CaptureQueriesContext(connection) as small:
+            services.publish_report(self.report, self.user)
+
+        self.report.status = Report.ReportStatus.OPEN
+        self.report.save()
+        for _ in range(5):
+            self._add_section()
+        with CaptureQueriesContext(connection) as large:
+            services.publish_report(self.report, self.user)
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(Report.objects.get(pk=self.report.pk).status, Report.ReportStatus.PUBLISHED)
+
+    def test_publish_report_reports_blockers(self):
+        """
+        Testuje, že neúspěšná publikace vrátí seznam prvků, které ji blokují.
+        """
+        self._add_section()
+        blocked = self._add_section(status=ContentElement.ContentElementStatus.STAGED)
+
+        blockers = services.get_publish_blockers(self.report)
+        self.assertEqual([(b['section_id'], b['type'], b['status']) for b in blockers], [
+            (blocked.pk, 'paragraph', 'STAGED'), (blocked.pk, 'chart', 'STAGED'),
+        ])
+        with self.assertRaises(ValidationError) as context:
+            services.publish_report(self.report, self.user)
+        self.assertEqual(context.exception.params['blockers'], blockers)
+        self.assertEqual(Report.objects.get(pk=self.report.pk).status, Report.ReportStatus.OPEN)
+
+    def test_publish_checks_approval_after_locking_report(self):
+        """
+        Testuje, že kontrola neschválených prvků proběhne v transakci publikace až po zamčení řádku reportu.
+        """
+        self._add_section()
+        calls = mock.Mock()
+        outer = len(connection.savepoint_ids)  # TestCase už běží v transakci
+
+        def check(report):
+            calls.check(len(connection.savepoint_ids) > outer)  # Uvnitř transaction.atomic() publikace
+            return False
+
+        with mock.patch('reports.repositories.lock_report', side_effect=lambda pk: calls.lock(pk)), \
+                mock.patch('reports.repositories.has_unapproved_elements', side_effect=check):
+            services.publish_report(self.report, self.user)
+
+        self.assertEqual(calls.mock_calls, [mock.call.lock(self.report.pk), mock.call.check(True)])
+
+    def test_approve_staged_elements_single_update(self):
+        """
+        Testuje hromadné schválení STAGED prvků sekce a reportu jedním UPDATE (DRAFT zůstává).
+        """
+        first = self._add_section(status=ContentElement.ContentElementStatus.STAGED)
+        second = self._add_section(status=ContentElement.ContentElementStatus.STAGED)
+        draft = services.add_paragraph(section=second, text="Koncept")
+
+        self.assertEqual(services.approve_staged_elements(section=first), 2)
+        self.assertEqual(ContentElement.objects.filter(section=second, status=ContentElement.ContentElementStatus.STAGED).count(), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(services.approve_staged_elements(report=self.report), 2)
+        element_updates = [q for q in queries.captured_queries if q['sql'].startswith(f'UPDATE "{ContentElement._meta.db_table}"')]
+        self.assertEqual(len(element_updates), 1)
+
+        self.assertEqual([b['id'] for b in services.get_publish_blockers(self.report)], [draft.pk])
+        with self.assertRaises(ValidationError):
+            services.approve_staged_elements()
+
+
+    # -------------------- published snapshots --------------------
+
+from reports import chart_cache, snapshots
+from reports.models import ReportSnapshot, SnapshotTableChunk
+
+class ReportSnapshotTest(TestCase):
+    """
+    Testy pro neměnné verze publikovaných reportů (reports/snapshots.py).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Úvod")
+        self.paragraph = services.add_paragraph(section=self.section, text="<p>Původní text</p>")
+        ContentElement.objects.filter(pk=self.paragraph.pk).update(status=ContentElement.ContentElementStatus.APPROVED)
+
+    def test_publish_creates_versioned_snapshot(self):
+        """
+        Testuje, že každá publikace uloží novou verzi se stromem reportu, HTML a PDF.
+        """
+        services.publish_report(self.report, self.user)
+        services.publish_report(self.report, self.user)
+
+        first, second = ReportSnapshot.objects.filter(report=self.report).order_by('version')
+        self.assertEqual((first.version, second.version), (1, 2))
+        content = snapshots.read_content(first)
+        self.assertEqual(content['report']['author'], "testuser")
+        self.assertEqual(content['sections'][0]['elements'][0], {
+            'id': self.paragraph.pk, 'type': 'paragraph', 'status': 'APPROVED', 'text': "<p>Původní text</p>",
+        })
+        self.assertIn("Původní text", first.html)
+        self.assertTrue(bytes(first.pdf).startswith(b"%PDF"))
+        self.assertEqual(first.published_by, self.user)
+
+        with self.assertRaises(ValueError):
+            first.save()
+
+    def test_published_version_ignores_later_edits(self):
+        """
+        Testuje, že úprava reportu po publikaci nezmění publikovanou verzi.
+        """
+        services.publish_report(self.report, self.user)
+        services.edit_paragraph(Paragraph.objects.get(pk=self.paragraph.pk), "<p>Nový text</p>")
+
+        response = self.client.get(reverse('reports:report_snapshot', kwargs={'pk': self.report.pk}))
+        self.assertContains(response, "Původní text")
+        self.assertNotContains(response, "Nový text")
+
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse('reports:report_detail', kwargs={'pk': self.report.pk}))
+        self.assertContains(response, "Původní text")
+        self.assertEqual(response.context['snapshot_version'], 1)
+
+        services.publish_report(self.report, self.user)
+        response = self.client.get(reverse('reports:report_snapshot', kwargs={'pk': self.report.pk}))
+        self.assertContains(response, "Nový text")
+
+    def test_snapshot_page_is_one_row_fetch(self):
+        """
+        Testuje, že stránka publikované verze načte snapshot jedním dotazem (+ seznam verzí).
+        """
+        for _ in range(3):
+            services.add_paragraph(section=services.add_section(report=self.report, title="Sekce"), text="Text")
+        ContentElement.objects.filter(section__report=self.report).update(status=ContentElement.ContentElementStatus.APPROVED)
+        services.publish_report(self.report, self.user)
+
+        with self.assertNumQueries(1):
+            snapshot = snapshots.get_snapshot(self.report.pk)
+            self.assertIn("Původní text", snapshot.html)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('reports:report_snapshot', kwargs={'pk': self.report.pk}))
+
+    def test_snapshot_versions_and_pdf(self):
+        """
+        Testuje dostupnost starších verzí, PDF verze a přesměrování reportu bez snapshotu.
+        """
+        url = reverse('reports:report_snapshot', kwargs={'pk': self.report.pk})
+        self.assertRedirects(self.client.get(url), reverse('reports:report_detail', kwargs={'pk': self.report.pk}),
+                             fetch_redirect_response=False)
+
+        services.publish_report(self.report, self.user)
+        services.edit_paragraph(Paragraph.objects.get(pk=self.paragraph.pk), "<p>Nový text</p>")
+        services.publish_report(self.report, self.user)
+
+        response = self.client.get(reverse('reports:report_snapshot_version', kwargs={'pk': self.report.pk, 'version': 1}))
+        self.assertContains(response, "Původní text")
+        self.assertEqual(
+            self.client.get(reverse('reports:report_snapshot_version', kwargs={'pk': self.report.pk, 'version': 3})).status_code,
+            404,
+        )
+
+        response = self.client.get(reverse('reports:report_snapshot_pdf', kwargs={'pk': self.report.pk, 'version': 1}))
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response.content.startswith(b"%PDF"))
+
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse('reports:report_pdf', kwargs={'pk': self.report.pk}))
+        self.assertRedirects(response, reverse('reports:report_snapshot_pdf', kwargs={'pk': self.report.pk, 'version': 2}),
+                             fetch_redirect_response=False)
+
+    def test_snapshot_keeps_chart_files_and_table_rows(self):
+        """
+        Testuje, že HTML snapshotu odkazuje na soubory variant grafu z cache a řádky tabulky uložené
+        ve verzi, ne na živé grafy a tabulky, a že cache obrázků soubory snapshotu nevyřadí.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        chart = services.add_chart(section=self.section, title="Tržby")
+        services.request_chart_render(chart, 'bar', ["2021", "2022"], [1.0, 2.0])
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+        for variant in snapshots.SNAPSHOT_CHART_VARIANTS:  # Varianty vyžádané při prohlížení reportu
+            services.get_chart_variant(Chart.objects.get(pk=chart.pk), variant)
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+        rows = [[f"obec-{i:03d}", i] for i in range(80)]
+        table = repositories.create_table(
+            section=self.section, title="Obce",
+            data={'columns': ["obec", "pocet"], 'rows': rows, 'row_count': 80, 'truncated': False},
+        )
+        ContentElement.objects.filter(section=self.section).update(status=ContentElement.ContentElementStatus.APPROVED)
+        with mock.patch('reports.snapshots.SNAPSHOT_TABLE_CHUNK_ROWS', 30):
+            services.publish_report(self.report, self.user)
+
+        snapshot = ReportSnapshot.objects.get(report=self.report)
+        self.assertEqual(snapshots.read_content(snapshot)['sections'][0]['elements'][2]['columns'], ["obec", "pocet"])
+        self.assertEqual(
+            list(SnapshotTableChunk.objects.filter(table__snapshot=snapshot).values_list('start_row', 'row_count')),
+            [(0, 30), (30, 30), (60, 20)],
+        )
+        variants = snapshots.read_content(snapshot)['sections'][0]['elements'][1]['variants']
+        self.assertEqual(set(variants), set(snapshots.SNAPSHOT_CHART_VARIANTS))
+        self.assertNotIn(reverse('reports:chart_image', kwargs={'pk': chart.pk, 'variant': 'md'}), snapshot.html)
+        live_rows_url = reverse('reports:table_rows', kwargs={'pk': table.pk})
+        self.assertNotIn(f'data-rows-url="{live_rows_url}"', snapshot.html)
+        self.assertIn(default_storage.url(variants['lg']), snapshot.html)
+        self.assertEqual(snapshot.images.count(), len(variants) + 1)  # + hlavní obrázek grafu
+
+        # Změny po publikaci: nový graf, jiné řádky tabulky, vyprázdnění cache obrázků
+        services.request_chart_render(Chart.objects.get(pk=chart.pk), 'line', ["2023"], [5.0])
+        call_command('run_chart_workers', '--once', '--workers', '0', stdout=StringIO())
+        Table.objects.filter(pk=table.pk).update(data={'columns': ["obec"], 'rows': [["nova"]], 'row_count': 1})
+        chart_cache.evict(max_bytes=0)
+
+        self.assertTrue(all(default_storage.exists(path) for path in variants.values()))
+        url = reverse('reports:report_snapshot_table_rows',
+                      kwargs={'pk': self.report.pk, 'version': 1, 'element_id': table.pk})
+        self.assertIn(url, snapshot.html)
+        with self.assertNumQueries(2):  # Tabulka verze a bloky stránky, bez obsahu snapshotu
+            page = self.client.get(url, {'offset': 50, 'limit': 5}).json()  # Veřejné, bez přihlášení
+        self.assertEqual((page['total'], page['rows'][0]), (80, ["obec-050", 50]))
+        page = self.client.get(url, {'sort': 1, 'desc': 1, 'limit': 2}).json()
+        self.assertEqual(page['rows'], [["obec-079", 79], ["obec-078", 78]])
+        missing = reverse('reports:report_snapshot_table_rows',
+                          kwargs={'pk': self.report.pk, 'version': 1, 'element_id': chart.pk})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+
+    # -------------------- conditional GET --------------------
+
+from django.test import RequestFactory
+from reports import chart_cache
+from reports.views import media_file
+
+class ConditionalGetTest(TestCase):
+    """
+    Testy pro ETag a Last-Modified detailu reportu a hlavičky cache médií.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Úvod")
+        self.paragraph = services.add_paragraph(section=self.section, text="Text")
+        self.url = reverse('reports:report_detail', kwargs={'pk': self.report.pk})
+        self.client.login(username="testuser", password="testpassword")
+
+    def _etag(self):
+        return self.client.get(self.url)['ETag']
+
+    def test_report_detail_returns_304_when_unchanged(self):
+        """
+        Testuje, že nezměněná stránka vrátí 304 bez renderování šablony.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertTemplateNotUsed(response, 'reports/report_detail.html')
+
+        last_modified = self.client.get(self.url)['Last-Modified']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_report_detail_etag_follows_changes(self):
+        """
+        Testuje, že ETag se změní po úpravě prvku, reportu, sekcí, pořadí i po smazání prvku.
+        """
+        second = services.add_paragraph(section=self.section, text="Druhý")
+        etags = [self._etag()]
+
+        services.edit_paragraph(Paragraph.objects.get(pk=self.paragraph.pk), "Nový text")
+        etags.append(self._etag())
+        services.apply_content_ordering(self.section, [second.pk, self.paragraph.pk])
+        etags.append(self._etag())
+        services.move_content_element(ContentElement.objects.get(pk=second.pk), 2)
+        etags.append(self._etag())
+        services.add_section(report=self.report, title="Závěr")
+        etags.append(self._etag())
+        services.remove_content_element(ContentElement.objects.get(pk=second.pk))
+        etags.append(self._etag())
+        self.report.title = "Nový název"
+        self.report.save()
+        etags.append(self._etag())
+
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_element_delete_signals_run_once(self):
+        """
+        Testuje, že smazání prvku spustí handlery jednou a kaskádové smazání sekce nespouští handlery prvků.
+        """
+        second = services.add_paragraph(section=self.section, text="Druhý")
+        services.add_chart(section=self.section, title="Graf")
+
+        with mock.patch.object(repositories, 'touch_report', wraps=repositories.touch_report) as touch, \
+                mock.patch.object(fragments, 'invalidate_section', wraps=fragments.invalidate_section) as invalidate:
+            services.remove_content_element(ContentElement.objects.get(pk=second.pk))
+            self.assertEqual((touch.call_count, invalidate.call_count), (1, 1))
+
+            touch.reset_mock()
+            invalidate.reset_mock()
+            services.remove_section(self.section)
+            self.assertEqual((touch.call_count, invalidate.call_count), (1, 1))  # Jen signál sekce
+        self.assertFalse(ContentElement.objects.filter(section=self.section.pk).exists())
+
+    def test_report_detail_etag_differs_per_user(self):
+        """
+        Testuje, že ETag stránky jednoho uživatele neplatí pro jiného (stránka obsahuje odkazy a CSRF).
+        """
+        etag = self._etag()
+        User.objects.create_user(username="other", password="testpassword")
+        self.client.login(username="other", password="testpassword")
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_media_file_cache_headers(self):
+        """
+        Testuje, že obsahově pojmenované obrázky grafů jsou immutable a ostatní média se ověřují.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cached = chart_cache.image_path("ab" * 32)
+        for name in (cached, "charts/upload.png"):
+            os.makedirs(os.path.join(media_root, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(media_root, name), 'wb') as f:
+                f.write(b"png")
+
+        factory = RequestFactory()
+        with override_settings(MEDIA_ROOT=media_root):
+            response = media_file(factory.get(f"/media/{cached}"), cached)
+            self.assertEqual(response['Cache-Control'], chart_cache.IMMUTABLE_CACHE_CONTROL)
+
+            response = media_file(factory.get("/media/charts/upload.png"), "charts/upload.png")
+            self.assertEqual(response['Cache-Control'], 'no-cache')
+            request = factory.get("/media/charts/upload.png", HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(media_file(request, "charts/upload.png").status_code, 304)
+
+
+    # -------------------- section actions --------------------
+
+class SectionActionTest(TestCase):
+    """
+    Testy pro endpoint akcí v sekci, který vrací jen HTML dotčené sekce.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Úvod")
+        self.other = services.add_section(report=self.report, title="Jiná sekce")
+        self.url = reverse('reports:section_action', kwargs={'pk': self.section.pk})
+        self.client.login(username="testuser", password="testpassword")
+
+    def _ids(self, section):
+        return list(ContentElement.objects.filter(section=section).order_by('order').values_list('pk', flat=True))
+
+    def test_section_action_add_returns_section_html(self):
+        """
+        Testuje, že přidání prvku vrátí JSON s HTML jen dotčené sekce.
+        """
+        data = self.client.post(self.url, {'add_paragraph': ''}).json()
+
+        self.assertEqual(data['section_id'], self.section.pk)
+        self.assertEqual(data['message'], "Odstavec byl úspěšně přidán.")
+        self.assertIn(f'id="section-{self.section.pk}"', data['html'])
+        self.assertIn("Zadejte text odstavce", data['html'])
+        self.assertIn("csrfmiddlewaretoken", data['html'])
+        self.assertNotIn("Jiná sekce", data['html'])
+        self.assertEqual(len(self._ids(self.section)), 1)
+
+        self.client.post(self.url, {'add_chart': ''})
+        self.assertEqual(ContentElement.objects.get(pk=self._ids(self.section)[1]).get_real_instance_class(), Chart)
+
+    def test_section_action_move_query_count_independent_of_report_size(self):
+        """
+        Testuje přesun prvku a že počet dotazů nezávisí na velikosti zbytku reportu.
+        """
+        first, second = [services.add_paragraph(section=self.section, text=f"P{i}") for i in range(2)]
+        with CaptureQueriesContext(connection) as small:
+            data = self.client.post(self.url, {'move_element_down': '', 'element_id': first.pk}).json()
+        self.assertEqual(self._ids(self.section), [second.pk, first.pk])
+        self.assertEqual(data['message'], "Prvek byl úspěšně přesunut.")
+
+        for i in range(10):
+            services.add_paragraph(section=self.other, text=f"Jiný {i}")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {'move_element_up': '', 'element_id': first.pk})
+        self.assertEqual(self._ids(self.section), [first.pk, second.pk])
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_section_action_rejects_invalid_requests(self):
+        """
+        Testuje chyby: prvek z jiné sekce, posun mimo sekci, neznámá akce, GET a nepřihlášený uživatel.
+        """
+        element = services.add_paragraph(section=self.section, text="P")
+        foreign = services.add_paragraph(section=self.other, text="Cizí")
+
+        self.assertEqual(self.client.post(self.url, {'move_element_up': '', 'element_id': foreign.pk}).status_code, 404)
+        response = self.client.post(self.url, {'move_element_up': '', 'element_id': element.pk})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], ["Prvek nelze přesunout."])
+        self.assertEqual(self.client.post(self.url, {'delete': ''}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+        self.client.logout()
+        self.assertEqual(self.client.post(self.url, {'add_paragraph': ''}).status_code, 302)
+
+
+    # -------------------- profiling --------------------
+
+from django.template.base import Template
+from reports import profiling
+from reports.profiling import QueryBudgetExceeded
+
+
+@override_settings(REPORT_PROFILING=True, REPORT_QUERY_BUDGET_STRICT=True)
+class ProfilingMiddlewareTest(TestCase):
+    """
+    Testy pro měření dotazů a časů požadavků a rozpočty dotazů podle view.
+    """
+
+    def setUp(self):
+        profiling.reset()
+        self.user = User.objects.create_user(username="testuser", password="testpassword", is_staff=True)
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        Report.objects.create(
+            title="Publikovaný", topic="Téma", year=2023, author=self.user, status=Report.ReportStatus.PUBLISHED
+        )
+        for i in range(5):
+            section = services.add_section(report=self.report, title=f"Sekce {i}")
+            services.add_paragraph(section=section, text=f"Odstavec {i}")
+            self.chart = services.add_chart(section=section, title=f"Graf {i}")
+            Table.objects.create(
+                section=section, title=f"Tabulka {i}", order=100000,
+                data={'columns': ['a'], 'rows': [[i]], 'row_count': 1},
+            )
+        self.section = section
+        self.client.login(username="testuser", password="testpassword")
+
+    def test_hot_views_stay_within_query_budgets(self):
+        """
+        Testuje, že detail, seznamy, úprava grafu a akce v sekci nepřekročí rozpočet
+        dotazů z REPORT_QUERY_BUDGETS (jinak by middleware vyvolal QueryBudgetExceeded).
+        """
+        chart_url = reverse('reports:chart_edit', kwargs={'pk': self.chart.pk})
+        responses = [
+            self.client.get(reverse('reports:report_detail', kwargs={'pk': self.report.pk})),
+            self.client.get(reverse('reports:published_report_list')),
+            self.client.get(reverse('reports:open_report_list')),
+            self.client.get(chart_url),
+            self.client.post(chart_url, {'title': "Nový", 'chart_type': 'bar', 'data_x': '2020,2021', 'data_y': '1,2'}),
+            self.client.post(reverse('reports:section_action', kwargs={'pk': self.section.pk}), {'add_paragraph': ''}),
+        ]
+
+        for response in responses:
+            self.assertIn(response.status_code, (200, 302))
+            self.assertRegex(response['Server-Timing'], r'^sql;desc="\d+ SQL";dur=[\d.]+, tpl;dur=[\d.]+, py;dur=[\d.]+$')
+        self.assertEqual(profiling.stats('reports:chart_edit')['reports:chart_edit']['count'], 2)
+        self.assertGreater(profiling.stats('reports:report_detail')['reports:report_detail']['template_ms']['max'], 0)
+        self.assertEqual(Template.render.__module__, 'django.template.base')  # Měření nic globálně nepřepisuje
+
+    def test_chart_edit_fits_tight_query_budget(self):
+        """
+        Testuje, že úprava grafu se vejde do rozpočtu nastaveného těsně nad naměřený počet
+        a že uložení beze změny titulku graf znovu neindexuje.
+        """
+        url = reverse('reports:chart_edit', kwargs={'pk': self.chart.pk})
+        data = {'title': "Nový", 'chart_type': 'bar', 'data_x': '2020,2021', 'data_y': '1,2'}
+        self.assertEqual(self.client.post(url, data).status_code, 302)  # Ve striktním režimu by překročení vyvolalo výjimku
+        changed = profiling.stats('reports:chart_edit')['reports:chart_edit']['queries']['max']
+        profiling.reset()
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        unchanged = profiling.stats('reports:chart_edit')['reports:chart_edit']['queries']['max']
+
+        self.assertGreaterEqual(changed, settings.REPORT_QUERY_BUDGETS['reports:chart_edit'] - 2)
+        self.assertLess(unchanged, changed)
+        self.assertEqual(Chart.objects.get(pk=self.chart.pk).title, "Nový")
+        self.assertEqual(search.search("novy")['total'], 1)
+
+    def test_query_budget_exceeded_raises_in_strict_mode_and_logs_otherwise(self):
+        """
+        Testuje, že překročený rozpočet ve striktním režimu vyvolá výjimku a jinak se jen zaloguje.
+        """
+        url = reverse('reports:report_detail', kwargs={'pk': self.report.pk})
+        with self.settings(REPORT_QUERY_BUDGETS={'reports:report_detail': 1}):
+            with self.assertRaises(QueryBudgetExceeded), self.assertLogs('django.request', 'ERROR'):
+                self.client.get(url)
+
+            with self.settings(REPORT_QUERY_BUDGET_STRICT=False), self.assertLogs('reports.profiling', 'WARNING') as logs:
+                self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertIn("reports:report_detail", logs.output[0])
+
+        with self.settings(REPORT_PROFILING=False):
+            self.assertNotIn('Server-Timing', self.client.get(url))
+
+    def test_profiling_stats_reports_percentiles_for_staff(self):
+        """
+        Testuje endpoint s percentily a že je dostupný jen pro staff.
+        """
+        for _ in range(3):
+            self.client.get(reverse('reports:published_report_list'))
+
+        data = self.client.get(reverse('reports:profiling_stats'), {'view': 'reports:published_report_list'}).json()
+        self.assertEqual(list(data), ['reports:published_report_list'])
+        stats = data['reports:published_report_list']
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(set(stats['queries']), {'p50', 'p90', 'p99', 'max'})
+        self.assertLessEqual(stats['total_ms']['p50'], stats['total_ms']['max'])
+        self.assertIn('reports:profiling_stats', self.client.get(reverse('reports:profiling_stats')).json())
+
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        self.assertEqual(self.client.get(reverse('reports:profiling_stats')).status_code, 302)
+
+
+    # -------------------- benchmarks --------------------
+
+import json
+import tempfile
+
+from django.core.management import call_command
+
+from reports import benchmarks
+
+
+class BenchmarkTest(TestCase):
+    """
+    Testy pro generátor syntetických reportů a příkaz benchmark_reports.
+    """
+
+    def test_generate_report_creates_polymorphic_elements(self):
+        """
+        Testuje, že hromadně vytvořené prvky se načtou jako správné podtřídy se seřazeným pořadím.
+        """
+        user = User.objects.create_user(username="testuser", password="testpassword")
+        report = benchmarks.generate_report(user, sections=3, elements=4, chart_points=5)
+
+        repositories.load_report_content(report)
+        sections = report.section_list
+        self.assertEqual([section.title for section in sections], ["Sekce 1", "Sekce 2", "Sekce 3"])
+        elements = list(sections[0].element_list)
+        self.assertEqual([type(element) for element in elements], [Paragraph, Chart, Table, Paragraph])
+        self.assertEqual(len(series.unpack_series(elements[1].series)[0]), 5)
+        self.assertEqual(elements[2].data['row_count'], benchmarks.TABLE_ROWS)
+        self.assertFalse(repositories.has_unapproved_elements(report))
+
+    def test_benchmark_command_writes_json_and_rolls_back(self):
+        """
+        Testuje, že příkaz změří všechny operace, uloží JSON, porovná ho s předchozím během
+        a databázi nechá beze změny.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "bench.json")
+            call_command(
+                'benchmark_reports', sections=2, elements=3, repeat=1, chart_points=4,
+                label="base", output=output, stdout=StringIO(),
+            )
+            with open(output, encoding='utf-8') as fileobj:
+                result = json.load(fileobj)
+
+            stdout = StringIO()
+            call_command('benchmark_reports', sections=2, elements=3, repeat=1, chart_points=4, compare=output, stdout=stdout)
+
+        self.assertEqual(result['meta']['label'], "base")
+        self.assertEqual(result['meta']['sections'], 2)
+        self.assertEqual(
+            list(result['results']),
+            ['detail_render', 'generate_pdf', 'move_section', 'reorder_section_content', 'chart_render', 'publish_report'],
+        )
+        self.assertEqual(len(result['results']['publish_report']['runs_ms']), 1)
+        self.assertEqual(result['results']['chart_render']['queries'], 0)
+        self.assertIn("Porovnání s base", stdout.getvalue())
+        self.assertEqual(Report.objects.count(), 0)
+        self.assertEqual(ContentElement.objects.count(), 0)
+        self.assertEqual(ReportSnapshot.objects.count(), 0)
+
+
+    # -------------------- report archive --------------------
+
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from django.core.management.base import CommandError
+
+from reports import archive
+from reports import search
+
+
+class ReportArchiveTest(TestCase):
+    """
+    Testy pro proudový export a import reportů (archiv tar.gz s JSON lines a médii).
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="autor", password="testpassword")
+        self.report = Report.objects.create(title="Ovzduší", topic="Emise", year=2023, author=self.user)
+        section = services.add_section(report=self.report, title="Úvod")
+        services.add_paragraph(section=section, text="<p>Smogová situace</p>", author=self.user)
+
+        self.source = DataSource.objects.create(
+            name="Měření", source_type="CSV", file=default_storage.save("data_sources/mereni.csv", ContentFile(b"a,b\n1,2\n")),
+            columns=['a', 'b'], row_count=1,
+        )
+        Data.objects.create(data_source=self.source, content=[[1, 2]], start_row=0, row_count=1)
+        self.chart = services.add_chart(section=section, title="Graf", data_source=self.source)
+        self.chart.dataset.save("graf.png", ContentFile(b"png"), save=False)
+        self.chart.render_params = {'title': "Graf", 'chart_type': 'bar', 'color': None}
+        self.chart.series = series.pack_series(['2020', '2021'], [1.5, 2.5])
+        self.chart.save()
+        Table.objects.create(
+            section=section, title="Tabulka", order=100000, data_source=self.source,
+            data={'columns': ['a', 'b'], 'rows': [[1, 2]], 'row_count': 1},
+        )
+        services.add_section(report=self.report, title="Závěr")
+        Report.objects.create(title="Jiný rok", topic="Emise", year=2022, author=self.user)
+
+    def _export(self, reports=None):
+        output = BytesIO()
+        counts = archive.export_reports(output, reports)
+        output.seek(0)
+        return output, counts
+
+    def test_export_import_round_trip_remaps_ids_and_media(self):
+        """
+        Testuje, že import vytvoří kopii reportu se stejným obsahem, novými id,
+        přemapovaným datovým zdrojem a zkopírovanými soubory.
+        """
+        output, counts = self._export(Report.objects.filter(year=2023))
+        self.assertEqual(
+            {key: counts[key] for key in ('reports', 'sections', 'elements', 'data_sources', 'data', 'media')},
+            {'reports': 1, 'sections': 2, 'elements': 3, 'data_sources': 1, 'data': 1, 'media': 2},
+        )
+
+        result = archive.import_reports(output)
+        self.assertEqual(result['reports'], 1)
+        copy = Report.objects.get(pk=result['report_ids'][self.report.pk])
+        self.assertNotEqual(copy.pk, self.report.pk)
+        self.assertEqual((copy.title, copy.year, copy.author), ("Ovzduší", 2023, self.user))
+
+        repositories.load_report_content(copy)
+        sections = copy.section_list
+        self.assertEqual([section.title for section in sections], ["Úvod", "Závěr"])
+        paragraph, chart, table = sections[0].element_list
+        self.assertEqual((type(paragraph), paragraph.text, paragraph.author), (Paragraph, "<p>Smogová situace</p>", self.user))
+        self.assertEqual(series.unpack_series(chart.series)[1].tolist(), [1.5, 2.5])
+        self.assertEqual(chart.render_params['chart_type'], 'bar')
+        self.assertNotEqual(chart.dataset.name, self.chart.dataset.name)
+        with chart.dataset.open('rb') as fileobj:
+            self.assertEqual(fileobj.read(), b"png")
+        self.assertEqual(table.data['rows'], [[1, 2]])
+
+        new_source = chart.data_source
+        self.assertNotEqual(new_source.pk, self.source.pk)
+        self.assertEqual(table.data_source, new_source)
+        self.assertEqual(list(new_source.data_entries.values_list('content', flat=True)), [[[1, 2]]])
+        with new_source.file.open('rb') as fileobj:
+            self.assertEqual(fileobj.read(), b"a,b\n1,2\n")
+
+    def test_import_maps_missing_authors_to_default_author(self):
+        """
+        Testuje, že report autora, který v cíli neexistuje, vyžaduje výchozího autora.
+        """
+        output, _ = self._export(Report.objects.filter(year=2022))
+        User.objects.filter(pk=self.user.pk).update(username="prejmenovany")
+
+        with self.assertRaises(ValidationError):
+            archive.import_reports(output)
+        self.assertEqual(Report.objects.count(), 2)
+
+        output.seek(0)
+        editor = User.objects.create_user(username="editor", password="testpassword")
+        result = archive.import_reports(output, default_author=editor)
+        self.assertEqual(Report.objects.get(pk=result['report_ids'][Report.objects.get(year=2022, author=self.user).pk]).author, editor)
+
+    def test_import_rejects_invalid_archive_without_partial_data(self):
+        """
+        Testuje, že poškozený archiv neuloží nic a skončí ValidationError.
+        """
+        output, _ = self._export()
+        truncated = BytesIO(output.getvalue()[:len(output.getvalue()) // 2])
+        counts = (Report.objects.count(), Section.objects.count(), ContentElement.objects.count())
+
+        for fileobj in (truncated, BytesIO(b"nejde o archiv")):
+            with self.assertRaises(ValidationError):
+                archive.import_reports(fileobj)
+        self.assertEqual((Report.objects.count(), Section.objects.count(), ContentElement.objects.count()), counts)
+
+    def test_export_import_commands_rebuild_search_index(self):
+        """
+        Testuje příkazy export_reports a import_reports včetně sestavení fulltextového indexu.
+        """
+        path = os.path.join(self.media_root, "export.tar.gz")
+        stdout = StringIO()
+        call_command('export_reports', path, year=[2023], stdout=stdout)
+        self.assertIn("Exportováno reportů: 1", stdout.getvalue())
+
+        stdout = StringIO()
+        call_command('import_reports', path, stdout=stdout)
+        self.assertIn("Importováno reportů: 1", stdout.getvalue())
+        self.assertEqual(Report.objects.filter(title="Ovzduší").count(), 2)
+        self.assertEqual(search.search("smogova")['total'], 2)
+
+        with self.assertRaises(CommandError):
+            call_command('import_reports', path, author="neexistuje", stdout=StringIO())
+
+
+    # -------------------- bulk content services --------------------
+
+class AddElementsTest(TestCase):
+    """
+    Testy pro hromadné přidávání prvků do sekce (services.add_elements).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Sekce")
+
+    def test_add_elements_appends_mixed_elements_with_constant_queries(self):
+        """
+        Testuje, že prvky se přidají za existující obsah ve stejném pořadí jako specifikace,
+        jsou v indexu vyhledávání a počet dotazů nezávisí na počtu prvků.
+        """
+        first = services.add_paragraph(section=self.section, text="První")
+        created = services.add_elements(self.section, [
+            {'type': 'paragraph', 'text': "Hromadný odstavec"},
+            {'type': 'chart', 'title': "Hromadný graf"},
+            {'type': 'table', 'title': "Hromadný přehled"},
+        ], author=self.user)
+
+        elements = list(ContentElement.objects.filter(section=self.section).order_by('order'))
+        self.assertEqual([element.pk for element in elements], [first.pk] + [element.pk for element in created])
+        self.assertEqual([type(element) for element in elements], [Paragraph, Paragraph, Chart, Table])
+        self.assertEqual([element.order for element in elements], [first.order + i * repositories.ORDER_GAP for i in range(4)])
+        self.assertEqual(elements[1].author, self.user)
+        self.assertEqual(search.search("hromadny")['total'], 3)
+
+        def count_queries(n):
+            with CaptureQueriesContext(connection) as captured:
+                services.add_elements(self.section, [{'type': 'paragraph', 'text': f"Odstavec {i}"} for i in range(n)])
+            return len(captured.captured_queries)
+
+        self.assertEqual(count_queries(5), count_queries(50))
+        self.assertEqual(ContentElement.objects.filter(section=self.section).count(), 59)
+
+    def test_add_elements_validates_all_specs_before_saving(self):
+        """
+        Testuje, že neplatné specifikace vrátí všechny chyby najednou a nic se neuloží.
+        """
+        with self.assertRaises(ValidationError) as raised:
+            services.add_elements(self.section, [
+                {'type': 'paragraph', 'text': "Platný"},
+                {'type': 'chart', 'title': ""},
+                {'type': 'video'},
+            ])
+
+        self.assertEqual(len(raised.exception.messages), 2)
+        self.assertTrue(raised.exception.messages[0].startswith("Prvek 2:"))
+        self.assertIn("Prvek 3: neznámý typ 'video'", raised.exception.messages[1])
+        self.assertEqual(ContentElement.objects.count(), 0)
+        self.assertEqual(services.add_elements(self.section, []), [])
+
+    def test_add_elements_materializes_table_data_once_and_saves_files(self):
+        """
+        Testuje, že tabulky ze stejného zdroje sdílí jedno načtení dat a soubor grafu se uloží.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        source = DataSource.objects.create(name="Zdroj", source_type="CSV", columns=['a', 'b'], row_count=2)
+        Data.objects.create(data_source=source, content=[[1, 2], [3, 4]], start_row=0, row_count=2)
+
+        with override_settings(MEDIA_ROOT=media_root), \
+                mock.patch('reports.utils.materialize_table_data', wraps=utils.materialize_table_data) as materialize:
+            table, other, chart = services.add_elements(self.section, [
+                {'type': 'table', 'title': "Tabulka 1", 'data_source': source},
+                {'type': 'table', 'title': "Tabulka 2", 'data_source': source},
+                {'type': 'chart', 'title': "Graf", 'dataset_file': ContentFile(b"png", name="graf.png")},
+            ])
+            self.assertEqual(materialize.call_count, 1)
+
+            table.refresh_from_db()
+            self.assertEqual(table.data['rows'], [[1, 2], [3, 4]])
+            self.assertEqual(Table.objects.get(pk=other.pk).data_fingerprint, utils.data_source_fingerprint(source))
+            stored = Chart.objects.get(pk=chart.pk).dataset
+            self.assertTrue(stored.name.startswith("charts/graf"))
+            with stored.open('rb') as fileobj:
+                self.assertEqual(fileobj.read(), b"png")
+
+
+    # -------------------- content counters --------------------
+
+from io import StringIO
+
+
+class ContentCountersTest(TestCase):
+    """
+    Testy pro denormalizované počty prvků na sekcích a reportech.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.report = Report.objects.create(title="Report", topic="Téma", year=2024, author=self.user)
+        self.section = services.add_section(report=self.report, title="Sekce")
+        self.other = services.add_section(report=self.report, title="Druhá sekce")
+
+    def assertCounters(self, obj, **expected):
+        obj.refresh_from_db()
+        actual = {field: getattr(obj, field) for field in repositories.COUNTER_FIELDS}
+        self.assertEqual(actual, {field: expected.get(field, 0) for field in repositories.COUNTER_FIELDS})
+
+    def test_counters_follow_add_edit_approve_and_delete(self):
+        """
+        Testuje, že počty sekce i reportu odpovídají přidání, změně stavu, schválení a smazání prvků.
+        """
+        paragraph = services.add_paragraph(section=self.section, text="Text")
+        chart = services.add_chart(section=self.section, title="Graf")
+        services.add_elements(self.other, [{'type': 'table', 'title': "Tabulka"}, {'type': 'paragraph', 'text': "Další"}])
+        self.assertCounters(self.section, paragraph_count=1, chart_count=1, draft_count=2)
+        self.assertCounters(self.report, paragraph_count=2, chart_count=1, table_count=1, draft_count=4)
+        self.assertIsNotNone(self.report.content_updated_at)
+
+        repositories.update_chart(chart, status=Chart.ContentElementStatus.STAGED)
+        repositories.update_paragraph(paragraph, text="Nový text")
+        self.assertCounters(self.section, paragraph_count=1, chart_count=1, draft_count=1, staged_count=1)
+
+        self.assertEqual(services.approve_staged_elements(report=self.report), 1)
+        self.assertCounters(self.report, paragraph_count=2, chart_count=1, table_count=1, draft_count=3, approved_count=1)
+
+        services.remove_content_element(paragraph)
+        self.assertCounters(self.section, chart_count=1, approved_count=1)
+        services.remove_section(self.other)
+        self.assertCounters(self.report, chart_count=1, approved_count=1)
+        self.assertEqual(self.report.element_count, 1)
+
+    def test_counters_use_stored_state_of_stale_instances(self):
+        """
+        Testuje, že úprava a smazání zastaralé instance (jiný stav nebo sekce v DB) počítá se stavem uloženým v DB.
+        """
+        paragraph = services.add_paragraph(section=self.section, text="Text")
+        stale = Paragraph.objects.get(pk=paragraph.pk)
+
+        repositories.update_paragraph(paragraph, status=Paragraph.ContentElementStatus.STAGED, section=self.other)
+        self.assertCounters(self.section)
+        self.assertCounters(self.other, paragraph_count=1, staged_count=1)
+
+        repositories.update_paragraph(stale, text="Starší kopie")  # Zapíše DRAFT a původní sekci z paměti
+        self.assertCounters(self.section, paragraph_count=1, draft_count=1)
+        self.assertCounters(self.other)
+
+        repositories.delete_paragraph(Paragraph.objects.get(pk=paragraph.pk))
+        repositories.delete_paragraph(stale)  # Už smazaný prvek počty znovu neodečte
+        self.assertCounters(self.section)
+        self.assertCounters(self.report)
+        self.assertEqual(repositories.recount_content_counters(), (0, 0))
+
+    def test_counter_deltas_map_element_types(self):
+        """
+        Testuje, že změny počtů instance základní třídy ContentElement jdou podle skutečného typu
+        a neznámý typ vyvolá ValueError.
+        """
+        table = repositories.create_table(section=self.section, title="Tabulka", data={'columns': [], 'rows': []})
+        plain = ContentElement.plain_objects.get(pk=table.pk)
+        self.assertEqual(repositories.element_counter_deltas(plain, sign=-1), {'table_count': -1, 'draft_count': -1})
+
+        with self.assertRaises(ValueError):
+            repositories.element_counter_deltas(ContentElement(status=ContentElement.ContentElementStatus.DRAFT))
+
+    def test_approve_staged_elements_adjusts_counters_per_section(self):
+        """
+        Testuje, že hromadné schválení posune počty STAGED -> APPROVED v každé sekci i reportu bez přepočtu.
+        """
+        for section, count in ((self.section, 2), (self.other, 1)):
+            for element in services.add_elements(section, [{'type': 'paragraph', 'text': "Text"}] * count):
+                repositories.update_paragraph(element, status=Paragraph.ContentElementStatus.STAGED)
+        services.add_chart(section=self.other, title="Koncept")
+
+        with mock.patch('reports.repositories.recount_content_counters', side_effect=AssertionError):
+            self.assertEqual(services.approve_staged_elements(report=self.report), 3)
+        self.assertCounters(self.section, paragraph_count=2, approved_count=2)
+        self.assertCounters(self.other, paragraph_count=1, chart_count=1, draft_count=1, approved_count=1)
+        self.assertCounters(self.report, paragraph_count=3, chart_count=1, draft_count=1, approved_count=3)
+        self.assertEqual(repositories.recount_content_counters(), (0, 0))
+
+    def test_list_pages_show_approved_counts_without_element_queries(self):
+        """
+        Testuje, že seznam reportů a API zobrazí schváleno/celkem bez dotazu na tabulky prvků.
+        """
+        services.add_elements(self.section, [{'type': 'paragraph', 'text': f"Odstavec {i}"} for i in range(3)])
+        chart = services.add_chart(section=self.other, title="Graf")
+        repositories.update_chart(chart, status=Chart.ContentElementStatus.STAGED)
+        services.approve_staged_elements(section=self.other)
+        self.client.login(username="testuser", password="testpassword")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('reports:open_report_list'))
+            api = self.client.get(reverse('reports:report_list_api'), {'status': 'open'}).json()
+        self.assertContains(response, "1/4 schváleno")
+        self.assertEqual((api['results'][0]['approved'], api['results'][0]['elements']), (1, 4))
+        element_tables = (ContentElement._meta.db_table, Paragraph._meta.db_table, Chart._meta.db_table, Table._meta.db_table)
+        self.assertFalse([q['sql'] for q in captured.captured_queries if any(f'"{table}"' in q['sql'] for table in element_tables)])
+
+    def test_repair_command_fixes_counters_after_raw_update(self):
+        """
+        Testuje, že repair_content_counters opraví počty po změně mimo repository funkce
+        (--dry-run nic nezmění) a druhé spuštění už nic neopravuje.
+        """
+        services.add_elements(self.section, [{'type': 'paragraph', 'text': "A"}, {'type': 'chart', 'title': "B"}])
+        ContentElement.objects.non_polymorphic().filter(section=self.section).update(status=ContentElement.ContentElementStatus.APPROVED)
+        Section.objects.filter(pk=self.other.pk).update(table_count=5)
+
+        out = StringIO()
+        call_command('repair_content_counters', '--dry-run', stdout=out)
+        self.assertIn("K opravě: 2 sekcí, 1 reportů.", out.getvalue())
+        self.assertCounters(self.section, paragraph_count=1, chart_count=1, draft_count=2)
+
+        out = StringIO()
+        call_command('repair_content_counters', stdout=out)
+        self.assertIn("Opraveno: 2 sekcí, 1 reportů.", out.getvalue())
+        self.assertCounters(self.section, paragraph_count=1, chart_count=1, approved_count=2)
+        self.assertCounters(self.other)
+        self.assertCounters(self.report, paragraph_count=1, chart_count=1, approved_count=2)
+
+        out = StringIO()
+        call_command('repair_content_counters', '--report', str(self.report.pk), stdout=out)
+        self.assertIn("Opraveno: 0 sekcí, 0 reportů.", out.getvalue())
@@ -9,9 +9,23 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('published/', views.PublishedReportListView.as_view(), name='published_report_list'),
     path('open/', views.OpenReportListView.as_view(), name='open_report_list'),
+    path('search/', views.search_reports, name='search'),
+    path('api/reports/', views.report_list_api, name='report_list_api'),
+    path('profiling/', views.profiling_stats, name='profiling_stats'),
     path('<int:pk>/', views.ReportDetailView.as_view(), name='report_detail'),
     path('<int:pk>/edit/', views.ReportEditView.as_view(), name='report_edit'),
+    path('<int:pk>/pdf/', views.report_pdf, name='report_pdf'),
+    path('<int:pk>/published/', views.report_snapshot, name='report_snapshot'),
+    path('<int:pk>/published/v<int:version>/', views.report_snapshot, name='report_snapshot_version'),
+    path('<int:pk>/published/v<int:version>/pdf/', views.report_snapshot_pdf, name='report_snapshot_pdf'),
+    path('<int:pk>/published/v<int:version>/tables/<int:element_id>/rows/', views.report_snapshot_table_rows,
+         name='report_snapshot_table_rows'),
+    path('<int:pk>/sections/order/', views.section_order, name='section_order'),
+    path('sections/<int:pk>/order/', views.content_order, name='content_order'),
+    path('sections/<int:pk>/action/', views.section_action, name='section_action'),
     path('paragraph/<int:pk>/edit/', views.ParagraphUpdateView.as_view(), name='paragraph_edit'),
     path('charts/<int:pk>/edit/', views.ChartUpdateView.as_view(), name='chart_edit'),
+    path('charts/<int:pk>/image/<slug:variant>/', views.chart_image, name='chart_image'),
+    path('tables/<int:pk>/rows/', views.table_rows, name='table_rows'),
     path('logout/', LogoutView.as_view(next_page='reports:index'), name='logout'), # Používám LogoutView správně
 ]
\ No newline at end of file
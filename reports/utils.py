@@ -21,11 +21,21 @@ Přečíslování obsahu
 Generování souborů
 7. `generate_pdf(report: Report) -> bytes`
 8. `generate_chart_preview(chart: Chart) -> str`
+
+Data tabulek
+9. `data_source_fingerprint(data_source: DataSource) -> str`
+10. `materialize_table_data(data_source: DataSource) -> dict`
 """
 
+import hashlib
+import json
+
+from django.conf import settings
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from .models import Report, Section, ContentElement, Paragraph, Chart, Table
+from . import fragments
+from . import repositories
 
 
 # -------------------- Validation Functions --------------------
@@ -124,35 +134,41 @@ def validate_table_data(data: dict) -> None:
 #                 print(f"🔄 Updating ID={element.id} from {element.order} to {index}")  # Debug
 #                 ContentElement.objects.filter(id=element.id).update(order=index)  # Přímý SQL UPDATE
 
-from django.db import transaction
-
 def reorder_section_content(section: Section) -> None:
     """
-    Přečísluje pořadí (order) všech prvků obsahu v dané sekci efektivně pomocí `bulk_update()`.
-    """
-    content_elements = list(ContentElement.objects.filter(section=section).order_by("order"))
+    Přečísluje pořadí (order) všech prvků obsahu v dané sekci s rozestupem ORDER_GAP.
 
-    if not content_elements:
-        return  # Pokud není nic k přeuspořádání, skončíme
+    Běžné vkládání a přesuny přečíslování nepotřebují (používají středy mezer);
+    funkce se volá, až když mezera mezi sousedy dojde, nebo z příkazu
+    `manage.py compact_ordering`. Načítají se jen dvojice (id, order) bez
+    polymorfních dotazů a změněné prvky se zapíší jediným UPDATE.
+    """
+    rows = list(
+        ContentElement.objects.non_polymorphic()
+        .filter(section=section)
+        .order_by("order", "id")
+        .values_list("pk", "order")
+    )
+    spaced = repositories.spaced_orders([pk for pk, _ in rows])
+    changes = {pk: spaced[pk] for pk, order in rows if order != spaced[pk]}
+    if not changes:
+        return  # Pořadí už má rozestupy, není co zapisovat
 
-    with transaction.atomic():  # Zajistí, že všechny změny proběhnou najednou
-        for index, element in enumerate(content_elements, start=1):
-            if element.order != index:
-                print(f"🔄 Updating ID={element.id} from {element.order} to {index}")  # Debug
-                element.order = index  # Změníme hodnotu v paměti
+    with transaction.atomic():
+        repositories.set_content_element_orders(section, changes)
 
-        ContentElement.objects.bulk_update(content_elements, ["order"])  # Hromadná aktualizace
+    fragments.invalidate_section(section.pk)  # UPDATE neposílá signály
 
 
 # -------------------- File Generation Functions --------------------
 
 def generate_pdf(report: Report) -> bytes:
-    from io import BytesIO
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.units import inch
     """
-        Generuje PDF dokument z Report objektu.
+    Generuje PDF dokument z Report objektu.
+
+    Sazbu provádí stránkovaný engine `reports.pdf`. Funkce vrací celý dokument
+    v paměti; pro export velkých reportů používejte streamovaný endpoint
+    (`reports.pdf.render_report_pdf` + `reports.pdf.iter_file_chunks`).
 
     Args:
         report: Report objekt k exportu do PDF.
@@ -163,48 +179,11 @@ def generate_pdf(report: Report) -> bytes:
     Raises:
         Exception: Pokud generování PDF selže (např. chyba knihovny ReportLab).
     """
+    from io import BytesIO
+    from .pdf import write_report_pdf
 
     buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(inch, 10.5 * inch, report.title)
-
-    p.setFont("Helvetica", 12)
-    y_position = 10 * inch
-    p.drawString(inch, y_position, f"Author: {report.author}")
-    y_position -= 0.3 * inch
-    p.drawString(inch, y_position, f"Topic: {report.topic}")
-    y_position -= 0.3 * inch
-    p.drawString(inch, y_position, f"Year: {report.year}")
-    y_position -= 0.5 * inch
-
-    p.setFont("Helvetica-Bold", 14)
-    for section in report.sections.order_by("order"):
-        p.drawString(inch, y_position, section.title)
-        y_position -= 0.3 * inch
-        p.setFont("Helvetica", 12)
-
-        for element in section.content_elements.order_by("order"):
-            if isinstance(element, Paragraph):
-                text_lines = element.text.split("\n")
-                for line in text_lines:
-                    p.drawString(inch + 0.2 * inch, y_position, line)
-                    y_position -= 0.3 * inch  # Posun dolů
-            
-            elif isinstance(element, Chart):
-                p.drawString(inch + 0.2 * inch, y_position, f"Chart: {element.title} (Chart visualization not implemented in PDF)")
-                y_position -= 0.3 * inch
-
-            elif isinstance(element, Table):
-                p.drawString(inch + 0.2 * inch, y_position, f"Table: {element.title} (Table data not implemented in PDF)")
-                y_position -= 0.3 * inch
-
-        y_position -= 0.5 * inch
-        if y_position < inch:
-            p.showPage()
-            y_position = 10.5 * inch
-
-    p.save()
+    write_report_pdf(report, buffer)
     pdf_data = buffer.getvalue()
     buffer.close()
     return pdf_data
@@ -226,18 +205,15 @@ def generate_chart_preview(chart: Chart) -> str: # Returns path to preview image
     # Implementace generování náhledu grafu (např. pomocí matplotlib nebo seaborn)
     # Uložení obrázku do souboru a vrácení cesty k souboru
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import io
 from django.core.files.base import ContentFile
+from . import charts
 
 def render_chart_image(title, chart_type, x_data, y_data, color=None):
     """
-        Vygeneruje graf jako PNG obrázek a vrátí ho jako Django ContentFile.
+    Synchronně vygeneruje graf jako PNG obrázek a vrátí ho jako Django ContentFile.
 
-    Funkce použije matplotlib pro vytvoření grafu z poskytnutých dat a uloží ho
-    do paměti jako PNG soubor vhodný pro uložení do Django FileField.
+    Webové view grafy nekreslí – zakládají úlohu ve frontě (`services.request_chart_render`)
+    a kreslí je `manage.py run_chart_workers`. Tato funkce slouží pro skripty a testy.
 
     Args:
         title (str): Titulek grafu.
@@ -250,25 +226,56 @@ def render_chart_image(title, chart_type, x_data, y_data, color=None):
         ContentFile: Objekt připravený k uložení do FileField (např. Chart.dataset).
 
     Raises:
-        ValueError: Pokud je zadaný nepodporovaný typ grafu.
+        ValueError: Pokud je zadaný nepodporovaný typ grafu nebo se délky dat neshodují.
+    """
+    params = charts.chart_params(title, chart_type, x_data, y_data, color)
+    return ContentFile(charts.render_chart_png(params), name=f"{charts.chart_key(params)}.png")
+
+
+# -------------------- Table Data Functions --------------------
+
+from data_sources.ingest import iter_source_rows
+
+# Kolik řádků zdroje se nejvýš zkopíruje do Table.data (zbytek se čte přímo ze zdroje)
+TABLE_MAX_ROWS = getattr(settings, 'REPORT_TABLE_MAX_ROWS', 10_000)
+
+
+def data_source_fingerprint(data_source) -> str:
     """
+    Vrátí otisk obsahu datového zdroje – změní se při každém novém načtení souboru.
 
-    if len(x_data) != len(y_data):
-        raise ValueError(f"Počet prvků osy X a Y se musí shodovat (x: {len(x_data)}, y: {len(y_data)}).")
-    
-    plt.figure(figsize=(6, 4))
-    if chart_type == 'line':
-        plt.plot(x_data, y_data, color=color or 'blue')
-    elif chart_type == 'bar':
-        plt.bar(x_data, y_data, color=color or 'green')
-    elif chart_type == 'pie':
-        plt.pie(y_data, labels=x_data, colors=[color]*len(x_data) if color else None)
-
-    plt.title(title)
-    plt.tight_layout()
-
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
-    return ContentFile(buf.read(), name=f"{title.lower().replace(' ', '_')}.png")
+    Args:
+        data_source: Datový zdroj (`data_sources.DataSource`).
+
+    Returns:
+        str: SHA-256 z hashe souboru, počtu řádků, sloupců a úložiště.
+    """
+    payload = {
+        'hash': data_source.content_hash,
+        'rows': data_source.row_count,
+        'columns': data_source.columns,
+        'storage': data_source.storage,
+        'limit': TABLE_MAX_ROWS,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def materialize_table_data(data_source) -> dict:
+    """
+    Sestaví obsah `Table.data` z uložených řádků datového zdroje.
+
+    Args:
+        data_source: Datový zdroj (`data_sources.DataSource`).
+
+    Returns:
+        dict: `columns`, `rows` (nejvýš `TABLE_MAX_ROWS` řádků), `row_count`
+        (řádků ve zdroji) a `truncated` (True, pokud se nevešly všechny řádky).
+    """
+    rows = list(iter_source_rows(data_source, 0, TABLE_MAX_ROWS))
+    return {
+        'columns': list(data_source.columns),
+        'rows': rows,
+        'row_count': data_source.row_count,
+        'truncated': data_source.row_count > len(rows),
+    }
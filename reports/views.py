@@ -1,5 +1,12 @@
 # reports/views.py
+import json
+from functools import partial
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.forms import AuthenticationForm
 from .models import Report, Section, Paragraph
@@ -9,13 +16,26 @@ from .services import add_paragraph, add_chart, add_table
 from django.contrib import messages
 from .models import Paragraph, Chart, Table, ContentElement
 from .forms import ParagraphForm, ChartForm, TableForm
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required, permission_required
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.views.static import serve
 from . import repositories
+from . import services
 from . import utils
+from . import pdf
+from . import fragments
+from . import tables
+from . import search
+from . import chart_cache
+from . import charts
+from . import snapshots
+from . import profiling
 from .services import add_paragraph
-from django.db import transaction
 
 def index(request):
     """
@@ -41,7 +61,7 @@ def index(request):
         form = AuthenticationForm()
 
     # Načtení nejnovějších publikovaných reportů (např. posledních 5)
-    latest_reports = Report.objects.filter(status=Report.ReportStatus.OPEN).order_by('-year')[:5]
+    latest_reports = Report.objects.filter(status=Report.ReportStatus.OPEN).only('title').order_by('-year', '-id')[:5]
 
     context = {
         'form': form,
@@ -49,33 +69,151 @@ def index(request):
     }
     return render(request, 'home.html', context)
 
-class PublishedReportListView(ListView):
+# Stavy reportů v seznamech; IN (...) místo NOT (status = ...), aby dotazy obsloužil index report_status_year_idx
+REPORT_LIST_STATUSES = {
+    'published': [Report.ReportStatus.PUBLISHED],
+    'open': [status for status in Report.ReportStatus if status != Report.ReportStatus.PUBLISHED],
+}
+
+
+def _parse_report_cursor(value: str):
+    """
+    Převede kurzor stránky ("rok.id") na klíč (year, id); prázdný kurzor = první stránka.
+
+    Raises:
+        ValueError: Pokud kurzor nemá správný tvar.
+    """
+    if not value:
+        return None
+    year, pk = value.split('.')
+    return int(year), int(pk)
+
+
+def _format_report_cursor(key) -> str:
+    return f"{key[0]}.{key[1]}" if key else None
+
+
+class ReportKeysetListView(ListView):
+    """
+    Seznam reportů stránkovaný podle klíče (year, id) – viz `repositories.get_reports_page`.
+    Další stránka se adresuje parametrem `after` (kurzor z předchozí stránky).
+    """
     model = Report
-    template_name = 'reports/published_report_list.html'
     context_object_name = 'reports'
+    list_status = None  # Klíč do REPORT_LIST_STATUSES
 
     def get_queryset(self):
-        return Report.objects.filter(status=Report.ReportStatus.PUBLISHED)
+        try:
+            after = _parse_report_cursor(self.request.GET.get('after', ''))
+        except ValueError:
+            raise Http404("Neplatný kurzor stránky.")
+        self.is_first_page = after is None
+        reports, self.next_key = repositories.get_reports_page(REPORT_LIST_STATUSES[self.list_status], after=after)
+        return reports
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = _format_report_cursor(self.next_key)
+        context['is_first_page'] = self.is_first_page
+        return context
 
-class OpenReportListView(ListView):
-    model = Report
+
+class PublishedReportListView(ReportKeysetListView):
+    template_name = 'reports/published_report_list.html'
+    list_status = 'published'
+
+
+class OpenReportListView(ReportKeysetListView):
     template_name = 'reports/open_report_list.html'
-    context_object_name = 'reports'
+    list_status = 'open'
+
+
+def report_list_api(request):
+    """
+    Vrátí stránku seznamu reportů jako JSON.
+
+    Parametry: `status` ('published' nebo 'open'), `after` (kurzor `next` z předchozí stránky),
+    `limit` (nejvýš REPORT_PAGE_SIZE).
+    """
+    status = request.GET.get('status', 'published')
+    if status not in REPORT_LIST_STATUSES:
+        return JsonResponse({'error': [f"Neplatný stav: {status}"]}, status=400)
+    try:
+        after = _parse_report_cursor(request.GET.get('after', ''))
+        limit = int(request.GET.get('limit', repositories.REPORT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'error': ["Neplatný kurzor nebo limit."]}, status=400)
+    if limit < 1:
+        return JsonResponse({'error': ["Limit musí být kladný."]}, status=400)
+
+    reports, next_key = repositories.get_reports_page(
+        REPORT_LIST_STATUSES[status], after=after, limit=min(limit, repositories.REPORT_PAGE_SIZE)
+    )
+    return JsonResponse({
+        'results': [
+            {
+                'id': report.pk,
+                'title': report.title,
+                'year': report.year,
+                'author': report.author.username,
+                'elements': report.element_count,
+                'approved': report.approved_count,
+                'url': report.get_absolute_url(),
+            }
+            for report in reports
+        ],
+        'next': _format_report_cursor(next_key),
+    })
+
+def _report_detail_state(request, pk):
+    """
+    Údaje pro ETag a Last-Modified detailu reportu – jeden dotaz, uložený na requestu.
+
+    Stránka závisí i na uživateli (odkazy, CSRF) a na čekajících zprávách (messages),
+    které by odpověď 304 nezobrazila; s čekajícími zprávami se podmíněný GET nepoužije.
+    """
+    if not hasattr(request, '_report_detail_state'):
+        state = repositories.get_report_change_state(pk)
+        request._report_detail_state = None if state is None or len(messages.get_messages(request)) else state
+    return request._report_detail_state
+
+
+def _report_detail_etag(request, pk):
+    state = _report_detail_state(request, pk)
+    if state is None:
+        return None
+    version, updated_at, content_updated_at = state
+    content_stamp = content_updated_at.timestamp() if content_updated_at else 0
+    return f'"report-{pk}-{version}-{updated_at.timestamp():.6f}-{content_stamp:.6f}-u{request.user.pk}"'
+
+
+def _report_detail_last_modified(request, pk):
+    state = _report_detail_state(request, pk)
+    if state is None:
+        return None
+    _, updated_at, content_updated_at = state
+    return max(updated_at, content_updated_at) if content_updated_at else updated_at
 
-    def get_queryset(self):
-        return Report.objects.exclude(status=Report.ReportStatus.PUBLISHED)
 
 @method_decorator(login_required, name='dispatch')
+@method_decorator(cache_control(private=True, no_cache=True), name='get')
+@method_decorator(condition(etag_func=_report_detail_etag, last_modified_func=_report_detail_last_modified), name='get')
 class ReportDetailView(DetailView):
     model = Report
     template_name = 'reports/report_detail.html'
 
     def get_queryset(self):
-        return Report.objects.prefetch_related('sections__content_elements')
+        return Report.objects.select_related('author')
+
+    def get_object(self, queryset=None):
+        report = super().get_object(queryset)
+        if report.status == Report.ReportStatus.PUBLISHED:
+            return report  # Obsah publikovaného reportu se čte z cache fragmentů
+        # Strom reportu (sekce + všechny prvky) se načte konstantním počtem dotazů
+        return repositories.load_report_content(report)
 
     def post(self, request, *args, **kwargs):
-        self.object = self.get_object()
+        self.object = super().get_object()  # Pro akce stačí samotný report bez obsahu
 
         actions = {
             'add_paragraph': lambda req: self.handle_add_element(req, 'Paragraph'),
@@ -96,7 +234,17 @@ class ReportDetailView(DetailView):
             'paragraph_form': ParagraphForm(),
             'chart_form': ChartForm(),
             'table_form': TableForm(),
+            'table_page_size': tables.TABLE_PAGE_SIZE,
+            'section_fragments': None,
         })
+        if self.object.status == Report.ReportStatus.PUBLISHED:
+            # Publikovaná verze se čte ze snapshotu; reporty publikované před zavedením snapshotů z cache fragmentů
+            snapshot = snapshots.get_snapshot(self.object.pk, fields=('version', 'html'))
+            if snapshot is not None:
+                context['section_fragments'] = [mark_safe(snapshot.html)]
+                context['snapshot_version'] = snapshot.version
+            else:
+                context['section_fragments'] = fragments.render_report_sections(self.object)
         return context
 
     def handle_add_element(self, request, element_type):
@@ -104,56 +252,306 @@ class ReportDetailView(DetailView):
         section = get_object_or_404(Section, pk=section_id)
 
         try:
-            if element_type == 'Paragraph':
-                add_paragraph(section=section, text="Zadejte text odstavce", author=request.user)
-                messages.success(request, "Odstavec byl úspěšně přidán.")
-            elif element_type == 'Chart':
-                add_chart(section=section, title="Nový graf",author=request.user)
-                messages.success(request, "Graf byl úspěšně přidán.")
-            # Další typy (např. Table) lze snadno přidat sem
+            messages.success(request, _add_element(section, element_type, request.user))
         except Exception as e:
             messages.error(request, f"Chyba při přidávání prvku ({element_type}): {e}")
 
         return redirect('reports:report_detail', pk=self.object.pk)
 
     def handle_move_element(self, request, direction):
-        element_id = request.POST.get('element_id')
-        element_base = get_object_or_404(ContentElement, pk=request.POST.get('element_id'))
-
-        # Rozpoznání podle reálné instance
-        if isinstance(element_base, Paragraph):
-            element = element_base
-        elif isinstance(element_base, Chart):
-            element = element_base
-        elif isinstance(element_base, Table):
-            element = element_base
-        else:
-            messages.error(request, "Neznámý typ prvku.")
-            return redirect('reports:report_detail', pk=self.object.pk)
-
-        elements = list(ContentElement.objects.filter(section=element.section).order_by('order'))
+        element = get_object_or_404(
+            ContentElement.objects.non_polymorphic().select_related('section'), pk=request.POST.get('element_id')
+        )
 
         try:
-            index = elements.index(element)
-            new_index = index - 1 if direction == 'up' else index + 1
-            if not (0 <= new_index < len(elements)):
-                raise IndexError
-            target = elements[new_index]
-        except (ValueError, IndexError):
+            _move_element(element, direction)
+        except ValidationError:
             messages.info(request, "Prvek nelze přesunout.")
             return redirect('reports:report_detail', pk=self.object.pk)
 
-        element.order, target.order = target.order, element.order
-
-        with transaction.atomic():
-            element.save()
-            target.save()
-
-        utils.reorder_section_content(element.section)
         messages.success(request, "Prvek byl úspěšně přesunut.")
         return redirect('reports:report_detail', pk=self.object.pk)
 
 
+def _add_element(section: Section, element_type: str, user) -> str:
+    """
+    Přidá na konec sekce nový prvek ('Paragraph' nebo 'Chart') a vrátí zprávu pro uživatele.
+    """
+    if element_type == 'Paragraph':
+        add_paragraph(section=section, text="Zadejte text odstavce", author=user)
+        return "Odstavec byl úspěšně přidán."
+    if element_type == 'Chart':
+        add_chart(section=section, title="Nový graf", author=user)
+        return "Graf byl úspěšně přidán."
+    # Další typy (např. Table) lze snadno přidat sem
+    raise ValidationError(f"Neznámý typ prvku: {element_type}")
+
+
+def _move_element(element: ContentElement, direction: str) -> None:
+    """
+    Posune prvek o jednu pozici nahoru ('up') nebo dolů ('down').
+
+    Raises:
+        ValidationError: Pokud prvek už je na okraji sekce.
+    """
+    position = repositories.get_content_element_position(element)
+    services.move_content_element(element, position - 1 if direction == 'up' else position + 1)
+
+
+@login_required
+@require_POST
+def section_action(request, pk):
+    """
+    Provede akci v sekci rozpracovaného reportu a vrátí jen nové HTML této sekce.
+
+    Akce se volí stejně jako ve formulářích detailu reportu (`add_paragraph`, `add_chart`,
+    `move_element_up`, `move_element_down` + `element_id`). Odpověď je JSON
+    {"section_id", "html", "message"}; static/js/section_actions.js jím sekci na stránce
+    nahradí, takže se nerenderuje celý report.
+    """
+    section = get_object_or_404(Section.objects.select_related('report'), pk=pk)
+    try:
+        if 'add_paragraph' in request.POST or 'add_chart' in request.POST:
+            element_type = 'Paragraph' if 'add_paragraph' in request.POST else 'Chart'
+            message = _add_element(section, element_type, request.user)
+        elif 'move_element_up' in request.POST or 'move_element_down' in request.POST:
+            element = get_object_or_404(
+                ContentElement.objects.non_polymorphic(), pk=request.POST.get('element_id'), section=section
+            )
+            try:
+                _move_element(element, 'up' if 'move_element_up' in request.POST else 'down')
+            except ValidationError:
+                return JsonResponse({'error': ["Prvek nelze přesunout."]}, status=400)
+            message = "Prvek byl úspěšně přesunut."
+        else:
+            return JsonResponse({'error': ["Neznámá akce."]}, status=400)
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages}, status=400)
+
+    html = render_to_string(
+        'reports/section_editable.html',
+        {'section': repositories.load_section_content(section), 'table_page_size': tables.TABLE_PAGE_SIZE},
+        request=request,
+    )
+    return JsonResponse({'section_id': section.pk, 'html': html, 'message': message})
+
+
+def _read_id_list(request, key):
+    """
+    Načte z JSON těla požadavku seznam celočíselných ID pod klíčem `key`.
+    """
+    try:
+        ids = json.loads(request.body)[key]
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError(f"Tělo požadavku musí být JSON s klíčem '{key}'.")
+    if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+        raise ValidationError(f"'{key}' musí být seznam celých čísel.")
+    return ids
+
+
+@login_required
+@require_POST
+def section_order(request, pk):
+    """
+    Uloží kompletní pořadí sekcí reportu (drag-and-drop). Tělo: {"section_ids": [...]}.
+    """
+    report = get_object_or_404(Report, pk=pk)
+    try:
+        services.apply_section_ordering(report, _read_id_list(request, 'section_ids'))
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages}, status=400)
+    return JsonResponse({'status': 'ok'})
+
+
+@login_required
+@require_POST
+def content_order(request, pk):
+    """
+    Uloží kompletní pořadí prvků sekce (drag-and-drop). Tělo: {"element_ids": [...]}.
+    """
+    section = get_object_or_404(Section, pk=pk)
+    try:
+        services.apply_content_ordering(section, _read_id_list(request, 'element_ids'))
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages}, status=400)
+    return JsonResponse({'status': 'ok'})
+
+
+# Zástupný obrázek varianty grafu, kterou worker ještě nevykreslil
+CHART_PENDING_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="600" height="400" viewBox="0 0 600 400">'
+    '<rect width="600" height="400" fill="#f4f4f4"/>'
+    '<text x="300" y="205" font-family="sans-serif" font-size="20" text-anchor="middle" fill="#888">'
+    'Graf se vykresluje…</text></svg>'
+)
+
+
+@login_required
+def chart_image(request, pk, variant):
+    """
+    Přesměruje na soubor varianty grafu (viz `charts.CHART_VARIANTS`). Soubory mají
+    obsahové názvy, takže je prohlížeč i proxy mohou cachovat natrvalo.
+
+    Chybějící variantu view nekreslí – zařadí ji do fronty `run_chart_workers`
+    a vrátí 202 se zástupným SVG, které se necachuje.
+    """
+    chart = get_object_or_404(Chart.objects.only('pk', 'dataset', 'render_params', 'series'), pk=pk)
+    if variant not in charts.CHART_VARIANTS:
+        raise Http404("Neznámá varianta grafu.")
+    if not chart.render_params or chart.series is None:
+        if chart.dataset:
+            return redirect(chart.dataset.url)  # Starší grafy bez zdrojových dat
+        raise Http404("Graf zatím nemá data.")
+    path = services.get_chart_variant(chart, variant)
+    if path is None:
+        response = HttpResponse(CHART_PENDING_SVG, content_type='image/svg+xml', status=202)
+        response['Cache-Control'] = 'no-store'
+        response['Retry-After'] = '2'
+        return response
+    return redirect(default_storage.url(path))
+
+
+def media_file(request, path):
+    """
+    Obslouží soubor z MEDIA_ROOT (při DEBUG, v produkci média obsluhuje webový server).
+
+    Obrázky v cache grafů mají obsahové názvy (hash parametrů vykreslení), takže se
+    nikdy nemění a prohlížeč je může cachovat natrvalo. Ostatní soubory se při
+    každém použití ověřují (Last-Modified, odpověď 304).
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if chart_cache.is_content_addressed(path):
+        response['Cache-Control'] = chart_cache.IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@staff_member_required
+def profiling_stats(request):
+    """
+    Vrátí JSON s percentily dotazů a časů požadavků podle view (viz `reports/profiling.py`).
+    Parametr `view` omezí výstup na jeden view, např. `?view=reports:report_detail`.
+    """
+    return JsonResponse(profiling.stats(request.GET.get('view') or None), json_dumps_params={'ensure_ascii': False})
+
+
+def search_reports(request):
+    """
+    Fulltextové vyhledávání v reportech (viz `reports/search.py`).
+    Nepřihlášení uživatelé hledají jen v publikovaných reportech.
+    """
+    query = request.GET.get('q', '').strip()
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+    page_size = search.SEARCH_PAGE_SIZE
+    found = search.search(
+        query, offset=(page_number - 1) * page_size, limit=page_size,
+        published_only=not request.user.is_authenticated,
+    )
+    return render(request, 'reports/search_results.html', {
+        'query': query,
+        'results': found['results'],
+        'total': found['total'],
+        'page_number': page_number,
+        'has_previous': page_number > 1,
+        'has_next': page_number * page_size < found['total'],
+    })
+
+
+@login_required
+def table_rows(request, pk):
+    """
+    Vrátí stránku řádků tabulky jako JSON (další stránky, řazení a filtr v detailu reportu).
+    Stejně jako detail reportu je přístupná jen přihlášeným.
+
+    Parametry: `offset`, `limit`, `sort` (index sloupce), `desc` (1 = sestupně), `q` (hledaný text).
+    """
+    table = get_object_or_404(Table.objects.non_polymorphic().select_related('data_source'), pk=pk)
+    return _table_page_response(request, partial(tables.table_page, table))
+
+
+def _table_page_response(request, read_page) -> JsonResponse:
+    """Načte stránku řádků funkcí `read_page` (`tables.table_page` apod.) podle parametrů požadavku."""
+    try:
+        page = read_page(
+            offset=int(request.GET.get('offset', 0)),
+            limit=int(request.GET.get('limit', tables.TABLE_PAGE_SIZE)),
+            sort=int(request.GET['sort']) if request.GET.get('sort', '') != '' else None,
+            descending=request.GET.get('desc') == '1',
+            query=request.GET.get('q', '').strip(),
+        )
+    except ValueError as e:
+        return JsonResponse({'error': [str(e)]}, status=400)
+    return JsonResponse(page)
+
+
+# Publikované verze (snapshoty) jsou záměrně veřejné – stejně jako seznam publikovaných
+# reportů je čtou i nepřihlášení. Obsahují jen data uložená při publikaci, nic živého.
+
+def report_snapshot(request, pk, version=None):
+    """
+    Zobrazí publikovanou verzi reportu ze snapshotu (poslední, nebo zadanou `version`).
+    Stránka se skládá z jediného řádku `ReportSnapshot`; přístupná je i nepřihlášeným.
+    """
+    snapshot = snapshots.get_snapshot(pk, version)
+    if snapshot is None:
+        if version is None:  # Report publikovaný před zavedením snapshotů
+            return redirect('reports:report_detail', pk=pk)
+        raise Http404("Verze reportu neexistuje.")
+    return render(request, 'reports/report_snapshot.html', {
+        'snapshot': snapshot,
+        'versions': snapshots.list_versions(pk),
+    })
+
+
+def report_snapshot_pdf(request, pk, version):
+    """
+    Vrátí PDF uložené v dané publikované verzi reportu (veřejné jako stránka verze).
+    """
+    snapshot = snapshots.get_snapshot(pk, version, fields=('report_id', 'version', 'pdf'))
+    if snapshot is None:
+        raise Http404("Verze reportu neexistuje.")
+    response = HttpResponse(bytes(snapshot.pdf), content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="report-{pk}-v{version}.pdf"'
+    return response
+
+
+def report_snapshot_table_rows(request, pk, version, element_id):
+    """
+    Vrátí stránku řádků tabulky z dané publikované verze jako JSON (parametry jako `table_rows`).
+
+    Řádky se čtou z bloků uložených ve verzi, takže starší verze stránkují data z doby publikace.
+    """
+    snapshot_table = snapshots.get_snapshot_table(pk, version, element_id)
+    if snapshot_table is None:
+        raise Http404("Tabulka v této verzi reportu neexistuje.")
+    return _table_page_response(request, partial(snapshots.table_page, snapshot_table))
+
+
+@login_required
+def report_pdf(request, pk):
+    """
+    Exportuje report do PDF a posílá ho klientovi po částech (StreamingHttpResponse).
+    Publikovaný report se snapshotem vrací PDF své poslední publikované verze.
+    """
+    report = get_object_or_404(Report.objects.select_related('author'), pk=pk)
+    if report.status == Report.ReportStatus.PUBLISHED:
+        snapshot = snapshots.get_snapshot(report.pk, fields=('version',))
+        if snapshot is not None:
+            return redirect('reports:report_snapshot_pdf', pk=report.pk, version=snapshot.version)
+    pdf_file = pdf.render_report_pdf(report)
+    size = pdf_file.seek(0, 2)
+    pdf_file.seek(0)
+
+    response = StreamingHttpResponse(pdf.iter_file_chunks(pdf_file), content_type='application/pdf')
+    response['Content-Length'] = str(size)
+    response['Content-Disposition'] = f'attachment; filename="report-{report.pk}.pdf"'
+    return response
+
+
 @method_decorator(login_required, name='dispatch') #  Zabezpečí, že se do view dostane pouze přihlášený uživatel
 class ReportEditView(UpdateView):
     model = Report
@@ -183,19 +581,24 @@ class ChartUpdateView(UpdateView):
     form_class = ChartForm
     template_name = 'reports/chart_form.html'
 
+    def get_queryset(self):
+        return Chart.objects.select_related('section')  # report_id pro přesměrování bez dalších dotazů
+
     def form_valid(self, form):
         chart = form.save(commit=False)
 
-        # vykresli graf jako PNG a ulož ho
-        data_x = [x.strip() for x in form.cleaned_data['data_x'].split(',')]
-        data_y = [float(y.strip()) for y in form.cleaned_data['data_y'].split(',')]
+        data_x, data_y = form.cleaned_data['series']
         color = form.cleaned_data['color']
         chart_type = form.cleaned_data['chart_type']
 
-        from .utils import render_chart_image
-        chart.dataset = render_chart_image(chart.title, chart_type, data_x, data_y, color)
-        chart.save()
+        # Graf se nekreslí v requestu – úlohu zpracuje `manage.py run_chart_workers`.
+        # Titulek z formuláře uloží jediný zápis grafu v request_chart_render (update_chart).
+        try:
+            services.request_chart_render(chart, chart_type, data_x, data_y, color)
+        except ValidationError as e:
+            form.add_error(None, e)
+            return self.form_invalid(form)
 
-        messages.success(self.request, "Graf byl úspěšně upraven.")
-        return redirect('reports:report_detail', pk=chart.section.report.pk)
+        messages.success(self.request, "Graf byl uložen a vykresluje se.")
+        return redirect('reports:report_detail', pk=chart.section.report_id)
 
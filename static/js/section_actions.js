@@ -0,0 +1,49 @@
+/* static/js/section_actions.js */
+
+/*
+ * Akce v sekcích rozpracovaného reportu (přidání odstavce/grafu, posun prvku)
+ * bez načtení celé stránky. Formulář se odešle na endpoint sekce
+ * reports:section_action (data-fragment-url) a sekce se nahradí vráceným HTML.
+ * Bez JavaScriptu formuláře dál fungují přes ReportDetailView.post.
+ */
+(function () {
+    'use strict';
+
+    var ACTIONS = ['add_paragraph', 'add_chart', 'move_element_up', 'move_element_down'];
+
+    function showStatus(section, text) {
+        var status = section.querySelector('.section-status');
+        if (status) { status.textContent = text; }
+    }
+
+    document.addEventListener('submit', function (event) {
+        var form = event.target;
+        var section = form.closest('.report-section[data-fragment-url]');
+        var submitter = event.submitter;
+        if (!section || !submitter || ACTIONS.indexOf(submitter.name) < 0) { return; }
+        event.preventDefault();
+
+        var data = new FormData(form);
+        data.append(submitter.name, submitter.value || '');
+        fetch(section.dataset.fragmentUrl, {
+            method: 'POST',
+            body: data,
+            credentials: 'same-origin',
+            headers: {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'}
+        })
+            .then(function (response) { return response.json(); })
+            .then(function (result) {
+                if (result.error) {
+                    showStatus(section, result.error.join(' '));
+                    return;
+                }
+                var template = document.createElement('template');
+                template.innerHTML = result.html.trim();
+                var fresh = template.content.firstElementChild;
+                section.replaceWith(fresh);
+                showStatus(fresh, result.message);
+                if (window.reportTables) { window.reportTables.setup(fresh); }
+            })
+            .catch(function () { window.location.reload(); });
+    });
+}());
@@ -0,0 +1,94 @@
+/* static/js/table_pages.js */
+
+/*
+ * Stránkování, řazení a filtr tabulek v detailu reportu.
+ * V DOM je vždy jen aktuální stránka; další řádky se načítají z JSON
+ * endpointu reports:table_rows (viz reports/tables.py).
+ */
+(function () {
+    'use strict';
+
+    function setupTable(container) {
+        var url = container.dataset.rowsUrl;
+        var pageSize = parseInt(container.dataset.pageSize, 10);
+        var state = {offset: 0, total: parseInt(container.dataset.total, 10), sort: null, desc: false, q: ''};
+        var tbody = container.querySelector('tbody');
+        var status = container.querySelector('.table-status');
+
+        var controls = document.createElement('div');
+        controls.className = 'table-controls';
+        controls.innerHTML =
+            '<input type="search" placeholder="Hledat v tabulce…">' +
+            '<button type="button" data-step="-1">◀</button>' +
+            '<button type="button" data-step="1">▶</button>';
+        container.insertBefore(controls, container.firstChild);
+
+        function render(page) {
+            tbody.replaceChildren();
+            page.rows.forEach(function (row) {
+                var tr = document.createElement('tr');
+                row.forEach(function (value) {
+                    var td = document.createElement('td');
+                    td.textContent = value === null ? '' : value;
+                    tr.appendChild(td);
+                });
+                tbody.appendChild(tr);
+            });
+            state.total = page.total;
+            var last = Math.min(page.offset + page.rows.length, page.total);
+            status.textContent = 'Řádky ' + (page.total ? page.offset + 1 : 0) + '–' + last + ' z ' + page.total;
+        }
+
+        function load() {
+            var params = new URLSearchParams({offset: state.offset, limit: pageSize, q: state.q});
+            if (state.sort !== null) {
+                params.set('sort', state.sort);
+                params.set('desc', state.desc ? '1' : '0');
+            }
+            fetch(url + '?' + params.toString(), {headers: {'Accept': 'application/json'}})
+                .then(function (response) { return response.json(); })
+                .then(function (page) { if (!page.error) { render(page); } });
+        }
+
+        controls.addEventListener('click', function (event) {
+            var step = parseInt(event.target.dataset.step, 10);
+            if (!step) { return; }
+            var offset = state.offset + step * pageSize;
+            if (offset < 0 || offset >= state.total) { return; }
+            state.offset = offset;
+            load();
+        });
+
+        var timer = null;
+        controls.querySelector('input').addEventListener('input', function (event) {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                state.q = event.target.value.trim();
+                state.offset = 0;
+                load();
+            }, 300);
+        });
+
+        container.querySelectorAll('th[data-column]').forEach(function (th) {
+            th.style.cursor = 'pointer';
+            th.addEventListener('click', function () {
+                var column = parseInt(th.dataset.column, 10);
+                state.desc = state.sort === column ? !state.desc : false;
+                state.sort = column;
+                state.offset = 0;
+                load();
+            });
+        });
+    }
+
+    function setupAll(root) {
+        root.querySelectorAll('.table-element[data-rows-url]').forEach(setupTable);
+    }
+
+    // Sekce nahrazené přes static/js/section_actions.js volají setup na nový obsah
+    window.reportTables = {setup: setupAll};
+
+    document.addEventListener('DOMContentLoaded', function () {
+        setupAll(document);
+    });
+}());